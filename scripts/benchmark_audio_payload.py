@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark for the per-sentence audio post-processing.
+
+Compares the file path (write a WAV, decode it with pydub, re-export it and
+compute volumes with make_chunks) with the in-memory path used by engines
+that support PCM (NumPy WAV framing and volume envelope). The file path is
+timed with a WAV file, which pydub reads without ffmpeg; mp3 engines are
+slower still.
+
+Usage:
+    uv run python scripts/benchmark_audio_payload.py [--seconds 4] [--rate 24000]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project source to path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+import numpy as np
+
+from open_llm_vtuber.utils.stream_audio import (
+    pcm_to_wav_bytes,
+    prepare_audio_payload,
+    prepare_pcm_audio_payload,
+)
+
+RUNS = 50
+
+
+def _sentence(seconds: float, sample_rate: int) -> np.ndarray:
+    """A voice-like signal: a tone with a syllable-rate envelope."""
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    envelope = 0.5 + 0.5 * np.sin(2 * np.pi * 4 * t)
+    return (np.sin(2 * np.pi * 220 * t) * envelope * 12000).astype(np.int16)
+
+
+def _time_ms(fn) -> float:
+    start = time.perf_counter()
+    for _ in range(RUNS):
+        fn()
+    return (time.perf_counter() - start) / RUNS * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark audio payload preparation")
+    parser.add_argument("--seconds", type=float, default=4.0)
+    parser.add_argument("--rate", type=int, default=24000)
+    args = parser.parse_args()
+
+    samples = _sentence(args.seconds, args.rate)
+    fd, path = tempfile.mkstemp(suffix=".wav")
+    os.close(fd)
+
+    def file_path() -> None:
+        with open(path, "wb") as f:
+            f.write(pcm_to_wav_bytes(samples, args.rate))
+        prepare_audio_payload(path)
+
+    def in_memory() -> None:
+        prepare_pcm_audio_payload(samples, args.rate)
+
+    try:
+        file_path()
+        file_volumes = prepare_audio_payload(path)["volumes"]
+        memory_volumes = prepare_pcm_audio_payload(samples, args.rate)["volumes"]
+        max_diff = float(np.max(np.abs(np.subtract(file_volumes, memory_volumes))))
+
+        print(f"{args.seconds:.1f}s sentence at {args.rate} Hz, {RUNS} runs")
+        print(f"{'file + pydub':>14}: {_time_ms(file_path):8.3f} ms")
+        print(f"{'in memory':>14}: {_time_ms(in_memory):8.3f} ms")
+        print(f"max volume difference: {max_diff:.2e}")
+    finally:
+        os.remove(path)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark for SentenceDivider: per-token processing cost vs. reply length.
+
+The divider scans only text after its cursors, so the per-token cost should stay
+flat as the reply grows, including long stretches without a sentence boundary.
+
+Usage:
+    uv run python scripts/benchmark_sentence_divider.py [--method pysbd|regex]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add project source to path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from loguru import logger
+
+from open_llm_vtuber.utils.sentence_divider import SentenceDivider
+
+SENTENCE = "This is a fairly ordinary sentence, produced by the model. "
+NO_BOUNDARY = "and the thought just keeps going without any punctuation "
+TOKEN_SIZE = 4
+
+
+async def _token_stream(text: str):
+    for i in range(0, len(text), TOKEN_SIZE):
+        yield text[i : i + TOKEN_SIZE]
+
+
+async def _measure(text: str, method: str) -> float:
+    """Return the mean processing time per token in microseconds."""
+    divider = SentenceDivider(
+        faster_first_response=True, segment_method=method, valid_tags=["think"]
+    )
+    tokens = (len(text) + TOKEN_SIZE - 1) // TOKEN_SIZE
+    start = time.perf_counter()
+    async for _ in divider.process_stream(_token_stream(text)):
+        pass
+    return (time.perf_counter() - start) / tokens * 1e6
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark SentenceDivider")
+    parser.add_argument("--method", choices=["pysbd", "regex"], default="pysbd")
+    args = parser.parse_args()
+
+    logger.remove()
+    # Warm up language detection and pysbd before timing
+    await _measure(SENTENCE * 10, args.method)
+
+    print(f"segment_method={args.method}, token size={TOKEN_SIZE} chars")
+    print(
+        f"{'reply chars':>12} {'sentences us/token':>20} {'no boundary us/token':>22}"
+    )
+    for length in (1_000, 4_000, 16_000, 64_000):
+        sentences = (SENTENCE * (length // len(SENTENCE) + 1))[:length]
+        run_on = (NO_BOUNDARY * (length // len(NO_BOUNDARY) + 1))[:length]
+        with_boundaries = await _measure(sentences, args.method)
+        without_boundaries = await _measure(run_on, args.method)
+        print(f"{length:>12} {with_boundaries:>20.1f} {without_boundaries:>22.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Synthesize phrases into the TTS audio cache ahead of time.
+
+Phrases come from the command line, a text file (one phrase per line) and
+`tts_config.tts_cache.prewarm_phrases` of the config. They are synthesized
+with the TTS engine of the config, so the cache keys match the ones the
+server computes.
+
+Usage:
+    uv run python scripts/prewarm_tts_cache.py [--config PATH] [--file PATH] [PHRASE ...]
+
+Examples:
+    uv run python scripts/prewarm_tts_cache.py
+    uv run python scripts/prewarm_tts_cache.py --file greetings.txt "Привет!"
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from open_llm_vtuber.config_manager import read_yaml, validate_config
+from open_llm_vtuber.tts.cached_tts import CachedTTS
+from open_llm_vtuber.tts.tts_factory import TTSFactory
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Synthesize phrases into the TTS audio cache"
+    )
+    parser.add_argument("phrases", nargs="*", help="Phrases to synthesize")
+    parser.add_argument(
+        "--config",
+        type=str,
+        default="conf.yaml",
+        help="Path to config file (default: conf.yaml)",
+    )
+    parser.add_argument(
+        "--file",
+        type=str,
+        default=None,
+        help="Text file with one phrase per line",
+    )
+    args = parser.parse_args()
+
+    try:
+        config = validate_config(read_yaml(args.config))
+    except Exception as e:
+        print(f"Error: Could not load config {args.config}: {e}")
+        return 1
+
+    tts_config = config.character_config.tts_config
+    cache_config = tts_config.tts_cache
+    if not cache_config or not cache_config.enabled:
+        print(
+            "Warning: tts_cache is disabled in the config, the server will not use it."
+        )
+
+    phrases = list(args.phrases)
+    if args.file:
+        phrases += Path(args.file).read_text(encoding="utf-8").splitlines()
+    if cache_config:
+        phrases += cache_config.prewarm_phrases
+    if not phrases:
+        print("Nothing to synthesize.")
+        return 0
+
+    engine_params = getattr(tts_config, tts_config.tts_model.lower()).model_dump()
+    cache_kwargs = {}
+    if cache_config:
+        cache_kwargs = {
+            "cache_dir": cache_config.cache_dir,
+            "max_size_mb": cache_config.max_size_mb,
+        }
+    tts = CachedTTS(
+        TTSFactory.get_tts_engine(tts_config.tts_model, **engine_params),
+        engine_type=tts_config.tts_model,
+        engine_params=engine_params,
+        **cache_kwargs,
+    )
+
+    print(f"Synthesizing {len(phrases)} phrases with {tts_config.tts_model}...")
+    created = asyncio.run(tts.prewarm(phrases))
+    stats = tts.stats()
+    print(
+        f"{created} new files, {stats['entries']} cached "
+        f"({stats['bytes'] / 1024 / 1024:.1f} MB) in {tts.cache_dir}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
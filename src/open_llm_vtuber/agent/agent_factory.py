@@ -55,9 +55,14 @@ class AgentFactory:
                     f"Configuration not found for LLM provider: {llm_provider}"
                 )
 
+            prompt_caching: bool = basic_memory_settings.get("prompt_caching", False)
+
             # Create the stateless LLM
             llm = StatelessLLMFactory.create_llm(
-                llm_provider=llm_provider, system_prompt=system_prompt, **llm_config
+                llm_provider=llm_provider,
+                system_prompt=system_prompt,
+                prompt_caching=prompt_caching,
+                **llm_config,
             )
 
             tool_prompts = kwargs.get("system_config", {}).get("tool_prompts", {})
@@ -83,6 +88,7 @@ class AgentFactory:
                 tool_manager=tool_manager,
                 tool_executor=tool_executor,
                 mcp_prompt_string=mcp_prompt_string,
+                prompt_caching=prompt_caching,
             )
 
         elif conversation_agent_choice == "mem0_agent":
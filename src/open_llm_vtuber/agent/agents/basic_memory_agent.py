@@ -14,12 +14,11 @@ from ..output_types import SentenceOutput, DisplayText
 from ..stateless_llm.stateless_llm_interface import StatelessLLMInterface
 from ..stateless_llm.claude_llm import AsyncLLM as ClaudeAsyncLLM
 from ..stateless_llm.openai_compatible_llm import AsyncLLM as OpenAICompatibleAsyncLLM
+from ..stateless_llm.prompt_cache import PromptUsage
 from ...chat_history_manager import get_history
 from ..transformers import (
     sentence_divider,
-    actions_extractor,
-    tts_filter,
-    display_processor,
+    text_processor,
 )
 from ...config_manager import TTSPreprocessorConfig
 from ..input_types import BatchInput, TextSource
@@ -49,6 +48,7 @@ class BasicMemoryAgent(AgentInterface):
         tool_manager: Optional[ToolManager] = None,
         tool_executor: Optional[ToolExecutor] = None,
         mcp_prompt_string: str = "",
+        prompt_caching: bool = False,
     ):
         """Initialize agent with LLM and configuration."""
         super().__init__()
@@ -62,6 +62,10 @@ class BasicMemoryAgent(AgentInterface):
         self._tool_prompts = tool_prompts or {}
         self._interrupt_handled = False
         self.prompt_mode_flag = False
+        # Keep the prompt prefix stable across turns and track cache hits
+        self._prompt_caching = prompt_caching
+        self._turn_prompt_usage = PromptUsage()
+        self.last_prompt_usage: PromptUsage | None = None
 
         self._tool_manager = tool_manager
         self._tool_executor = tool_executor
@@ -255,8 +259,8 @@ class BasicMemoryAgent(AgentInterface):
         )
         logger.info(f"Handled interrupt with role '{interrupt_role}'.")
 
-    def _to_text_prompt(self, input_data: BatchInput) -> str:
-        """Format input data to text prompt."""
+    def _context_prompt_parts(self, input_data: BatchInput) -> List[str]:
+        """Format the per-turn RAG and dialogue memory context."""
         message_parts = []
 
         # RAG context from metadata (injected by conversation flow)
@@ -280,6 +284,20 @@ class BasicMemoryAgent(AgentInterface):
                     f"{mem_text}\n\n[Теперь ответь на запрос пользователя]\n"
                 )
 
+        return message_parts
+
+    def _to_text_prompt(self, input_data: BatchInput) -> str:
+        """Format input data to text prompt.
+
+        With prompt caching the volatile RAG/memory context is left out here and
+        appended after the user's text by `_to_messages`, so it never enters the
+        stored history that forms the cached prefix of later turns.
+        """
+        message_parts = []
+
+        if not self._prompt_caching:
+            message_parts.extend(self._context_prompt_parts(input_data))
+
         for text_data in input_data.texts:
             if text_data.source == TextSource.INPUT:
                 message_parts.append(text_data.content)
@@ -324,6 +342,12 @@ class BasicMemoryAgent(AgentInterface):
                     "User input contains images but none could be processed."
                 )
 
+        # Volatile context goes last so everything before it stays cacheable
+        if self._prompt_caching and user_content:
+            context_prompt = "\n".join(self._context_prompt_parts(input_data)).strip()
+            if context_prompt:
+                user_content.append({"type": "text", "text": context_prompt})
+
         if user_content:
             user_message = {"role": "user", "content": user_content}
             messages.append(user_message)
@@ -341,6 +365,21 @@ class BasicMemoryAgent(AgentInterface):
 
         return messages
 
+    def _record_prompt_usage(self, event: Any) -> bool:
+        """Accumulate prompt cache usage from an LLM stream event.
+
+        Returns:
+            bool: True if the event was a usage report and needs no further handling.
+        """
+        if isinstance(event, PromptUsage):
+            self._turn_prompt_usage.add(event)
+            return True
+        if isinstance(event, dict) and event.get("type") == "message_start":
+            usage = (event.get("data") or {}).get("usage")
+            if usage:
+                self._turn_prompt_usage.add(PromptUsage.from_anthropic(usage))
+        return False
+
     async def _claude_tool_interaction_loop(
         self,
         initial_messages: List[Dict[str, Any]],
@@ -358,6 +397,7 @@ class BasicMemoryAgent(AgentInterface):
             current_assistant_message_content.clear()
 
             async for event in stream:
+                self._record_prompt_usage(event)
                 if event["type"] == "text_delta":
                     text = event["text"]
                     current_turn_text += text
@@ -467,10 +507,13 @@ class BasicMemoryAgent(AgentInterface):
 
         while True:
             if self.prompt_mode_flag:
-                if self._mcp_prompt_string:
-                    current_system_prompt = (
-                        f"{self._system}\n\n{self._mcp_prompt_string}"
-                    )
+                mcp_prompt_string = (
+                    self._tool_manager.mcp_prompt
+                    if self._tool_manager and self._tool_manager.mcp_prompt
+                    else self._mcp_prompt_string
+                )
+                if mcp_prompt_string:
+                    current_system_prompt = f"{self._system}\n\n{mcp_prompt_string}"
                 else:
                     logger.warning("Prompt mode active but mcp_prompt_string is empty!")
                     current_system_prompt = self._system
@@ -489,6 +532,8 @@ class BasicMemoryAgent(AgentInterface):
             goto_next_while_iteration = False
 
             async for event in stream:
+                if self._record_prompt_usage(event):
+                    continue
                 if self.prompt_mode_flag:
                     if isinstance(event, str):
                         current_turn_text += event
@@ -637,9 +682,7 @@ class BasicMemoryAgent(AgentInterface):
     ) -> Callable[[BatchInput], AsyncIterator[Union[SentenceOutput, Dict[str, Any]]]]:
         """Create the chat pipeline function."""
 
-        @tts_filter(self._tts_preprocessor_config)
-        @display_processor()
-        @actions_extractor(self._live2d_model)
+        @text_processor(self._live2d_model, self._tts_preprocessor_config)
         @sentence_divider(
             faster_first_response=self._faster_first_response,
             segment_method=self._segment_method,
@@ -651,69 +694,84 @@ class BasicMemoryAgent(AgentInterface):
             """Process chat with memory and tools."""
             self.reset_interrupt()
             self.prompt_mode_flag = False
+            self._turn_prompt_usage = PromptUsage()
+            try:
+                async for output in self._chat_turn(input_data):
+                    yield output
+            finally:
+                if self._prompt_caching and self._turn_prompt_usage.requests:
+                    self.last_prompt_usage = self._turn_prompt_usage
+                    logger.info(f"Prompt cache usage: {self._turn_prompt_usage}")
 
-            messages = self._to_messages(input_data)
-            tools = None
-            tool_mode = None
-            llm_supports_native_tools = False
-
-            if self._use_mcpp and self._tool_manager:
-                tools = None
-                if isinstance(self._llm, ClaudeAsyncLLM):
-                    tool_mode = "Claude"
-                    tools = self._formatted_tools_claude
-                    llm_supports_native_tools = True
-                elif isinstance(self._llm, OpenAICompatibleAsyncLLM):
-                    tool_mode = "OpenAI"
-                    tools = self._formatted_tools_openai
-                    llm_supports_native_tools = True
-                else:
-                    logger.warning(
-                        f"LLM type {type(self._llm)} not explicitly handled for tool mode determination."
-                    )
+        return chat_with_memory
 
-                if llm_supports_native_tools and not tools:
-                    logger.warning(
-                        f"No tools available/formatted for '{tool_mode}' mode, despite MCP being enabled."
-                    )
+    async def _chat_turn(
+        self, input_data: BatchInput
+    ) -> AsyncIterator[Union[str, Dict[str, Any]]]:
+        """Run one LLM turn, dispatching to the tool loop matching the LLM."""
+        messages = self._to_messages(input_data)
+        tools = None
+        tool_mode = None
+        llm_supports_native_tools = False
 
-            if self._use_mcpp and tool_mode == "Claude":
-                logger.debug(
-                    f"Starting Claude tool interaction loop with {len(tools)} tools."
+        if self._use_mcpp and self._tool_manager:
+            tools = None
+            if isinstance(self._llm, ClaudeAsyncLLM):
+                tool_mode = "Claude"
+                # Read at each turn: the tool manager may have been updated
+                tools = self._tool_manager.get_formatted_tools("Claude")
+                llm_supports_native_tools = True
+            elif isinstance(self._llm, OpenAICompatibleAsyncLLM):
+                tool_mode = "OpenAI"
+                tools = self._tool_manager.get_formatted_tools("OpenAI")
+                llm_supports_native_tools = True
+            else:
+                logger.warning(
+                    f"LLM type {type(self._llm)} not explicitly handled for tool mode determination."
                 )
-                async for output in self._claude_tool_interaction_loop(
-                    messages, tools if tools else []
-                ):
-                    yield output
-                return
-            elif self._use_mcpp and tool_mode == "OpenAI":
-                logger.debug(
-                    f"Starting OpenAI tool interaction loop with {len(tools)} tools."
+
+            if llm_supports_native_tools and not tools:
+                logger.warning(
+                    f"No tools available/formatted for '{tool_mode}' mode, despite MCP being enabled."
                 )
-                async for output in self._openai_tool_interaction_loop(
-                    messages, tools if tools else []
-                ):
-                    yield output
-                return
-            else:
-                logger.info("Starting simple chat completion.")
-                token_stream = self._llm.chat_completion(messages, self._system)
-                complete_response = ""
-                async for event in token_stream:
-                    text_chunk = ""
-                    if isinstance(event, dict) and event.get("type") == "text_delta":
-                        text_chunk = event.get("text", "")
-                    elif isinstance(event, str):
-                        text_chunk = event
-                    else:
-                        continue
-                    if text_chunk:
-                        yield text_chunk
-                        complete_response += text_chunk
-                if complete_response:
-                    self._add_message(complete_response, "assistant")
 
-        return chat_with_memory
+        if self._use_mcpp and tool_mode == "Claude":
+            logger.debug(
+                f"Starting Claude tool interaction loop with {len(tools)} tools."
+            )
+            async for output in self._claude_tool_interaction_loop(
+                messages, tools if tools else []
+            ):
+                yield output
+            return
+        elif self._use_mcpp and tool_mode == "OpenAI":
+            logger.debug(
+                f"Starting OpenAI tool interaction loop with {len(tools)} tools."
+            )
+            async for output in self._openai_tool_interaction_loop(
+                messages, tools if tools else []
+            ):
+                yield output
+            return
+        else:
+            logger.info("Starting simple chat completion.")
+            token_stream = self._llm.chat_completion(messages, self._system)
+            complete_response = ""
+            async for event in token_stream:
+                if self._record_prompt_usage(event):
+                    continue
+                text_chunk = ""
+                if isinstance(event, dict) and event.get("type") == "text_delta":
+                    text_chunk = event.get("text", "")
+                elif isinstance(event, str):
+                    text_chunk = event
+                else:
+                    continue
+                if text_chunk:
+                    yield text_chunk
+                    complete_response += text_chunk
+            if complete_response:
+                self._add_message(complete_response, "assistant")
 
     async def chat(
         self,
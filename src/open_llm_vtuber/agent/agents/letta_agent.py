@@ -3,9 +3,7 @@ from .agent_interface import AgentInterface
 from ..output_types import SentenceOutput
 from ..transformers import (
     sentence_divider,
-    actions_extractor,
-    tts_filter,
-    display_processor,
+    text_processor,
 )
 from ...config_manager import TTSPreprocessorConfig
 from ..input_types import BatchInput, TextSource
@@ -38,16 +36,12 @@ class LettaAgent(AgentInterface):
         self._segment_method = segment_method
 
         # Delay decorator application
-        self.chat = tts_filter(self._tts_preprocessor_config)(
-            display_processor()(
-                actions_extractor(self._live2d_model)(
-                    sentence_divider(
-                        faster_first_response=self._faster_first_response,
-                        segment_method=self._segment_method,
-                        valid_tags=["think"],
-                    )(self.chat)
-                )
-            )
+        self.chat = text_processor(self._live2d_model, self._tts_preprocessor_config)(
+            sentence_divider(
+                faster_first_response=self._faster_first_response,
+                segment_method=self._segment_method,
+                valid_tags=["think"],
+            )(self.chat)
         )
 
     def set_memory_from_history(self, conf_uid: str, history_uid: str) -> None:
@@ -10,6 +10,7 @@ from loguru import logger
 from anthropic import AsyncAnthropic, NOT_GIVEN
 
 from .stateless_llm_interface import StatelessLLMInterface
+from .prompt_cache import mark_claude_cache_breakpoints
 
 
 class AsyncLLM(StatelessLLMInterface):
@@ -19,6 +20,7 @@ class AsyncLLM(StatelessLLMInterface):
         base_url: str = None,
         llm_api_key: str = None,
         system: str = None,
+        prompt_caching: bool = False,
     ):
         """
         Initialize Claude LLM.
@@ -28,9 +30,12 @@ class AsyncLLM(StatelessLLMInterface):
             base_url (str): Base URL for Claude API
             llm_api_key (str): Claude API key
             system (str): System prompt
+            prompt_caching (bool): Mark the system prompt, tools and chat history
+                with `cache_control` breakpoints
         """
         self.model = model
         self.system = system
+        self.prompt_caching = prompt_caching
 
         # Initialize Claude client
         self.client = AsyncAnthropic(
@@ -116,12 +121,22 @@ class AsyncLLM(StatelessLLMInterface):
                 if msg["role"] != "system"
             ]
 
+            system_prompt = system if system else (self.system if self.system else "")
+            if self.prompt_caching:
+                (
+                    system_prompt,
+                    tools,
+                    converted_messages,
+                ) = mark_claude_cache_breakpoints(
+                    system_prompt, tools, converted_messages
+                )
+
             logger.debug(f"Sending messages to Claude API: {converted_messages}")
             logger.debug(f"Tools provided: {tools}")
 
             async with self.client.messages.stream(
                 messages=converted_messages,
-                system=system if system else (self.system if self.system else ""),
+                system=system_prompt,
                 model=self.model,
                 max_tokens=1024,
                 tools=tools if tools else NOT_GIVEN,
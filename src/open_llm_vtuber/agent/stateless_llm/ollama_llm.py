@@ -15,6 +15,7 @@ class OllamaLLM(AsyncLLM):
         temperature: float = 1.0,
         keep_alive: float = -1,
         unload_at_exit: bool = True,
+        prompt_caching: bool = False,
     ):
         self.keep_alive = keep_alive
         self.unload_at_exit = unload_at_exit
@@ -26,6 +27,7 @@ class OllamaLLM(AsyncLLM):
             organization_id=organization_id,
             project_id=project_id,
             temperature=temperature,
+            prompt_caching=prompt_caching,
         )
         try:
             # preload model
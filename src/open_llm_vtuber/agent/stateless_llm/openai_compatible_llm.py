@@ -3,12 +3,13 @@ This class is responsible for handling asynchronous interaction with OpenAI API
 endpoints for language generation.
 """
 
-from typing import AsyncIterator, List, Dict, Any
+from typing import AsyncIterator, List, Dict, Any, Tuple
 from openai import (
     AsyncStream,
     AsyncOpenAI,
     APIError,
     APIConnectionError,
+    BadRequestError,
     RateLimitError,
     NotGiven,
     NOT_GIVEN,
@@ -18,6 +19,7 @@ from openai.types.chat.chat_completion_chunk import ChoiceDeltaToolCall
 from loguru import logger
 
 from .stateless_llm_interface import StatelessLLMInterface
+from .prompt_cache import PromptUsage
 from ...mcpp.types import ToolCallObject
 
 
@@ -30,6 +32,7 @@ class AsyncLLM(StatelessLLMInterface):
         organization_id: str = "z",
         project_id: str = "z",
         temperature: float = 1.0,
+        prompt_caching: bool = False,
     ):
         """
         Initializes an instance of the `AsyncLLM` class.
@@ -41,10 +44,14 @@ class AsyncLLM(StatelessLLMInterface):
         - project_id (str, optional): The project ID for the OpenAI API. Defaults to "z".
         - llm_api_key (str, optional): The API key for the OpenAI API. Defaults to "z".
         - temperature (float, optional): What sampling temperature to use, between 0 and 2. Defaults to 1.0.
+        - prompt_caching (bool, optional): Request usage stats in the stream and yield `PromptUsage`
+            with the number of prompt tokens served from the provider's prefix cache. Defaults to False.
+            Backends rejecting the `stream_options` parameter are retried without it.
         """
         self.base_url = base_url
         self.model = model
         self.temperature = temperature
+        self.prompt_caching = prompt_caching
         self.client = AsyncOpenAI(
             base_url=base_url,
             organization=organization_id,
@@ -52,6 +59,8 @@ class AsyncLLM(StatelessLLMInterface):
             api_key=llm_api_key,
         )
         self.support_tools = True
+        # Cleared when the backend rejects stream_options (older Ollama, LM Studio...)
+        self.support_stream_usage = True
 
         logger.info(
             f"Initialized AsyncLLM with the parameters: {self.base_url}, {self.model}"
@@ -74,6 +83,7 @@ class AsyncLLM(StatelessLLMInterface):
         Yields:
         - str: The content of each chunk from the API response.
         - List[ChoiceDeltaToolCall]: The tool calls detected in the response.
+        - PromptUsage: Prompt token usage, only when `prompt_caching` is enabled.
 
         Raises:
         - APIConnectionError: When the server cannot be reached
@@ -97,20 +107,18 @@ class AsyncLLM(StatelessLLMInterface):
 
             available_tools = tools if self.support_tools else NOT_GIVEN
 
-            stream: AsyncStream[
-                ChatCompletionChunk
-            ] = await self.client.chat.completions.create(
-                messages=messages_with_system,
-                model=self.model,
-                stream=True,
-                temperature=self.temperature,
-                tools=available_tools,
+            stream, include_usage = await self._create_stream(
+                messages_with_system, available_tools
             )
             logger.debug(
                 f"Tool Support: {self.support_tools}, Available tools: {available_tools}"
             )
 
             async for chunk in stream:
+                # With include_usage, the last chunk carries usage and no choices
+                if include_usage and getattr(chunk, "usage", None):
+                    yield PromptUsage.from_openai(chunk.usage)
+
                 # Guard against chunks with missing choices field (e.g., from OpenWebUI)
                 if not chunk.choices:
                     continue
@@ -166,8 +174,10 @@ class AsyncLLM(StatelessLLMInterface):
 
                         continue
 
-                    # If we were in a tool call but now we're not, yield the tool call result
-                    elif in_tool_call and not has_tool_calls:
+                    # If we were in a tool call but now we're not, yield the tool call result.
+                    # When usage was requested, hold the tool calls until the stream ends
+                    # so the trailing usage chunk is read before the caller stops iterating.
+                    elif in_tool_call and not has_tool_calls and not include_usage:
                         in_tool_call = False
                         # Convert accumulated tool calls to the required format and output
                         logger.info(f"Complete tool calls: {accumulated_tool_calls}")
@@ -235,3 +245,39 @@ class AsyncLLM(StatelessLLMInterface):
                 logger.debug("Chat completion finished.")
                 await stream.close()
                 logger.debug("Stream closed.")
+
+    async def _create_stream(
+        self,
+        messages: List[Dict[str, Any]],
+        tools: List[Dict[str, Any]] | NotGiven,
+    ) -> Tuple[AsyncStream[ChatCompletionChunk], bool]:
+        """
+        Start the completion stream, asking for usage stats with `prompt_caching`.
+        If the backend rejects the request with them but accepts it without,
+        they are not requested anymore. Returns the stream and whether it
+        ends with usage stats.
+        """
+
+        def create(include_usage: bool):
+            return self.client.chat.completions.create(
+                messages=messages,
+                model=self.model,
+                stream=True,
+                temperature=self.temperature,
+                tools=tools,
+                stream_options={"include_usage": True} if include_usage else NOT_GIVEN,
+            )
+
+        if not (self.prompt_caching and self.support_stream_usage):
+            return await create(False), False
+        try:
+            return await create(True), True
+        except BadRequestError as e:
+            # A rejected request for another reason fails again and raises
+            stream = await create(False)
+            self.support_stream_usage = False
+            logger.warning(
+                f"{self.base_url} rejected stream_options, prompt cache usage "
+                f"will not be reported: {e}"
+            )
+            return stream, False
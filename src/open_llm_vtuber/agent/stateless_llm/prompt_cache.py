@@ -0,0 +1,130 @@
+"""Description: Helpers for provider-side prompt prefix caching.
+
+The stateless LLMs use these helpers to attach cache hints to the stable part
+of a request and to report how many prompt tokens were served from the
+provider's cache, so the agent can log the savings per turn.
+"""
+
+import copy
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+EPHEMERAL_CACHE_CONTROL = {"type": "ephemeral"}
+
+
+@dataclass
+class PromptUsage:
+    """Prompt token usage reported by an LLM backend for one or more requests.
+
+    Args:
+        cached_tokens (int): Prompt tokens read from the provider's prefix cache.
+        uncached_tokens (int): Prompt tokens processed without a cache hit.
+        cache_write_tokens (int): Prompt tokens written to the cache (Claude only).
+        requests (int): Number of LLM requests aggregated in this object.
+    """
+
+    cached_tokens: int = 0
+    uncached_tokens: int = 0
+    cache_write_tokens: int = 0
+    requests: int = 0
+
+    @property
+    def prompt_tokens(self) -> int:
+        return self.cached_tokens + self.uncached_tokens + self.cache_write_tokens
+
+    @property
+    def hit_ratio(self) -> float:
+        if not self.prompt_tokens:
+            return 0.0
+        return self.cached_tokens / self.prompt_tokens
+
+    def add(self, other: "PromptUsage") -> None:
+        """Accumulate another usage report into this one."""
+        self.cached_tokens += other.cached_tokens
+        self.uncached_tokens += other.uncached_tokens
+        self.cache_write_tokens += other.cache_write_tokens
+        self.requests += other.requests
+
+    def __str__(self) -> str:
+        return (
+            f"cached={self.cached_tokens}, uncached={self.uncached_tokens}, "
+            f"cache_write={self.cache_write_tokens}, "
+            f"hit_ratio={self.hit_ratio:.0%}, requests={self.requests}"
+        )
+
+    @classmethod
+    def from_openai(cls, usage: Any) -> "PromptUsage":
+        """Build from an OpenAI-compatible `usage` object or dict.
+
+        Reads `prompt_tokens_details.cached_tokens` (OpenAI, Gemini, Groq...)
+        and falls back to DeepSeek's `prompt_cache_hit_tokens`.
+        """
+        if not isinstance(usage, dict):
+            usage = usage.model_dump() if hasattr(usage, "model_dump") else {}
+
+        prompt_tokens = usage.get("prompt_tokens") or 0
+        details = usage.get("prompt_tokens_details") or {}
+        cached = details.get("cached_tokens") or usage.get("prompt_cache_hit_tokens")
+        cached = cached or 0
+        return cls(
+            cached_tokens=cached,
+            uncached_tokens=max(prompt_tokens - cached, 0),
+            requests=1,
+        )
+
+    @classmethod
+    def from_anthropic(cls, usage: Optional[Dict[str, Any]]) -> "PromptUsage":
+        """Build from the `usage` dict of a Claude `message_start` event."""
+        usage = usage or {}
+        return cls(
+            cached_tokens=usage.get("cache_read_input_tokens") or 0,
+            uncached_tokens=usage.get("input_tokens") or 0,
+            cache_write_tokens=usage.get("cache_creation_input_tokens") or 0,
+            requests=1,
+        )
+
+
+def with_cache_control(block: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a copy of a Claude content block / tool marked as a cache breakpoint."""
+    return {**block, "cache_control": EPHEMERAL_CACHE_CONTROL}
+
+
+def mark_claude_cache_breakpoints(
+    system: str,
+    tools: Optional[List[Dict[str, Any]]],
+    messages: List[Dict[str, Any]],
+) -> tuple[
+    List[Dict[str, Any]] | str, Optional[List[Dict[str, Any]]], List[Dict[str, Any]]
+]:
+    """
+    Place Claude `cache_control` breakpoints on the stable prefix of a request.
+
+    Breakpoints are set on the last tool, on the system prompt and on the last
+    message before the newest one, so the history read on the next turn is a
+    cache hit. The input lists are not modified.
+
+    Returns:
+        tuple: (system blocks, tools, messages) ready for `messages.stream`.
+    """
+    system_blocks = system
+    if system:
+        system_blocks = [with_cache_control({"type": "text", "text": system})]
+
+    cached_tools = tools
+    if tools:
+        cached_tools = [*tools[:-1], with_cache_control(tools[-1])]
+
+    cached_messages = list(messages)
+    if len(cached_messages) >= 2:
+        history_end = copy.deepcopy(cached_messages[-2])
+        content = history_end.get("content")
+        if isinstance(content, str) and content:
+            history_end["content"] = [
+                with_cache_control({"type": "text", "text": content})
+            ]
+            cached_messages[-2] = history_end
+        elif isinstance(content, list) and content:
+            content[-1] = with_cache_control(content[-1])
+            cached_messages[-2] = history_end
+
+    return system_blocks, cached_tools, cached_messages
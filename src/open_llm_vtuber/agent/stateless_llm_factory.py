@@ -41,6 +41,7 @@ class LLMFactory:
                 organization_id=kwargs.get("organization_id"),
                 project_id=kwargs.get("project_id"),
                 temperature=kwargs.get("temperature"),
+                prompt_caching=kwargs.get("prompt_caching", False),
             )
         if llm_provider == "stateless_llm_with_template":
             return StatelessLLMWithTemplate(
@@ -61,6 +62,7 @@ class LLMFactory:
                 temperature=kwargs.get("temperature"),
                 keep_alive=kwargs.get("keep_alive"),
                 unload_at_exit=kwargs.get("unload_at_exit"),
+                prompt_caching=kwargs.get("prompt_caching", False),
             )
 
         elif llm_provider == "llama_cpp_llm":
@@ -75,6 +77,7 @@ class LLMFactory:
                 base_url=kwargs.get("base_url"),
                 model=kwargs.get("model"),
                 llm_api_key=kwargs.get("llm_api_key"),
+                prompt_caching=kwargs.get("prompt_caching", False),
             )
         else:
             raise ValueError(f"Unsupported LLM provider: {llm_provider}")
@@ -1,12 +1,13 @@
-import re
+import time
 from typing import AsyncIterator, Tuple, Callable, List, Union, Dict, Any
 from functools import wraps
 from .output_types import Actions, SentenceOutput, DisplayText
-from ..utils.tts_preprocessor import tts_filter as filter_text
+from ..utils.text_pipeline import FORBIDDEN_EXPRESSION_PATTERN, TextPipeline
 from ..live2d_model import Live2dModel
 from ..config_manager import TTSPreprocessorConfig
 from ..utils.sentence_divider import SentenceDivider
 from ..utils.sentence_divider import SentenceWithTags, TagState
+from ..tracing import current_trace, trace_mark, turn_tracer
 from loguru import logger
 
 
@@ -40,11 +41,12 @@ def sentence_divider(
                 segment_method=segment_method,
                 valid_tags=valid_tags or [],
             )
-            stream_from_func = func(*args, **kwargs)
+            stream_from_func = _trace_first_token(func(*args, **kwargs))
 
             # Process the mixed stream using the updated SentenceDivider
             async for item in divider.process_stream(stream_from_func):
                 if isinstance(item, SentenceWithTags):
+                    trace_mark("first_sentence")
                     logger.debug(f"sentence_divider yielding sentence: {item}")
                 elif isinstance(item, dict):
                     logger.debug(f"sentence_divider yielding dict: {item}")
@@ -56,6 +58,22 @@ def sentence_divider(
     return decorator
 
 
+async def _trace_first_token(
+    stream: AsyncIterator[Union[str, Dict[str, Any]]],
+) -> AsyncIterator[Union[str, Dict[str, Any]]]:
+    """Pass the LLM stream through, recording the time to its first text token."""
+    trace = current_trace()
+    start = trace.elapsed() if trace else 0.0
+    t0 = time.perf_counter()
+    first_token = True
+    async for item in stream:
+        if first_token and isinstance(item, str):
+            first_token = False
+            turn_tracer.record_span("llm_ttft", start, time.perf_counter() - t0)
+            trace_mark("llm_first_token")
+        yield item
+
+
 def actions_extractor(live2d_model: Live2dModel):
     """
     Decorator that extracts actions from sentences, passing through dicts.
@@ -131,20 +149,8 @@ def display_processor():
                     and isinstance(item[0], SentenceWithTags)
                 ):
                     sentence, actions = item
-                    text = sentence.text
                     # Strip forbidden expression tags from display (case-insensitive)
-                    for name in [
-                        "neutral",
-                        "joy",
-                        "smirk",
-                        "confused",
-                        "surprise",
-                        "anger",
-                        "sadness",
-                        "disgust",
-                        "fear",
-                    ]:
-                        text = re.sub(rf"\[{re.escape(name)}\]", "", text, flags=re.I)
+                    text = FORBIDDEN_EXPRESSION_PATTERN.sub("", sentence.text)
                     # Handle think tag states
                     for tag in sentence.tags:
                         if tag.name == "think":
@@ -186,12 +192,15 @@ def tts_filter(
     ) -> Callable[
         ..., AsyncIterator[Union[SentenceOutput, Dict[str, Any]]]
     ]:  # Output type hint
+        pipeline = TextPipeline(
+            **TextPipeline.config_key(tts_preprocessor_config)._asdict()
+        )
+
         @wraps(func)
         async def wrapper(
             *args, **kwargs
         ) -> AsyncIterator[Union[SentenceOutput, Dict[str, Any]]]:  # Yield type hint
             stream = func(*args, **kwargs)
-            config = tts_preprocessor_config or TTSPreprocessorConfig()
 
             async for item in stream:
                 if (
@@ -203,14 +212,7 @@ def tts_filter(
                     if any(tag.name == "think" for tag in sentence.tags):
                         tts = ""
                     else:
-                        tts = filter_text(
-                            text=display.text,
-                            remove_special_char=config.remove_special_char,
-                            ignore_brackets=config.ignore_brackets,
-                            ignore_parentheses=config.ignore_parentheses,
-                            ignore_asterisks=config.ignore_asterisks,
-                            ignore_angle_brackets=config.ignore_angle_brackets,
-                        )
+                        tts = pipeline.filter_tts(display.text)
 
                     logger.debug(f"[{display.name}] display: {display.text}")
                     logger.debug(f"[{display.name}] tts: {tts}")
@@ -229,3 +231,74 @@ def tts_filter(
         return wrapper
 
     return decorator
+
+
+def text_processor(
+    live2d_model: Live2dModel,
+    tts_preprocessor_config: TTSPreprocessorConfig = None,
+):
+    """
+    Decorator that turns sentences into SentenceOutput, passing through dicts.
+
+    Does the work of `actions_extractor`, `display_processor` and `tts_filter`
+    in one scan per sentence, using the text pipeline compiled by the Live2D
+    model for this TTS preprocessor config.
+    """
+
+    def decorator(
+        func: Callable[
+            ..., AsyncIterator[Union[SentenceWithTags, Dict[str, Any]]]
+        ],  # Input type hint
+    ) -> Callable[
+        ..., AsyncIterator[Union[SentenceOutput, Dict[str, Any]]]
+    ]:  # Output type hint
+        @wraps(func)
+        async def wrapper(
+            *args, **kwargs
+        ) -> AsyncIterator[Union[SentenceOutput, Dict[str, Any]]]:  # Yield type hint
+            # Looked up per call so a model switch picks up the new pipeline
+            pipeline = live2d_model.text_pipeline(tts_preprocessor_config)
+            stream = func(*args, **kwargs)
+
+            async for item in stream:
+                if isinstance(item, SentenceWithTags):
+                    sentence = item
+                    processed = pipeline.process(sentence.text)
+                    actions = Actions()
+                    text = processed.display_text
+                    tts = processed.tts_text
+                    # Only extract emotions for non-tag text
+                    if processed.expressions and not any(
+                        tag.state in [TagState.START, TagState.END]
+                        for tag in sentence.tags
+                    ):
+                        actions.expressions = processed.expressions
+                    # Handle think tag states
+                    for tag in sentence.tags:
+                        if tag.name == "think":
+                            tts = ""
+                            if tag.state == TagState.START:
+                                text = "("
+                            elif tag.state == TagState.END:
+                                text = ")"
+
+                    display = DisplayText(text=text)
+                    logger.debug(f"[{display.name}] display: {display.text}")
+                    logger.debug(f"[{display.name}] tts: {tts}")
+
+                    yield SentenceOutput(
+                        display_text=display,
+                        tts_text=tts,
+                        actions=actions,
+                    )
+                elif isinstance(item, dict):
+                    # Pass through dictionaries
+                    yield item
+                else:
+                    logger.warning(
+                        f"text_processor received unexpected type: {type(item)}"
+                    )
+
+        return wrapper
+
+    return decorator
@@ -3,10 +3,68 @@ import numpy as np
 import asyncio
 
 
+class ASRStream(metaclass=abc.ABCMeta):
+    """Transcription of one utterance whose audio arrives while it is spoken.
+
+    The methods block; callers run them off the event loop, one at a time.
+    """
+
+    @abc.abstractmethod
+    def accept_waveform(self, audio: np.ndarray) -> None:
+        """Add the next piece of the utterance's audio."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def partial_text(self) -> str:
+        """Interim transcript of the audio accepted so far."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def final_text(self) -> str:
+        """Transcript of all the audio accepted so far.
+
+        The stream can still accept audio afterwards; calling this again
+        then returns the transcript including that audio.
+        """
+        raise NotImplementedError
+
+
+class RedecodeASRStream(ASRStream):
+    """Stream of an offline engine: each transcript decodes the audio so far.
+
+    Interim transcripts only decode the last `partial_window` seconds, to
+    keep their cost bounded during long utterances.
+    """
+
+    def __init__(self, engine: "ASRInterface", partial_window: float = 10.0):
+        self.engine = engine
+        self.partial_window = partial_window
+        self._chunks: list[np.ndarray] = []
+
+    def _audio(self) -> np.ndarray:
+        if len(self._chunks) > 1:
+            self._chunks = [np.concatenate(self._chunks)]
+        return self._chunks[0] if self._chunks else np.zeros(0, np.float32)
+
+    def accept_waveform(self, audio: np.ndarray) -> None:
+        self._chunks.append(np.asarray(audio, dtype=np.float32))
+
+    def partial_text(self) -> str:
+        audio = self._audio()
+        window = int(self.partial_window * self.engine.SAMPLE_RATE)
+        return self.engine.transcribe_np(audio[-window:]) if len(audio) else ""
+
+    def final_text(self) -> str:
+        audio = self._audio()
+        return self.engine.transcribe_np(audio) if len(audio) else ""
+
+
 class ASRInterface(metaclass=abc.ABCMeta):
     SAMPLE_RATE = 16000
     NUM_CHANNELS = 1
     SAMPLE_WIDTH = 2
+    # Whether transcribe_batch_np runs several utterances in one inference call
+    SUPPORTS_BATCH = False
 
     async def async_transcribe_np(self, audio: np.ndarray) -> str:
         """Asynchronously transcribe speech audio in numpy array format.
@@ -24,6 +82,31 @@ class ASRInterface(metaclass=abc.ABCMeta):
             audio = audio.astype(np.float32)
         return await asyncio.to_thread(self.transcribe_np, audio)
 
+    def transcribe_batch_np(self, audios: list[np.ndarray]) -> list[str]:
+        """Transcribe several utterances; engines with SUPPORTS_BATCH do it in
+        one inference call.
+
+        Args:
+            audios: The numpy arrays of the utterances.
+
+        Returns:
+            list[str]: The transcriptions, in the order of `audios`.
+        """
+        return [self.transcribe_np(audio) for audio in audios]
+
+    def create_stream(self) -> ASRStream:
+        """Create a stream transcribing an utterance while it is spoken.
+
+        By default the accepted audio is decoded again with transcribe_np
+        for each transcript. Engines with a streaming recognizer override
+        this.
+        """
+        return RedecodeASRStream(self)
+
+    async def async_create_stream(self) -> ASRStream:
+        """Create a stream (see create_stream) without blocking the event loop."""
+        return await asyncio.to_thread(self.create_stream)
+
     @abc.abstractmethod
     def transcribe_np(self, audio: np.ndarray) -> str:
         """Transcribe speech audio in numpy array format and return the transcription.
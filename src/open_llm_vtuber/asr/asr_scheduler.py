@@ -0,0 +1,384 @@
+import asyncio
+import heapq
+import itertools
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import numpy as np
+from loguru import logger
+
+from .asr_interface import ASRInterface, ASRStream, RedecodeASRStream
+
+# Engines calling a remote API: requests can run in parallel
+REMOTE_ASR_ENGINES = {"azure_asr", "groq_whisper_asr"}
+LOCAL_CONCURRENCY = 1
+REMOTE_CONCURRENCY = 4
+DEFAULT_MAX_BATCH_SIZE = 8
+WAIT_EMA_WEIGHT = 0.2
+
+
+def default_asr_concurrency(asr_model: str) -> int:
+    """Transcriptions run at once when the config does not set a limit."""
+    return REMOTE_CONCURRENCY if asr_model in REMOTE_ASR_ENGINES else LOCAL_CONCURRENCY
+
+
+class ASRDeadlineExceeded(TimeoutError):
+    """The deadline of a transcription passed before it could start."""
+
+
+@dataclass(order=True)
+class _ASRRequest:
+    deadline: float
+    order: int
+    # Audio to transcribe, or a blocking call using the engine (`job`)
+    audio: Optional[np.ndarray] = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+    enqueued_at: float = field(compare=False)
+    job: Optional[Callable[[], Any]] = field(default=None, compare=False)
+    started: bool = field(default=False, compare=False)
+
+
+class _ScheduledASRStream(ASRStream):
+    """Stream of the engine whose calls wait for a turn in the scheduler's queue."""
+
+    def __init__(self, scheduler: "ASRScheduler", stream: ASRStream):
+        self.scheduler = scheduler
+        self.stream = stream
+
+    def accept_waveform(self, audio: np.ndarray) -> None:
+        self.scheduler.run_blocking(self.stream.accept_waveform, audio)
+
+    def partial_text(self) -> str:
+        return self.scheduler.run_blocking(self.stream.partial_text)
+
+    def final_text(self) -> str:
+        return self.scheduler.run_blocking(self.stream.final_text)
+
+
+class ASRScheduler(ASRInterface):
+    """
+    Shared queue in front of an ASR engine, for the utterances of all
+    clients and the /asr route.
+
+    Waiting requests are served earliest deadline first; a request whose
+    deadline passes before it starts fails with ASRDeadlineExceeded instead
+    of using the engine. When the engine supports batches
+    (`SUPPORTS_BATCH`), requests waiting together, or arriving within
+    `max_batch_delay` of the first, are transcribed in one inference call.
+
+    The streams of `create_stream` and the blocking methods, which the
+    streaming transcriber calls from worker threads, go through the same
+    queue. Engine calls run on the scheduler's own threads, so worker
+    threads waiting for the queue never hold up the engine.
+
+    Args:
+        engine: The ASR engine.
+        name (str): Engine name, for logs and metrics.
+        max_concurrency (int): Transcriptions (or batches) run at once.
+        max_batch_size (int): Largest batch; 1 disables batching.
+        max_batch_delay (float): Seconds to wait for more requests to batch.
+        timeout (float | None): Default seconds a request may wait to start.
+    """
+
+    def __init__(
+        self,
+        engine: ASRInterface,
+        name: str,
+        max_concurrency: int = LOCAL_CONCURRENCY,
+        max_batch_size: Optional[int] = None,
+        max_batch_delay: float = 0.02,
+        timeout: Optional[float] = None,
+    ):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.engine = engine
+        self.name = name
+        self.max_concurrency = max_concurrency
+        if max_batch_size is None:
+            max_batch_size = DEFAULT_MAX_BATCH_SIZE if engine.SUPPORTS_BATCH else 1
+        self.max_batch_size = max_batch_size if engine.SUPPORTS_BATCH else 1
+        self.max_batch_delay = max_batch_delay
+        self.timeout = timeout
+        self.active = 0
+        self._waiting: List[_ASRRequest] = []
+        self._counter = itertools.count()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._running: set[asyncio.Task] = set()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix=f"asr-{name}"
+        )
+        # Event loop serving the queue, for calls from worker threads
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self.completed = 0
+        self.failed = 0
+        self.expired = 0
+        self.batches = 0
+        self.mean_wait = 0.0
+        self.mean_batch_size = 0.0
+        logger.info(
+            f"ASR scheduler for {name}: {max_concurrency} concurrent, "
+            f"batches of up to {self.max_batch_size}"
+        )
+
+    @property
+    def SAMPLE_RATE(self) -> int:
+        return self.engine.SAMPLE_RATE
+
+    @property
+    def queued(self) -> int:
+        return sum(1 for request in self._waiting if not request.future.done())
+
+    def __getattr__(self, name: str) -> Any:
+        # Engine specific attributes; methods would bypass the queue
+        value = getattr(self.engine, name)
+        if callable(value):
+            raise AttributeError(
+                f"{name} of the ASR engine is not available through the scheduler"
+            )
+        return value
+
+    def _from_thread(
+        self, make_coroutine: Callable[[], Awaitable], direct: Callable[[], Any]
+    ) -> Any:
+        """
+        Run a queued call from a worker thread and wait for its result.
+        Before an event loop has used the queue, `direct` is called instead.
+        """
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return direct()
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            raise RuntimeError(
+                "Blocking ASR call on the event loop, use the async methods"
+            )
+        return asyncio.run_coroutine_threadsafe(make_coroutine(), loop).result()
+
+    def transcribe_np(self, audio: np.ndarray) -> str:
+        return self._from_thread(
+            lambda: self.async_transcribe_np(audio),
+            lambda: self.engine.transcribe_np(audio),
+        )
+
+    def transcribe_batch_np(self, audios: List[np.ndarray]) -> List[str]:
+        async def transcribe_all() -> List[str]:
+            # Queued together: batched when the engine supports it
+            return list(
+                await asyncio.gather(*(self.async_transcribe_np(a) for a in audios))
+            )
+
+        return self._from_thread(
+            transcribe_all, lambda: self.engine.transcribe_batch_np(audios)
+        )
+
+    def run_blocking(self, func: Callable, *args) -> Any:
+        """Call `func`, which uses the engine, in its turn in the queue."""
+        return self._from_thread(
+            lambda: self.async_run(func, *args), lambda: func(*args)
+        )
+
+    def create_stream(self) -> ASRStream:
+        stream = self.engine.create_stream()
+        if type(stream) is RedecodeASRStream:
+            # Its decodes are queued transcriptions, batched with the others
+            return RedecodeASRStream(self, stream.partial_window)
+        return _ScheduledASRStream(self, stream)
+
+    async def async_create_stream(self) -> ASRStream:
+        self._loop = asyncio.get_running_loop()
+        return await asyncio.to_thread(self.create_stream)
+
+    async def async_transcribe_np(
+        self, audio: np.ndarray, deadline: Optional[float] = None
+    ) -> str:
+        """
+        Queue a transcription. `deadline` is a time.monotonic() value by
+        which it must have started; by default `timeout` seconds from now.
+        """
+        if audio.dtype != np.float32:
+            audio = audio.astype(np.float32)
+        return await self._enqueue(audio, None, deadline)
+
+    async def async_run(
+        self, func: Callable, *args, deadline: Optional[float] = None
+    ) -> Any:
+        """Queue a blocking call using the engine, e.g. a stream decode."""
+        return await self._enqueue(None, lambda: func(*args), deadline)
+
+    async def _enqueue(
+        self,
+        audio: Optional[np.ndarray],
+        job: Optional[Callable[[], Any]],
+        deadline: Optional[float],
+    ) -> Any:
+        now = time.monotonic()
+        if deadline is None:
+            deadline = now + self.timeout if self.timeout else math.inf
+        loop = self._loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        request = _ASRRequest(deadline, next(self._counter), audio, future, now, job)
+        heapq.heappush(self._waiting, request)
+        if deadline != math.inf:
+            timer = loop.call_later(deadline - now, self._expire, request)
+            future.add_done_callback(lambda _: timer.cancel())
+        self._wake()
+        return await future
+
+    def _expire(self, request: _ASRRequest) -> None:
+        if request.started or request.future.done():
+            return
+        self.expired += 1
+        request.future.set_exception(
+            ASRDeadlineExceeded(
+                f"ASR request waited {time.monotonic() - request.enqueued_at:.2f}s "
+                "without starting"
+            )
+        )
+
+    def _wake(self) -> None:
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        self._wakeup.set()
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch())
+
+    def _next_batch(self) -> List[_ASRRequest]:
+        batch = []
+        while self._waiting and len(batch) < self.max_batch_size:
+            request = self._waiting[0]
+            if request.future.done():
+                # Cancelled by the caller, or past its deadline
+                heapq.heappop(self._waiting)
+                continue
+            if request.job is not None and batch:
+                # Jobs run alone
+                break
+            heapq.heappop(self._waiting)
+            request.started = True
+            batch.append(request)
+            if request.job is not None:
+                break
+        return batch
+
+    async def _dispatch(self) -> None:
+        while True:
+            self._wakeup.clear()
+            if not self.queued:
+                return
+            if self.active >= self.max_concurrency:
+                await self._wakeup.wait()
+                continue
+            if self.max_batch_size > 1 and self.queued < self.max_batch_size:
+                # Give requests arriving right after this one a chance to join
+                oldest = min(
+                    r.enqueued_at for r in self._waiting if not r.future.done()
+                )
+                delay = oldest + self.max_batch_delay - time.monotonic()
+                if delay > 0:
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), delay)
+                        continue
+                    except asyncio.TimeoutError:
+                        pass
+            batch = self._next_batch()
+            if batch:
+                self.active += 1
+                task = asyncio.create_task(self._run(batch))
+                self._running.add(task)
+                task.add_done_callback(self._running.discard)
+
+    async def _run(self, batch: List[_ASRRequest]) -> None:
+        started = time.monotonic()
+        # The first batch sets the averages
+        weight = 1.0 if self.batches == 0 else WAIT_EMA_WEIGHT
+        wait = max(started - request.enqueued_at for request in batch)
+        self.mean_wait += weight * (wait - self.mean_wait)
+        self.mean_batch_size += weight * (len(batch) - self.mean_batch_size)
+        self.batches += 1
+        loop = asyncio.get_running_loop()
+        try:
+            if batch[0].job is not None:
+                texts = [await loop.run_in_executor(self._executor, batch[0].job)]
+            elif len(batch) > 1:
+                texts = await loop.run_in_executor(
+                    self._executor,
+                    self.engine.transcribe_batch_np,
+                    [r.audio for r in batch],
+                )
+            elif (
+                type(self.engine).async_transcribe_np
+                is ASRInterface.async_transcribe_np
+            ):
+                texts = [
+                    await loop.run_in_executor(
+                        self._executor, self.engine.transcribe_np, batch[0].audio
+                    )
+                ]
+            else:
+                # The engine has its own async implementation (remote API)
+                texts = [await self.engine.async_transcribe_np(batch[0].audio)]
+        except Exception as e:
+            self.failed += len(batch)
+            for request in batch:
+                if not request.future.done():
+                    request.future.set_exception(e)
+        else:
+            self.completed += len(batch)
+            for request, text in zip(batch, texts):
+                if not request.future.done():
+                    request.future.set_result(text)
+        finally:
+            self.active -= 1
+            self._wake()
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "max_batch_size": self.max_batch_size,
+            "active": self.active,
+            "queued": self.queued,
+            "completed": self.completed,
+            "failed": self.failed,
+            "expired": self.expired,
+            "batches": self.batches,
+            "mean_wait_seconds": self.mean_wait,
+            "mean_batch_size": self.mean_batch_size,
+        }
+
+    def render_prometheus(self) -> List[str]:
+        """Scheduler metrics in the Prometheus text format, for /metrics."""
+        label = f'engine="{self.name}"'
+        return [
+            "# HELP vtuber_asr_active Transcription batches running.",
+            "# TYPE vtuber_asr_active gauge",
+            f"vtuber_asr_active{{{label}}} {self.active}",
+            "# HELP vtuber_asr_queued Transcriptions waiting to start.",
+            "# TYPE vtuber_asr_queued gauge",
+            f"vtuber_asr_queued{{{label}}} {self.queued}",
+            "# HELP vtuber_asr_completed_total Transcriptions finished.",
+            "# TYPE vtuber_asr_completed_total counter",
+            f"vtuber_asr_completed_total{{{label}}} {self.completed}",
+            "# HELP vtuber_asr_failed_total Transcriptions failed in the engine.",
+            "# TYPE vtuber_asr_failed_total counter",
+            f"vtuber_asr_failed_total{{{label}}} {self.failed}",
+            "# HELP vtuber_asr_expired_total Transcriptions dropped past their deadline.",
+            "# TYPE vtuber_asr_expired_total counter",
+            f"vtuber_asr_expired_total{{{label}}} {self.expired}",
+            "# HELP vtuber_asr_batches_total Inference calls.",
+            "# TYPE vtuber_asr_batches_total counter",
+            f"vtuber_asr_batches_total{{{label}}} {self.batches}",
+            "# HELP vtuber_asr_queue_wait_seconds Moving average of the longest wait to start, per batch.",
+            "# TYPE vtuber_asr_queue_wait_seconds gauge",
+            f"vtuber_asr_queue_wait_seconds{{{label}}} {self.mean_wait:.4f}",
+            "# HELP vtuber_asr_batch_size Moving average of the batch size.",
+            "# TYPE vtuber_asr_batch_size gauge",
+            f"vtuber_asr_batch_size{{{label}}} {self.mean_batch_size:.2f}",
+        ]
@@ -12,6 +12,8 @@ from .asr_interface import ASRInterface
 class VoiceRecognition(ASRInterface):
     """GigaAM ONNX ASR using onnx-asr library."""
 
+    SUPPORTS_BATCH = True
+
     def __init__(
         self,
         model_path: str,
@@ -56,3 +58,18 @@ class VoiceRecognition(ASRInterface):
             sample_rate=self.SAMPLE_RATE,
         )
         return result if isinstance(result, str) else str(result)
+
+    def transcribe_batch_np(self, audios: list[np.ndarray]) -> list[str]:
+        """Transcribe several utterances in one batched inference call.
+
+        Args:
+            audios: Float32 numpy arrays of audio at 16kHz.
+
+        Returns:
+            Transcribed text strings, in the order of `audios`.
+        """
+        results = self.model.recognize(
+            [np.asarray(audio, dtype=np.float32) for audio in audios],
+            sample_rate=self.SAMPLE_RATE,
+        )
+        return [r if isinstance(r, str) else str(r) for r in results]
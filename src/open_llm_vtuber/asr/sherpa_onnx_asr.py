@@ -2,17 +2,49 @@ import os
 import numpy as np
 import sherpa_onnx
 from loguru import logger
-from .asr_interface import ASRInterface
+from .asr_interface import ASRInterface, ASRStream
 from .utils import download_and_extract, check_and_extract_local_file
 import onnxruntime
 
+# Silence fed after the last audio, so the last frames go through the
+# model's right context
+ONLINE_TAIL_PADDING_SECONDS = 0.66
+
+
+class SherpaOnlineASRStream(ASRStream):
+    """Stream of a sherpa-onnx online recognizer: audio is decoded as it arrives."""
+
+    def __init__(self, recognizer, sample_rate: int):
+        self.recognizer = recognizer
+        self.sample_rate = sample_rate
+        self.stream = recognizer.create_stream()
+
+    def _decode(self) -> None:
+        while self.recognizer.is_ready(self.stream):
+            self.recognizer.decode_stream(self.stream)
+
+    def accept_waveform(self, audio: np.ndarray) -> None:
+        self.stream.accept_waveform(self.sample_rate, np.asarray(audio, np.float32))
+        self._decode()
+
+    def partial_text(self) -> str:
+        return self.recognizer.get_result(self.stream)
+
+    def final_text(self) -> str:
+        self.stream.accept_waveform(
+            self.sample_rate,
+            np.zeros(int(ONLINE_TAIL_PADDING_SECONDS * self.sample_rate), np.float32),
+        )
+        self._decode()
+        return self.recognizer.get_result(self.stream)
+
 
 class VoiceRecognition(ASRInterface):
     def __init__(
         self,
-        model_type: str = "paraformer",  # or "transducer", "nemo_ctc", "wenet_ctc", "whisper", "tdnn_ctc", "sense_voice", "fire_red_asr"
-        encoder: str = None,  # Path to the encoder model, used with transducer
-        decoder: str = None,  # Path to the decoder model, used with transducer
+        model_type: str = "paraformer",  # or "transducer", "nemo_ctc", "wenet_ctc", "whisper", "tdnn_ctc", "sense_voice", "fire_red_asr", "online_transducer", "online_paraformer"
+        encoder: str = None,  # Path to the encoder model, used with (online) transducer and online paraformer
+        decoder: str = None,  # Path to the decoder model, used with (online) transducer and online paraformer
         joiner: str = None,  # Path to the joiner model, used with transducer
         paraformer: str = None,  # Path to the model.onnx from Paraformer
         nemo_ctc: str = None,  # Path to the model.onnx from NeMo CTC
@@ -85,9 +117,46 @@ class VoiceRecognition(ASRInterface):
         logger.info(f"Sherpa-Onnx-ASR: Using {self.provider} for inference")
 
         self.recognizer = self._create_recognizer()
+        # Offline recognizers decode several streams in one call
+        self.SUPPORTS_BATCH = not self.online
+
+    @property
+    def online(self) -> bool:
+        """Whether the model is a streaming (online) model."""
+        return self.model_type.startswith("online_")
 
     def _create_recognizer(self):
-        if self.model_type == "transducer":
+        if self.model_type == "online_transducer":
+            recognizer = sherpa_onnx.OnlineRecognizer.from_transducer(
+                tokens=self.tokens,
+                encoder=self.encoder,
+                decoder=self.decoder,
+                joiner=self.joiner,
+                num_threads=self.num_threads,
+                sample_rate=self.SAMPLE_RATE,
+                feature_dim=self.feature_dim,
+                decoding_method=self.decoding_method,
+                hotwords_file=self.hotwords_file,
+                hotwords_score=self.hotwords_score,
+                modeling_unit=self.modeling_unit,
+                bpe_vocab=self.bpe_vocab,
+                blank_penalty=self.blank_penalty,
+                debug=self.debug,
+                provider=self.provider,
+            )
+        elif self.model_type == "online_paraformer":
+            recognizer = sherpa_onnx.OnlineRecognizer.from_paraformer(
+                tokens=self.tokens,
+                encoder=self.encoder,
+                decoder=self.decoder,
+                num_threads=self.num_threads,
+                sample_rate=self.SAMPLE_RATE,
+                feature_dim=self.feature_dim,
+                decoding_method=self.decoding_method,
+                debug=self.debug,
+                provider=self.provider,
+            )
+        elif self.model_type == "transducer":
             recognizer = sherpa_onnx.OfflineRecognizer.from_transducer(
                 encoder=self.encoder,
                 decoder=self.decoder,
@@ -212,8 +281,28 @@ class VoiceRecognition(ASRInterface):
 
         return recognizer
 
+    def create_stream(self) -> ASRStream:
+        if self.online:
+            return SherpaOnlineASRStream(self.recognizer, self.SAMPLE_RATE)
+        return super().create_stream()
+
     def transcribe_np(self, audio: np.ndarray) -> str:
+        if self.online:
+            stream = self.create_stream()
+            stream.accept_waveform(audio)
+            return stream.final_text()
         stream = self.recognizer.create_stream()
         stream.accept_waveform(self.SAMPLE_RATE, audio)
         self.recognizer.decode_streams([stream])
         return stream.result.text
+
+    def transcribe_batch_np(self, audios: list[np.ndarray]) -> list[str]:
+        if self.online:
+            return super().transcribe_batch_np(audios)
+        streams = []
+        for audio in audios:
+            stream = self.recognizer.create_stream()
+            stream.accept_waveform(self.SAMPLE_RATE, audio)
+            streams.append(stream)
+        self.recognizer.decode_streams(streams)
+        return [stream.result.text for stream in streams]
@@ -0,0 +1,196 @@
+import asyncio
+import json
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Optional, Union
+
+import numpy as np
+from loguru import logger
+
+from .asr_interface import ASRInterface, ASRStream
+
+
+class TranscribedSpeech(str):
+    """Text of an utterance that was transcribed while it was spoken.
+
+    Passed as user input instead of the utterance's audio; it is announced
+    with a user-input-transcription message like a transcription of audio.
+    """
+
+
+@dataclass
+class PendingTranscript:
+    """Utterance whose final transcript is still being decoded.
+
+    Passed as user input instead of the audio and resolved in the
+    conversation task, so the client's receive loop does not wait for the
+    decode.
+    """
+
+    audio: np.ndarray
+    transcript: "asyncio.Task[Optional[TranscribedSpeech]]"
+
+    async def resolve(self) -> Union[TranscribedSpeech, np.ndarray]:
+        """The transcript, or the audio if it could not be transcribed."""
+        text = await self.transcript
+        return self.audio if text is None else text
+
+
+class StreamingTranscriber:
+    """
+    Transcribes the utterance of one client while it is spoken, from the
+    audio forwarded by the server-side VAD.
+
+    Interim transcripts are sent as `user-input-transcription` messages with
+    `is_final: false`, at most every `partial_interval` seconds. When the
+    VAD reports that speech stopped, the final transcript is decoded during
+    its hangover, so it is usually ready when the end of speech is
+    confirmed. `latest_text`, the newest interim or speculative transcript,
+    lets the VAD adapt the hangover to it.
+
+    Args:
+        asr_engine: ASR engine creating the streams.
+        send_text: Sends a text message to the client.
+        partial_interval (float): Minimum seconds between interim transcripts.
+    """
+
+    def __init__(
+        self,
+        asr_engine: ASRInterface,
+        send_text: Callable[[str], Awaitable[None]],
+        partial_interval: float = 0.3,
+    ):
+        self.asr_engine = asr_engine
+        self._send_text = send_text
+        self.partial_interval = partial_interval
+        self._stream: Optional[ASRStream] = None
+        self._fed_samples = 0
+        # Stream methods block and are not thread-safe: one call at a time
+        self._lock = asyncio.Lock()
+        self._partial_task: Optional[asyncio.Task] = None
+        self._last_partial_at = 0.0
+        self._last_partial_text = ""
+        self.latest_text: Optional[str] = None
+        # (speech resumes counted when it started, final transcript task)
+        self._speculation: Optional[tuple[int, asyncio.Task]] = None
+
+    @property
+    def active(self) -> bool:
+        return self._stream is not None
+
+    async def _call(self, stream: ASRStream, method: str, *args):
+        async with self._lock:
+            return await asyncio.to_thread(getattr(stream, method), *args)
+
+    async def start(self) -> None:
+        """Start transcribing a new utterance."""
+        self.cancel()
+        self._stream = await self.asr_engine.async_create_stream()
+        self._fed_samples = 0
+        self._last_partial_at = time.monotonic()
+        self._last_partial_text = ""
+
+    def cancel(self) -> None:
+        """Drop the utterance in progress; running decodes finish unused."""
+        self._stream = None
+        self._speculation = None
+        self.latest_text = None
+
+    async def feed(self, audio: np.ndarray) -> None:
+        """Add audio of the utterance and send an interim transcript if due."""
+        stream = self._stream
+        if stream is None or not len(audio):
+            return
+        await self._call(stream, "accept_waveform", audio)
+        self._fed_samples += len(audio)
+        if (
+            self._speculation is None
+            and (self._partial_task is None or self._partial_task.done())
+            and time.monotonic() - self._last_partial_at >= self.partial_interval
+        ):
+            self._last_partial_at = time.monotonic()
+            self._partial_task = asyncio.create_task(self._send_partial(stream))
+
+    async def _send_partial(self, stream: ASRStream) -> None:
+        try:
+            text = await self._call(stream, "partial_text")
+        except Exception as e:
+            logger.warning(f"Interim transcription failed: {e}")
+            return
+        if stream is not self._stream or not text:
+            return
+        self.latest_text = text
+        if text == self._last_partial_text:
+            return
+        self._last_partial_text = text
+        await self._send_text(
+            json.dumps(
+                {"type": "user-input-transcription", "text": text, "is_final": False}
+            )
+        )
+
+    def speculate(self, speech_resumes: int) -> None:
+        """
+        Speech stopped: decode the final transcript now. It is used if speech
+        does not go on (`speech_resumes` unchanged) before the utterance ends.
+        """
+        if self._stream is None:
+            return
+        if self._speculation is not None and self._speculation[0] == speech_resumes:
+            return
+        stream = self._stream
+        task = asyncio.create_task(self._call(stream, "final_text"))
+        task.add_done_callback(lambda t: self._speculation_done(stream, t))
+        self._speculation = (speech_resumes, task)
+
+    def _speculation_done(self, stream: ASRStream, task: asyncio.Task) -> None:
+        # A dropped speculation's failure is not worth a warning
+        if task.cancelled() or task.exception() is not None:
+            return
+        if stream is self._stream and task.result():
+            self.latest_text = task.result()
+
+    def finish(
+        self, utterance: np.ndarray, speech_resumes: int
+    ) -> "asyncio.Task[Optional[TranscribedSpeech]]":
+        """
+        Task decoding the final transcript of the utterance whose whole audio
+        is `utterance`. Its result is None if it could not be transcribed
+        (the caller falls back to transcribing the audio). The transcriber
+        is free for the next utterance right away.
+        """
+        stream, speculation = self._stream, self._speculation
+        fed_samples = self._fed_samples
+        self.cancel()
+        return asyncio.create_task(
+            self._finish(stream, speculation, fed_samples, utterance, speech_resumes)
+        )
+
+    async def _finish(
+        self,
+        stream: Optional[ASRStream],
+        speculation: Optional[tuple[int, asyncio.Task]],
+        fed_samples: int,
+        utterance: np.ndarray,
+        speech_resumes: int,
+    ) -> Optional[TranscribedSpeech]:
+        if stream is None:
+            return None
+        start = time.perf_counter()
+        try:
+            if speculation is not None and speculation[0] == speech_resumes:
+                text = await speculation[1]
+                source = "decoded during the VAD hangover"
+            else:
+                if fed_samples < len(utterance):
+                    await self._call(stream, "accept_waveform", utterance[fed_samples:])
+                text = await self._call(stream, "final_text")
+                source = "decoded at end of speech"
+        except Exception as e:
+            logger.warning(f"Streaming transcription failed, transcribing again: {e}")
+            return None
+        logger.info(
+            f"Final transcript ready {(time.perf_counter() - start) * 1000:.0f} ms "
+            f"after end of speech ({source})"
+        )
+        return TranscribedSpeech(text)
@@ -8,6 +8,7 @@ and utility functions for loading/saving configurations.
 # Import main configuration classes
 from .main import Config
 from .rag import RAGConfig
+from .tracing import TracingConfig
 from .system import SystemConfig
 from .character import CharacterConfig
 from .live import LiveConfig, BiliBiliLiveConfig
@@ -38,6 +39,7 @@ from .tts import (
     GPTSoVITSConfig,
     FishAPITTSConfig,
     SherpaOnnxTTSConfig,
+    TTSCacheConfig,
 )
 from .vad import (
     VADConfig,
@@ -69,6 +71,7 @@ __all__ = [
     # Main configuration classes
     "Config",
     "RAGConfig",
+    "TracingConfig",
     "SystemConfig",
     "CharacterConfig",
     "LiveConfig",
@@ -107,6 +110,7 @@ __all__ = [
     "GPTSoVITSConfig",
     "FishAPITTSConfig",
     "SherpaOnnxTTSConfig",
+    "TTSCacheConfig",
     # VAD related classes
     "VADConfig",
     "SileroVADConfig",
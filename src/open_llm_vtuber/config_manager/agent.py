@@ -35,6 +35,7 @@ class BasicMemoryAgentConfig(I18nMixin, BaseModel):
     segment_method: Literal["regex", "pysbd"] = Field("pysbd", alias="segment_method")
     use_mcpp: Optional[bool] = Field(False, alias="use_mcpp")
     mcp_enabled_servers: Optional[List[str]] = Field([], alias="mcp_enabled_servers")
+    prompt_caching: Optional[bool] = Field(False, alias="prompt_caching")
 
     DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
         "llm_provider": Description(
@@ -57,6 +58,10 @@ class BasicMemoryAgentConfig(I18nMixin, BaseModel):
             en="List of MCP servers to enable for the agent",
             zh="为智能体启用 MCP 服务器列表",
         ),
+        "prompt_caching": Description(
+            en="Keep the system prompt, tools and history as a byte-identical prefix across turns, place RAG/memory context after it, send provider cache hints and log cached prompt tokens (default: False)",
+            zh="在各轮之间保持系统提示词、工具与历史记录前缀不变，将 RAG/记忆上下文放在其后，发送缓存提示并记录命中缓存的提示词 token 数（默认：False）",
+        ),
     }
 
 
@@ -216,6 +216,8 @@ class SherpaOnnxASRConfig(I18nMixin):
         "tdnn_ctc",
         "sense_voice",
         "fire_red_asr",
+        "online_transducer",
+        "online_paraformer",
     ] = Field(..., alias="model_type")
     encoder: Optional[str] = Field(None, alias="encoder")
     decoder: Optional[str] = Field(None, alias="decoder")
@@ -236,15 +238,16 @@ class SherpaOnnxASRConfig(I18nMixin):
 
     DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
         "model_type": Description(
-            en="Type of ASR model to use", zh="要使用的 ASR 模型类型"
+            en="Type of ASR model to use; online_* are streaming models",
+            zh="要使用的 ASR 模型类型；online_* 为流式模型",
         ),
         "encoder": Description(
-            en="Path to encoder model (for transducer)",
-            zh="编码器模型路径（用于 transducer）",
+            en="Path to encoder model (for transducer and online models)",
+            zh="编码器模型路径（用于 transducer 和 online 模型）",
         ),
         "decoder": Description(
-            en="Path to decoder model (for transducer)",
-            zh="解码器模型路径（用于 transducer）",
+            en="Path to decoder model (for transducer and online models)",
+            zh="解码器模型路径（用于 transducer 和 online 模型）",
         ),
         "joiner": Description(
             en="Path to joiner model (for transducer)",
@@ -286,10 +289,15 @@ class SherpaOnnxASRConfig(I18nMixin):
     def check_model_paths(cls, values: "SherpaOnnxASRConfig", info: ValidationInfo):
         model_type = values.model_type
 
-        if model_type == "transducer":
+        if model_type in ("transducer", "online_transducer"):
             if not all([values.encoder, values.decoder, values.joiner, values.tokens]):
                 raise ValueError(
-                    "encoder, decoder, joiner, and tokens must be provided for transducer model type"
+                    f"encoder, decoder, joiner, and tokens must be provided for {model_type} model type"
+                )
+        elif model_type == "online_paraformer":
+            if not all([values.encoder, values.decoder, values.tokens]):
+                raise ValueError(
+                    "encoder, decoder, and tokens must be provided for online_paraformer model type"
                 )
         elif model_type == "paraformer":
             if not all([values.paraformer, values.tokens]):
@@ -363,6 +371,12 @@ class ASRConfig(I18nMixin):
     gigaam_onnx_asr: Optional[GigaAMOnnxASRConfig] = Field(
         None, alias="gigaam_onnx_asr"
     )
+    streaming: bool = Field(False, alias="streaming")
+    partial_interval_ms: int = Field(300, ge=50, alias="partial_interval_ms")
+    max_concurrency: Optional[int] = Field(None, ge=1, alias="max_concurrency")
+    max_batch_size: Optional[int] = Field(None, ge=1, alias="max_batch_size")
+    max_batch_delay_ms: int = Field(20, ge=0, alias="max_batch_delay_ms")
+    request_timeout: Optional[float] = Field(None, gt=0, alias="request_timeout")
 
     DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
         "asr_model": Description(
@@ -387,6 +401,30 @@ class ASRConfig(I18nMixin):
             en="Configuration for GigaAM ONNX ASR (Russian)",
             zh="GigaAM ONNX ASR 配置（俄语）",
         ),
+        "streaming": Description(
+            en="Transcribe while the user speaks (server-side VAD only) and send interim transcripts (is_final: false); offline models decode the audio again for each interim transcript",
+            zh="在用户说话时进行识别（仅服务端 VAD），并发送中间识别结果（is_final: false）；离线模型每次中间结果都会重新解码音频",
+        ),
+        "partial_interval_ms": Description(
+            en="Minimum interval between interim transcripts, in milliseconds",
+            zh="中间识别结果的最小间隔（毫秒）",
+        ),
+        "max_concurrency": Description(
+            en="Transcriptions run at once for all clients (default: 1 for local models, 4 for APIs)",
+            zh="所有客户端同时进行的识别数（默认：本地模型 1，API 4）",
+        ),
+        "max_batch_size": Description(
+            en="Most utterances transcribed in one inference call, for models supporting batches (default: 8)",
+            zh="支持批处理的模型一次推理最多识别的语音条数（默认：8）",
+        ),
+        "max_batch_delay_ms": Description(
+            en="How long a transcription waits for others to batch with, in milliseconds",
+            zh="识别请求等待其他请求组成批次的时间（毫秒）",
+        ),
+        "request_timeout": Description(
+            en="Seconds a transcription may wait in the queue before it fails (default: no limit)",
+            zh="识别请求在队列中等待的最长秒数，超时即失败（默认：不限）",
+        ),
     }
 
     @model_validator(mode="after")
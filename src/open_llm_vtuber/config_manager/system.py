@@ -1,9 +1,10 @@
 # config_manager/system.py
 from pydantic import Field, model_validator
-from typing import Dict, ClassVar
+from typing import Dict, ClassVar, List, Literal
 
 from .i18n import I18nMixin, Description
 from .rag import RAGConfig
+from .tracing import TracingConfig
 
 
 class SystemConfig(I18nMixin):
@@ -17,7 +18,12 @@ class SystemConfig(I18nMixin):
     enable_proxy: bool = Field(False, alias="enable_proxy")
     auto_start_microphone: bool = Field(True, alias="auto_start_microphone")
     launch_pet_mode_only: bool = Field(False, alias="launch_pet_mode_only")
+    lazy_engines: List[Literal["asr", "translate"]] = Field(
+        default_factory=list, alias="lazy_engines"
+    )
+    max_utterance_seconds: int = Field(120, ge=1, alias="max_utterance_seconds")
     rag_config: RAGConfig | None = Field(default=None, alias="rag_config")
+    tracing_config: TracingConfig | None = Field(default=None, alias="tracing_config")
 
     DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
         "conf_version": Description(en="Configuration version", zh="配置文件版本"),
@@ -42,10 +48,22 @@ class SystemConfig(I18nMixin):
             en="Launch only in pet/desktop overlay mode (no main window). Client must support this.",
             zh="仅以宠物/桌面覆盖模式启动（无主窗口）。客户端需支持此选项。",
         ),
+        "lazy_engines": Description(
+            en="Engines loaded on first use instead of at startup (asr, translate), e.g. ASR for text-only chat",
+            zh="首次使用时才加载而非启动时加载的引擎（asr、translate），例如纯文字聊天时的 ASR",
+        ),
+        "max_utterance_seconds": Description(
+            en="Longest microphone utterance kept for ASR, in seconds; audio beyond it is dropped",
+            zh="为 ASR 保留的最长麦克风语音（秒），超出部分会被丢弃",
+        ),
         "rag_config": Description(
             en="RAG (Retrieval-Augmented Generation) settings with ChromaDB",
             zh="RAG（检索增强生成）设置，使用 ChromaDB",
         ),
+        "tracing_config": Description(
+            en="Per-turn latency tracing, Prometheus /metrics and JSONL trace output",
+            zh="每轮对话延迟追踪、Prometheus /metrics 与 JSONL 追踪输出",
+        ),
     }
 
     @model_validator(mode="after")
@@ -0,0 +1,28 @@
+"""Per-turn latency tracing configuration."""
+
+from pydantic import Field
+from typing import ClassVar, Dict
+
+from .i18n import I18nMixin, Description
+
+
+class TracingConfig(I18nMixin):
+    """Configuration for per-turn latency tracing and the /metrics endpoint."""
+
+    enabled: bool = Field(True, alias="enabled")
+    trace_file: str | None = Field(
+        None,
+        alias="trace_file",
+        description="JSONL file that receives one trace per finished turn (optional)",
+    )
+
+    DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
+        "enabled": Description(
+            en="Record per-turn latency spans and expose them on /metrics",
+            zh="记录每轮对话的延迟阶段并通过 /metrics 暴露",
+        ),
+        "trace_file": Description(
+            en="Optional JSONL file to append one trace per finished turn for offline analysis",
+            zh="可选的 JSONL 文件，每轮结束后追加一条追踪记录，便于离线分析",
+        ),
+    }
@@ -1,6 +1,6 @@
 # config_manager/tts.py
 from pydantic import ValidationInfo, Field, model_validator
-from typing import Literal, Optional, Dict, ClassVar
+from typing import Literal, Optional, Dict, ClassVar, List
 from .i18n import I18nMixin, Description
 
 CartesiaLanguages = Literal[
@@ -723,6 +723,39 @@ class CartesiaTTSConfig(I18nMixin):
     }
 
 
+class TTSCacheConfig(I18nMixin):
+    """Configuration for the content-addressed TTS audio cache."""
+
+    enabled: bool = Field(False, alias="enabled")
+    cache_dir: str = Field("cache/tts_audio", alias="cache_dir")
+    max_size_mb: float = Field(512, alias="max_size_mb")
+    prewarm_phrases: List[str] = Field([], alias="prewarm_phrases")
+
+    DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
+        "enabled": Description(
+            en="Reuse synthesized audio of identical sentences (same engine, voice and parameters)",
+            zh="复用相同句子（相同引擎、音色与参数）已合成的音频",
+        ),
+        "cache_dir": Description(
+            en="Directory of the cached audio files", zh="缓存音频文件目录"
+        ),
+        "max_size_mb": Description(
+            en="Disk budget in MB; least recently used files are evicted first",
+            zh="磁盘占用上限（MB），优先淘汰最久未使用的文件",
+        ),
+        "prewarm_phrases": Description(
+            en="Phrases synthesized ahead of time by scripts/prewarm_tts_cache.py (greetings, fillers...)",
+            zh="由 scripts/prewarm_tts_cache.py 预先合成的短语（问候语、填充语等）",
+        ),
+    }
+
+    @model_validator(mode="after")
+    def check_max_size(cls, values):
+        if values.max_size_mb <= 0:
+            raise ValueError("max_size_mb must be positive")
+        return values
+
+
 class TTSConfig(I18nMixin):
     """Configuration for Text-to-Speech."""
 
@@ -747,6 +780,9 @@ class TTSConfig(I18nMixin):
         "piper_tts",
         "silero_tts",
     ] = Field(..., alias="tts_model")
+    stream_audio: bool = Field(False, alias="stream_audio")
+    max_concurrency: Optional[int] = Field(None, alias="max_concurrency", ge=1)
+    batch_sentences: bool = Field(True, alias="batch_sentences")
 
     azure_tts: Optional[AzureTTSConfig] = Field(None, alias="azure_tts")
     bark_tts: Optional[BarkTTSConfig] = Field(None, alias="bark_tts")
@@ -771,6 +807,7 @@ class TTSConfig(I18nMixin):
     cartesia_tts: CartesiaTTSConfig | None = Field(None, alias="cartesia_tts")
     piper_tts: Optional[PiperTTSConfig] = Field(None, alias="piper_tts")
     silero_tts: Optional[SileroTTSConfig] = Field(None, alias="silero_tts")
+    tts_cache: Optional[TTSCacheConfig] = Field(None, alias="tts_cache")
 
     DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
         "tts_model": Description(
@@ -818,6 +855,22 @@ class TTSConfig(I18nMixin):
             en="Configuration for Silero TTS (local Russian)",
             zh="Silero TTS 配置（本地俄语）",
         ),
+        "stream_audio": Description(
+            en="Send audio in chunks while it is synthesized (openai_tts, minimax_tts, gpt_sovits_tts with streaming_mode, sherpa_onnx_tts). Needs a frontend that plays audio-chunk messages; not used with tts_cache",
+            zh="边合成边分块发送音频（openai_tts、minimax_tts、开启 streaming_mode 的 gpt_sovits_tts、sherpa_onnx_tts）。需要支持 audio-chunk 消息的前端；启用 tts_cache 时不生效",
+        ),
+        "max_concurrency": Description(
+            en="Syntheses running at once on the engine, shared by all clients. Default: 1 for local engines, 2 for self-hosted servers, 4 for cloud APIs",
+            zh="引擎同时进行的合成数量，所有客户端共享。默认：本地引擎 1，自托管服务器 2，云端 API 4",
+        ),
+        "batch_sentences": Description(
+            en="Merge short sentences after the first one into one synthesis while enough audio is queued, based on the measured speed of the engine",
+            zh="在已排队音频足够时，根据引擎实测速度，将首句之后的短句合并为一次合成",
+        ),
+        "tts_cache": Description(
+            en="Audio cache for repeated sentences (greetings, fillers, proactive speech)",
+            zh="重复句子（问候、填充语、主动说话）的音频缓存",
+        ),
     }
 
     @model_validator(mode="after")
@@ -14,6 +14,10 @@ class SileroVADConfig(I18nMixin):
     required_hits: int = Field(..., alias="required_hits")  # 3 * (0.032) = 0.1s
     required_misses: int = Field(..., alias="required_misses")  # 24 * (0.032) = 0.8s
     smoothing_window: int = Field(..., alias="smoothing_window")  # 5
+    backend: Literal["onnx", "torch"] = Field("onnx", alias="backend")
+    adaptive_endpointing: bool = Field(False, alias="adaptive_endpointing")
+    min_misses: int = Field(8, alias="min_misses")  # 8 * (0.032) = 0.26s
+    max_misses: int = Field(48, alias="max_misses")  # 48 * (0.032) = 1.5s
 
     DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
         "orig_sr": Description(en="Original Audio Sample Rate", zh="原始音频采样率"),
@@ -35,6 +39,22 @@ class SileroVADConfig(I18nMixin):
         "smoothing_window": Description(
             en="Smoothing window size for VAD", zh="语音活动检测的平滑窗口大小"
         ),
+        "backend": Description(
+            en="Model runtime: 'onnx' (onnxruntime, lower overhead) or 'torch'",
+            zh="模型运行时：'onnx'（onnxruntime，开销更低）或 'torch'",
+        ),
+        "adaptive_endpointing": Description(
+            en="Adapt the silence ending an utterance to the speaker's pauses and the interim transcript",
+            zh="根据说话人的停顿习惯和临时转录结果调整判定语音结束所需的静音时长",
+        ),
+        "min_misses": Description(
+            en="Shortest silence ending an utterance with adaptive endpointing, in windows",
+            zh="自适应端点检测时判定语音结束的最短静音（窗口数）",
+        ),
+        "max_misses": Description(
+            en="Longest silence ending an utterance with adaptive endpointing, in windows",
+            zh="自适应端点检测时判定语音结束的最长静音（窗口数）",
+        ),
     }
 
 
@@ -8,7 +8,9 @@ from loguru import logger
 
 from ..chat_group import ChatGroupManager
 from ..chat_history_manager import store_message
+from ..asr.streaming import PendingTranscript
 from ..service_context import ServiceContext
+from ..utils.audio_ingest import UtteranceBuffer
 from .group_conversation import process_group_conversation
 from .single_conversation import process_single_conversation
 from .conversation_utils import EMOJI_LIST
@@ -25,7 +27,7 @@ async def handle_conversation_trigger(
     client_contexts: Dict[str, ServiceContext],
     client_connections: Dict[str, WebSocket],
     chat_group_manager: ChatGroupManager,
-    received_data_buffers: Dict[str, np.ndarray],
+    received_data_buffers: Dict[str, UtteranceBuffer],
     current_conversation_tasks: Dict[str, Optional[asyncio.Task]],
     broadcast_to_group: Callable,
 ) -> None:
@@ -65,8 +67,13 @@ async def handle_conversation_trigger(
     elif msg_type == "text-input":
         user_input = data.get("text", "")
     else:  # mic-audio-end
-        user_input = received_data_buffers[client_uid]
-        received_data_buffers[client_uid] = np.array([])
+        buffer = received_data_buffers[client_uid]
+        # Transcribed while it was spoken (asr_config.streaming); the final
+        # decode may still be running, the conversation task waits for it
+        transcript = buffer.transcript
+        user_input = buffer.take()
+        if transcript is not None:
+            user_input = PendingTranscript(user_input, transcript)
 
     images = data.get("images")
     session_emoji = np.random.choice(EMOJI_LIST)
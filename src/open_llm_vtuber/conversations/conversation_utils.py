@@ -1,19 +1,22 @@
 import asyncio
-import re
-from typing import Optional, Union, Any, List, Dict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional, Union, Any, List, Dict
 import numpy as np
 import json
 from loguru import logger
 
 from ..message_handler import message_handler
+from ..tracing import trace_span, turn_tracer
 from .types import WebSocketSend, BroadcastContext
 from .tts_manager import TTSTaskManager
 from ..agent.output_types import SentenceOutput, AudioOutput
 from ..agent.input_types import BatchInput, TextData, ImageData, TextSource, ImageSource
 from ..asr.asr_interface import ASRInterface
+from ..asr.streaming import PendingTranscript, TranscribedSpeech
 from ..live2d_model import Live2dModel
 from ..tts.tts_interface import TTSInterface
 from ..utils.stream_audio import prepare_audio_payload
+from ..utils.lazy_engine import ensure_loaded
 
 
 # Convert class methods to standalone functions
@@ -94,11 +97,7 @@ async def handle_sentence_output(
     async for display_text, tts_text, actions in output:
         logger.debug(f"🏃 Processing output: '''{tts_text}'''...")
 
-        if translate_engine:
-            if len(re.sub(r'[\s.,!?，。！？\'"』」）】\s]+', "", tts_text)):
-                tts_text = translate_engine.translate(tts_text)
-            logger.info(f"🏃 Text after translation: '''{tts_text}'''...")
-        else:
+        if not translate_engine:
             logger.debug("🚫 No translation engine available. Skipping translation.")
 
         full_response += display_text.text
@@ -109,6 +108,7 @@ async def handle_sentence_output(
             live2d_model=live2d_model,
             tts_engine=tts_engine,
             websocket_send=websocket_send,
+            translate_engine=translate_engine,
         )
     return full_response
 
@@ -157,14 +157,25 @@ async def send_conversation_start_signals(websocket_send: WebSocketSend) -> None
 
 
 async def process_user_input(
-    user_input: Union[str, np.ndarray],
+    user_input: Union[str, np.ndarray, PendingTranscript],
     asr_engine: ASRInterface,
     websocket_send: WebSocketSend,
 ) -> str:
     """Process user input, converting audio to text if needed"""
+    if isinstance(user_input, PendingTranscript):
+        user_input = await user_input.resolve()
+    if isinstance(user_input, TranscribedSpeech):
+        await websocket_send(
+            json.dumps({"type": "user-input-transcription", "text": user_input})
+        )
+        return str(user_input)
     if isinstance(user_input, np.ndarray):
         logger.info("Transcribing audio input...")
-        input_text = await asr_engine.async_transcribe_np(user_input)
+        # Build a lazily loaded ASR off the event loop before reading SAMPLE_RATE
+        await ensure_loaded(asr_engine)
+        audio_seconds = round(len(user_input) / asr_engine.SAMPLE_RATE, 3)
+        with trace_span("asr", audio_seconds=audio_seconds):
+            input_text = await asr_engine.async_transcribe_np(user_input)
         await websocket_send(
             json.dumps({"type": "user-input-transcription", "text": input_text})
         )
@@ -179,15 +190,17 @@ async def finalize_conversation_turn(
     broadcast_ctx: Optional[BroadcastContext] = None,
 ) -> None:
     """Finalize a conversation turn"""
+    await tts_manager.flush()
     if tts_manager.task_list:
         await asyncio.gather(*tts_manager.task_list)
         await safe_websocket_send(
             websocket_send, json.dumps({"type": "backend-synth-complete"})
         )
 
-        response = await message_handler.wait_for_response(
-            client_uid, "frontend-playback-complete"
-        )
+        with trace_span("playback_roundtrip"):
+            response = await message_handler.wait_for_response(
+                client_uid, "frontend-playback-complete"
+            )
 
         if not response:
             logger.warning(f"No playback completion response from {client_uid}")
@@ -227,6 +240,22 @@ async def send_conversation_end_signal(
     logger.info(f"😎👍✅ Conversation Chain {session_emoji} completed!")
 
 
+@asynccontextmanager
+async def closing_agent_stream(stream: AsyncIterator) -> AsyncIterator[AsyncIterator]:
+    """
+    Close the agent's output stream if the turn stops reading it before its
+    end (interrupted or failed), so the LLM request behind it is closed now
+    rather than whenever the generator is garbage collected.
+    """
+    try:
+        yield stream
+    finally:
+        # ag_frame is None once an async generator is exhausted or closed
+        if getattr(stream, "ag_frame", None) is not None:
+            turn_tracer.count_cancelled("llm_stream")
+            await stream.aclose()
+
+
 def cleanup_conversation(tts_manager: TTSTaskManager, session_emoji: str) -> None:
     """Clean up conversation resources"""
     tts_manager.clear()
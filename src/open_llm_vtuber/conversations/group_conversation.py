@@ -13,6 +13,7 @@ from .conversation_utils import (
     process_user_input,
     finalize_conversation_turn,
     cleanup_conversation,
+    closing_agent_stream,
     EMOJI_LIST,
 )
 from .types import (
@@ -24,6 +25,7 @@ from .types import (
 from ..service_context import ServiceContext
 from ..chat_history_manager import store_message
 from .tts_manager import TTSTaskManager
+from ..tracing import trace_span, turn_tracer
 
 
 async def process_group_conversation(
@@ -51,7 +53,17 @@ async def process_group_conversation(
         metadata: Optional metadata for special processing flags
     """
     # Create TTSTaskManager for each member
-    tts_managers = {uid: TTSTaskManager() for uid in group_members}
+    tts_managers = {
+        uid: TTSTaskManager(
+            stream_audio=client_contexts[uid].character_config.tts_config.stream_audio,
+            audio_transport=client_contexts[uid].audio_transport,
+            scheduler=client_contexts[uid].tts_scheduler,
+            batch_sentences=client_contexts[
+                uid
+            ].character_config.tts_config.batch_sentences,
+        )
+        for uid in group_members
+    }
 
     try:
         logger.info(f"Group Conversation Chain {session_emoji} started!")
@@ -235,6 +247,39 @@ async def handle_group_member_turn(
     metadata: Optional[Dict[str, Any]] = None,
 ) -> None:
     """Handle a single group member's conversation turn"""
+    trace = turn_tracer.start_turn(current_member_uid, kind="group")
+    try:
+        await _handle_group_member_turn(
+            current_member_uid=current_member_uid,
+            state=state,
+            client_contexts=client_contexts,
+            client_connections=client_connections,
+            broadcast_func=broadcast_func,
+            group_members=group_members,
+            images=images,
+            tts_manager=tts_manager,
+            metadata=metadata,
+        )
+    except asyncio.CancelledError:
+        turn_tracer.end_turn(trace, "interrupted")
+        raise
+    except Exception:
+        turn_tracer.end_turn(trace, "error")
+        raise
+    turn_tracer.end_turn(trace, "completed")
+
+
+async def _handle_group_member_turn(
+    current_member_uid: str,
+    state: GroupConversationState,
+    client_contexts: Dict[str, ServiceContext],
+    client_connections: Dict[str, WebSocket],
+    broadcast_func: BroadcastFunc,
+    group_members: List[str],
+    images: Optional[List[Dict[str, Any]]],
+    tts_manager: TTSTaskManager,
+    metadata: Optional[Dict[str, Any]] = None,
+) -> None:
     # Update current speaker before processing
     state.current_speaker_uid = current_member_uid
 
@@ -256,9 +301,10 @@ async def handle_group_member_turn(
                 else None
             )
             n_results = rag_config.n_results if rag_config else 5
-            rag_context = context.rag_engine.query(
-                new_context.strip(), n_results=n_results
-            )
+            with trace_span("retrieval", source="rag"):
+                rag_context = context.rag_engine.query(
+                    new_context.strip(), n_results=n_results
+                )
         except Exception as e:
             logger.warning(f"RAG query failed: {e}")
 
@@ -287,6 +333,7 @@ async def handle_group_member_turn(
         group_members=group_members,
     )
 
+    await tts_manager.flush()
     if tts_manager.task_list:
         await asyncio.gather(*tts_manager.task_list)
         await current_ws_send(json.dumps({"type": "backend-synth-complete"}))
@@ -371,37 +418,38 @@ async def process_member_response(
 
     try:
         # agent.chat now yields Union[SentenceOutput, Dict[str, Any]]
-        agent_output_stream = context.agent_engine.chat(batch_input)
-
-        async for output_item in agent_output_stream:
-            if (
-                isinstance(output_item, dict)
-                and output_item.get("type") == "tool_call_status"
-            ):
-                if broadcast_func and group_members:
-                    logger.debug(f"Broadcasting tool status update: {output_item}")
-                    output_item["name"] = context.character_config.character_name
-                    await broadcast_func(group_members, output_item)
+        async with closing_agent_stream(
+            context.agent_engine.chat(batch_input)
+        ) as agent_output_stream:
+            async for output_item in agent_output_stream:
+                if (
+                    isinstance(output_item, dict)
+                    and output_item.get("type") == "tool_call_status"
+                ):
+                    if broadcast_func and group_members:
+                        logger.debug(f"Broadcasting tool status update: {output_item}")
+                        output_item["name"] = context.character_config.character_name
+                        await broadcast_func(group_members, output_item)
+                    else:
+                        logger.warning(
+                            "Cannot broadcast tool status: broadcast_func or group_members missing."
+                        )
+                elif isinstance(output_item, (SentenceOutput, AudioOutput)):
+                    # Handle SentenceOutput or AudioOutput: Send to current user, broadcast audio later if needed
+                    response_part = await process_agent_output(
+                        output=output_item,
+                        character_config=context.character_config,
+                        live2d_model=context.live2d_model,
+                        tts_engine=context.tts_engine,
+                        websocket_send=current_ws_send,  # Send TTS/display text directly to speaker's client
+                        tts_manager=tts_manager,
+                        translate_engine=context.translate_engine,
+                    )
+                    full_response += response_part  # Accumulate text response
                 else:
                     logger.warning(
-                        "Cannot broadcast tool status: broadcast_func or group_members missing."
+                        f"Received unexpected item type from agent chat stream: {type(output_item)}"
                     )
-            elif isinstance(output_item, (SentenceOutput, AudioOutput)):
-                # Handle SentenceOutput or AudioOutput: Send to current user, broadcast audio later if needed
-                response_part = await process_agent_output(
-                    output=output_item,
-                    character_config=context.character_config,
-                    live2d_model=context.live2d_model,
-                    tts_engine=context.tts_engine,
-                    websocket_send=current_ws_send,  # Send TTS/display text directly to speaker's client
-                    tts_manager=tts_manager,
-                    translate_engine=context.translate_engine,
-                )
-                full_response += response_part  # Accumulate text response
-            else:
-                logger.warning(
-                    f"Received unexpected item type from agent chat stream: {type(output_item)}"
-                )
 
     except Exception as e:
         logger.exception(f"Error processing group member response stream: {e}")
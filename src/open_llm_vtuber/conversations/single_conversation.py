@@ -12,6 +12,7 @@ from .conversation_utils import (
     process_user_input,
     finalize_conversation_turn,
     cleanup_conversation,
+    closing_agent_stream,
     EMOJI_LIST,
 )
 from .types import WebSocketSend
@@ -19,6 +20,7 @@ from .tts_manager import TTSTaskManager
 from ..chat_history_manager import store_message, get_history
 from ..service_context import ServiceContext
 from ..rag.memory_processor import process_memory_background
+from ..tracing import trace_span, turn_tracer
 
 # Import necessary types from agent outputs
 from ..agent.output_types import SentenceOutput, AudioOutput
@@ -48,8 +50,15 @@ async def process_single_conversation(
         str: Complete response text
     """
     # Create TTSTaskManager for this conversation
-    tts_manager = TTSTaskManager()
+    tts_manager = TTSTaskManager(
+        stream_audio=context.character_config.tts_config.stream_audio,
+        audio_transport=context.audio_transport,
+        scheduler=context.tts_scheduler,
+        batch_sentences=context.character_config.tts_config.batch_sentences,
+    )
     full_response = ""  # Initialize full_response here
+    trace = turn_tracer.start_turn(client_uid)
+    outcome = "error"
 
     try:
         # Send initial signals
@@ -92,9 +101,10 @@ async def process_single_conversation(
                     else None
                 )
                 n_results = rag_config.n_results if rag_config else 5
-                rag_context = context.rag_engine.query(
-                    input_text.strip(), n_results=n_results
-                )
+                with trace_span("retrieval", source="rag"):
+                    rag_context = context.rag_engine.query(
+                        input_text.strip(), n_results=n_results
+                    )
                 if rag_context:
                     logger.debug(f"RAG retrieved {len(rag_context)} chunks")
             except Exception as e:
@@ -110,20 +120,22 @@ async def process_single_conversation(
                     else None
                 )
                 mem_n = getattr(rag_config, "memory_n_results", 5) if rag_config else 5
-                profile = context.dialogue_memory.get_user_profile(
-                    context.history_uid, context.character_config.conf_uid
-                )
+                with trace_span("retrieval", source="profile"):
+                    profile = context.dialogue_memory.get_user_profile(
+                        context.history_uid, context.character_config.conf_uid
+                    )
                 if profile:
                     memory_context.append(
                         f"Профиль пользователя (ОБЯЗАТЕЛЬНО используй при ответе):\n{profile}"
                     )
-                similar = context.dialogue_memory.query(
-                    input_text.strip(),
-                    n_results=mem_n,
-                    history_uid=context.history_uid,
-                    conf_uid=context.character_config.conf_uid,
-                    roles=["fact", "summary"],
-                )
+                with trace_span("retrieval", source="dialogue_memory"):
+                    similar = context.dialogue_memory.query(
+                        input_text.strip(),
+                        n_results=mem_n,
+                        history_uid=context.history_uid,
+                        conf_uid=context.character_config.conf_uid,
+                        roles=["fact", "summary"],
+                    )
                 if similar:
                     lines = []
                     for content, _, meta in similar:
@@ -174,40 +186,41 @@ async def process_single_conversation(
 
         try:
             # agent.chat yields Union[SentenceOutput, Dict[str, Any]]
-            agent_output_stream = context.agent_engine.chat(batch_input)
-
-            async for output_item in agent_output_stream:
-                if (
-                    isinstance(output_item, dict)
-                    and output_item.get("type") == "tool_call_status"
-                ):
-                    # Handle tool status event: send WebSocket message
-                    output_item["name"] = context.character_config.character_name
-                    logger.debug(f"Sending tool status update: {output_item}")
+            async with closing_agent_stream(
+                context.agent_engine.chat(batch_input)
+            ) as agent_output_stream:
+                async for output_item in agent_output_stream:
+                    if (
+                        isinstance(output_item, dict)
+                        and output_item.get("type") == "tool_call_status"
+                    ):
+                        # Handle tool status event: send WebSocket message
+                        output_item["name"] = context.character_config.character_name
+                        logger.debug(f"Sending tool status update: {output_item}")
 
-                    await websocket_send(json.dumps(output_item))
+                        await websocket_send(json.dumps(output_item))
 
-                elif isinstance(output_item, (SentenceOutput, AudioOutput)):
-                    # Handle SentenceOutput or AudioOutput
-                    response_part = await process_agent_output(
-                        output=output_item,
-                        character_config=context.character_config,
-                        live2d_model=context.live2d_model,
-                        tts_engine=context.tts_engine,
-                        websocket_send=websocket_send,  # Pass websocket_send for audio/tts messages
-                        tts_manager=tts_manager,
-                        translate_engine=context.translate_engine,
-                    )
-                    # Ensure response_part is treated as a string before concatenation
-                    response_part_str = (
-                        str(response_part) if response_part is not None else ""
-                    )
-                    full_response += response_part_str  # Accumulate text response
-                else:
-                    logger.warning(
-                        f"Received unexpected item type from agent chat stream: {type(output_item)}"
-                    )
-                    logger.debug(f"Unexpected item content: {output_item}")
+                    elif isinstance(output_item, (SentenceOutput, AudioOutput)):
+                        # Handle SentenceOutput or AudioOutput
+                        response_part = await process_agent_output(
+                            output=output_item,
+                            character_config=context.character_config,
+                            live2d_model=context.live2d_model,
+                            tts_engine=context.tts_engine,
+                            websocket_send=websocket_send,  # Pass websocket_send for audio/tts messages
+                            tts_manager=tts_manager,
+                            translate_engine=context.translate_engine,
+                        )
+                        # Ensure response_part is treated as a string before concatenation
+                        response_part_str = (
+                            str(response_part) if response_part is not None else ""
+                        )
+                        full_response += response_part_str  # Accumulate text response
+                    else:
+                        logger.warning(
+                            f"Received unexpected item type from agent chat stream: {type(output_item)}"
+                        )
+                        logger.debug(f"Unexpected item content: {output_item}")
 
         except Exception as e:
             logger.exception(
@@ -226,6 +239,7 @@ async def process_single_conversation(
         # --- End processing agent response ---
 
         # Wait for any pending TTS tasks
+        await tts_manager.flush()
         if tts_manager.task_list:
             await asyncio.gather(*tts_manager.task_list)
             await safe_websocket_send(
@@ -276,9 +290,11 @@ async def process_single_conversation(
 
                     asyncio.create_task(_bg_memory_task())
 
+        outcome = "completed"
         return full_response  # Return accumulated full_response
 
     except asyncio.CancelledError:
+        outcome = "interrupted"
         logger.info(f"🤡👍 Conversation {session_emoji} cancelled because interrupted.")
         raise
     except Exception as e:
@@ -290,3 +306,4 @@ async def process_single_conversation(
         raise
     finally:
         cleanup_conversation(tts_manager, session_emoji)
+        turn_tracer.end_turn(trace, outcome)
@@ -1,31 +1,145 @@
 import asyncio
-import json
+import dataclasses
 import re
+import time
 import uuid
+from contextlib import asynccontextmanager, nullcontext
 from datetime import datetime
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Set, Tuple
 from loguru import logger
 
 from ..agent.output_types import DisplayText, Actions
 from ..live2d_model import Live2dModel
+from ..tracing import trace_mark, trace_span, turn_tracer
+from ..translate.translate_interface import TranslateInterface
 from ..tts.tts_interface import TTSInterface
-from ..utils.stream_audio import prepare_audio_payload
+from ..tts.tts_scheduler import SynthesisSpeed, TTSScheduler
+from ..utils.audio_transport import AudioTransport
+from ..utils.stream_audio import (
+    ChunkVolumeMeter,
+    prepare_audio_chunk_payload,
+    prepare_audio_payload,
+    prepare_pcm_audio_payload,
+)
 from .types import WebSocketSend
 
+# Sentences a conversation may have queued ahead of the one being sent
+MAX_SENTENCES_AHEAD = 8
+# Longest text sentence batching merges into one synthesis
+MAX_BATCH_CHARS = 300
+# A held sentence is dispatched this long before the listener would run out of audio
+BATCH_SAFETY_SECONDS = 0.3
+
+
+def _is_silent_text(tts_text: str) -> bool:
+    return len(re.sub(r'[\s.,!?，。！？\'"』」）】\s]+', "", tts_text)) == 0
+
+
+def _payload_seconds(payload: Dict) -> float:
+    """Duration of the audio of an `audio` or `audio-chunk` payload."""
+    return len(payload.get("volumes") or []) * payload.get("slice_length", 0) / 1000
+
+
+def _merge_actions(
+    first: Optional[Actions], second: Optional[Actions]
+) -> Optional[Actions]:
+    if first is None or second is None:
+        return first or second
+    merged = Actions()
+    for field in dataclasses.fields(Actions):
+        values = (getattr(first, field.name) or []) + (
+            getattr(second, field.name) or []
+        )
+        setattr(merged, field.name, values or None)
+    return merged
+
+
+@dataclasses.dataclass
+class _PendingSentence:
+    """Arguments of a `speak` call held back by sentence batching."""
+
+    tts_text: str
+    display_text: DisplayText
+    actions: Optional[Actions]
+    live2d_model: Live2dModel
+    tts_engine: TTSInterface
+    websocket_send: WebSocketSend
+    translate_engine: Optional[TranslateInterface]
+
+    def merge(self, other: "_PendingSentence") -> None:
+        self.tts_text = f"{self.tts_text} {other.tts_text}"
+        self.display_text = DisplayText(
+            text=f"{self.display_text.text} {other.display_text.text}",
+            name=self.display_text.name,
+            avatar=self.display_text.avatar,
+        )
+        self.actions = _merge_actions(self.actions, other.actions)
+
 
 class TTSTaskManager:
-    """Manages TTS tasks and ensures ordered delivery to frontend while allowing parallel TTS generation"""
+    """Manages TTS tasks and ensures ordered delivery to frontend while allowing parallel TTS generation
+
+    With `stream_audio`, engines that support streaming send each sentence as
+    `audio-chunk` messages while it is synthesized. Chunks of a sentence are
+    only sent once all earlier sentences are complete.
+
+    Audio is sent through the client's negotiated `audio_transport` (JSON with
+    base64 audio by default, or binary frames).
 
-    def __init__(self) -> None:
+    Syntheses wait for a slot of the engine's shared `scheduler`, and `speak`
+    waits while more than `MAX_SENTENCES_AHEAD` sentences are queued, so a
+    fast LLM does not pile up work the engine and the client cannot absorb.
+
+    With `batch_sentences`, sentences after the first one are held back and
+    merged with the following ones while the audio already synthesized or
+    playing covers the time to synthesize them. The merge length follows the
+    measured real-time factor of the engine and the queued audio duration, so
+    short fragments do not each pay a full TTS request. Call `flush` before
+    waiting for `task_list`.
+
+    `clear` (interrupted or finished turn) cancels the TTS tasks still
+    running: their translation and synthesis requests are aborted, and
+    streaming engines stop producing audio. Sentences still waiting to be
+    dispatched are dropped.
+    """
+
+    def __init__(
+        self,
+        stream_audio: bool = False,
+        audio_transport: Optional[AudioTransport] = None,
+        scheduler: Optional[TTSScheduler] = None,
+        batch_sentences: bool = False,
+    ) -> None:
+        self.stream_audio = stream_audio
+        self.audio_transport = audio_transport or AudioTransport()
+        self.scheduler = scheduler
+        self.batch_sentences = batch_sentences
+        # Measured speed of the engine, shared with other sessions when possible
+        self.speed = scheduler.speed if scheduler else SynthesisSpeed()
         self.task_list: List[asyncio.Task] = []
+        # TTS tasks holding a synthesis slot
+        self._synthesizing: Set[asyncio.Task] = set()
         self._lock = asyncio.Lock()
-        # Queue to store ordered payloads
-        self._payload_queue: asyncio.Queue[Dict] = asyncio.Queue()
+        # Queue to store ordered payloads: (payload, sequence, last payload of the sequence)
+        self._payload_queue: asyncio.Queue[Tuple[Dict, int, bool]] = asyncio.Queue()
         # Task to handle sending payloads in order
         self._sender_task: Optional[asyncio.Task] = None
         # Counter for maintaining order
         self._sequence_counter = 0
         self._next_sequence_to_send = 0
+        # Set by the sender each time a sentence has been sent
+        self._progress = asyncio.Event()
+        # Bumped by `clear`: a dispatch started before is for an interrupted turn
+        self._generation = 0
+        # Sentence batching: the held sentence, the task dispatching it on
+        # time, timer tasks whose sentence is being dispatched, the characters
+        # of the sentences not sent yet and when the audio sent so far ends
+        # playing (event loop clock)
+        self._pending: Optional[_PendingSentence] = None
+        self._flush_timer: Optional[asyncio.Task] = None
+        self._timer_flushes: Set[asyncio.Task] = set()
+        self._unsent_chars: Dict[int, int] = {}
+        self._playback_end = 0.0
 
     async def speak(
         self,
@@ -35,9 +149,11 @@ class TTSTaskManager:
         live2d_model: Live2dModel,
         tts_engine: TTSInterface,
         websocket_send: WebSocketSend,
+        translate_engine: Optional[TranslateInterface] = None,
     ) -> None:
         """
-        Queue a TTS task while maintaining order of delivery.
+        Queue a TTS task while maintaining order of delivery. With sentence
+        batching, the sentence may be held back and merged with the next ones.
 
         Args:
             tts_text: Text to synthesize
@@ -46,67 +162,195 @@ class TTSTaskManager:
             live2d_model: Live2D model instance
             tts_engine: TTS engine instance
             websocket_send: WebSocket send function
+            translate_engine: Optional translator applied to tts_text inside the
+                task, so it overlaps with the synthesis of earlier sentences
         """
-        if len(re.sub(r'[\s.,!?，。！？\'"』」）】\s]+', "", tts_text)) == 0:
-            logger.debug("Empty TTS text, sending silent display payload")
-            # Get current sequence number for silent payload
-            current_sequence = self._sequence_counter
-            self._sequence_counter += 1
+        sentence = _PendingSentence(
+            tts_text=tts_text,
+            display_text=display_text,
+            actions=actions,
+            live2d_model=live2d_model,
+            tts_engine=tts_engine,
+            websocket_send=websocket_send,
+            translate_engine=translate_engine,
+        )
+        if not self.batch_sentences or _is_silent_text(tts_text):
+            await self.flush()
+            await self._dispatch(sentence)
+            return
 
-            # Start sender task if not running
-            if not self._sender_task or self._sender_task.done():
-                self._sender_task = asyncio.create_task(
-                    self._process_payload_queue(websocket_send)
-                )
+        target = self._batch_target_chars()
+        if self._pending is not None:
+            if len(self._pending.tts_text) + 1 + len(tts_text) <= target:
+                self._pending.merge(sentence)
+                logger.debug(f"Batched TTS text: '''{self._pending.tts_text}'''")
+                await self._schedule_flush()
+                return
+            await self.flush()
 
-            await self._send_silent_payload(display_text, actions, current_sequence)
+        if self._sequence_counter == 0 or len(tts_text) >= target:
+            # The first sentence of a reply is never held back
+            await self._dispatch(sentence)
             return
+        self._pending = sentence
+        await self._schedule_flush()
 
-        logger.debug(
-            f"🏃Queuing TTS task for: '''{tts_text}''' (by {display_text.name})"
+    async def flush(self) -> None:
+        """Dispatch the sentence held back by sentence batching, if any."""
+        timer, self._flush_timer = self._flush_timer, None
+        if timer is not None and timer is not asyncio.current_task():
+            timer.cancel()
+        pending, self._pending = self._pending, None
+        if pending is not None:
+            await self._dispatch(pending)
+
+    def _audio_ahead(self) -> float:
+        """
+        Seconds of audio the listener has before running out, counting the
+        estimated audio of sentences still being synthesized.
+        """
+        playing = max(0.0, self._playback_end - time.monotonic())
+        unsent = sum(self._unsent_chars.values()) * self.speed.seconds_per_char
+        return playing + unsent * max(0.0, 1.0 - self.speed.rtf)
+
+    def _batch_target_chars(self) -> int:
+        """Longest text that can be synthesized before the listener runs out of audio."""
+        seconds_per_synthesized_char = self.speed.rtf * self.speed.seconds_per_char
+        if seconds_per_synthesized_char <= 0:
+            return MAX_BATCH_CHARS
+        slack = self._audio_ahead() - BATCH_SAFETY_SECONDS
+        return max(0, min(MAX_BATCH_CHARS, int(slack / seconds_per_synthesized_char)))
+
+    async def _schedule_flush(self) -> None:
+        """Dispatch the held sentence when waiting longer would leave a gap."""
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        synthesis = (
+            len(self._pending.tts_text) * self.speed.seconds_per_char * self.speed.rtf
         )
+        delay = self._audio_ahead() - synthesis - BATCH_SAFETY_SECONDS
+        if delay <= 0:
+            await self.flush()
+            return
+        self._flush_timer = asyncio.create_task(self._flush_after(delay))
+
+    async def _flush_after(self, delay: float) -> None:
+        await asyncio.sleep(delay)
+        # The held sentence is taken: from here on only `clear` cancels this
+        # task, a new timer must not drop the sentence while it is dispatched
+        task = asyncio.current_task()
+        self._flush_timer = None
+        self._timer_flushes.add(task)
+        try:
+            await self.flush()
+        finally:
+            self._timer_flushes.discard(task)
 
-        # Get current sequence number
-        current_sequence = self._sequence_counter
-        self._sequence_counter += 1
+    async def _dispatch(self, sentence: _PendingSentence) -> None:
+        """Assign the next sequence number to a sentence and start its TTS task."""
+        generation = self._generation
+        # Keeps sequence numbers in call order when a timer flush and speak race
+        async with self._lock:
+            if self._is_stale(generation):
+                return
+            if _is_silent_text(sentence.tts_text):
+                logger.debug("Empty TTS text, sending silent display payload")
+                # Get current sequence number for silent payload
+                current_sequence = self._sequence_counter
+                self._sequence_counter += 1
 
-        # Start sender task if not running
-        if not self._sender_task or self._sender_task.done():
-            self._sender_task = asyncio.create_task(
-                self._process_payload_queue(websocket_send)
+                # Start sender task if not running
+                if not self._sender_task or self._sender_task.done():
+                    self._sender_task = asyncio.create_task(
+                        self._process_payload_queue(sentence.websocket_send)
+                    )
+
+                await self._send_silent_payload(
+                    sentence.display_text, sentence.actions, current_sequence
+                )
+                return
+
+            logger.debug(
+                f"🏃Queuing TTS task for: '''{sentence.tts_text}''' (by {sentence.display_text.name})"
             )
 
-        # Create and queue the TTS task
-        task = asyncio.create_task(
-            self._process_tts(
-                tts_text=tts_text,
-                display_text=display_text,
-                actions=actions,
-                live2d_model=live2d_model,
-                tts_engine=tts_engine,
-                sequence_number=current_sequence,
+            # Start sender task if not running
+            if not self._sender_task or self._sender_task.done():
+                self._sender_task = asyncio.create_task(
+                    self._process_payload_queue(sentence.websocket_send)
+                )
+
+            # Backpressure: wait until the client has caught up
+            while (
+                self._sequence_counter - self._next_sequence_to_send
+                >= MAX_SENTENCES_AHEAD
+            ):
+                self._progress.clear()
+                await self._progress.wait()
+                if self._is_stale(generation):
+                    return
+
+            # Get current sequence number
+            current_sequence = self._sequence_counter
+            self._sequence_counter += 1
+            self._unsent_chars[current_sequence] = len(sentence.tts_text)
+
+            # Create and queue the TTS task
+            task = asyncio.create_task(
+                self._process_tts(
+                    tts_text=sentence.tts_text,
+                    display_text=sentence.display_text,
+                    actions=sentence.actions,
+                    live2d_model=sentence.live2d_model,
+                    tts_engine=sentence.tts_engine,
+                    sequence_number=current_sequence,
+                    translate_engine=sentence.translate_engine,
+                )
             )
-        )
-        self.task_list.append(task)
+            self.task_list.append(task)
+
+    def _is_stale(self, generation: int) -> bool:
+        """Whether `clear` was called since a dispatch started; it is dropped."""
+        if generation == self._generation:
+            return False
+        turn_tracer.count_cancelled("tts_queued")
+        logger.debug("Dropped a sentence of an interrupted turn")
+        return True
 
     async def _process_payload_queue(self, websocket_send: WebSocketSend) -> None:
         """
         Process and send payloads in correct order.
         Runs continuously until all payloads are processed.
         """
-        buffered_payloads: Dict[int, Dict] = {}
+        buffered_payloads: Dict[int, List[Dict]] = {}
+        completed_sequences: Set[int] = set()
 
         while True:
             try:
                 # Get payload from queue
-                payload, sequence_number = await self._payload_queue.get()
-                buffered_payloads[sequence_number] = payload
+                payload, sequence_number, is_last = await self._payload_queue.get()
+                buffered_payloads.setdefault(sequence_number, []).append(payload)
+                if is_last:
+                    completed_sequences.add(sequence_number)
 
                 # Send payloads in order
                 while self._next_sequence_to_send in buffered_payloads:
-                    next_payload = buffered_payloads.pop(self._next_sequence_to_send)
-                    await websocket_send(json.dumps(next_payload))
+                    sequence = self._next_sequence_to_send
+                    for next_payload in buffered_payloads.pop(sequence):
+                        await self.audio_transport.send(next_payload, websocket_send)
+                        if next_payload.get("audio"):
+                            trace_mark("first_audio_sent")
+                        self._playback_end = max(
+                            self._playback_end, time.monotonic()
+                        ) + _payload_seconds(next_payload)
+                    if sequence not in completed_sequences:
+                        # More chunks of this sentence are coming
+                        break
+                    completed_sequences.discard(sequence)
+                    self._unsent_chars.pop(sequence, None)
                     self._next_sequence_to_send += 1
+                    self._progress.set()
 
                 self._payload_queue.task_done()
 
@@ -125,7 +369,7 @@ class TTSTaskManager:
             display_text=display_text,
             actions=actions,
         )
-        await self._payload_queue.put((audio_payload, sequence_number))
+        await self._payload_queue.put((audio_payload, sequence_number, True))
 
     async def _process_tts(
         self,
@@ -135,18 +379,68 @@ class TTSTaskManager:
         live2d_model: Live2dModel,
         tts_engine: TTSInterface,
         sequence_number: int,
+        translate_engine: Optional[TranslateInterface] = None,
     ) -> None:
         """Process TTS generation and queue the result for ordered delivery"""
         audio_file_path = None
         try:
-            audio_file_path = await self._generate_audio(tts_engine, tts_text)
-            payload = prepare_audio_payload(
-                audio_path=audio_file_path,
-                display_text=display_text,
-                actions=actions,
+            if translate_engine:
+                tts_text = await self._translate(translate_engine, tts_text)
+            if self.stream_audio and tts_engine.supports_streaming:
+                async with self._synthesis_slot(sequence_number):
+                    start = time.monotonic()
+                    with trace_span(
+                        "tts",
+                        sequence=sequence_number,
+                        chars=len(tts_text),
+                        streaming=True,
+                    ):
+                        audio_seconds = await self._stream_tts(
+                            tts_engine, tts_text, display_text, actions, sequence_number
+                        )
+                    self.speed.record(
+                        len(tts_text), time.monotonic() - start, audio_seconds
+                    )
+                return
+            if tts_engine.supports_pcm:
+                # In memory: no temporary file, no ffmpeg decoding
+                async with self._synthesis_slot(sequence_number):
+                    start = time.monotonic()
+                    with trace_span(
+                        "tts", sequence=sequence_number, chars=len(tts_text)
+                    ):
+                        audio = await tts_engine.async_generate_pcm(tts_text)
+                    synthesis_seconds = time.monotonic() - start
+                with trace_span("audio_encode", sequence=sequence_number):
+                    payload = prepare_pcm_audio_payload(
+                        samples=audio.samples,
+                        sample_rate=audio.sample_rate,
+                        display_text=display_text,
+                        actions=actions,
+                        encode_base64=False,
+                    )
+            else:
+                async with self._synthesis_slot(sequence_number):
+                    start = time.monotonic()
+                    with trace_span(
+                        "tts", sequence=sequence_number, chars=len(tts_text)
+                    ):
+                        audio_file_path = await self._generate_audio(
+                            tts_engine, tts_text
+                        )
+                    synthesis_seconds = time.monotonic() - start
+                with trace_span("audio_encode", sequence=sequence_number):
+                    payload = prepare_audio_payload(
+                        audio_path=audio_file_path,
+                        display_text=display_text,
+                        actions=actions,
+                        encode_base64=False,
+                    )
+            self.speed.record(
+                len(tts_text), synthesis_seconds, _payload_seconds(payload)
             )
             # Queue the payload with its sequence number
-            await self._payload_queue.put((payload, sequence_number))
+            await self._payload_queue.put((payload, sequence_number, True))
 
         except Exception as e:
             logger.error(f"Error preparing audio payload: {e}")
@@ -156,13 +450,100 @@ class TTSTaskManager:
                 display_text=display_text,
                 actions=actions,
             )
-            await self._payload_queue.put((payload, sequence_number))
+            await self._payload_queue.put((payload, sequence_number, True))
 
         finally:
             if audio_file_path:
                 tts_engine.remove_file(audio_file_path)
                 logger.debug("Audio cache file cleaned.")
 
+    @asynccontextmanager
+    async def _synthesis_slot(self, sequence_number: int):
+        """Slot of the shared engine scheduler, if there is one."""
+        if self.scheduler is None:
+            slot = nullcontext()
+        else:
+            slot = self.scheduler.slot(sequence_number)
+        async with slot:
+            task = asyncio.current_task()
+            self._synthesizing.add(task)
+            try:
+                yield
+            finally:
+                self._synthesizing.discard(task)
+
+    async def _stream_tts(
+        self,
+        tts_engine: TTSInterface,
+        text: str,
+        display_text: DisplayText,
+        actions: Optional[Actions],
+        sequence_number: int,
+    ) -> float:
+        """
+        Queue the audio of a sentence chunk by chunk while it is synthesized.
+        Returns the duration of the audio in seconds.
+        """
+        logger.debug(f"🏃Streaming audio for '''{text}'''...")
+        meter: Optional[ChunkVolumeMeter] = None
+        sample_rate = 0
+        chunk_index = 0
+        audio_seconds = 0.0
+        # Odd byte of a sample split across two chunks
+        carry = b""
+        try:
+            async for chunk in tts_engine.async_stream_audio(text):
+                pcm = carry + chunk.pcm
+                whole = len(pcm) - len(pcm) % 2
+                pcm, carry = pcm[:whole], pcm[whole:]
+                if not pcm:
+                    continue
+                if meter is None:
+                    sample_rate = chunk.sample_rate
+                    meter = ChunkVolumeMeter(sample_rate)
+                payload = prepare_audio_chunk_payload(
+                    pcm=pcm,
+                    sample_rate=sample_rate,
+                    chunk_index=chunk_index,
+                    volumes=meter.feed(pcm),
+                    is_final=False,
+                    display_text=display_text,
+                    actions=actions,
+                    encode_base64=False,
+                )
+                await self._payload_queue.put((payload, sequence_number, False))
+                audio_seconds += _payload_seconds(payload)
+                chunk_index += 1
+        except Exception as e:
+            if chunk_index == 0:
+                # Nothing was sent yet: the caller sends a silent payload
+                raise
+            logger.error(f"Audio stream interrupted after {chunk_index} chunks: {e}")
+
+        if chunk_index == 0:
+            raise ValueError("TTS engine streamed no audio")
+        payload = prepare_audio_chunk_payload(
+            pcm=None,
+            sample_rate=sample_rate,
+            chunk_index=chunk_index,
+            volumes=meter.flush(),
+            is_final=True,
+            encode_base64=False,
+        )
+        await self._payload_queue.put((payload, sequence_number, True))
+        return audio_seconds + _payload_seconds(payload)
+
+    async def _translate(self, translate_engine: TranslateInterface, text: str) -> str:
+        """Translate text for TTS, falling back to the original text on failure"""
+        try:
+            with trace_span("translate", chars=len(text)):
+                translated = await translate_engine.async_translate(text)
+        except Exception as e:
+            logger.error(f"Translation failed, speaking the original text: {e}")
+            return text
+        logger.info(f"🏃 Text after translation: '''{translated}'''...")
+        return translated
+
     async def _generate_audio(self, tts_engine: TTSInterface, text: str) -> str:
         """Generate audio file from text"""
         logger.debug(f"🏃Generating audio for '''{text}'''...")
@@ -172,11 +553,36 @@ class TTSTaskManager:
         )
 
     def clear(self) -> None:
-        """Clear all pending tasks and reset state"""
+        """Cancel the TTS tasks still running and reset state"""
+        unfinished = [task for task in self.task_list if not task.done()]
+        if unfinished:
+            synthesizing = sum(1 for task in unfinished if task in self._synthesizing)
+            for task in unfinished:
+                task.cancel()
+            turn_tracer.count_cancelled("tts_synthesis", synthesizing)
+            turn_tracer.count_cancelled("tts_queued", len(unfinished) - synthesizing)
+            logger.debug(
+                f"Cancelled {len(unfinished)} TTS tasks, {synthesizing} of them synthesizing"
+            )
+        held = len(self._timer_flushes) + (self._pending is not None)
+        turn_tracer.count_cancelled("tts_held_sentence", held)
         self.task_list.clear()
         if self._sender_task:
             self._sender_task.cancel()
+        if self._flush_timer:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        # Timers dispatching a held sentence, possibly waiting on backpressure
+        for task in self._timer_flushes:
+            task.cancel()
+        self._timer_flushes.clear()
+        self._pending = None
+        self._unsent_chars.clear()
+        self._playback_end = 0.0
         self._sequence_counter = 0
         self._next_sequence_to_send = 0
+        self._generation += 1
+        # Release a speak() waiting for the previous reply to drain
+        self._progress.set()
         # Create a new queue to clear any pending items
         self._payload_queue = asyncio.Queue()
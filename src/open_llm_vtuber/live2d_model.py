@@ -1,8 +1,9 @@
 import json
-import re
 import chardet
 from loguru import logger
 
+from .utils.text_pipeline import FORBIDDEN_EXPRESSION_PATTERN, TextPipeline
+
 # This class will only prepare the payload for the live2d model
 # the process of sending the payload should be done by the caller
 # This class is **Not responsible** for sending the payload to the server
@@ -52,6 +53,9 @@ class Live2dModel:
         self.emo_str: str = " ".join([f"[{key}]," for key in self.emo_map.keys()])
         # emo_str is a string of the keys in the emoMap dictionary. The keys are enclosed in square brackets.
         # example: `"[fear], [anger], [disgust], [sadness], [surprise]"` (neutral, joy, smirk excluded)
+        # Compiled text pipelines of this model, keyed by TTS filter flags
+        self._text_pipelines: dict = {}
+        self.text_pipeline()
 
     def _load_file_content(self, file_path: str) -> str:
         """Load the content of a file with robust encoding handling."""
@@ -144,6 +148,27 @@ class Live2dModel:
 
         return matched_model
 
+    def text_pipeline(self, tts_preprocessor_config=None) -> TextPipeline:
+        """
+        Get the compiled text pipeline of this model for a TTS preprocessor config.
+
+        Pipelines are built once per filter configuration and dropped when the
+        model changes.
+
+        Parameters:
+            tts_preprocessor_config (TTSPreprocessorConfig, optional): TTS filter
+                settings. Defaults to the default filter settings.
+
+        Returns:
+            TextPipeline: The pipeline extracting expressions and filtering text.
+        """
+        key = TextPipeline.config_key(tts_preprocessor_config)
+        pipeline = self._text_pipelines.get(key)
+        if pipeline is None:
+            pipeline = TextPipeline(self.emo_map, **key._asdict())
+            self._text_pipelines[key] = pipeline
+        return pipeline
+
     def extract_emotion(self, str_to_check: str) -> list:
         """
         Check the input string for any emotion keywords and return a list of values (the expression index) of the emotions found in the string.
@@ -154,23 +179,7 @@ class Live2dModel:
         Returns:
             list: A list of values of the emotions found in the string. An empty list is returned if no emotions are found.
         """
-
-        expression_list = []
-        str_to_check_lower = str_to_check.lower()
-
-        i = 0
-        while i < len(str_to_check_lower):
-            if str_to_check_lower[i] != "[":
-                i += 1
-                continue
-            for key in self.emo_map.keys():
-                emo_tag = f"[{key}]"
-                if str_to_check_lower[i : i + len(emo_tag)] == emo_tag:
-                    expression_list.append(self.emo_map[key])
-                    i += len(emo_tag) - 1
-                    break
-            i += 1
-        return expression_list
+        return self.text_pipeline().extract_emotion(str_to_check)
 
     def remove_emotion_keywords(self, target_str: str) -> str:
         """
@@ -182,17 +191,7 @@ class Live2dModel:
         Returns:
             str: The cleaned string with the emotion keywords removed.
         """
-
-        lower_str = target_str.lower()
-
-        for key in self.emo_map.keys():
-            lower_key = f"[{key}]".lower()
-            while lower_key in lower_str:
-                start_index = lower_str.find(lower_key)
-                end_index = start_index + len(lower_key)
-                target_str = target_str[:start_index] + target_str[end_index:]
-                lower_str = lower_str[:start_index] + lower_str[end_index:]
-        return target_str
+        return self.text_pipeline().remove_emotion_keywords(target_str)
 
     @staticmethod
     def remove_forbidden_expressions(text: str) -> str:
@@ -200,16 +199,4 @@ class Live2dModel:
         Remove forbidden expression tags from text (for display/subtitle).
         Strips [neutral], [joy], [smirk], [confused], [surprise] case-insensitively.
         """
-        for name in [
-            "neutral",
-            "joy",
-            "smirk",
-            "confused",
-            "surprise",
-            "anger",
-            "sadness",
-            "disgust",
-            "fear",
-        ]:
-            text = re.sub(rf"\[{re.escape(name)}\]", "", text, flags=re.I)
-        return text
+        return FORBIDDEN_EXPRESSION_PATTERN.sub("", text)
@@ -1,16 +1,49 @@
 import json
-from typing import List, Dict, Any, Optional, Tuple
+import re
+from typing import List, Dict, Any, Optional
 from loguru import logger
 
+_STRING_SPECIAL_CHARS = re.compile(r'["\\]')
+_SCALAR_CHARS = frozenset("0123456789+-.eEtrufalsn")
+_WHITESPACE = frozenset(" \t\n\r")
+
+# Parser states inside a candidate object
+KEY_OR_END = "key_or_end"  # after "{"
+KEY = "key"  # after "," in an object
+COLON = "colon"  # after a key
+VALUE_OR_END = "value_or_end"  # after "["
+VALUE = "value"  # after ":" or "," in an array
+SCALAR = "scalar"  # inside a number, true, false or null
+AFTER_VALUE = "after_value"
+
+# A candidate object longer than this is given up (e.g. a stray "{" in prose)
+MAX_OBJECT_LENGTH = 64 * 1024
+
 
 class StreamJSONDetector:
-    """Detector for real-time JSON detection in streaming text."""
+    """Detector for real-time JSON detection in streaming text.
+
+    Parses incrementally: the container stack, the grammar state and the
+    string/escape state are kept across chunks, so the text of a candidate
+    object is scanned once and each top-level JSON object is parsed once, when
+    its closing brace arrives. A "{" in prose is given up at the first char
+    that cannot follow it in JSON. Text before the current candidate object is
+    dropped from the buffer.
+    """
 
     def __init__(self):
-        self.buffer = ""  # Store text that has not been fully processed
-        self.potential_jsons = []  # Store possible JSON starting positions
+        self.buffer = ""  # Text from the start of the current candidate object
         self.completed_jsons = []  # Store completed JSON objects
-        self.processed_ranges = []  # Store processed intervals [start, end]
+        self._reset_scan()
+
+    def _reset_scan(self) -> None:
+        self._pos = 0  # Next position of the buffer to scan
+        self._start = -1  # Start of the candidate object, -1 if none
+        self._stack: List[str] = []  # Open containers: "{" or "["
+        self._state = KEY_OR_END
+        self._in_string = False
+        self._escape = False
+        self._state_after_string = AFTER_VALUE
 
     def process_chunk(self, chunk: str) -> List[Dict[str, Any]]:
         """Process a single text chunk, return a list of complete JSON objects found in this chunk.
@@ -21,104 +54,168 @@ class StreamJSONDetector:
         Returns:
             List[Dict[str, Any]]: List of complete JSON objects parsed from the current chunk
         """
-        # Add new chunk to buffer
-        old_length = len(self.buffer)
         self.buffer += chunk
-
-        # Update potential JSON starting positions
-        self._find_potential_starts(old_length)
-
-        # Try to parse potential JSON objects
-        new_jsons = self._try_parse_jsons()
-
-        return new_jsons
-
-    def _find_potential_starts(self, start_from: int) -> None:
-        """Find new potential JSON starting positions in the buffer.
-
-        Args:
-            start_from (int): Position to start searching from
-        """
-        for i in range(start_from, len(self.buffer)):
-            if self.buffer[i] == "{" and not self._is_in_processed_range(i):
-                self.potential_jsons.append(i)
-
-    def _is_in_processed_range(self, pos: int) -> bool:
-        """Check if a specified position is within a processed range.
-
-        Args:
-            pos (int): Position to check
-
-        Returns:
-            bool: True if position is within a processed range, otherwise False
-        """
-        for start, end in self.processed_ranges:
-            if start <= pos <= end:
-                return True
-        return False
-
-    def _try_parse_jsons(self) -> List[Dict[str, Any]]:
-        """Try to parse JSON objects from the current buffer.
-
-        Returns:
-            List[Dict[str, Any]]: List of newly parsed JSON objects
-        """
         new_jsons = []
-        remaining_potential = []
-
-        # Sort by starting position, process outermost JSON first
-        self.potential_jsons.sort()
 
-        for start_idx in self.potential_jsons:
-            # Skip if this position is already within a processed range
-            if self._is_in_processed_range(start_idx):
+        while True:
+            if self._start < 0:
+                start = self.buffer.find("{", self._pos)
+                if start < 0:
+                    # No object started: the scanned text is not needed anymore
+                    self.buffer = ""
+                    self._pos = 0
+                    return new_jsons
+                self._begin_candidate(start)
+
+            end = self._scan()
+            if end is None:
+                if len(self.buffer) - self._start > MAX_OBJECT_LENGTH:
+                    logger.warning(
+                        f"Giving up on unterminated JSON candidate: {self.buffer[self._start : self._start + 50]}..."
+                    )
+                    self._abandon_candidate()
+                    continue
+                self._drop_prefix(self._start)
+                return new_jsons
+            if end < 0:
+                # Not a JSON object after all
+                self._abandon_candidate()
                 continue
 
-            result, end_idx = self._extract_json(start_idx)
-            if result is not None:
-                new_jsons.append(result)
-                # Mark this range as processed
-                self.processed_ranges.append((start_idx, end_idx))
-                self.completed_jsons.append(result)
-            else:
-                # This JSON may not be complete yet, keep it
-                remaining_potential.append(start_idx)
-
-        self.potential_jsons = remaining_potential
-        return new_jsons
-
-    def _extract_json(self, start_idx: int) -> Tuple[Optional[Dict[str, Any]], int]:
-        """Try to extract a complete JSON object from the given position.
-
-        Args:
-            start_idx (int): Potential starting position of JSON
-
-        Returns:
-            Tuple[Optional[Dict[str, Any]], int]: Parsed JSON object and ending position,
-                                               or (None, -1) if incomplete
-        """
-        stack = 1
-        i = start_idx + 1
-
-        while i < len(self.buffer) and stack > 0:
-            if self.buffer[i] == "{":
-                stack += 1
-            elif self.buffer[i] == "}":
-                stack -= 1
-            i += 1
-
-        # If complete JSON is found
-        if stack == 0:
-            json_str = self.buffer[start_idx:i]
+            json_str = self.buffer[self._start : end]
             try:
                 json_data = json.loads(json_str)
-                return json_data, i - 1
             except json.JSONDecodeError:
                 logger.warning(
                     f"JSON structure found but parsing failed: {json_str[:50]}..."
                 )
+                # Objects nested in the invalid text may still be valid
+                self._abandon_candidate()
+                continue
+
+            new_jsons.append(json_data)
+            self.completed_jsons.append(json_data)
+            self._start = -1
+            self._pos = end
+
+    def _begin_candidate(self, start: int) -> None:
+        self._start = start
+        self._pos = start + 1
+        self._stack = ["{"]
+        self._state = KEY_OR_END
+        self._in_string = False
+        self._escape = False
+
+    def _abandon_candidate(self) -> None:
+        """Resume scanning right after the "{" of the current candidate."""
+        self._pos = self._start + 1
+        self._start = -1
+
+    def _drop_prefix(self, length: int) -> None:
+        if length:
+            self.buffer = self.buffer[length:]
+            self._pos -= length
+            self._start -= length
+
+    def _scan(self) -> Optional[int]:
+        """Continue scanning the candidate object.
+
+        Returns:
+            Optional[int]: End position (exclusive) of the object, -1 if the
+            candidate cannot be a JSON object, or None if more text is needed
+        """
+        buffer = self.buffer
+        length = len(buffer)
+        pos = self._pos
+
+        while pos < length:
+            if self._in_string:
+                if self._escape:
+                    pos += 1
+                    self._escape = False
+                    continue
+                match = _STRING_SPECIAL_CHARS.search(buffer, pos)
+                if match is None:
+                    pos = length
+                    break
+                pos = match.end()
+                if match.group() == "\\":
+                    self._escape = True
+                else:
+                    self._in_string = False
+                    self._state = self._state_after_string
+                continue
+
+            char = buffer[pos]
+            state = self._state
+
+            if state == SCALAR:
+                if char in _SCALAR_CHARS:
+                    pos += 1
+                    continue
+                # End of the scalar: handle the char as what follows a value
+                state = self._state = AFTER_VALUE
+
+            pos += 1
+            if char in _WHITESPACE:
+                continue
 
-        return None, -1
+            if state in (KEY_OR_END, KEY):
+                if char == '"':
+                    self._in_string = True
+                    self._state_after_string = COLON
+                elif char == "}" and state == KEY_OR_END:
+                    self._close_container(char)
+                    if not self._stack:
+                        return pos
+                else:
+                    return -1
+            elif state == COLON:
+                if char != ":":
+                    return -1
+                self._state = VALUE
+            elif state in (VALUE, VALUE_OR_END):
+                if char == "]" and state == VALUE_OR_END:
+                    self._close_container(char)
+                elif not self._start_value(char):
+                    return -1
+            else:  # AFTER_VALUE
+                if char == ",":
+                    self._state = KEY if self._stack[-1] == "{" else VALUE
+                elif char in "}]":
+                    if not self._close_container(char):
+                        return -1
+                    if not self._stack:
+                        return pos
+                else:
+                    return -1
+
+        self._pos = pos
+        return None
+
+    def _start_value(self, char: str) -> bool:
+        if char == '"':
+            self._in_string = True
+            self._state_after_string = AFTER_VALUE
+        elif char == "{":
+            self._stack.append("{")
+            self._state = KEY_OR_END
+        elif char == "[":
+            self._stack.append("[")
+            self._state = VALUE_OR_END
+        elif char in _SCALAR_CHARS:
+            self._state = SCALAR
+        else:
+            return False
+        return True
+
+    def _close_container(self, closer: str) -> bool:
+        """Close the innermost container. Returns False if `closer` does not match it."""
+        if self._stack[-1] != ("{" if closer == "}" else "["):
+            return False
+        self._stack.pop()
+        self._state = AFTER_VALUE
+        return True
 
     def get_all_jsons(self) -> List[Dict[str, Any]]:
         """Get all JSON objects parsed so far.
@@ -131,9 +228,8 @@ class StreamJSONDetector:
     def reset(self) -> None:
         """Reset detector state, prepare to process a new stream."""
         self.buffer = ""
-        self.potential_jsons = []
         self.completed_jsons = []
-        self.processed_ranges = []
+        self._reset_scan()
 
 
 # Usage example
@@ -0,0 +1,106 @@
+"""Cache of tool results for tools marked as cacheable in mcp_servers.json."""
+
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Tuple, TypeVar
+
+from loguru import logger
+
+T = TypeVar("T")
+
+DEFAULT_MAX_ENTRIES = 256
+
+
+class ToolResultCache:
+    """TTL and LRU cache of tool results, shared by all client sessions.
+
+    Identical calls running at the same time share a single flight: the first
+    one runs the tool in its own task and the others wait for its result. The
+    task is not tied to any caller, so an interrupted turn does not cancel a
+    call other sessions are waiting for.
+
+    Args:
+        max_entries (int): Maximum number of results kept. The least recently
+            used result is dropped first.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        self.max_entries = max_entries
+        # key -> (expiry time on the monotonic clock, result)
+        self._entries: OrderedDict[str, Tuple[float, Any]] = OrderedDict()
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(server_name: str, tool_name: str, tool_args: Any) -> str:
+        """Key of a call: server, tool name and canonicalized arguments."""
+        return json.dumps(
+            [server_name, tool_name, tool_args],
+            sort_keys=True,
+            separators=(",", ":"),
+            ensure_ascii=False,
+            default=str,
+        )
+
+    async def get_or_call(
+        self,
+        key: str,
+        ttl: float,
+        call: Callable[[], Awaitable[T]],
+        cacheable: Callable[[T], bool] = lambda result: True,
+    ) -> Tuple[T, bool]:
+        """Return the cached result of `key`, or run `call` once to get it.
+
+        Returns:
+            tuple: (result, cache_hit). Joining a call already in flight counts
+            as a hit.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, result = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return result, True
+            del self._entries[key]
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.hits += 1
+            return await asyncio.shield(task), True
+
+        self.misses += 1
+        task = asyncio.create_task(self._fill(key, ttl, call, cacheable))
+        # Mark errors as retrieved when every caller was interrupted
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        self._inflight[key] = task
+        return await asyncio.shield(task), False
+
+    async def _fill(
+        self,
+        key: str,
+        ttl: float,
+        call: Callable[[], Awaitable[T]],
+        cacheable: Callable[[T], bool],
+    ) -> T:
+        try:
+            result = await call()
+        finally:
+            self._inflight.pop(key, None)
+        if cacheable(result):
+            self._entries[key] = (time.monotonic() + ttl, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        else:
+            logger.debug("MCPRC: Tool result not cached (tool reported an error).")
+        return result
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,120 @@
+"""On-disk cache of the tool schemas listed by MCP servers."""
+
+import hashlib
+import json
+import os
+import re
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+from mcp.types import Tool
+
+from .types import MCPServer
+
+DEFAULT_CACHE_DIR = os.path.join("cache", "mcp_tools")
+
+
+class ToolSchemaCache:
+    """Stores the `list_tools` result of each server between process starts.
+
+    An entry is keyed by the server command, args, working directory and a
+    hash of its environment, so editing mcp_servers.json invalidates it. The
+    server version reported at initialization is stored with the tools and
+    compared when the entry is revalidated against the live server.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR) -> None:
+        self.cache_dir = cache_dir
+
+    @staticmethod
+    def cache_key(server: MCPServer) -> str:
+        """Hash of the launch parameters of a server."""
+        env_hash = hashlib.sha256(
+            json.dumps(sorted((server.env or {}).items())).encode("utf-8")
+        ).hexdigest()
+        launch = {
+            "command": server.command,
+            "args": server.args,
+            "cwd": server.cwd,
+            "env": env_hash,
+        }
+        return hashlib.sha256(
+            json.dumps(launch, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+
+    def _file_prefix(self, server_name: str) -> str:
+        return re.sub(r"[^\w.-]", "_", server_name) + "-"
+
+    def _path(self, server: MCPServer) -> str:
+        return os.path.join(
+            self.cache_dir,
+            f"{self._file_prefix(server.name)}{self.cache_key(server)[:16]}.json",
+        )
+
+    def _read(self, server: MCPServer) -> Optional[Dict[str, Any]]:
+        path = self._path(server)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"MCPTC: Ignoring unreadable tool cache {path}: {e}")
+            return None
+        if entry.get("key") != self.cache_key(server):
+            return None
+        return entry
+
+    def load(self, server: MCPServer) -> Optional[List[Tool]]:
+        """Return the cached tools of a server, or None on a miss."""
+        entry = self._read(server)
+        if entry is None:
+            return None
+        try:
+            tools = [Tool.model_validate(tool) for tool in entry.get("tools", [])]
+        except Exception as e:
+            logger.warning(f"MCPTC: Invalid cached tools for '{server.name}': {e}")
+            return None
+        logger.debug(
+            f"MCPTC: Loaded {len(tools)} cached tools for server '{server.name}' "
+            f"(version {entry.get('server_version')})."
+        )
+        return tools
+
+    def store(
+        self, server: MCPServer, tools: List[Tool], server_version: Optional[str]
+    ) -> bool:
+        """Write the tools of a server. Returns True if the entry changed."""
+        serialized = [tool.model_dump(mode="json", exclude_none=True) for tool in tools]
+        previous = self._read(server)
+        if (
+            previous is not None
+            and previous.get("tools") == serialized
+            and previous.get("server_version") == server_version
+        ):
+            return False
+
+        entry = {
+            "key": self.cache_key(server),
+            "server": server.name,
+            "server_version": server_version,
+            "tools": serialized,
+        }
+        path = self._path(server)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Drop entries written for older launch parameters of this server
+            own_file = re.compile(
+                re.escape(self._file_prefix(server.name)) + r"[0-9a-f]{16}\.json"
+            )
+            for file_name in os.listdir(self.cache_dir):
+                stale = os.path.join(self.cache_dir, file_name)
+                if own_file.fullmatch(file_name) and stale != path:
+                    os.remove(stale)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"MCPTC: Failed to write tool cache {path}: {e}")
+        return True
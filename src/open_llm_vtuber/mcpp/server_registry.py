@@ -7,7 +7,7 @@ from pathlib import Path
 from typing import Dict, Optional, Union, Any
 from loguru import logger
 
-from .types import MCPServer
+from .types import MCPServer, MCPToolOptions
 from .utils.path import validate_file
 
 DEFAULT_CONFIG_PATH = "mcp_servers.json"
@@ -87,9 +87,32 @@ class ServerRegistry:
                 env=server_details.get("env", None),
                 cwd=server_details.get("cwd", None),
                 timeout=server_details.get("timeout", None),
+                max_concurrency=server_details.get("max_concurrency", 4),
+                tool_timeout=server_details.get("tool_timeout", 60.0),
+                tool_options=self._load_tool_options(
+                    server_name, server_details.get("tools", {})
+                ),
             )
             logger.debug(f"MCPSR: Loaded server: '{server_name}'.")
 
+    def _load_tool_options(
+        self, server_name: str, tools_config: Dict[str, Dict[str, Any]]
+    ) -> Dict[str, MCPToolOptions]:
+        """Load the per-tool execution options of a server."""
+        tool_options = {}
+        for tool_name, options in tools_config.items():
+            if not isinstance(options, dict):
+                logger.warning(
+                    f"MCPSR: Invalid options for tool '{tool_name}' of server '{server_name}'. Ignoring."
+                )
+                continue
+            tool_options[tool_name] = MCPToolOptions(
+                timeout=options.get("timeout", None),
+                reentrant=options.get("reentrant", True),
+                cache_ttl=options.get("cache_ttl", None),
+            )
+        return tool_options
+
     def remove_server(self, server_name: str) -> None:
         """Remove a server from the available servers."""
         try:
@@ -0,0 +1,293 @@
+"""Process-wide pool of MCP server sessions shared by all client sessions."""
+
+import asyncio
+from contextlib import AsyncExitStack
+from datetime import timedelta
+from typing import Any, Dict, List, Optional
+
+import anyio
+from loguru import logger
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+from mcp.types import CallToolResult, Tool
+
+from .result_cache import DEFAULT_MAX_ENTRIES, ToolResultCache
+from .server_registry import ServerRegistry
+from .types import MCPServer
+
+DEFAULT_TIMEOUT = timedelta(seconds=30)
+HEALTH_CHECK_INTERVAL = 30.0
+HEALTH_CHECK_TIMEOUT = 10.0
+RESTART_DELAY = 1.0
+
+# Errors meaning the stdio transport of a server is gone
+TRANSPORT_ERRORS = (
+    anyio.ClosedResourceError,
+    anyio.BrokenResourceError,
+    anyio.EndOfStream,
+    BrokenPipeError,
+    ConnectionError,
+    EOFError,
+)
+
+
+class _PooledServer:
+    """One MCP server process and its session, owned by a dedicated task.
+
+    The stdio transport and the session are entered and exited by the same
+    task (anyio requires it), which also pings the server periodically and
+    restarts it when the ping or the transport fails.
+    """
+
+    def __init__(self, server: MCPServer, health_check_interval: float):
+        self.server = server
+        self.health_check_interval = health_check_interval
+        self.restarts = 0
+        # Version from the server info sent at initialization
+        self.version: Optional[str] = None
+        self._session: Optional[ClientSession] = None
+        self._ready: Optional[asyncio.Future] = None
+        self._task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+        self._wake = asyncio.Event()
+        self._stopping = False
+        self._restart_requested = False
+
+    async def get_session(self) -> ClientSession:
+        """Return the running session, starting the server if needed."""
+        if self._session is not None:
+            return self._session
+        async with self._lock:
+            if self._task is None or self._task.done():
+                self._stopping = False
+                self._ready = self._new_ready_future()
+                self._task = asyncio.create_task(
+                    self._run(), name=f"mcp-server-{self.server.name}"
+                )
+            ready = self._ready
+        try:
+            # Shielded: a cancelled caller must not abort a start others wait for
+            return await asyncio.shield(ready)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            raise RuntimeError(
+                f"MCPSP: Failed to connect to server '{self.server.name}'."
+            ) from e
+
+    def request_restart(self) -> None:
+        """Restart the server after a transport failure seen by a caller."""
+        if self._task is not None and not self._task.done():
+            self._restart_requested = True
+            self._wake.set()
+
+    async def stop(self) -> None:
+        """Stop the server and wait for its process to exit."""
+        self._stopping = True
+        self._wake.set()
+        if self._task is not None:
+            try:
+                await self._task
+            except Exception as e:
+                logger.warning(
+                    f"MCPSP: Error stopping server '{self.server.name}': {e}"
+                )
+        self._task = None
+        self._session = None
+
+    def _new_ready_future(self) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        # Mark start errors as retrieved when no caller is waiting
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        return future
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            ready = self._ready
+            try:
+                await self._serve(ready)
+            except Exception as e:
+                if not ready.done():
+                    # The start failed: fail the waiting callers, retry on next use.
+                    # A server that cannot start is thus never restarted in a loop
+                    ready.set_exception(e)
+                    return
+                logger.error(f"MCPSP: Server '{self.server.name}' failed: {e}")
+            finally:
+                self._session = None
+
+            if self._stopping:
+                break
+            self.restarts += 1
+            logger.warning(
+                f"MCPSP: Restarting server '{self.server.name}' in {RESTART_DELAY:.0f}s "
+                f"(restart #{self.restarts})."
+            )
+            self._ready = self._new_ready_future()
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=RESTART_DELAY)
+            except asyncio.TimeoutError:
+                pass
+
+        if not self._ready.done():
+            self._ready.set_exception(
+                RuntimeError(f"Server '{self.server.name}' was stopped.")
+            )
+
+    async def _serve(self, ready: asyncio.Future) -> None:
+        """Run the server until it is stopped, unhealthy or a restart is requested."""
+        server = self.server
+        logger.info(f"MCPSP: Starting and connecting to server '{server.name}'...")
+        server_params = StdioServerParameters(
+            command=server.command, args=server.args, env=server.env, cwd=server.cwd
+        )
+        timeout = server.timeout if server.timeout else DEFAULT_TIMEOUT
+
+        async with AsyncExitStack() as stack:
+            read, write = await stack.enter_async_context(stdio_client(server_params))
+            session = await stack.enter_async_context(
+                ClientSession(read, write, read_timeout_seconds=timeout)
+            )
+            init_result = await session.initialize()
+            server_info = getattr(init_result, "serverInfo", None)
+            self.version = getattr(server_info, "version", None)
+
+            self._session = session
+            self._restart_requested = False
+            ready.set_result(session)
+            logger.info(f"MCPSP: Successfully connected to server '{server.name}'.")
+
+            while not self._stopping:
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(
+                        self._wake.wait(), timeout=self.health_check_interval
+                    )
+                except asyncio.TimeoutError:
+                    try:
+                        await asyncio.wait_for(
+                            session.send_ping(), timeout=HEALTH_CHECK_TIMEOUT
+                        )
+                    except Exception as e:
+                        raise RuntimeError(f"health check failed: {e!r}") from e
+                    continue
+                if self._restart_requested:
+                    raise RuntimeError("transport failure reported by a tool call")
+
+            self._session = None
+            logger.info(f"MCPSP: Stopping server '{server.name}'.")
+
+
+class MCPSessionPool:
+    """Starts each configured MCP server once and shares its session.
+
+    Sessions are multiplexed: the MCP session matches each response to its
+    request id, so calls from different client sessions run side by side on
+    one server process without seeing each other's results. The limits on
+    those calls (`call_limit`, `tool_lock`) are kept here too, one per server
+    process, so they hold across all client sessions.
+    """
+
+    def __init__(
+        self,
+        server_registery: ServerRegistry,
+        health_check_interval: float = HEALTH_CHECK_INTERVAL,
+        result_cache_size: int = DEFAULT_MAX_ENTRIES,
+    ) -> None:
+        self.server_registery = server_registery
+        self.health_check_interval = health_check_interval
+        # Results of the tools with a cache_ttl, shared like the sessions
+        self.result_cache = ToolResultCache(result_cache_size)
+        self._servers: Dict[str, _PooledServer] = {}
+        self._list_tools_cache: Dict[str, List[Tool]] = {}
+        # Per-server call limits and locks of non-reentrant tools
+        self._call_limits: Dict[str, asyncio.Semaphore] = {}
+        self._tool_locks: Dict[tuple[Optional[str], str], asyncio.Lock] = {}
+        logger.info("MCPSP: Initialized MCP session pool.")
+
+    def _get_pooled_server(self, server_name: str) -> _PooledServer:
+        pooled = self._servers.get(server_name)
+        if pooled is None:
+            server = self.server_registery.get_server(server_name)
+            if not server:
+                raise ValueError(
+                    f"MCPSP: Server '{server_name}' not found in available servers."
+                )
+            pooled = _PooledServer(server, self.health_check_interval)
+            self._servers[server_name] = pooled
+        return pooled
+
+    def call_limit(self, server_name: str, default: int) -> asyncio.Semaphore:
+        """Semaphore limiting the concurrent tool calls on a server."""
+        semaphore = self._call_limits.get(server_name)
+        if semaphore is None:
+            server = self.server_registery.get_server(server_name)
+            limit = server.max_concurrency if server else default
+            semaphore = self._call_limits[server_name] = asyncio.Semaphore(
+                max(1, limit)
+            )
+        return semaphore
+
+    def tool_lock(self, server_name: Optional[str], tool_name: str) -> asyncio.Lock:
+        """Lock letting a non-reentrant tool run once at a time."""
+        return self._tool_locks.setdefault((server_name, tool_name), asyncio.Lock())
+
+    async def get_session(self, server_name: str) -> ClientSession:
+        """Get the shared session of a server, starting it if needed."""
+        return await self._get_pooled_server(server_name).get_session()
+
+    async def list_tools(self, server_name: str) -> List[Tool]:
+        """List the tools of a server. The result is cached for the pool lifetime."""
+        if server_name in self._list_tools_cache:
+            logger.debug(f"MCPSP: Cache hit for list_tools on server '{server_name}'.")
+            return self._list_tools_cache[server_name]
+
+        session = await self.get_session(server_name)
+        response = await session.list_tools()
+        self._list_tools_cache[server_name] = response.tools
+        return response.tools
+
+    async def call_tool(
+        self, server_name: str, tool_name: str, tool_args: Dict[str, Any]
+    ) -> CallToolResult:
+        """Call a tool on the shared session of a server.
+
+        A transport failure restarts the server in the background and is raised
+        as a ConnectionError, so the caller reports it as a tool error.
+        """
+        pooled = self._get_pooled_server(server_name)
+        session = await pooled.get_session()
+        try:
+            return await session.call_tool(tool_name, tool_args)
+        except TRANSPORT_ERRORS as e:
+            logger.error(
+                f"MCPSP: Lost connection to server '{server_name}' while calling '{tool_name}': {e!r}"
+            )
+            pooled.request_restart()
+            raise ConnectionError(
+                f"Connection to MCP server '{server_name}' was lost."
+            ) from e
+
+    def server_version(self, server_name: str) -> Optional[str]:
+        """Version reported by a started server, if known."""
+        pooled = self._servers.get(server_name)
+        return pooled.version if pooled else None
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Running state and restart count of each started server."""
+        return {
+            name: {"running": pooled._session is not None, "restarts": pooled.restarts}
+            for name, pooled in self._servers.items()
+        }
+
+    async def aclose(self) -> None:
+        """Stop all server processes."""
+        logger.info(f"MCPSP: Closing {len(self._servers)} pooled server(s)...")
+        await asyncio.gather(*(pooled.stop() for pooled in self._servers.values()))
+        self._servers.clear()
+        self._list_tools_cache.clear()
+        self.result_cache.clear()
+        self._call_limits.clear()
+        self._tool_locks.clear()
+        logger.info("MCPSP: Session pool closed.")
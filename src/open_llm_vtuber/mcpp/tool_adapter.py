@@ -1,19 +1,102 @@
 """Constructs prompts for servers and tools, formats tool information for OpenAI API."""
 
-from typing import Dict, Optional, List, Tuple, Any
+import asyncio
+from typing import Awaitable, Callable, Dict, Optional, List, Set, Tuple, Any
 from loguru import logger
+from mcp.types import Tool
 
 from .types import FormattedTool
 from .mcp_client import MCPClient
+from .schema_cache import ToolSchemaCache
 from .server_registry import ServerRegistry
+from .session_pool import MCPSessionPool
+
+# Called with the names of the servers whose tools changed
+ToolsChangedListener = Callable[[Set[str]], Awaitable[None]]
 
 
 class ToolAdapter:
     """Dynamically fetches tool information from enabled MCP servers and formats it."""
 
-    def __init__(self, server_registery: Optional[ServerRegistry] = None) -> None:
-        """Initialize with an ServerRegistry."""
+    def __init__(
+        self,
+        server_registery: Optional[ServerRegistry] = None,
+        session_pool: Optional[MCPSessionPool] = None,
+        schema_cache: Optional[ToolSchemaCache] = None,
+    ) -> None:
+        """Initialize with an ServerRegistry and the shared session pool.
+
+        Without a session_pool, each fetch starts the servers in a temporary pool.
+        With a schema_cache, tools are read from disk when possible and checked
+        against the live servers in the background.
+        """
         self.server_registery = server_registery or ServerRegistry()
+        self.session_pool = session_pool
+        self.schema_cache = schema_cache
+        self._listeners: Set[ToolsChangedListener] = set()
+        # Servers already checked (or being checked) against the cache
+        self._revalidated: Set[str] = set()
+        self._tasks: Set[asyncio.Task] = set()
+
+    def add_tools_listener(self, listener: ToolsChangedListener) -> None:
+        """Register a coroutine called when revalidation finds changed tools."""
+        self._listeners.add(listener)
+
+    def remove_tools_listener(self, listener: ToolsChangedListener) -> None:
+        self._listeners.discard(listener)
+
+    async def _list_tools(self, client: MCPClient, server_name: str) -> List[Tool]:
+        """List the tools of a server, from the schema cache when possible."""
+        server = self.server_registery.get_server(server_name)
+        if self.schema_cache and server:
+            cached_tools = self.schema_cache.load(server)
+            if cached_tools is not None:
+                self._schedule_revalidation(server_name)
+                return cached_tools
+
+        tools = await client.list_tools(server_name)
+        if self.schema_cache and server:
+            self.schema_cache.store(
+                server, tools, client.session_pool.server_version(server_name)
+            )
+            self._revalidated.add(server_name)
+        return tools
+
+    def _schedule_revalidation(self, server_name: str) -> None:
+        if server_name in self._revalidated:
+            return
+        self._revalidated.add(server_name)
+        task = asyncio.create_task(self._revalidate(server_name))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _revalidate(self, server_name: str) -> None:
+        """Compare the cached tools with the live server and notify on change."""
+        server = self.server_registery.get_server(server_name)
+        try:
+            async with MCPClient(
+                self.server_registery, session_pool=self.session_pool
+            ) as client:
+                tools = await client.list_tools(server_name)
+                version = client.session_pool.server_version(server_name)
+        except Exception as e:
+            logger.warning(f"MC: Could not revalidate tools of '{server_name}': {e}")
+            # Try again the next time the cached tools are used
+            self._revalidated.discard(server_name)
+            return
+
+        if not self.schema_cache.store(server, tools, version):
+            logger.debug(f"MC: Cached tools of server '{server_name}' are up to date.")
+            return
+
+        logger.info(
+            f"MC: Tools of server '{server_name}' changed, updating {len(self._listeners)} tool manager(s)."
+        )
+        for listener in list(self._listeners):
+            try:
+                await listener({server_name})
+            except Exception as e:
+                logger.error(f"MC: Failed to update tools after revalidation: {e}")
 
     async def get_server_and_tool_info(
         self, enabled_servers: List[str]
@@ -31,7 +114,9 @@ class ToolAdapter:
         logger.debug(f"MC: Fetching tool info for enabled servers: {enabled_servers}")
 
         # Use a single client instance for efficiency
-        async with MCPClient(self.server_registery) as client:
+        async with MCPClient(
+            self.server_registery, session_pool=self.session_pool
+        ) as client:
             for server_name in enabled_servers:
                 if server_name not in self.server_registery.servers:
                     logger.warning(
@@ -41,7 +126,7 @@ class ToolAdapter:
 
                 try:
                     servers_info[server_name] = {}
-                    tools = await client.list_tools(server_name)
+                    tools = await self._list_tools(client, server_name)
                     logger.debug(
                         f"MC: Found {len(tools)} tools on server '{server_name}'"
                     )
@@ -216,10 +301,16 @@ class ToolAdapter:
         )
         return openai_tools, claude_tools
 
-    async def get_tools(
+    async def build_tools(
         self, enabled_servers: List[str]
-    ) -> Tuple[str, List[Dict[str, Any]], List[Dict[str, Any]]]:
-        """Run the dynamic fetching and formatting process."""
+    ) -> Tuple[
+        str, List[Dict[str, Any]], List[Dict[str, Any]], Dict[str, FormattedTool]
+    ]:
+        """Fetch the tools once and build everything a ToolManager needs.
+
+        Returns:
+            tuple: (mcp_prompt_string, openai_tools, claude_tools, formatted_tools_dict)
+        """
         logger.info(
             f"MC: Running dynamic tool construction for servers: {enabled_servers}"
         )
@@ -229,4 +320,13 @@ class ToolAdapter:
         mcp_prompt_string = self.construct_mcp_prompt_string(servers_info)
         openai_tools, claude_tools = self.format_tools_for_api(formatted_tools_dict)
         logger.info("MC: Dynamic tool construction complete.")
+        return mcp_prompt_string, openai_tools, claude_tools, formatted_tools_dict
+
+    async def get_tools(
+        self, enabled_servers: List[str]
+    ) -> Tuple[str, List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Run the dynamic fetching and formatting process."""
+        mcp_prompt_string, openai_tools, claude_tools, _ = await self.build_tools(
+            enabled_servers
+        )
         return mcp_prompt_string, openai_tools, claude_tools
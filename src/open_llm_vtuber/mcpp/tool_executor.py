@@ -1,5 +1,7 @@
+import asyncio
 import json
 import datetime
+from contextlib import AsyncExitStack
 from loguru import logger
 from typing import (
     Dict,
@@ -10,19 +12,34 @@ from typing import (
     AsyncIterator,
 )
 
-from .types import ToolCallObject
+from .types import MCPToolOptions, ToolCallObject
 from .mcp_client import MCPClient
 from .tool_manager import ToolManager
 
 
+DEFAULT_MAX_CONCURRENCY = 4
+DEFAULT_TOOL_TIMEOUT = 60.0
+
+
 class ToolExecutor:
     def __init__(
         self,
         mcp_client: MCPClient,
         tool_manager: ToolManager,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        sequential: bool = False,
     ):
+        """
+        Args:
+            mcp_client (MCPClient): Client used to call the tools.
+            tool_manager (ToolManager): Tools available to the LLM.
+            max_concurrency (int): Maximum number of tool calls of one turn running at once.
+            sequential (bool): Run the tool calls of a turn one after another.
+        """
         self._mcp_client = mcp_client
         self._tool_manager = tool_manager
+        self._max_concurrency = max(1, max_concurrency)
+        self._sequential = sequential
 
     def parse_tool_call(self, call: Union[Dict[str, Any], ToolCallObject]) -> tuple:
         """Parse tool call from different formats.
@@ -157,11 +174,17 @@ class ToolExecutor:
         tool_calls: Union[List[Dict[str, Any]], List[ToolCallObject]],
         caller_mode: Literal["Claude", "OpenAI", "Prompt"],
     ) -> AsyncIterator[Dict[str, Any]]:
-        """Execute tools and yield status updates."""
-        tool_results_for_llm = []
+        """Execute tools and yield status updates.
+
+        Independent calls run concurrently, within the per-turn and per-server
+        limits. Status updates are yielded as each call finishes, while the
+        final results keep the order of `tool_calls`.
+        """
+        tool_results_for_llm: List[Dict[str, Any] | None] = [None] * len(tool_calls)
+        runnable_calls = []  # (index, tool_name, tool_id, tool_input)
 
         logger.info(f"Executing {len(tool_calls)} tool(s) for {caller_mode} caller.")
-        for call in tool_calls:
+        for index, call in enumerate(tool_calls):
             (
                 tool_name,
                 tool_id,
@@ -177,128 +200,251 @@ class ToolExecutor:
                 logger.warning(
                     f"Skipping tool call due to parsing error: {result_content}"
                 )
-                status_update = {
-                    "type": "tool_call_status",
-                    "tool_id": tool_id
-                    or f"parse_error_{datetime.datetime.now(datetime.timezone.utc).isoformat()}",
-                    "tool_name": tool_name or "Unknown Tool",
-                    "status": "error",
-                    "content": result_content,
-                    "timestamp": datetime.datetime.now(
-                        datetime.timezone.utc
-                    ).isoformat()
-                    + "Z",
-                }
-                yield status_update
-                # Even on parse error, we might need to format a result for the LLM
-                # Use dummy values or the error message
-                formatted_result = self.format_tool_result(
-                    caller_mode,
+                tool_id = (
                     tool_id
-                    or f"parse_error_{datetime.datetime.now(datetime.timezone.utc).isoformat()}",
-                    result_content,
-                    True,  # is_error
+                    or f"parse_error_{datetime.datetime.now(datetime.timezone.utc).isoformat()}"
+                )
+                yield self._status_update(
+                    tool_id, tool_name or "Unknown Tool", "error", result_content
+                )
+                # Even on parse error, we might need to format a result for the LLM
+                tool_results_for_llm[index] = self.format_tool_result(
+                    caller_mode, tool_id, result_content, True
                 )
-                if formatted_result:
-                    tool_results_for_llm.append(formatted_result)
                 continue  # Skip execution logic for this call
 
-            # Yield 'running' status before execution
-            yield {
-                "type": "tool_call_status",
-                "tool_id": tool_id,
-                "tool_name": tool_name,
-                "status": "running",
-                "content": f"Input: {json.dumps(tool_input)}",
-                "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat()
-                + "Z",
-            }
+            runnable_calls.append((index, tool_name, tool_id, tool_input))
 
-            # Execute the tool
-            (
-                is_error,
-                text_content,
-                metadata,
-                content_items,
-            ) = await self.run_single_tool(tool_name, tool_id, tool_input)
-
-            # Determine content for status update and LLM result format
-            status_content = text_content  # Default to text content
-            llm_formatted_content = text_content  # Default to text content for LLM
-
-            if content_items:
-                image_items = [
-                    item for item in content_items if item.get("type") == "image"
-                ]
-                if image_items:
-                    num_images = len(image_items)
-                    status_content = (
-                        f"{text_content}\n[Tool returned {num_images} image(s)]".strip()
-                    )
+        turn_limit = asyncio.Semaphore(self._max_concurrency)
 
-                    if caller_mode == "Claude":
-                        # Format for Claude: list of blocks
-                        claude_blocks = []
-                        if text_content:
-                            claude_blocks.append({"type": "text", "text": text_content})
-                        for item in content_items:
-                            if (
-                                item.get("type") == "image"
-                                and "data" in item
-                                and "mimeType" in item
-                            ):
-                                claude_blocks.append(
-                                    {
-                                        "type": "image",
-                                        "source": {
-                                            "type": "base64",
-                                            "media_type": item["mimeType"],
-                                            "data": item["data"],
-                                        },
-                                    }
-                                )
-                            # Add other non-text types here
-                        llm_formatted_content = (
-                            claude_blocks if claude_blocks else ""
-                        )  # Use blocks or empty string
-                    elif caller_mode in ["OpenAI", "Prompt"]:
-                        llm_formatted_content = status_content
-
-            # Prepare and yield tool call status update
-            status_update = {
-                "type": "tool_call_status",
-                "tool_id": tool_id,
-                "tool_name": tool_name,
-                "status": "error" if is_error else "completed",
-                "content": status_content
-                if not is_error
-                else f"Error: {text_content}",  # Use descriptive content or error message
-                "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat()
-                + "Z",
-            }
+        if self._sequential or len(runnable_calls) <= 1:
+            for index, tool_name, tool_id, tool_input in runnable_calls:
+                yield self._running_update(tool_name, tool_id, tool_input)
+                run_result, cache_hit = await self._run_with_limits(
+                    tool_name, tool_id, tool_input, turn_limit
+                )
+                status_update, tool_results_for_llm[index] = self._build_result(
+                    caller_mode, tool_name, tool_id, run_result, cache_hit
+                )
+                yield status_update
+        else:
+            tasks: Dict[asyncio.Task, tuple] = {}
+            for index, tool_name, tool_id, tool_input in runnable_calls:
+                task = asyncio.create_task(
+                    self._run_with_limits(tool_name, tool_id, tool_input, turn_limit)
+                )
+                tasks[task] = (index, tool_name, tool_id)
+            try:
+                for _, tool_name, tool_id, tool_input in runnable_calls:
+                    yield self._running_update(tool_name, tool_id, tool_input)
 
-            # For stagehand_navigate tool, include browser view links if available
-            if tool_name == "stagehand_navigate" and not is_error:
-                live_view_data = metadata.get("liveViewData", {})
-                if live_view_data:
-                    logger.info(
-                        f"Found live view data for stagehand_navigate: {live_view_data}"
+                remaining = set(tasks)
+                while remaining:
+                    done, remaining = await asyncio.wait(
+                        remaining, return_when=asyncio.FIRST_COMPLETED
                     )
-                    status_update["browser_view"] = live_view_data
+                    for task in sorted(done, key=lambda t: tasks[t][0]):
+                        index, tool_name, tool_id = tasks[task]
+                        status_update, tool_results_for_llm[index] = self._build_result(
+                            caller_mode, tool_name, tool_id, *task.result()
+                        )
+                        yield status_update
+            finally:
+                # The consumer stopped early (e.g. the turn was interrupted)
+                for task in tasks:
+                    if not task.done():
+                        task.cancel()
+
+        tool_results_for_llm = [r for r in tool_results_for_llm if r]
+        logger.info(
+            f"Finished executing tools with {len(tool_results_for_llm)} results."
+        )
+        yield {"type": "final_tool_results", "results": tool_results_for_llm}
+
+    def _status_update(
+        self, tool_id: str, tool_name: str, status: str, content: Any
+    ) -> Dict[str, Any]:
+        return {
+            "type": "tool_call_status",
+            "tool_id": tool_id,
+            "tool_name": tool_name,
+            "status": status,
+            "content": content,
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat() + "Z",
+        }
+
+    def _running_update(
+        self, tool_name: str, tool_id: str, tool_input: Any
+    ) -> Dict[str, Any]:
+        return self._status_update(
+            tool_id, tool_name, "running", f"Input: {json.dumps(tool_input)}"
+        )
+
+    def _build_result(
+        self,
+        caller_mode: Literal["Claude", "OpenAI", "Prompt"],
+        tool_name: str,
+        tool_id: str,
+        run_result: tuple[bool, str, Dict[str, Any], List[Dict[str, Any]]],
+        cache_hit: bool = False,
+    ) -> tuple[Dict[str, Any], Dict[str, Any] | None]:
+        """Turn the result of `run_single_tool` into a status update and an LLM result.
 
-            yield status_update
+        Returns:
+            tuple: (status_update, formatted_result)
+        """
+        is_error, text_content, metadata, content_items = run_result
+
+        # Determine content for status update and LLM result format
+        status_content = text_content  # Default to text content
+        llm_formatted_content = text_content  # Default to text content for LLM
+
+        if content_items:
+            image_items = [
+                item for item in content_items if item.get("type") == "image"
+            ]
+            if image_items:
+                num_images = len(image_items)
+                status_content = (
+                    f"{text_content}\n[Tool returned {num_images} image(s)]".strip()
+                )
+
+                if caller_mode == "Claude":
+                    # Format for Claude: list of blocks
+                    claude_blocks = []
+                    if text_content:
+                        claude_blocks.append({"type": "text", "text": text_content})
+                    for item in content_items:
+                        if (
+                            item.get("type") == "image"
+                            and "data" in item
+                            and "mimeType" in item
+                        ):
+                            claude_blocks.append(
+                                {
+                                    "type": "image",
+                                    "source": {
+                                        "type": "base64",
+                                        "media_type": item["mimeType"],
+                                        "data": item["data"],
+                                    },
+                                }
+                            )
+                        # Add other non-text types here
+                    llm_formatted_content = (
+                        claude_blocks if claude_blocks else ""
+                    )  # Use blocks or empty string
+                elif caller_mode in ["OpenAI", "Prompt"]:
+                    llm_formatted_content = status_content
+
+        # Use descriptive content or error message
+        status_update = self._status_update(
+            tool_id,
+            tool_name,
+            "error" if is_error else "completed",
+            status_content if not is_error else f"Error: {text_content}",
+        )
+
+        # For stagehand_navigate tool, include browser view links if available
+        if tool_name == "stagehand_navigate" and not is_error:
+            live_view_data = metadata.get("liveViewData", {})
+            if live_view_data:
+                logger.info(
+                    f"Found live view data for stagehand_navigate: {live_view_data}"
+                )
+                status_update["browser_view"] = live_view_data
+
+        # Let the frontend show that the result was reused
+        if cache_hit:
+            status_update["cache_hit"] = True
+
+        formatted_result = self.format_tool_result(
+            caller_mode, tool_id, llm_formatted_content, is_error
+        )
+        return status_update, formatted_result
+
+    def _get_tool_options(self, tool_name: str) -> tuple[str | None, MCPToolOptions]:
+        """Get the server name and execution options of a tool."""
+        tool_info = self._tool_manager.get_tool(tool_name)
+        server_name = tool_info.related_server if tool_info else None
+        server = (
+            self._mcp_client.server_registery.get_server(server_name)
+            if server_name
+            else None
+        )
+        if server is None:
+            return server_name, MCPToolOptions(timeout=DEFAULT_TOOL_TIMEOUT)
+        return server_name, server.get_tool_options(tool_name)
+
+    async def _run_with_limits(
+        self,
+        tool_name: str,
+        tool_id: str,
+        tool_input: Any,
+        turn_limit: asyncio.Semaphore,
+    ) -> tuple[tuple[bool, str, Dict[str, Any], List[Dict[str, Any]]], bool]:
+        """Run a tool within its limits, or reuse its cached result.
 
-            # Format result for LLM and add to list
-            formatted_result = self.format_tool_result(
-                caller_mode, tool_id, llm_formatted_content, is_error
+        Returns:
+            tuple: (result of `run_single_tool`, cache_hit)
+        """
+        server_name, options = self._get_tool_options(tool_name)
+        result_cache = self._mcp_client.session_pool.result_cache
+
+        if options.cache_ttl and server_name:
+            key = result_cache.make_key(server_name, tool_name, tool_input)
+            run_result, cache_hit = await result_cache.get_or_call(
+                key,
+                options.cache_ttl,
+                lambda: self._run_limited(
+                    tool_name, tool_id, tool_input, turn_limit, server_name, options
+                ),
+                # Errors and timeouts are not reused
+                cacheable=lambda result: not result[0],
             )
-            if formatted_result:
-                tool_results_for_llm.append(formatted_result)
+            if cache_hit:
+                logger.info(f"Tool '{tool_name}' (ID: {tool_id}) served from cache.")
+            return run_result, cache_hit
 
-        logger.info(
-            f"Finished executing tools with {len(tool_results_for_llm)} results."
+        run_result = await self._run_limited(
+            tool_name, tool_id, tool_input, turn_limit, server_name, options
         )
-        yield {"type": "final_tool_results", "results": tool_results_for_llm}
+        return run_result, False
+
+    async def _run_limited(
+        self,
+        tool_name: str,
+        tool_id: str,
+        tool_input: Any,
+        turn_limit: asyncio.Semaphore,
+        server_name: str | None,
+        options: MCPToolOptions,
+    ) -> tuple[bool, str, Dict[str, Any], List[Dict[str, Any]]]:
+        """Run a tool within the turn, server and tool limits and its timeout."""
+        # Server and tool limits come from the session pool shared by all clients
+        pool = self._mcp_client.session_pool
+        async with AsyncExitStack() as stack:
+            await stack.enter_async_context(turn_limit)
+            if not options.reentrant:
+                await stack.enter_async_context(pool.tool_lock(server_name, tool_name))
+            if server_name:
+                await stack.enter_async_context(
+                    pool.call_limit(server_name, self._max_concurrency)
+                )
+
+            try:
+                return await asyncio.wait_for(
+                    self.run_single_tool(tool_name, tool_id, tool_input),
+                    timeout=options.timeout,
+                )
+            except asyncio.TimeoutError:
+                logger.error(
+                    f"Tool '{tool_name}' (ID: {tool_id}) timed out after {options.timeout}s."
+                )
+                text_content = (
+                    f"Tool '{tool_name}' timed out after {options.timeout} seconds."
+                )
+                return True, text_content, {}, [{"type": "error", "text": text_content}]
 
     async def run_single_tool(
         self, tool_name: str, tool_id: str, tool_input: Any
@@ -12,6 +12,7 @@ class ToolManager:
         formatted_tools_openai: List[Dict[str, Any]] = None,
         formatted_tools_claude: List[Dict[str, Any]] = None,
         initial_tools_dict: Dict[str, FormattedTool] = None,
+        mcp_prompt: str = "",
     ) -> None:
         """Initialize the Tool Manager with pre-formatted tool lists."""
         # Store the raw tool data (optional, for get_tool)
@@ -24,11 +25,29 @@ class ToolManager:
         self._formatted_tools_claude: List[Dict[str, Any]] = (
             formatted_tools_claude or []
         )
+        # Tool description used in prompt mode
+        self.mcp_prompt: str = mcp_prompt
 
         logger.info(
             f"ToolManager initialized with {len(self._formatted_tools_openai)} OpenAI tools and {len(self._formatted_tools_claude)} Claude tools."
         )
 
+    def update_tools(
+        self,
+        formatted_tools_openai: List[Dict[str, Any]],
+        formatted_tools_claude: List[Dict[str, Any]],
+        tools_dict: Dict[str, FormattedTool],
+        mcp_prompt: str,
+    ) -> None:
+        """Replace the tools in place, e.g. after the tool schemas changed."""
+        self.tools = tools_dict
+        self._formatted_tools_openai = formatted_tools_openai
+        self._formatted_tools_claude = formatted_tools_claude
+        self.mcp_prompt = mcp_prompt
+        logger.info(
+            f"ToolManager updated with {len(formatted_tools_openai)} OpenAI tools and {len(formatted_tools_claude)} Claude tools."
+        )
+
     def get_tool(self, tool_name: str) -> FormattedTool | None:
         """Get a tool's raw information by its name."""
         tool = self.tools.get(tool_name)
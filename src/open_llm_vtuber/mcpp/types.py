@@ -3,6 +3,21 @@ from datetime import timedelta
 from typing import Optional, Any
 
 
+@dataclass
+class MCPToolOptions:
+    """Execution options of a tool, from the "tools" section of a server in mcp_servers.json
+
+    Args:
+        timeout (Optional[float], optional): Seconds a call may take before it is reported as failed. Defaults to the server's tool_timeout.
+        reentrant (bool, optional): Whether calls of this tool may overlap. Non-reentrant tools run one call at a time. Defaults to True.
+        cache_ttl (Optional[float], optional): Seconds a successful result is reused for identical arguments. Only for idempotent tools. Defaults to None (no caching).
+    """
+
+    timeout: Optional[float] = None
+    reentrant: bool = True
+    cache_ttl: Optional[float] = None
+
+
 @dataclass
 class MCPServer:
     """Class representing a MCP Server
@@ -14,6 +29,9 @@ class MCPServer:
         env (Optional[dict[str, str]], optional): Environment variables for the command. Defaults to None.
         cwd (Optional[str], optional): Working directory for the command. Defaults to None.
         timeout (Optional[timedelta], optional): Timeout for the command. Defaults to 10 seconds.
+        max_concurrency (int, optional): Maximum number of tool calls running on this server at once. Defaults to 4.
+        tool_timeout (float, optional): Default timeout in seconds of a tool call. Defaults to 60 seconds.
+        tool_options (dict[str, MCPToolOptions], optional): Execution options per tool name. Defaults to an empty dict.
     """
 
     name: str
@@ -23,6 +41,20 @@ class MCPServer:
     cwd: str | None = None
     timeout: Optional[timedelta] = timedelta(seconds=30)
     description: str = "No description available."
+    max_concurrency: int = 4
+    tool_timeout: float = 60.0
+    tool_options: dict[str, MCPToolOptions] = field(default_factory=dict)
+
+    def get_tool_options(self, tool_name: str) -> MCPToolOptions:
+        """Get the execution options of a tool, falling back to the server defaults."""
+        options = self.tool_options.get(tool_name, MCPToolOptions())
+        if options.timeout is None:
+            options = MCPToolOptions(
+                timeout=self.tool_timeout,
+                reentrant=options.reentrant,
+                cache_ttl=options.cache_ttl,
+            )
+        return options
 
 
 @dataclass
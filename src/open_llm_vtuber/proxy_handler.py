@@ -122,7 +122,13 @@ class ProxyHandler:
                 message = await websocket.receive_json()
 
                 # Process text-input messages through the queue
-                if message.get("type") == "text-input":
+                if message.get("type") == "audio-transport":
+                    # The server connection is shared by all proxy clients, which
+                    # may not all read binary frames: keep the JSON format
+                    await websocket.send_json(
+                        {"type": "audio-transport-ack", "binary": False, "codec": None}
+                    )
+                elif message.get("type") == "text-input":
                     # Queue the message with the sender's ID
                     self.message_queue.queue_message(message, client_id)
                 # Handle interrupt signals
@@ -228,8 +234,8 @@ class ProxyHandler:
                                 logger.info("Received conversation end signal")
                                 self.message_queue.conversation_active = False
 
-                            # Broadcast the message to all clients
-                            await self.broadcast_to_clients(data)
+                            # Broadcast the message to all clients, as received
+                            await self.broadcast_to_clients(data, raw=msg.data)
                         except json.JSONDecodeError as e:
                             logger.error(f"Failed to parse message data: {e}")
                             continue
@@ -249,7 +255,10 @@ class ProxyHandler:
             logger.info("Server message forwarding ended")
 
     async def broadcast_to_clients(
-        self, message: dict, exclude_client: Optional[str] = None
+        self,
+        message: dict,
+        exclude_client: Optional[str] = None,
+        raw: Optional[str] = None,
     ):
         """
         Broadcast a message to all connected clients.
@@ -257,9 +266,12 @@ class ProxyHandler:
         Args:
             message: The message to broadcast
             exclude_client: Optional client ID to exclude from broadcast
+            raw: The message as received from the server, sent without
+                serializing it again for each client
         """
         if not message:  # Add null check
             return
+        text = raw if raw is not None else json.dumps(message)
 
         disconnected_clients = []
 
@@ -276,7 +288,9 @@ class ProxyHandler:
         if "volumes" in log_msg and len(log_msg.get("volumes", [])) > 10:
             log_msg["volumes"] = f"[{len(message.get('volumes', []))} volume values]"
 
-        logger.debug(f"Broadcasting to clients (excluding {exclude_client}): {log_msg}")
+        logger.debug(
+            "Broadcasting to clients (excluding {}): {}", exclude_client, log_msg
+        )
 
         for client_id, websocket in self.clients.items():
             # Skip the excluded client
@@ -284,7 +298,7 @@ class ProxyHandler:
                 continue
 
             try:
-                await websocket.send_json(message)
+                await websocket.send_text(text)
             except Exception as e:
                 logger.error(f"Error sending to client {client_id}: {e}")
                 disconnected_clients.append(client_id)
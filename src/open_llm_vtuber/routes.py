@@ -1,4 +1,6 @@
 import json
+import time
+from typing import Optional
 from uuid import uuid4
 import numpy as np
 from datetime import datetime
@@ -10,6 +12,8 @@ from .service_context import ServiceContext
 from .websocket_handler import WebSocketHandler
 from .proxy_handler import ProxyHandler
 from .live2d_models import get_merged_model_list
+from .tracing import turn_tracer
+from .asr.asr_scheduler import ASRDeadlineExceeded
 
 
 def init_client_ws_route(default_context_cache: ServiceContext) -> APIRouter:
@@ -105,10 +109,22 @@ def init_webtool_routes(default_context_cache: ServiceContext) -> APIRouter:
             }
         )
 
+    @router.get("/metrics")
+    async def get_metrics():
+        """Expose per-turn latency histograms in Prometheus text format."""
+        return Response(
+            content=turn_tracer.render_prometheus(),
+            media_type="text/plain; version=0.0.4; charset=utf-8",
+        )
+
     @router.post("/asr")
-    async def transcribe_audio(file: UploadFile = File(...)):
+    async def transcribe_audio(
+        file: UploadFile = File(...), timeout: Optional[float] = None
+    ):
         """
-        Endpoint for transcribing audio using the ASR engine
+        Endpoint for transcribing audio using the ASR engine.
+        The request shares the ASR queue with the clients; with `timeout`, it
+        fails with 503 if it could not start within that many seconds.
         """
         logger.info(f"Received audio file for transcription: {file.filename}")
 
@@ -142,12 +158,22 @@ def init_webtool_routes(default_context_cache: ServiceContext) -> APIRouter:
             if len(audio_array) == 0:
                 raise ValueError("Empty audio data")
 
+            kwargs = {}
+            if timeout:
+                kwargs["deadline"] = time.monotonic() + timeout
             text = await default_context_cache.asr_engine.async_transcribe_np(
-                audio_array
+                audio_array, **kwargs
             )
             logger.info(f"Transcription result: {text}")
             return {"text": text}
 
+        except ASRDeadlineExceeded as e:
+            logger.warning(f"Transcription not started in time: {e}")
+            return Response(
+                content=json.dumps({"error": "ASR queue is full, try again later"}),
+                status_code=503,
+                media_type="application/json",
+            )
         except ValueError as e:
             logger.error(f"Audio format error: {e}")
             return Response(
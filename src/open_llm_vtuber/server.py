@@ -17,6 +17,8 @@ from starlette.staticfiles import StaticFiles as StarletteStaticFiles
 from .routes import init_client_ws_route, init_webtool_routes, init_proxy_route
 from .service_context import ServiceContext
 from .config_manager.utils import Config
+from .tracing import turn_tracer
+from .tts.http_client import aclose_clients as aclose_tts_clients
 
 
 # Create a custom StaticFiles class that adds CORS headers
@@ -88,6 +90,9 @@ class WebSocketServer:
             allow_headers=["*"],
         )
 
+        turn_tracer.configure(config.system_config.tracing_config)
+        self.app.add_event_handler("shutdown", self._close_shared_resources)
+
         # Include routes, passing the context instance
         # The context will be populated during the initialize step
         self.app.include_router(
@@ -154,17 +159,26 @@ class WebSocketServer:
         Calling this function is needed if default_context_cache was not provided to the constructor."""
         await self.default_context_cache.load_from_config(self.config)
 
+    async def _close_shared_resources(self):
+        """Stop the MCP server processes shared by all sessions and close the
+        pooled TTS HTTP connections."""
+        if self.default_context_cache.mcp_session_pool:
+            await self.default_context_cache.mcp_session_pool.aclose()
+        await aclose_tts_clients()
+
     @staticmethod
     def clean_cache():
         """Clean the cache directory by removing and recreating it.
-        Skips rag_chroma (RAG vector store) to avoid PermissionError from open DB."""
+        Skips rag_chroma (RAG vector store) to avoid PermissionError from open DB,
+        and mcp_tools / tts_audio (tool schema and TTS audio caches) that are meant
+        to outlive the process."""
         cache_dir = "cache"
         if not os.path.exists(cache_dir):
             return
         try:
             for item in os.listdir(cache_dir):
                 path = os.path.join(cache_dir, item)
-                if item == "rag_chroma":
+                if item in ("rag_chroma", "mcp_tools", "tts_audio"):
                     continue
                 if os.path.isfile(path):
                     try:
@@ -1,7 +1,9 @@
 import os
 import json
+import asyncio
+import time
 from pathlib import Path
-from typing import Callable
+from typing import Callable, Dict
 from loguru import logger
 from fastapi import WebSocket
 
@@ -14,17 +16,25 @@ from .agent.agents.agent_interface import AgentInterface
 from .translate.translate_interface import TranslateInterface
 
 from .mcpp.server_registry import ServerRegistry
+from .mcpp.schema_cache import ToolSchemaCache
+from .mcpp.session_pool import MCPSessionPool
 from .mcpp.tool_manager import ToolManager
 from .mcpp.mcp_client import MCPClient
 from .mcpp.tool_executor import ToolExecutor
 from .mcpp.tool_adapter import ToolAdapter
 
 from .asr.asr_factory import ASRFactory
+from .asr.asr_scheduler import ASRScheduler, default_asr_concurrency
 from .rag import ChromaRAG, DialogueMemory
 from .tts.tts_factory import TTSFactory
+from .tts.cached_tts import CachedTTS
+from .tts.tts_scheduler import TTSScheduler, default_tts_concurrency
 from .vad.vad_factory import VADFactory
 from .agent.agent_factory import AgentFactory
 from .translate.translate_factory import TranslateFactory
+from .tracing import turn_tracer
+from .utils.audio_transport import AudioTransport
+from .utils.lazy_engine import LazyEngine
 
 from .config_manager import (
     Config,
@@ -54,13 +64,21 @@ class ServiceContext:
         self.live2d_model: Live2dModel = None
         self.asr_engine: ASRInterface = None
         self.tts_engine: TTSInterface = None
+        # Limits concurrent syntheses on tts_engine; shared with the engine
+        self.tts_scheduler: TTSScheduler | None = None
         self.agent_engine: AgentInterface = None
         # translate_engine can be none if translation is disabled
         self.vad_engine: VADInterface | None = None
+        # This client's detection state on the shared vad_engine
+        self.vad_session: VADInterface | None = None
         self.translate_engine: TranslateInterface | None = None
+        # False while translate_engine is shared by reference (load_cache)
+        self._owns_translate_engine = False
 
         self.mcp_server_registery: ServerRegistry | None = None
         self.tool_adapter: ToolAdapter | None = None
+        # Process-wide MCP server sessions, shared by reference like the registry
+        self.mcp_session_pool: MCPSessionPool | None = None
         self.tool_manager: ToolManager | None = None
         self.mcp_client: MCPClient | None = None
         self.tool_executor: ToolExecutor | None = None
@@ -73,11 +91,14 @@ class ServiceContext:
 
         # Store the generated MCP prompt string (if MCP enabled)
         self.mcp_prompt: str = ""
+        self.mcp_enabled_servers: list[str] = []
 
         self.history_uid: str = ""  # Add history_uid field
 
         self.send_text: Callable = None
         self.client_uid: str = None
+        # How audio is sent to this client, negotiated with "audio-transport"
+        self.audio_transport: AudioTransport = AudioTransport()
 
     def __str__(self):
         return (
@@ -105,8 +126,10 @@ class ServiceContext:
             f"Initializing MCP components: use_mcpp={use_mcpp}, enabled_servers={enabled_servers}"
         )
 
-        # Reset MCP components first
-        self.mcp_server_registery = None
+        # Reset session-specific MCP components first
+        if self.tool_adapter:
+            self.tool_adapter.remove_tools_listener(self._on_mcp_tools_changed)
+        self.mcp_enabled_servers = list(enabled_servers or [])
         self.tool_manager = None
         self.mcp_client = None
         self.tool_executor = None
@@ -115,7 +138,8 @@ class ServiceContext:
 
         if use_mcpp and enabled_servers:
             # 1. Initialize ServerRegistry
-            self.mcp_server_registery = ServerRegistry()
+            if not self.mcp_server_registery:
+                self.mcp_server_registery = ServerRegistry()
             logger.info("ServerRegistry initialized or referenced.")
 
             # 2. Use ToolAdapter to get the MCP prompt and tools
@@ -131,7 +155,8 @@ class ServiceContext:
                     mcp_prompt_string,
                     openai_tools,
                     claude_tools,
-                ) = await self.tool_adapter.get_tools(enabled_servers)
+                    raw_tools_dict,
+                ) = await self.tool_adapter.build_tools(enabled_servers)
                 # Store the generated prompt string
                 self.mcp_prompt = mcp_prompt_string
                 logger.info(
@@ -142,16 +167,15 @@ class ServiceContext:
                 )
 
                 # 3. Initialize ToolManager with the fetched formatted tools
-
-                _, raw_tools_dict = await self.tool_adapter.get_server_and_tool_info(
-                    enabled_servers
-                )
                 self.tool_manager = ToolManager(
                     formatted_tools_openai=openai_tools,
                     formatted_tools_claude=claude_tools,
                     initial_tools_dict=raw_tools_dict,
+                    mcp_prompt=mcp_prompt_string,
                 )
                 logger.info("ToolManager initialized with dynamically fetched tools.")
+                # Tools may come from the schema cache: follow its revalidation
+                self.tool_adapter.add_tools_listener(self._on_mcp_tools_changed)
 
             except Exception as e:
                 logger.error(
@@ -164,7 +188,10 @@ class ServiceContext:
             # 4. Initialize MCPClient
             if self.mcp_server_registery:
                 self.mcp_client = MCPClient(
-                    self.mcp_server_registery, self.send_text, self.client_uid
+                    self.mcp_server_registery,
+                    self.send_text,
+                    self.client_uid,
+                    session_pool=self.mcp_session_pool,
                 )
                 logger.info("MCPClient initialized for this session.")
             else:
@@ -194,15 +221,36 @@ class ServiceContext:
                 "MCP components not initialized (use_mcpp is False or no enabled servers)."
             )
 
+    async def _on_mcp_tools_changed(self, server_names: set[str]) -> None:
+        """Hot-swap the tools of this session after a server's tools changed."""
+        if not self.tool_manager or not server_names & set(self.mcp_enabled_servers):
+            return
+        (
+            mcp_prompt_string,
+            openai_tools,
+            claude_tools,
+            raw_tools_dict,
+        ) = await self.tool_adapter.build_tools(self.mcp_enabled_servers)
+        self.tool_manager.update_tools(
+            openai_tools, claude_tools, raw_tools_dict, mcp_prompt_string
+        )
+        self.mcp_prompt = mcp_prompt_string
+
     async def close(self):
         """Clean up resources, especially the MCPClient."""
         logger.info("Closing ServiceContext resources...")
+        if self.tool_adapter:
+            self.tool_adapter.remove_tools_listener(self._on_mcp_tools_changed)
         if self.mcp_client:
             logger.info(f"Closing MCPClient for context instance {id(self)}...")
             await self.mcp_client.aclose()
             self.mcp_client = None
         if self.agent_engine and hasattr(self.agent_engine, "close"):
             await self.agent_engine.close()  # Ensure agent resources are also closed
+        if self._owns_translate_engine:
+            await self._close_translator(self.translate_engine)
+            self.translate_engine = None
+            self._owns_translate_engine = False
         logger.info("ServiceContext closed.")
 
     async def load_cache(
@@ -218,10 +266,12 @@ class ServiceContext:
         translate_engine: TranslateInterface | None,
         mcp_server_registery: ServerRegistry | None = None,
         tool_adapter: ToolAdapter | None = None,
+        mcp_session_pool: MCPSessionPool | None = None,
         send_text: Callable = None,
         client_uid: str = None,
         rag_engine: ChromaRAG | None = None,
         dialogue_memory: DialogueMemory | None = None,
+        tts_scheduler: TTSScheduler | None = None,
     ) -> None:
         """
         Load the ServiceContext with the reference of the provided instances.
@@ -238,12 +288,16 @@ class ServiceContext:
         self.live2d_model = live2d_model
         self.asr_engine = asr_engine
         self.tts_engine = tts_engine
+        self.tts_scheduler = tts_scheduler
         self.vad_engine = vad_engine
+        self.vad_session = vad_engine.create_session() if vad_engine else None
         self.agent_engine = agent_engine
         self.translate_engine = translate_engine
+        self._owns_translate_engine = False
         # Load potentially shared components by reference
         self.mcp_server_registery = mcp_server_registery
         self.tool_adapter = tool_adapter
+        self.mcp_session_pool = mcp_session_pool
         self.send_text = send_text
         self.client_uid = client_uid
         if rag_engine is not None:
@@ -264,32 +318,92 @@ class ServiceContext:
         Load the ServiceContext with the config.
         Reinitialize the instances if the config is different.
 
+        Independent engines are built concurrently in worker threads; the
+        startup time of each one is logged.
+
         Parameters:
         - config (Dict): The configuration dictionary.
         """
         if not self.config:
             self.config = config
 
-        if not self.system_config:
-            self.system_config = config.system_config
+        # Before the engines: they read it (e.g. system_config.lazy_engines)
+        self.system_config = config.system_config or self.system_config
 
         if not self.character_config:
             self.character_config = config.character_config
 
         # update all sub-configs
+        old_translator = self.translate_engine if self._owns_translate_engine else None
+        timings: Dict[str, float] = {}
+        start = time.perf_counter()
+
+        # init live2d from character config; the agent's system prompt needs it
+        await self._timed_init(
+            "live2d",
+            timings,
+            self.init_live2d,
+            config.character_config.live2d_model_name,
+        )
 
-        # init live2d from character config
-        self.init_live2d(config.character_config.live2d_model_name)
-
-        # init asr from character config
-        self.init_asr(config.character_config.asr_config)
+        results = await asyncio.gather(
+            self._timed_init(
+                "asr", timings, self.init_asr, config.character_config.asr_config
+            ),
+            self._timed_init(
+                "tts", timings, self.init_tts, config.character_config.tts_config
+            ),
+            self._timed_init(
+                "vad", timings, self.init_vad, config.character_config.vad_config
+            ),
+            self._timed_init(
+                "translate",
+                timings,
+                self.init_translate,
+                config.character_config.tts_preprocessor_config.translator_config,
+            ),
+            self._timed_init(
+                "rag",
+                timings,
+                self.init_rag,
+                config.system_config.rag_config if config.system_config else None,
+            ),
+            self._timed_init("agent", timings, self._init_agent_stack, config),
+            # Wait for every engine before raising, so none is still being
+            # built in the background
+            return_exceptions=True,
+        )
+        logger.info(
+            f"Engines initialized in {time.perf_counter() - start:.2f}s ("
+            + ", ".join(f"{name}: {seconds:.2f}s" for name, seconds in timings.items())
+            + ")"
+        )
+        if old_translator is not None and self.translate_engine is not old_translator:
+            await self._close_translator(old_translator)
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
 
-        # init tts from character config
-        self.init_tts(config.character_config.tts_config)
+        # store typed config references
+        self.config = config
+        self.character_config = config.character_config
 
-        # init vad from character config
-        self.init_vad(config.character_config.vad_config)
+    @staticmethod
+    async def _timed_init(
+        name: str, timings: Dict[str, float], init: Callable, *args
+    ) -> None:
+        """Run an init method (in a worker thread unless it is a coroutine) and time it."""
+        start = time.perf_counter()
+        try:
+            if asyncio.iscoroutinefunction(init):
+                await init(*args)
+            else:
+                await asyncio.to_thread(init, *args)
+        finally:
+            timings[name] = time.perf_counter() - start
 
+    async def _init_agent_stack(self, config: Config) -> None:
+        """Initialize the shared MCP components, then the agent that uses them."""
         # Initialize shared ToolAdapter if it doesn't exist yet
         if (
             not self.tool_adapter
@@ -300,8 +414,15 @@ class ServiceContext:
                     "Initializing shared ServerRegistry within load_from_config."
                 )
                 self.mcp_server_registery = ServerRegistry()
+            if not self.mcp_session_pool:
+                logger.info("Initializing shared MCP session pool.")
+                self.mcp_session_pool = MCPSessionPool(self.mcp_server_registery)
             logger.info("Initializing shared ToolAdapter within load_from_config.")
-            self.tool_adapter = ToolAdapter(server_registery=self.mcp_server_registery)
+            self.tool_adapter = ToolAdapter(
+                server_registery=self.mcp_server_registery,
+                session_pool=self.mcp_session_pool,
+                schema_cache=ToolSchemaCache(),
+            )
 
         # Initialize MCP Components before initializing Agent
         await self._init_mcp_components(
@@ -315,17 +436,6 @@ class ServiceContext:
             config.character_config.persona_prompt,
         )
 
-        self.init_translate(
-            config.character_config.tts_preprocessor_config.translator_config
-        )
-
-        self.init_rag(config.system_config.rag_config if config.system_config else None)
-
-        # store typed config references
-        self.config = config
-        self.system_config = config.system_config or self.system_config
-        self.character_config = config.character_config
-
     def init_live2d(self, live2d_model_name: str) -> None:
         logger.info(f"Initializing Live2D: {live2d_model_name}")
         try:
@@ -338,21 +448,62 @@ class ServiceContext:
     def init_asr(self, asr_config: ASRConfig) -> None:
         if not self.asr_engine or (self.character_config.asr_config != asr_config):
             logger.info(f"Initializing ASR: {asr_config.asr_model}")
-            self.asr_engine = ASRFactory.get_asr_system(
-                asr_config.asr_model,
-                **getattr(asr_config, asr_config.asr_model).model_dump(),
-            )
+            if self._is_lazy("asr"):
+                self.asr_engine = LazyEngine(
+                    f"ASR {asr_config.asr_model}",
+                    lambda: self._build_asr(asr_config),
+                    ASRInterface,
+                )
+            else:
+                self.asr_engine = self._build_asr(asr_config)
             # saving config should be done after successful initialization
             self.character_config.asr_config = asr_config
         else:
             logger.info("ASR already initialized with the same config.")
 
+    def _build_asr(self, asr_config: ASRConfig) -> ASRScheduler:
+        """The ASR engine behind the transcription queue shared by all clients."""
+        params = getattr(asr_config, asr_config.asr_model).model_dump()
+        scheduler = ASRScheduler(
+            ASRFactory.get_asr_system(asr_config.asr_model, **params),
+            asr_config.asr_model,
+            max_concurrency=asr_config.max_concurrency
+            or default_asr_concurrency(asr_config.asr_model),
+            max_batch_size=asr_config.max_batch_size,
+            max_batch_delay=asr_config.max_batch_delay_ms / 1000,
+            timeout=asr_config.request_timeout,
+        )
+        turn_tracer.add_collector("asr_scheduler", scheduler.render_prometheus)
+        return scheduler
+
     def init_tts(self, tts_config: TTSConfig) -> None:
         if not self.tts_engine or (self.character_config.tts_config != tts_config):
             logger.info(f"Initializing TTS: {tts_config.tts_model}")
+            engine_params = getattr(
+                tts_config, tts_config.tts_model.lower()
+            ).model_dump()
             self.tts_engine = TTSFactory.get_tts_engine(
+                tts_config.tts_model, **engine_params
+            )
+            cache_config = tts_config.tts_cache
+            if cache_config and cache_config.enabled:
+                self.tts_engine = CachedTTS(
+                    self.tts_engine,
+                    engine_type=tts_config.tts_model,
+                    engine_params=engine_params,
+                    cache_dir=cache_config.cache_dir,
+                    max_size_mb=cache_config.max_size_mb,
+                )
+                turn_tracer.add_collector(
+                    "tts_cache", self.tts_engine.render_prometheus
+                )
+            self.tts_scheduler = TTSScheduler(
                 tts_config.tts_model,
-                **getattr(tts_config, tts_config.tts_model.lower()).model_dump(),
+                tts_config.max_concurrency
+                or default_tts_concurrency(tts_config.tts_model),
+            )
+            turn_tracer.add_collector(
+                "tts_scheduler", self.tts_scheduler.render_prometheus
             )
             # saving config should be done after successful initialization
             self.character_config.tts_config = tts_config
@@ -363,6 +514,7 @@ class ServiceContext:
         if vad_config.vad_model is None:
             logger.info("VAD is disabled.")
             self.vad_engine = None
+            self.vad_session = None
             return
 
         if not self.vad_engine or (self.character_config.vad_config != vad_config):
@@ -371,10 +523,13 @@ class ServiceContext:
                 vad_config.vad_model,
                 **getattr(vad_config, vad_config.vad_model.lower()).model_dump(),
             )
+            self.vad_session = None
             # saving config should be done after successful initialization
             self.character_config.vad_config = vad_config
         else:
             logger.info("VAD already initialized with the same config.")
+        if self.vad_session is None:
+            self.vad_session = self.vad_engine.create_session()
 
     async def init_agent(self, agent_config: AgentConfig, persona_prompt: str) -> None:
         """Initialize or update the LLM engine based on agent configuration."""
@@ -434,12 +589,19 @@ class ServiceContext:
             logger.info(
                 f"Initializing Translator: {translator_config.translate_provider}"
             )
-            self.translate_engine = TranslateFactory.get_translator(
-                translator_config.translate_provider,
-                getattr(
-                    translator_config, translator_config.translate_provider
-                ).model_dump(),
-            )
+            provider = translator_config.translate_provider
+            params = getattr(translator_config, provider).model_dump()
+            if self._is_lazy("translate"):
+                self.translate_engine = LazyEngine(
+                    f"Translator {provider}",
+                    lambda: TranslateFactory.get_translator(provider, params),
+                    TranslateInterface,
+                )
+            else:
+                self.translate_engine = TranslateFactory.get_translator(
+                    provider, params
+                )
+            self._owns_translate_engine = True
             self.character_config.tts_preprocessor_config.translator_config = (
                 translator_config
             )
@@ -488,6 +650,22 @@ class ServiceContext:
 
     # ==== utils
 
+    @staticmethod
+    async def _close_translator(translator: TranslateInterface | None) -> None:
+        """Close the HTTP connections of a translator this context built."""
+        if translator is None:
+            return
+        if isinstance(translator, LazyEngine) and not translator.loaded:
+            return
+        try:
+            await translator.aclose()
+        except Exception as e:
+            logger.warning(f"Failed to close the translator: {e}")
+
+    def _is_lazy(self, engine: str) -> bool:
+        """Whether the engine is built on first use (system_config.lazy_engines)."""
+        return bool(self.system_config and engine in self.system_config.lazy_engines)
+
     async def construct_system_prompt(self, persona_prompt: str) -> str:
         """
         Append tool prompts to persona prompt.
@@ -0,0 +1,374 @@
+"""
+Per-turn latency tracing.
+
+A conversation turn is traced from the moment the user input arrives until the
+frontend reports that playback is complete. Stages of the turn (ASR, retrieval,
+LLM first token, per-sentence TTS, playback round-trip...) are recorded as
+spans on a `TurnTrace`, which carries a `turn_id` used as correlation id in logs
+and in the optional JSONL trace file.
+
+The active trace is kept in a context variable, so tasks spawned during a turn
+(e.g. the TTS tasks of `TTSTaskManager`) record their spans on the right trace
+without passing it around. Code that runs outside of a turn can still use
+`trace_span`: the duration is then only added to the process-wide histograms.
+
+Stages that lead to a turn but end before it starts (end of utterance
+detection) are recorded with `record_before_turn` and added to the next turn
+of the client, at a negative offset.
+
+Work abandoned when a turn is interrupted (TTS syntheses, translations, LLM
+streams) is counted with `count_cancelled`.
+
+Histograms are exposed in the Prometheus text format by `render_prometheus`,
+which backs the `/metrics` route.
+"""
+
+import json
+import os
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from loguru import logger
+
+from .config_manager.tracing import TracingConfig
+
+# Upper bounds in seconds, chosen around the latencies of a voice turn
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.0,
+    4.0,
+    8.0,
+    16.0,
+    32.0,
+)
+
+# Spans recorded before a turn are dropped when no turn follows within this time
+PENDING_SPAN_SECONDS = 30.0
+
+_current_trace: ContextVar[Optional["TurnTrace"]] = ContextVar(
+    "current_turn_trace", default=None
+)
+
+
+class Histogram:
+    """Cumulative histogram with a single label, rendered in Prometheus format."""
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        label: str,
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.help_text = help_text
+        self.label = label
+        self.buckets = buckets
+        # label value -> (bucket counts, sum, count)
+        self._series: Dict[str, Tuple[List[int], float, int]] = {}
+
+    def observe(self, label_value: str, value: float) -> None:
+        counts, total, count = self._series.get(
+            label_value, ([0] * len(self.buckets), 0.0, 0)
+        )
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[i] += 1
+        self._series[label_value] = (counts, total + value, count + 1)
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.help_text}",
+            f"# TYPE {self.name} histogram",
+        ]
+        for label_value, (counts, total, count) in sorted(self._series.items()):
+            label = f'{self.label}="{_escape_label(label_value)}"'
+            for bound, bucket_count in zip(self.buckets, counts):
+                lines.append(
+                    f'{self.name}_bucket{{{label},le="{bound:g}"}} {bucket_count}'
+                )
+            lines.append(f'{self.name}_bucket{{{label},le="+Inf"}} {count}')
+            lines.append(f"{self.name}_sum{{{label}}} {total:.6f}")
+            lines.append(f"{self.name}_count{{{label}}} {count}")
+        return lines
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+@dataclass
+class Span:
+    """A timed stage of a turn. Offsets are in seconds since the turn started."""
+
+    name: str
+    start: float
+    duration: float
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {
+            "name": self.name,
+            "start": round(self.start, 6),
+            "duration": round(self.duration, 6),
+        }
+        if self.attributes:
+            data["attributes"] = self.attributes
+        return data
+
+
+class TurnTrace:
+    """Spans and milestones recorded during one conversation turn of a client."""
+
+    def __init__(self, client_uid: str, kind: str = "single"):
+        self.turn_id = uuid.uuid4().hex
+        self.client_uid = client_uid
+        self.kind = kind
+        self.started_at = time.time()
+        self.spans: List[Span] = []
+        # milestone name -> seconds since the turn started (first occurrence)
+        self.milestones: Dict[str, float] = {}
+        self.outcome: Optional[str] = None
+        self.duration: Optional[float] = None
+        self._t0 = time.perf_counter()
+        self._token: Optional[Token] = None
+
+    def elapsed(self) -> float:
+        """Seconds since the turn started."""
+        return time.perf_counter() - self._t0
+
+    def add_span(self, span: Span) -> None:
+        self.spans.append(span)
+
+    def mark(self, milestone: str) -> Optional[float]:
+        """Record a milestone once. Returns its offset, or None if already set."""
+        if milestone in self.milestones:
+            return None
+        offset = self.elapsed()
+        self.milestones[milestone] = offset
+        return offset
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "turn_id": self.turn_id,
+            "client_uid": self.client_uid,
+            "kind": self.kind,
+            "started_at": self.started_at,
+            "duration": round(
+                self.duration if self.duration is not None else self.elapsed(), 6
+            ),
+            "outcome": self.outcome,
+            "milestones": {k: round(v, 6) for k, v in self.milestones.items()},
+            "spans": [span.to_dict() for span in self.spans],
+        }
+
+
+class TurnTracer:
+    """Process-wide registry of turn traces and latency histograms."""
+
+    def __init__(self):
+        self.enabled = True
+        self.trace_file: Optional[str] = None
+        self.stage_seconds = Histogram(
+            "vtuber_stage_duration_seconds",
+            "Duration of a conversation turn stage.",
+            "stage",
+        )
+        self.milestone_seconds = Histogram(
+            "vtuber_turn_milestone_seconds",
+            "Time from the start of a turn until a milestone is reached.",
+            "milestone",
+        )
+        self.turn_seconds = Histogram(
+            "vtuber_turn_duration_seconds",
+            "Total duration of a conversation turn.",
+            "kind",
+            buckets=DEFAULT_BUCKETS + (64.0, 128.0),
+        )
+        self.turns_total: Dict[Tuple[str, str], int] = {}
+        self.turns_in_progress = 0
+        # Work abandoned by interrupted turns, by kind
+        self.cancelled_work: Dict[str, int] = {}
+        # Other components' metrics (e.g. the TTS cache), by name
+        self._collectors: Dict[str, Callable[[], List[str]]] = {}
+        # client uid -> span name -> (perf_counter() end, duration, attributes)
+        # of stages that precede the client's next turn
+        self._pending: Dict[str, Dict[str, Tuple[float, float, Dict[str, Any]]]] = {}
+
+    def configure(self, config: Optional[TracingConfig]) -> None:
+        """Apply the `tracing_config` section of the system config."""
+        config = config or TracingConfig()
+        self.enabled = config.enabled
+        self.trace_file = config.trace_file
+        if self.enabled:
+            logger.info(
+                "Turn tracing enabled"
+                + (f", writing traces to {self.trace_file}" if self.trace_file else "")
+            )
+
+    def start_turn(self, client_uid: str, kind: str = "single") -> Optional[TurnTrace]:
+        """Start a trace and make it the current trace of the calling task."""
+        if not self.enabled:
+            return None
+        trace = TurnTrace(client_uid=client_uid, kind=kind)
+        trace._token = _current_trace.set(trace)
+        self.turns_in_progress += 1
+        for name, (end, duration, attributes) in self._pending.pop(
+            client_uid, {}
+        ).items():
+            if trace._t0 - end > PENDING_SPAN_SECONDS:
+                continue
+            # Before the turn: the offset is negative
+            trace.add_span(Span(name, end - duration - trace._t0, duration, attributes))
+            self.stage_seconds.observe(name, duration)
+        logger.debug(f"Turn {trace.turn_id} started for client {client_uid}")
+        return trace
+
+    def end_turn(self, trace: Optional[TurnTrace], outcome: str = "completed") -> None:
+        """Finish a trace, update the turn metrics and write it to the trace file."""
+        if trace is None or trace.outcome is not None:
+            return
+        trace.outcome = outcome
+        if trace._token is not None:
+            try:
+                _current_trace.reset(trace._token)
+            except ValueError:
+                # Ended from another context; the owning task is finishing anyway
+                pass
+            trace._token = None
+
+        duration = trace.duration = trace.elapsed()
+        self.turns_in_progress = max(self.turns_in_progress - 1, 0)
+        key = (trace.kind, outcome)
+        self.turns_total[key] = self.turns_total.get(key, 0) + 1
+        if outcome == "completed":
+            self.turn_seconds.observe(trace.kind, duration)
+
+        milestones = ", ".join(f"{k}={v:.3f}s" for k, v in trace.milestones.items())
+        logger.info(
+            f"Turn {trace.turn_id} ({trace.client_uid}) {outcome} in {duration:.3f}s"
+            + (f": {milestones}" if milestones else "")
+        )
+
+        if self.trace_file:
+            self._write_trace(trace)
+
+    def _write_trace(self, trace: TurnTrace) -> None:
+        try:
+            directory = os.path.dirname(self.trace_file)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.trace_file, "a", encoding="utf-8") as f:
+                f.write(json.dumps(trace.to_dict(), ensure_ascii=False) + "\n")
+        except OSError as e:
+            logger.warning(f"Failed to write turn trace to {self.trace_file}: {e}")
+
+    def record_span(
+        self, name: str, start: float, duration: float, **attributes: Any
+    ) -> None:
+        """Record a finished span on the current trace and in the histograms."""
+        if not self.enabled:
+            return
+        self.stage_seconds.observe(name, duration)
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.add_span(Span(name, start, duration, attributes))
+
+    def record_before_turn(
+        self, client_uid: str, name: str, duration: float, **attributes: Any
+    ) -> None:
+        """
+        Record a span that just ended and leads to the next turn of a client
+        (e.g. the end of utterance detection); it is added to that turn when
+        it starts. A later span of the same name replaces it.
+        """
+        if not self.enabled:
+            return
+        self._pending.setdefault(client_uid, {})[name] = (
+            time.perf_counter(),
+            duration,
+            attributes,
+        )
+
+    def discard_pending(self, client_uid: str) -> None:
+        """Drop the spans waiting for the next turn of a client."""
+        self._pending.pop(client_uid, None)
+
+    def mark(self, milestone: str) -> None:
+        """Record a milestone of the current turn, once per turn."""
+        trace = _current_trace.get()
+        if not self.enabled or trace is None:
+            return
+        offset = trace.mark(milestone)
+        if offset is not None:
+            self.milestone_seconds.observe(milestone, offset)
+
+    def count_cancelled(self, work: str, count: int = 1) -> None:
+        """Count work abandoned because a turn was interrupted."""
+        if count > 0:
+            self.cancelled_work[work] = self.cancelled_work.get(work, 0) + count
+
+    def add_collector(self, name: str, collector: Callable[[], List[str]]) -> None:
+        """Add lines in Prometheus format to /metrics. Replaces a collector of the same name."""
+        self._collectors[name] = collector
+
+    def render_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines = [
+            "# HELP vtuber_turns_total Conversation turns finished, by outcome.",
+            "# TYPE vtuber_turns_total counter",
+        ]
+        for (kind, outcome), count in sorted(self.turns_total.items()):
+            lines.append(
+                f'vtuber_turns_total{{kind="{kind}",outcome="{outcome}"}} {count}'
+            )
+        lines += [
+            "# HELP vtuber_turns_in_progress Conversation turns currently running.",
+            "# TYPE vtuber_turns_in_progress gauge",
+            f"vtuber_turns_in_progress {self.turns_in_progress}",
+            "# HELP vtuber_interrupted_work_total Work abandoned because a turn was interrupted.",
+            "# TYPE vtuber_interrupted_work_total counter",
+        ]
+        for work, count in sorted(self.cancelled_work.items()):
+            lines.append(f'vtuber_interrupted_work_total{{work="{work}"}} {count}')
+        lines += self.turn_seconds.render()
+        lines += self.milestone_seconds.render()
+        lines += self.stage_seconds.render()
+        for collector in self._collectors.values():
+            lines += collector()
+        return "\n".join(lines) + "\n"
+
+
+def current_trace() -> Optional[TurnTrace]:
+    """Return the trace of the turn the calling task belongs to, if any."""
+    return _current_trace.get()
+
+
+@contextmanager
+def trace_span(name: str, **attributes: Any) -> Iterator[None]:
+    """Time the enclosed block as a stage of the current turn."""
+    trace = _current_trace.get()
+    start = trace.elapsed() if trace else 0.0
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        turn_tracer.record_span(name, start, time.perf_counter() - t0, **attributes)
+
+
+def trace_mark(milestone: str) -> None:
+    """Record a milestone of the current turn (e.g. the first audio frame sent)."""
+    turn_tracer.mark(milestone)
+
+
+# Create global tracer instance
+turn_tracer = TurnTracer()
@@ -0,0 +1,167 @@
+import asyncio
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from loguru import logger
+
+from ..tracing import turn_tracer
+from .translate_interface import TranslateInterface
+
+
+class CachedTranslator(TranslateInterface):
+    """
+    Translation stage in front of a provider: LRU cache, request coalescing and
+    batching.
+
+    Sentences are translated inside their TTS task, so the translation of the
+    next sentence runs while the previous one is being synthesized. Requests
+    that arrive within `batch_window` seconds are sent together when the
+    provider accepts a list of texts (DeepLX v2). Identical texts in flight
+    share one request. A translation all its callers stopped waiting for
+    (interrupted turn) is dropped if it was not sent yet, or aborted if it
+    was sent alone.
+
+    Args:
+        translator (TranslateInterface): The provider doing the translation.
+        cache_size (int): Number of translated sentences kept in memory.
+        max_batch_size (int): Maximum number of texts sent in one request.
+        batch_window (float): Seconds to wait for more texts before sending.
+    """
+
+    def __init__(
+        self,
+        translator: TranslateInterface,
+        cache_size: int = 512,
+        max_batch_size: int = 8,
+        batch_window: float = 0.02,
+    ):
+        self.translator = translator
+        self.supports_batch = translator.supports_batch
+        self.cache_size = cache_size
+        self.max_batch_size = max_batch_size
+        self.batch_window = batch_window
+        self._cache: OrderedDict[str, str] = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._pending: List[str] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        # Requests of a single text, by text
+        self._requests: Dict[str, asyncio.Task] = {}
+        # Callers waiting for each text in flight
+        self._waiters: Dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.dropped = 0
+
+    def _cache_get(self, text: str) -> Optional[str]:
+        translation = self._cache.get(text)
+        if translation is not None:
+            self._cache.move_to_end(text)
+            self.hits += 1
+        return translation
+
+    def _cache_put(self, text: str, translation: str) -> None:
+        self._cache[text] = translation
+        self._cache.move_to_end(text)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def translate(self, text: str) -> str:
+        translation = self._cache_get(text)
+        if translation is None:
+            self.misses += 1
+            translation = self.translator.translate(text)
+            self._cache_put(text, translation)
+        return translation
+
+    async def async_translate(self, text: str) -> str:
+        translation = self._cache_get(text)
+        if translation is not None:
+            return translation
+
+        future = self._inflight.get(text)
+        if future is None:
+            self.misses += 1
+            future = asyncio.get_running_loop().create_future()
+            # Mark errors as retrieved when every caller was interrupted
+            future.add_done_callback(lambda f: f.cancelled() or f.exception())
+            self._inflight[text] = future
+            if self.supports_batch:
+                self._pending.append(text)
+                if self._flush_task is None or self._flush_task.done():
+                    self._flush_task = asyncio.create_task(self._flush_pending())
+            else:
+                task = asyncio.create_task(self._translate_batch([text]))
+                self._requests[text] = task
+                task.add_done_callback(lambda t: self._request_done(text, t))
+
+        self._waiters[text] = self._waiters.get(text, 0) + 1
+        try:
+            # Shielded: an interrupted caller must not cancel a request others share
+            return await asyncio.shield(future)
+        finally:
+            self._waiters[text] -= 1
+            if not self._waiters[text]:
+                del self._waiters[text]
+                if not future.done():
+                    self._drop(text, future)
+
+    def _request_done(self, text: str, task: asyncio.Task) -> None:
+        if self._requests.get(text) is task:
+            del self._requests[text]
+
+    def _drop(self, text: str, future: asyncio.Future) -> None:
+        """Nobody waits for the translation of `text` anymore."""
+        if text in self._pending:
+            self._pending.remove(text)
+        elif text in self._requests:
+            self._requests.pop(text).cancel()
+        else:
+            # Sent in a batch: its translation is still cached
+            return
+        self._inflight.pop(text, None)
+        future.cancel()
+        self.dropped += 1
+        turn_tracer.count_cancelled("translation")
+
+    async def async_translate_batch(self, texts: List[str]) -> List[str]:
+        return list(await asyncio.gather(*(self.async_translate(t) for t in texts)))
+
+    async def aclose(self) -> None:
+        """Abort the requests still running and close the provider."""
+        tasks = [*self._requests.values()]
+        if self._flush_task is not None:
+            tasks.append(self._flush_task)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for future in self._inflight.values():
+            future.cancel()
+        self._inflight.clear()
+        self._pending.clear()
+        await self.translator.aclose()
+
+    async def _flush_pending(self) -> None:
+        """Send the pending texts in batches until none are left."""
+        while self._pending:
+            await asyncio.sleep(self.batch_window)
+            batch = self._pending[: self.max_batch_size]
+            del self._pending[: self.max_batch_size]
+            await self._translate_batch(batch)
+
+    async def _translate_batch(self, texts: List[str]) -> None:
+        try:
+            translations = await self.translator.async_translate_batch(texts)
+            if len(texts) > 1:
+                logger.debug(f"Translated {len(texts)} sentences in one request")
+        except Exception as e:
+            for text in texts:
+                future = self._inflight.pop(text, None)
+                if future and not future.done():
+                    future.set_exception(e)
+            return
+
+        for text, translation in zip(texts, translations):
+            self._cache_put(text, translation)
+            future = self._inflight.pop(text, None)
+            if future and not future.done():
+                future.set_result(translation)
@@ -1,8 +1,14 @@
 import json
+from typing import List
+
 import httpx
 from loguru import logger
 from .translate_interface import TranslateInterface
 
+# Connection pool shared by the requests of one translator
+POOL_LIMITS = httpx.Limits(max_connections=4, max_keepalive_connections=4)
+REQUEST_TIMEOUT = httpx.Timeout(10.0, connect=3.0)
+
 
 class DeepLXTranslate(TranslateInterface):
     api_endpoint: str = "http://127.0.0.1:1188/v2/translate"
@@ -11,18 +17,62 @@ class DeepLXTranslate(TranslateInterface):
     def __init__(self, api_endpoint: str, target_lang: str):
         self.api_endpoint = api_endpoint
         self.target_lang = target_lang
+        # The v2 endpoint takes a list of texts and returns one translation each
+        self.supports_batch = "/v2/" in api_endpoint
+        self._client = httpx.Client(limits=POOL_LIMITS, timeout=REQUEST_TIMEOUT)
+        self._async_client: httpx.AsyncClient | None = None
+
+    def _payload(self, texts: List[str]) -> str:
+        return json.dumps({"text": texts, "target_lang": self.target_lang})
 
     # translate v2 endpoint from DeepLX
     def translate(self, text: str) -> str:
+        req = None
         try:
-            data = {"text": [text], "target_lang": self.target_lang}
-            post_data = json.dumps(data)
-            req = httpx.post(url=self.api_endpoint, data=post_data).text
-            res = json.loads(req)["translations"]
+            req = self._client.post(url=self.api_endpoint, data=self._payload([text]))
+            res = req.json()["translations"]
             res = " ".join([d["text"] for d in res])
         except Exception as e:
             logger.critical(f"Error translating text '{text}'. Error message: {e}")
-            logger.critical(f"Response: {req}")
+            logger.critical(f"Response: {req.text if req is not None else None}")
             raise e
 
         return res
+
+    async def async_translate(self, text: str) -> str:
+        return " ".join(await self._async_post([text]))
+
+    async def async_translate_batch(self, texts: List[str]) -> List[str]:
+        if not self.supports_batch:
+            return await super().async_translate_batch(texts)
+
+        translations = await self._async_post(texts)
+        if len(translations) != len(texts):
+            logger.warning(
+                f"DeepLX returned {len(translations)} translations for "
+                f"{len(texts)} texts, translating them one by one"
+            )
+            return await super().async_translate_batch(texts)
+        return translations
+
+    async def _async_post(self, texts: List[str]) -> List[str]:
+        if self._async_client is None:
+            self._async_client = httpx.AsyncClient(
+                limits=POOL_LIMITS, timeout=REQUEST_TIMEOUT
+            )
+        req = None
+        try:
+            req = await self._async_client.post(
+                url=self.api_endpoint, data=self._payload(texts)
+            )
+            return [d["text"] for d in req.json()["translations"]]
+        except Exception as e:
+            logger.critical(f"Error translating texts {texts}. Error message: {e}")
+            logger.critical(f"Response: {req.text if req is not None else None}")
+            raise e
+
+    async def aclose(self) -> None:
+        self._client.close()
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
@@ -9,6 +9,10 @@ from loguru import logger
 
 from .translate_interface import TranslateInterface
 
+# Connection pool shared by the requests of one translator
+POOL_LIMITS = httpx.Limits(max_connections=4, max_keepalive_connections=4)
+REQUEST_TIMEOUT = httpx.Timeout(10.0, connect=3.0)
+
 
 def sign(key, msg):
     """Generate HMAC-SHA256 signature"""
@@ -36,6 +40,8 @@ class TencentTranslate(TranslateInterface):
         self.algorithm = "TC3-HMAC-SHA256"
         self.source_lang = source_lang
         self.target_lang = target_lang
+        self._client = httpx.Client(limits=POOL_LIMITS, timeout=REQUEST_TIMEOUT)
+        self._async_client: httpx.AsyncClient | None = None
 
     def create_signature(self, date, service):
         """Create signature"""
@@ -93,8 +99,8 @@ class TencentTranslate(TranslateInterface):
 
         return headers
 
-    def translate(self, text: str) -> str:
-        """Translate text"""
+    def _prepare_request(self, text: str) -> tuple[dict, str]:
+        """Build the signed headers and payload of a translation request"""
         timestamp = int(time.time())
         date = datetime.fromtimestamp(timestamp, timezone.utc).strftime("%Y-%m-%d")
 
@@ -107,10 +113,14 @@ class TencentTranslate(TranslateInterface):
             }
         )
 
-        headers = self._prepare_headers(payload, timestamp, date)
+        return self._prepare_headers(payload, timestamp, date), payload
+
+    def translate(self, text: str) -> str:
+        """Translate text"""
+        headers, payload = self._prepare_request(text)
 
         try:
-            response = httpx.post(
+            response = self._client.post(
                 url="https://" + self.host, headers=headers, data=payload
             )
             res = response.json()
@@ -119,3 +129,28 @@ class TencentTranslate(TranslateInterface):
         except Exception as e:
             logger.critical(f"API call error: {e}")
             raise e
+
+    async def async_translate(self, text: str) -> str:
+        """Translate text without blocking the event loop"""
+        headers, payload = self._prepare_request(text)
+        if self._async_client is None:
+            self._async_client = httpx.AsyncClient(
+                limits=POOL_LIMITS, timeout=REQUEST_TIMEOUT
+            )
+
+        try:
+            response = await self._async_client.post(
+                url="https://" + self.host, headers=headers, data=payload
+            )
+            res = response.json()
+            logger.info(f"Request successful: {res}")
+            return res.get("Response", {}).get("TargetText", "Translation failed")
+        except Exception as e:
+            logger.critical(f"API call error: {e}")
+            raise e
+
+    async def aclose(self) -> None:
+        self._client.close()
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
@@ -1,3 +1,4 @@
+from .cached_translator import CachedTranslator
 from .deeplx import DeepLXTranslate
 from .tencent import TencentTranslate
 from .translate_interface import TranslateInterface
@@ -8,14 +9,15 @@ class TranslateFactory:
     def get_translator(
         translate_provider: str, translate_provider_config: dict
     ) -> TranslateInterface:
+        """Create the translator, wrapped in a caching and batching stage"""
         translate_provider = translate_provider.lower()
         if translate_provider == "deeplx":
-            return DeepLXTranslate(
+            translator = DeepLXTranslate(
                 api_endpoint=translate_provider_config.get("deeplx_api_endpoint"),
                 target_lang=translate_provider_config.get("deeplx_target_lang"),
             )
         elif translate_provider == "tencent":
-            return TencentTranslate(
+            translator = TencentTranslate(
                 secret_id=translate_provider_config.get("secret_id"),
                 secret_key=translate_provider_config.get("secret_key"),
                 region=translate_provider_config.get("region"),
@@ -24,3 +26,4 @@ class TranslateFactory:
             )
         else:
             raise ValueError(f"Unsupported translate provider: {translate_provider}")
+        return CachedTranslator(translator)
@@ -1,9 +1,39 @@
 import abc
+import asyncio
+from typing import List
 
 
 class TranslateInterface(metaclass=abc.ABCMeta):
+    # Whether async_translate_batch sends several texts in a single request
+    supports_batch: bool = False
+
     @abc.abstractmethod
     def translate(self, text: str) -> str:
         """
         Translate the input text to the target language."""
         raise NotImplementedError
+
+    async def async_translate(self, text: str) -> str:
+        """
+        Asynchronously translate the input text to the target language.
+
+        By default, this runs the synchronous translate in a thread.
+        Subclasses can override this method to provide true async implementation.
+        """
+        return await asyncio.to_thread(self.translate, text)
+
+    async def async_translate_batch(self, texts: List[str]) -> List[str]:
+        """
+        Translate several texts, returning the translations in the same order.
+
+        By default, the texts are translated concurrently one request each.
+        Providers that accept a list of texts override this and set
+        `supports_batch`.
+        """
+        return list(await asyncio.gather(*(self.async_translate(t) for t in texts)))
+
+    async def aclose(self) -> None:
+        """
+        Release the connections of the translator once it is not used anymore.
+        Providers with an HTTP client override this.
+        """
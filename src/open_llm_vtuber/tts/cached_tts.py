@@ -0,0 +1,333 @@
+import asyncio
+import hashlib
+import json
+import os
+import time
+import unicodedata
+import wave
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional
+
+import numpy as np
+from loguru import logger
+
+from .tts_interface import PCMAudio, PCMChunk, TTSInterface
+
+DEFAULT_CACHE_DIR = os.path.join("cache", "tts_audio")
+DEFAULT_MAX_SIZE_MB = 512
+# Entries used more recently than this are not evicted: the TTS task that got
+# the path may not have read the file yet
+EVICTION_GRACE_SECONDS = 60.0
+
+
+def normalize_tts_text(text: str) -> str:
+    """Text as used in the cache key: NFKC normalized, whitespace collapsed."""
+    return " ".join(unicodedata.normalize("NFKC", text).split())
+
+
+def _read_wav(path: str) -> PCMAudio:
+    with wave.open(path, "rb") as wav:
+        frames = wav.readframes(wav.getnframes())
+        return PCMAudio(np.frombuffer(frames, dtype="<i2"), wav.getframerate())
+
+
+def _write_wav(path: str, audio: PCMAudio) -> None:
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(audio.sample_rate)
+        wav.writeframes(np.asarray(audio.samples, dtype="<i2").tobytes())
+
+
+class CachedTTS(TTSInterface):
+    """
+    Content-addressed audio cache in front of a TTS engine.
+
+    The audio of a sentence is stored under the hash of the engine type, the
+    engine parameters (voice, speed, seed...) and the normalized text, so
+    greetings, fillers and repeated replies are synthesized once. The cache
+    directory is kept within a byte budget by evicting the least recently
+    used files. Cached files are never deleted by `remove_file`, which the
+    TTS task manager calls after sending the audio.
+
+    Streaming and in-memory (PCM) synthesis keep the capabilities of the
+    engine: their audio is cached as 16-bit WAV under a separate key, and a
+    hit is streamed as a single chunk.
+
+    Args:
+        tts_engine (TTSInterface): The engine doing the synthesis.
+        engine_type (str): Name of the engine, part of the cache key.
+        engine_params (dict): Engine configuration, part of the cache key.
+        cache_dir (str): Directory of the cached audio files.
+        max_size_mb (float): Disk budget of the cache in megabytes.
+    """
+
+    def __init__(
+        self,
+        tts_engine: TTSInterface,
+        engine_type: str,
+        engine_params: Optional[Dict[str, Any]] = None,
+        cache_dir: str = DEFAULT_CACHE_DIR,
+        max_size_mb: float = DEFAULT_MAX_SIZE_MB,
+    ):
+        self.tts_engine = tts_engine
+        self.engine_type = engine_type
+        self.cache_dir = os.path.abspath(cache_dir)
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        self._engine_key = hashlib.sha256(
+            json.dumps(
+                [engine_type, engine_params or {}], sort_keys=True, default=str
+            ).encode("utf-8")
+        ).hexdigest()
+        # key -> (path, size, last use on the monotonic clock), in LRU order
+        self._entries: OrderedDict[str, List[Any]] = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._load_index()
+
+    def __getattr__(self, name: str) -> Any:
+        # Engine specific attributes (e.g. sample rate) stay reachable
+        if name == "tts_engine":
+            raise AttributeError(name)
+        return getattr(self.tts_engine, name)
+
+    # Defined by TTSInterface, so __getattr__ would not forward them
+    @property
+    def supports_streaming(self) -> bool:
+        return self.tts_engine.supports_streaming
+
+    @property
+    def supports_pcm(self) -> bool:
+        return self.tts_engine.supports_pcm
+
+    def _load_index(self) -> None:
+        """Index the files already on disk, oldest access first."""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        files = []
+        for file_name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, file_name)
+            key, _, ext = file_name.partition(".")
+            if not ext or ext.endswith("tmp") or not os.path.isfile(path):
+                continue
+            stat = os.stat(path)
+            files.append((stat.st_atime, key, path, stat.st_size))
+        for _, key, path, size in sorted(files):
+            self._entries[key] = [path, size, 0.0]
+            self.total_bytes += size
+        if files:
+            logger.info(
+                f"TTS cache: {len(files)} files, {self.total_bytes / 1024 / 1024:.1f} MB in {self.cache_dir}"
+            )
+        self._evict()
+
+    def cache_key(self, text: str, pcm: bool = False) -> str:
+        kind = "pcm\n" if pcm else ""
+        return hashlib.sha256(
+            f"{self._engine_key}\n{kind}{normalize_tts_text(text)}".encode("utf-8")
+        ).hexdigest()
+
+    def generate_audio(self, text: str, file_name_no_ext=None) -> str:
+        key = self.cache_key(text)
+        cached_path = self._lookup(key)
+        if cached_path:
+            return cached_path
+        self.misses += 1
+        return self._store(key, self.tts_engine.generate_audio(text, file_name_no_ext))
+
+    async def async_generate_audio(self, text: str, file_name_no_ext=None) -> str:
+        key = self.cache_key(text)
+        cached_path = self._lookup(key)
+        if cached_path:
+            return cached_path
+
+        future = self._inflight.get(key)
+        if future is not None:
+            # The same sentence is being synthesized for another client
+            self.hits += 1
+            return await asyncio.shield(future)
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[key] = future
+        try:
+            audio_path = await self.tts_engine.async_generate_audio(
+                text, file_name_no_ext
+            )
+            audio_path = self._store(key, audio_path)
+            future.set_result(audio_path)
+            return audio_path
+        except BaseException as e:
+            if not future.done():
+                future.set_exception(
+                    e if isinstance(e, Exception) else RuntimeError("TTS cancelled")
+                )
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    async def async_generate_pcm(self, text: str) -> PCMAudio:
+        key = self.cache_key(text, pcm=True)
+        audio = await self._lookup_pcm(key)
+        if audio is not None:
+            return audio
+        self.misses += 1
+        audio = await self.tts_engine.async_generate_pcm(text)
+        await self._store_pcm(key, audio)
+        return audio
+
+    async def async_stream_audio(self, text: str) -> AsyncIterator[PCMChunk]:
+        key = self.cache_key(text, pcm=True)
+        audio = await self._lookup_pcm(key)
+        if audio is not None:
+            yield PCMChunk(audio.samples.tobytes(), audio.sample_rate)
+            return
+        self.misses += 1
+        chunks = []
+        sample_rate = 0
+        async for chunk in self.tts_engine.async_stream_audio(text):
+            chunks.append(chunk.pcm)
+            sample_rate = chunk.sample_rate
+            yield chunk
+        # Only reached when the whole stream was read
+        pcm = b"".join(chunks)
+        await self._store_pcm(
+            key,
+            PCMAudio(np.frombuffer(pcm[: len(pcm) // 2 * 2], dtype="<i2"), sample_rate),
+        )
+
+    async def _lookup_pcm(self, key: str) -> Optional[PCMAudio]:
+        cached_path = self._lookup(key)
+        if not cached_path:
+            return None
+        try:
+            return await asyncio.to_thread(_read_wav, cached_path)
+        except (OSError, EOFError, wave.Error) as e:
+            logger.warning(f"TTS cache: unreadable {cached_path}, dropping it: {e}")
+            self.hits -= 1
+            if key in self._entries:
+                self._drop(key)
+            return None
+
+    async def _store_pcm(self, key: str, audio: PCMAudio) -> None:
+        if not audio.sample_rate or not len(audio.samples):
+            return
+        cached_path = os.path.join(self.cache_dir, f"{key}.wav")
+        tmp_path = f"{cached_path}.tmp"
+        try:
+            await asyncio.to_thread(_write_wav, tmp_path, audio)
+            os.replace(tmp_path, cached_path)
+        except (OSError, wave.Error) as e:
+            logger.warning(f"TTS cache: failed to store {cached_path}: {e}")
+            return
+        self._add_entry(key, cached_path)
+
+    def _lookup(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if not os.path.exists(entry[0]):
+            self._drop(key)
+            return None
+        entry[2] = time.monotonic()
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def _store(self, key: str, audio_path: Optional[str]) -> Optional[str]:
+        """Move the generated file into the cache and return its new path."""
+        if not audio_path or not os.path.exists(audio_path):
+            return audio_path
+        _, ext = os.path.splitext(audio_path)
+        cached_path = os.path.join(self.cache_dir, f"{key}{ext or '.wav'}")
+        try:
+            os.replace(audio_path, cached_path)
+        except OSError as e:
+            logger.warning(f"TTS cache: failed to store {audio_path}: {e}")
+            return audio_path
+        self._add_entry(key, cached_path)
+        return cached_path
+
+    def _add_entry(self, key: str, cached_path: str) -> None:
+        if key in self._entries:
+            self.total_bytes -= self._entries[key][1]
+        size = os.path.getsize(cached_path)
+        self._entries[key] = [cached_path, size, time.monotonic()]
+        self._entries.move_to_end(key)
+        self.total_bytes += size
+        self._evict()
+
+    def _drop(self, key: str) -> None:
+        path, size, _ = self._entries.pop(key)
+        self.total_bytes -= size
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"TTS cache: failed to remove {path}: {e}")
+
+    def _evict(self) -> None:
+        """Remove least recently used files until the cache fits its budget."""
+        if self.total_bytes <= self.max_size_bytes:
+            return
+        now = time.monotonic()
+        for key, (_, _, last_used) in list(self._entries.items()):
+            if self.total_bytes <= self.max_size_bytes:
+                break
+            if last_used and now - last_used < EVICTION_GRACE_SECONDS:
+                # Everything after this entry was used even more recently
+                break
+            self._drop(key)
+            self.evictions += 1
+
+    def remove_file(self, filepath: str, verbose: bool = True) -> None:
+        """Keep cached files; remove anything else (e.g. a file that failed to store)."""
+        if filepath and os.path.abspath(filepath).startswith(self.cache_dir + os.sep):
+            return
+        self.tts_engine.remove_file(filepath, verbose)
+
+    async def prewarm(self, phrases: Iterable[str]) -> int:
+        """Synthesize phrases ahead of time. Returns the number of new files."""
+        created = 0
+        for phrase in phrases:
+            phrase = phrase.strip()
+            if not phrase:
+                continue
+            if self._lookup(self.cache_key(phrase)):
+                continue
+            try:
+                await self.async_generate_audio(phrase)
+                created += 1
+            except Exception as e:
+                logger.error(f"TTS cache: failed to pre-warm '{phrase}': {e}")
+        return created
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "engine": self.engine_type,
+            "entries": len(self._entries),
+            "bytes": self.total_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def render_prometheus(self) -> List[str]:
+        """Cache metrics in the Prometheus text format, for /metrics."""
+        label = f'engine="{self.engine_type}"'
+        return [
+            "# HELP vtuber_tts_cache_requests_total TTS cache lookups, by result.",
+            "# TYPE vtuber_tts_cache_requests_total counter",
+            f'vtuber_tts_cache_requests_total{{{label},result="hit"}} {self.hits}',
+            f'vtuber_tts_cache_requests_total{{{label},result="miss"}} {self.misses}',
+            "# HELP vtuber_tts_cache_evictions_total Files evicted from the TTS cache.",
+            "# TYPE vtuber_tts_cache_evictions_total counter",
+            f"vtuber_tts_cache_evictions_total{{{label}}} {self.evictions}",
+            "# HELP vtuber_tts_cache_bytes Size of the TTS cache on disk.",
+            "# TYPE vtuber_tts_cache_bytes gauge",
+            f"vtuber_tts_cache_bytes{{{label}}} {self.total_bytes}",
+        ]
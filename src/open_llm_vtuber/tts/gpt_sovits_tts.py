@@ -3,9 +3,42 @@
 ####
 
 import re
+import struct
+from typing import Optional, Tuple
+
+import httpx
 import requests
 from loguru import logger
-from .tts_interface import TTSInterface
+from .http_client import download_to_file, get_client, stream_request
+from .tts_interface import PCMChunk, TTSInterface
+
+STREAM_READ_SIZE = 4096
+
+
+def _parse_wav_header(data: bytes) -> Optional[Tuple[int, int]]:
+    """Return (sample rate, offset of the samples) once the header is complete."""
+    if len(data) < 12 or data[:4] != b"RIFF" or data[8:12] != b"WAVE":
+        if len(data) >= 12:
+            raise ValueError("GPT-SoVITS stream does not start with a WAV header")
+        return None
+    sample_rate = None
+    offset = 12
+    while offset + 8 <= len(data):
+        chunk_id = data[offset : offset + 4]
+        (chunk_size,) = struct.unpack("<I", data[offset + 4 : offset + 8])
+        if chunk_id == b"fmt ":
+            if offset + 16 > len(data):
+                return None
+            channels, sample_rate = struct.unpack(
+                "<HI", data[offset + 10 : offset + 16]
+            )
+            if channels != 1:
+                raise ValueError(f"Expected mono audio, got {channels} channels")
+        elif chunk_id == b"data":
+            # Streamed WAV headers carry a placeholder data size
+            return (sample_rate, offset + 8) if sample_rate else None
+        offset += 8 + chunk_size
+    return None
 
 
 class TTSEngine(TTSInterface):
@@ -31,11 +64,13 @@ class TTSEngine(TTSInterface):
         self.media_type = media_type
         self.streaming_mode = streaming_mode
 
-    def generate_audio(self, text, file_name_no_ext=None):
-        file_name = self.generate_cache_file_name(file_name_no_ext, self.media_type)
+    @property
+    def supports_streaming(self) -> bool:
+        return str(self.streaming_mode).lower() in ("true", "ture", "1")
+
+    def _request_params(self, text, media_type):
         cleaned_text = re.sub(r"\[.*?\]", "", text)
-        # Prepare the data for the POST request
-        data = {
+        return {
             "text": cleaned_text,
             "text_lang": self.text_lang,
             "ref_audio_path": self.ref_audio_path,
@@ -43,10 +78,15 @@ class TTSEngine(TTSInterface):
             "prompt_text": self.prompt_text,
             "text_split_method": self.text_split_method,
             "batch_size": self.batch_size,
-            "media_type": self.media_type,
+            "media_type": media_type,
             "streaming_mode": self.streaming_mode,
         }
 
+    def generate_audio(self, text, file_name_no_ext=None):
+        file_name = self.generate_cache_file_name(file_name_no_ext, self.media_type)
+        # Prepare the data for the POST request
+        data = self._request_params(text, self.media_type)
+
         # Send POST request to the TTS API
         response = requests.get(self.api_url, params=data, timeout=120)
 
@@ -62,3 +102,42 @@ class TTSEngine(TTSInterface):
                 f"Error: Failed to generate audio. Status code: {response.status_code}"
             )
             return None
+
+    async def async_generate_audio(self, text, file_name_no_ext=None):
+        file_name = self.generate_cache_file_name(file_name_no_ext, self.media_type)
+        try:
+            await download_to_file(
+                get_client("gpt_sovits_tts"),
+                "GET",
+                self.api_url,
+                file_name,
+                params=self._request_params(text, self.media_type),
+            )
+            return file_name
+        except httpx.HTTPError as e:
+            logger.critical(f"Error: Failed to generate audio: {e}")
+            return None
+
+    async def async_stream_audio(self, text):
+        """
+        Stream the speech with `streaming_mode`: the server sends a WAV header
+        followed by the samples as they are synthesized.
+        """
+        params = self._request_params(text, "wav")
+        params["streaming_mode"] = "true"
+        async with stream_request(
+            get_client("gpt_sovits_tts"), "GET", self.api_url, params=params
+        ) as response:
+            response.raise_for_status()
+            header = b""
+            sample_rate = None
+            async for data in response.aiter_bytes(STREAM_READ_SIZE):
+                if sample_rate is None:
+                    header += data
+                    parsed = _parse_wav_header(header)
+                    if parsed is None:
+                        continue
+                    sample_rate, offset = parsed
+                    data = header[offset:]
+                if data:
+                    yield PCMChunk(data, sample_rate)
@@ -0,0 +1,124 @@
+"""
+Pooled async HTTP clients of the TTS engines calling an HTTP API.
+
+Each engine gets one `httpx.AsyncClient` for the process, so sentences reuse
+kept-alive connections instead of opening one per request, and synthesis
+does not hold a thread of the default executor while waiting for a server.
+"""
+
+import asyncio
+import os
+import random
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict
+
+import httpx
+from loguru import logger
+
+from .tts_scheduler import default_tts_concurrency
+
+# Waiting for a pooled connection is bounded by the TTS scheduler, not here
+REQUEST_TIMEOUT = httpx.Timeout(120.0, connect=5.0, pool=None)
+MAX_ATTEMPTS = 3
+RETRY_BASE_DELAY = 0.5
+# Overloaded or restarting server: worth another try
+RETRY_STATUS_CODES = {429, 502, 503, 504}
+# Failures before the server started answering; a kept-alive connection
+# closed by the server shows up as RemoteProtocolError
+RETRY_EXCEPTIONS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.RemoteProtocolError)
+STREAM_CHUNK_SIZE = 16384
+
+_clients: Dict[str, httpx.AsyncClient] = {}
+
+
+def get_client(engine: str) -> httpx.AsyncClient:
+    """
+    Shared client of an engine. Its connection limit matches the engine's
+    default synthesis concurrency (see tts_scheduler).
+    """
+    client = _clients.get(engine)
+    if client is None or client.is_closed:
+        max_connections = default_tts_concurrency(engine)
+        client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+            timeout=REQUEST_TIMEOUT,
+        )
+        _clients[engine] = client
+    return client
+
+
+async def aclose_clients() -> None:
+    """Close the clients of all engines; called on server shutdown."""
+    clients = list(_clients.values())
+    _clients.clear()
+    for client in clients:
+        await client.aclose()
+
+
+def _retry_delay(attempt: int) -> float:
+    """Exponential backoff with full jitter, so clients do not retry in step."""
+    return random.uniform(0, RETRY_BASE_DELAY * 2**attempt)
+
+
+@asynccontextmanager
+async def stream_request(
+    client: httpx.AsyncClient, method: str, url: str, **kwargs: Any
+) -> AsyncIterator[httpx.Response]:
+    """
+    Send a request and yield the response before its body is read.
+
+    Connection errors and the statuses in RETRY_STATUS_CODES are retried up
+    to MAX_ATTEMPTS times; nothing is retried once the body is being read.
+    """
+    attempt = 0
+    while True:
+        try:
+            response = await client.send(
+                client.build_request(method, url, **kwargs), stream=True
+            )
+        except RETRY_EXCEPTIONS as e:
+            if attempt + 1 >= MAX_ATTEMPTS:
+                raise
+            logger.warning(f"TTS request to {url} failed ({e!r}), retrying")
+        else:
+            if (
+                response.status_code not in RETRY_STATUS_CODES
+                or attempt + 1 >= MAX_ATTEMPTS
+            ):
+                break
+            await response.aclose()
+            logger.warning(
+                f"TTS server {url} answered {response.status_code}, retrying"
+            )
+        await asyncio.sleep(_retry_delay(attempt))
+        attempt += 1
+
+    try:
+        yield response
+    finally:
+        await response.aclose()
+
+
+async def download_to_file(
+    client: httpx.AsyncClient, method: str, url: str, file_name: str, **kwargs: Any
+) -> None:
+    """
+    Write the response body to `file_name` as it arrives.
+    Raises httpx.HTTPStatusError on an error status.
+    """
+    async with stream_request(client, method, url, **kwargs) as response:
+        if response.is_error:
+            await response.aread()
+            response.raise_for_status()
+        try:
+            with open(file_name, "wb") as audio_file:
+                async for data in response.aiter_bytes(STREAM_CHUNK_SIZE):
+                    audio_file.write(data)
+        except BaseException:
+            # Do not leave a truncated file behind
+            if os.path.exists(file_name):
+                os.remove(file_name)
+            raise
@@ -1,10 +1,18 @@
+import json
 import os
+from typing import Any, Dict, Iterator, Optional, Tuple
+
 import requests
 from loguru import logger
-from .tts_interface import TTSInterface
+from .http_client import get_client, stream_request
+from .tts_interface import PCMChunk, TTSInterface
+
+SAMPLE_RATE = 32000
 
 
 class TTSEngine(TTSInterface):
+    supports_streaming = True
+
     def __init__(
         self,
         group_id: str,
@@ -23,10 +31,10 @@ class TTSEngine(TTSInterface):
         if not os.path.exists(self.cache_dir):
             os.makedirs(self.cache_dir)
 
-    def generate_audio(self, text: str, file_name_no_ext=None) -> str:
-        import json
-
-        file_name = self.generate_cache_file_name(file_name_no_ext, self.file_extension)
+    def _request_args(
+        self, text: str, audio_format: str
+    ) -> Tuple[str, Dict[str, str], str]:
+        """Return the URL, headers and body of a streaming synthesis request."""
         url = "https://api.minimax.chat/v1/t2a_v2?GroupId=" + self.group_id
         headers = {
             "accept": "application/json, text/plain, */*",
@@ -57,33 +65,80 @@ class TTSEngine(TTSInterface):
             },
             "pronunciation_dict": pronunciation_dict,
             "audio_setting": {
-                "sample_rate": 32000,
+                "sample_rate": SAMPLE_RATE,
                 "bitrate": 128000,
-                "format": self.file_extension,
+                "format": audio_format,
                 "channel": 1,
             },
         }
+        return url, headers, json.dumps(body)
 
+    def _request(self, text: str, audio_format: str) -> requests.Response:
+        """Start a streaming synthesis request."""
+        url, headers, body = self._request_args(text, audio_format)
+        return requests.request("POST", url, stream=True, headers=headers, data=body)
+
+    @staticmethod
+    def _event_audio(line: Any) -> Optional[bytes]:
+        """Decode the audio piece of one server-sent event line, if any."""
+        if line[:5] not in (b"data:", "data:"):
+            return None
         try:
-            response = requests.request(
-                "POST", url, stream=True, headers=headers, data=json.dumps(body)
-            )
-            audio = b""
-            for chunk in response.raw:
-                if chunk:
-                    if chunk[:5] == b"data:":
-                        try:
-                            data = json.loads(chunk[5:])
-                            if "data" in data and "extra_info" not in data:
-                                if "audio" in data["data"]:
-                                    hex_audio = data["data"]["audio"]
-                                    decoded = bytes.fromhex(hex_audio)
-                                    audio += decoded
-                        except Exception as e:
-                            logger.error(f"Failed to parse audio chunk: {e}")
+            data = json.loads(line[5:])
+            # The last event repeats the whole audio along with extra_info
+            if "data" in data and "extra_info" not in data:
+                if "audio" in data["data"]:
+                    return bytes.fromhex(data["data"]["audio"])
+        except Exception as e:
+            logger.error(f"Failed to parse audio chunk: {e}")
+        return None
+
+    @classmethod
+    def _iter_audio(cls, response: requests.Response) -> Iterator[bytes]:
+        """Decode the audio pieces of the server-sent events."""
+        for line in response.iter_lines():
+            audio = cls._event_audio(line)
+            if audio:
+                yield audio
+
+    async def _aiter_audio(self, text: str, audio_format: str):
+        """Async version of `_request` and `_iter_audio`, on the pooled client."""
+        url, headers, body = self._request_args(text, audio_format)
+        async with stream_request(
+            get_client("minimax_tts"), "POST", url, headers=headers, content=body
+        ) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                audio = self._event_audio(line)
+                if audio:
+                    yield audio
+
+    def generate_audio(self, text: str, file_name_no_ext=None) -> str:
+        file_name = self.generate_cache_file_name(file_name_no_ext, self.file_extension)
+        try:
+            response = self._request(text, self.file_extension)
+            audio = b"".join(self._iter_audio(response))
             with open(file_name, "wb") as f:
                 f.write(audio)
             return file_name
         except Exception as e:
             logger.error(f"Exception in minimax_tts generate_audio: {e}")
             return None
+
+    async def async_generate_audio(self, text: str, file_name_no_ext=None) -> str:
+        file_name = self.generate_cache_file_name(file_name_no_ext, self.file_extension)
+        try:
+            with open(file_name, "wb") as f:
+                async for audio in self._aiter_audio(text, self.file_extension):
+                    f.write(audio)
+            return file_name
+        except Exception as e:
+            logger.error(f"Exception in minimax_tts async_generate_audio: {e}")
+            if os.path.exists(file_name):
+                os.remove(file_name)
+            return None
+
+    async def async_stream_audio(self, text: str):
+        """Stream the speech as raw PCM pieces as the server sends them."""
+        async for audio in self._aiter_audio(text, "pcm"):
+            yield PCMChunk(audio, SAMPLE_RATE)
@@ -6,13 +6,18 @@ from pathlib import Path
 from loguru import logger
 from openai import OpenAI  # Use the official OpenAI library
 
-from .tts_interface import TTSInterface
+from .tts_interface import PCMChunk, TTSInterface
 
 # Add the current directory to sys.path for relative imports if needed
 current_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.append(current_dir)
 
 
+# The `pcm` response format is raw 16-bit mono at 24 kHz
+PCM_SAMPLE_RATE = 24000
+PCM_READ_SIZE = 4800
+
+
 class TTSEngine(TTSInterface):
     """
     Uses an OpenAI-compatible TTS API endpoint to generate speech.
@@ -20,6 +25,8 @@ class TTSEngine(TTSInterface):
     API Reference: https://platform.openai.com/docs/api-reference/audio/createSpeech (for standard parameters)
     """
 
+    supports_streaming = True
+
     def __init__(
         self,
         model="kokoro",  # Default model based on user example
@@ -117,6 +124,29 @@ class TTSEngine(TTSInterface):
 
         return str(speech_file_path)
 
+    async def async_stream_audio(self, text, speed=1.0):
+        """
+        Stream the speech as raw PCM (`response_format="pcm"`) while the
+        server synthesizes it.
+        """
+        if not self.client:
+            raise RuntimeError("OpenAI client not initialized. Cannot stream audio.")
+
+        def produce(emit):
+            with self.client.audio.speech.with_streaming_response.create(
+                model=self.model,
+                voice=self.voice,
+                input=text,
+                response_format="pcm",
+                speed=speed,
+            ) as response:
+                for data in response.iter_bytes(PCM_READ_SIZE):
+                    if not emit(PCMChunk(data, PCM_SAMPLE_RATE)):
+                        break
+
+        async for chunk in self._stream_from_thread(produce):
+            yield chunk
+
 
 # Example usage (optional, for testing with the compatible endpoint)
 # if __name__ == '__main__':
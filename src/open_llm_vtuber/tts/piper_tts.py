@@ -1,8 +1,10 @@
+import io
 import os
 import wave
 
+import numpy as np
 from loguru import logger
-from .tts_interface import TTSInterface
+from .tts_interface import PCMAudio, TTSInterface
 
 try:
     from piper import PiperVoice
@@ -25,6 +27,8 @@ except ImportError:
 
 
 class TTSEngine(TTSInterface):
+    supports_pcm = True
+
     def __init__(
         self,
         model_path: str = "models/piper/zh_CN-huayan-medium.onnx",
@@ -115,3 +119,14 @@ class TTSEngine(TTSInterface):
         except Exception as e:
             logger.critical(f"Error: Piper TTS unable to generate audio: {e}")
             return None
+
+    def generate_pcm(self, text: str) -> PCMAudio:
+        """Generates speech in memory: the WAV is written to a buffer, not a file."""
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as wav_file:
+            self.voice.synthesize_wav(text, wav_file, syn_config=self.syn_config)
+        buffer.seek(0)
+        with wave.open(buffer, "rb") as wav_file:
+            sample_rate = wav_file.getframerate()
+            frames = wav_file.readframes(wav_file.getnframes())
+        return PCMAudio(np.frombuffer(frames, dtype="<i2"), sample_rate)
@@ -4,13 +4,15 @@ import os
 import sherpa_onnx
 import soundfile as sf
 from loguru import logger
-from .tts_interface import TTSInterface
+from .tts_interface import PCMChunk, TTSInterface, float_to_pcm16
 
 current_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.append(current_dir)
 
 
 class TTSEngine(TTSInterface):
+    supports_streaming = True
+
     def __init__(
         self,
         vits_model,
@@ -110,3 +112,21 @@ class TTSEngine(TTSInterface):
         except Exception as e:
             logger.critical(f"\nError: sherpa-onnx unable to generate audio: {e}")
             return None
+
+    async def async_stream_audio(self, text):
+        """
+        Stream the speech of each sentence as sherpa-onnx finishes it (its
+        generation callback), instead of waiting for the whole text.
+        """
+        sample_rate = self.tts.sample_rate
+
+        def produce(emit):
+            def callback(samples, progress):
+                pcm = float_to_pcm16(samples).tobytes()
+                # Returning 0 stops the generation
+                return 1 if emit(PCMChunk(pcm, sample_rate)) else 0
+
+            self.tts.generate(text, sid=self.sid, speed=self.speed, callback=callback)
+
+        async for chunk in self._stream_from_thread(produce):
+            yield chunk
@@ -6,12 +6,14 @@ import soundfile as sf
 import torch
 from loguru import logger
 
-from .tts_interface import TTSInterface
+from .tts_interface import PCMAudio, TTSInterface, float_to_pcm16
 
 
 class TTSEngine(TTSInterface):
     """Local TTS engine using Silero models (Russian v5_1)."""
 
+    supports_pcm = True
+
     def __init__(
         self,
         language: str = "ru",
@@ -64,6 +66,22 @@ class TTSEngine(TTSInterface):
         logger.info("Silero TTS model loaded successfully")
         return model
 
+    def _synthesize(self, text: str):
+        """Run the model; returns float samples in [-1, 1]."""
+        audio = self.model.apply_tts(
+            text=text,
+            speaker=self.speaker,
+            sample_rate=self.sample_rate,
+            put_accent=self.put_accent,
+            put_yo=self.put_yo,
+        )
+        # apply_tts returns a torch tensor
+        return audio.cpu().numpy() if hasattr(audio, "cpu") else audio
+
+    def generate_pcm(self, text: str) -> PCMAudio:
+        """Generate speech audio in memory using Silero TTS."""
+        return PCMAudio(float_to_pcm16(self._synthesize(text)), self.sample_rate)
+
     def generate_audio(
         self, text: str, file_name_no_ext: str | None = None
     ) -> str | None:
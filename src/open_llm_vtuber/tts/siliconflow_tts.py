@@ -1,5 +1,7 @@
+import httpx
 import requests
 from loguru import logger
+from .http_client import download_to_file, get_client
 from .tts_interface import TTSInterface
 
 
@@ -26,10 +28,8 @@ class SiliconFlowTTS(TTSInterface):
         self.speed = speed
         self.gain = gain
 
-    def generate_audio(self, text: str, file_name_no_ext=None) -> str:
-        cache_file = self.generate_cache_file_name(
-            file_name_no_ext, file_extension=self.response_format
-        )
+    def _request_args(self, text: str) -> tuple[dict, dict]:
+        """Return the JSON payload and the headers of a synthesis request."""
         payload = {
             "input": text,
             "response_format": self.response_format,
@@ -44,6 +44,13 @@ class SiliconFlowTTS(TTSInterface):
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json",
         }
+        return payload, headers
+
+    def generate_audio(self, text: str, file_name_no_ext=None) -> str:
+        cache_file = self.generate_cache_file_name(
+            file_name_no_ext, file_extension=self.response_format
+        )
+        payload, headers = self._request_args(text)
 
         try:
             if self.api_url is None:
@@ -65,6 +72,33 @@ class SiliconFlowTTS(TTSInterface):
             logger.error(f"生成音频文件失败Failed to generate the audio file.: {e}")
             return ""
 
+    async def async_generate_audio(self, text: str, file_name_no_ext=None) -> str:
+        if self.api_url is None:
+            logger.error(
+                "API URL 未正确配置，请检查配置文件。The configuration is incorrect. Please check the configuration file."
+            )
+            return ""
+        cache_file = self.generate_cache_file_name(
+            file_name_no_ext, file_extension=self.response_format
+        )
+        payload, headers = self._request_args(text)
+        try:
+            await download_to_file(
+                get_client("siliconflow_tts"),
+                "POST",
+                self.api_url,
+                cache_file,
+                json=payload,
+                headers=headers,
+            )
+            logger.info(
+                f"成功生成音频文件Successfully generated the audio file.: {cache_file}"
+            )
+            return cache_file
+        except httpx.HTTPError as e:
+            logger.error(f"生成音频文件失败Failed to generate the audio file.: {e}")
+            return ""
+
     def remove_file(self, filepath: str, verbose: bool = True) -> None:
         super().remove_file(filepath, verbose)
 
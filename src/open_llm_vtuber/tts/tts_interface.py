@@ -1,17 +1,46 @@
 import abc
 import os
 import asyncio
+import threading
+from typing import AsyncIterator, Callable, NamedTuple, Optional
 
+import numpy as np
 from loguru import logger
 
 
+class PCMChunk(NamedTuple):
+    """A piece of synthesized audio: 16-bit little-endian mono PCM."""
+
+    pcm: bytes
+    sample_rate: int
+
+
+class PCMAudio(NamedTuple):
+    """A whole synthesized clip: int16 mono samples."""
+
+    samples: np.ndarray
+    sample_rate: int
+
+
+def float_to_pcm16(samples) -> np.ndarray:
+    """Convert float samples in [-1, 1] to int16."""
+    return (np.clip(np.asarray(samples, dtype=np.float32), -1.0, 1.0) * 32767).astype(
+        np.int16
+    )
+
+
 class TTSInterface(metaclass=abc.ABCMeta):
+    # Engines able to produce audio progressively set this and implement
+    # `async_stream_audio`
+    supports_streaming: bool = False
+
     async def async_generate_audio(self, text: str, file_name_no_ext=None) -> str:
         """
         Asynchronously generate speech audio file using TTS.
 
-        By default, this runs the synchronous generate_audio in a coroutine.
-        Subclasses can override this method to provide true async implementation.
+        By default, this runs the synchronous generate_audio in a thread (see
+        `_run_in_thread`). Subclasses can override this method to provide true
+        async implementation; cancelling it should abort the request.
 
         text: str
             the text to speak
@@ -22,7 +51,9 @@ class TTSInterface(metaclass=abc.ABCMeta):
         str: the path to the generated audio file
 
         """
-        return await asyncio.to_thread(self.generate_audio, text, file_name_no_ext)
+        return await self._run_in_thread(
+            self.generate_audio, text, file_name_no_ext, discard=self.remove_file
+        )
 
     @abc.abstractmethod
     def generate_audio(self, text: str, file_name_no_ext=None) -> str:
@@ -39,6 +70,123 @@ class TTSInterface(metaclass=abc.ABCMeta):
         """
         raise NotImplementedError
 
+    @property
+    def supports_pcm(self) -> bool:
+        """Whether `async_generate_pcm` returns the audio without a file."""
+        return self.supports_streaming
+
+    def generate_pcm(self, text: str) -> PCMAudio:
+        """
+        Generate speech audio in memory, for engines with `supports_pcm`.
+        text: str
+            the text to speak
+
+        Returns:
+        PCMAudio: the samples and their sample rate
+
+        """
+        raise NotImplementedError
+
+    async def async_generate_pcm(self, text: str) -> PCMAudio:
+        """
+        Asynchronously generate speech audio in memory.
+
+        Streaming engines collect their stream; other engines with
+        `supports_pcm` run `generate_pcm` in a thread.
+        """
+        if not self.supports_streaming:
+            return await self._run_in_thread(self.generate_pcm, text)
+        chunks = []
+        sample_rate = 0
+        async for chunk in self.async_stream_audio(text):
+            chunks.append(chunk.pcm)
+            sample_rate = chunk.sample_rate
+        pcm = b"".join(chunks)
+        return PCMAudio(
+            np.frombuffer(pcm[: len(pcm) // 2 * 2], dtype="<i2"), sample_rate
+        )
+
+    @staticmethod
+    async def _run_in_thread(func: Callable, *args, discard: Optional[Callable] = None):
+        """
+        Run a blocking synthesis in a worker thread.
+
+        A thread cannot be stopped: when the caller is cancelled (interrupted
+        turn), the cancellation only completes once the thread returns, so
+        the synthesis slot the caller holds is not given to another synthesis
+        while this one still uses the engine. `discard` is then called with
+        the unused result, e.g. to remove its audio file.
+        """
+        work = asyncio.ensure_future(asyncio.to_thread(func, *args))
+        try:
+            return await asyncio.shield(work)
+        except asyncio.CancelledError:
+            await asyncio.wait([work])
+            if not work.cancelled() and work.exception() is None and discard:
+                result = work.result()
+                if result:
+                    discard(result)
+            raise
+
+    async def async_stream_audio(self, text: str) -> AsyncIterator[PCMChunk]:
+        """
+        Yield the speech audio as it is synthesized, for engines with
+        `supports_streaming`.
+
+        text: str
+            the text to speak
+
+        Yields:
+        PCMChunk: whole 16-bit samples, in order
+
+        """
+        raise NotImplementedError
+        yield  # makes this an async generator
+
+    async def _stream_from_thread(
+        self, produce: Callable[[Callable[[PCMChunk], bool]], None]
+    ) -> AsyncIterator[PCMChunk]:
+        """
+        Run a blocking producer in a thread and yield the chunks it emits.
+
+        produce: callable
+            called in a worker thread with an `emit(chunk)` function; returns
+            when the synthesis is done and may raise. `emit` returns False
+            once nobody reads the chunks anymore, so the producer can stop.
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        done = object()
+        stopped = threading.Event()
+
+        def emit(chunk: PCMChunk) -> bool:
+            if stopped.is_set():
+                return False
+            loop.call_soon_threadsafe(queue.put_nowait, chunk)
+            return True
+
+        def run() -> None:
+            try:
+                produce(emit)
+            finally:
+                if not stopped.is_set():
+                    loop.call_soon_threadsafe(queue.put_nowait, done)
+
+        worker = asyncio.ensure_future(asyncio.to_thread(run))
+        try:
+            while True:
+                chunk = await queue.get()
+                if chunk is done:
+                    break
+                yield chunk
+            # Raise the producer's error, if any
+            await worker
+        finally:
+            if not worker.done():
+                # The consumer stopped early (e.g. interrupted turn)
+                stopped.set()
+                worker.add_done_callback(lambda f: f.cancelled() or f.exception())
+
     def remove_file(self, filepath: str, verbose: bool = True) -> None:
         """
         Remove a file from the file system.
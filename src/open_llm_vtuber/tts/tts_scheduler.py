@@ -0,0 +1,161 @@
+import asyncio
+import heapq
+import itertools
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Tuple
+
+from loguru import logger
+
+# Engines running in this process: not thread-safe, and parallel runs only
+# compete for the same CPU/GPU
+LOCAL_TTS_ENGINES = {
+    "bark_tts",
+    "coqui_tts",
+    "melo_tts",
+    "piper_tts",
+    "sherpa_onnx_tts",
+    "silero_tts",
+}
+# Self-hosted servers, usually one model on one GPU
+SELF_HOSTED_TTS_ENGINES = {
+    "cosyvoice_tts",
+    "cosyvoice2_tts",
+    "gpt_sovits_tts",
+    "spark_tts",
+    "x_tts",
+}
+LOCAL_CONCURRENCY = 1
+SELF_HOSTED_CONCURRENCY = 2
+REMOTE_CONCURRENCY = 4
+
+# Assumed engine speed until the first syntheses are measured
+DEFAULT_RTF = 0.5
+DEFAULT_SECONDS_PER_CHAR = 0.07
+SPEED_EMA_WEIGHT = 0.2
+
+
+def default_tts_concurrency(tts_model: str) -> int:
+    """Concurrency limit of an engine when the config does not set one."""
+    if tts_model in LOCAL_TTS_ENGINES:
+        return LOCAL_CONCURRENCY
+    if tts_model in SELF_HOSTED_TTS_ENGINES:
+        return SELF_HOSTED_CONCURRENCY
+    return REMOTE_CONCURRENCY
+
+
+class SynthesisSpeed:
+    """
+    Measured speed of an engine: real-time factor (synthesis time over audio
+    duration) and seconds of audio per character, as moving averages.
+    """
+
+    def __init__(self):
+        self.rtf = DEFAULT_RTF
+        self.seconds_per_char = DEFAULT_SECONDS_PER_CHAR
+        self.samples = 0
+
+    def record(
+        self, chars: int, synthesis_seconds: float, audio_seconds: float
+    ) -> None:
+        if chars <= 0 or audio_seconds <= 0:
+            return
+        weight = 1.0 if self.samples == 0 else SPEED_EMA_WEIGHT
+        self.rtf += weight * (synthesis_seconds / audio_seconds - self.rtf)
+        self.seconds_per_char += weight * (
+            audio_seconds / chars - self.seconds_per_char
+        )
+        self.samples += 1
+
+
+class TTSScheduler:
+    """
+    Limits the syntheses running at once on one engine, for all sessions.
+
+    Waiting syntheses are served lowest sequence number first: the sentence a
+    listener needs next is synthesized before sentences further ahead, and a
+    session starting a reply is not stuck behind the tail of another
+    session's long reply.
+
+    Args:
+        name (str): Engine name, for logs and metrics.
+        max_concurrency (int): Syntheses allowed to run at once.
+    """
+
+    def __init__(self, name: str, max_concurrency: int):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.active = 0
+        # (sequence, arrival order, future)
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._counter = itertools.count()
+        self.completed = 0
+        self.speed = SynthesisSpeed()
+        logger.info(f"TTS scheduler for {name}: {max_concurrency} concurrent syntheses")
+
+    @property
+    def queued(self) -> int:
+        return sum(1 for _, _, future in self._waiters if not future.done())
+
+    @asynccontextmanager
+    async def slot(self, sequence: int) -> AsyncIterator[None]:
+        """Wait for a free synthesis slot; lower sequences are served first."""
+        await self._acquire(sequence)
+        try:
+            yield
+        finally:
+            self.completed += 1
+            self._release()
+
+    async def _acquire(self, sequence: int) -> None:
+        if self.active < self.max_concurrency and not self._waiters:
+            self.active += 1
+            return
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (sequence, next(self._counter), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was handed over just before the cancellation
+                self._release()
+            else:
+                future.cancel()
+            raise
+
+    def _release(self) -> None:
+        # Hand the slot over to the first waiter still waiting
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)
+                return
+        self.active -= 1
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "active": self.active,
+            "queued": self.queued,
+            "completed": self.completed,
+            "rtf": self.speed.rtf,
+        }
+
+    def render_prometheus(self) -> List[str]:
+        """Scheduler metrics in the Prometheus text format, for /metrics."""
+        label = f'engine="{self.name}"'
+        return [
+            "# HELP vtuber_tts_active Syntheses running.",
+            "# TYPE vtuber_tts_active gauge",
+            f"vtuber_tts_active{{{label}}} {self.active}",
+            "# HELP vtuber_tts_queued Syntheses waiting for a slot.",
+            "# TYPE vtuber_tts_queued gauge",
+            f"vtuber_tts_queued{{{label}}} {self.queued}",
+            "# HELP vtuber_tts_completed_total Syntheses finished.",
+            "# TYPE vtuber_tts_completed_total counter",
+            f"vtuber_tts_completed_total{{{label}}} {self.completed}",
+            "# HELP vtuber_tts_rtf Measured real-time factor of the engine.",
+            "# TYPE vtuber_tts_rtf gauge",
+            f"vtuber_tts_rtf{{{label}}} {self.speed.rtf:.4f}",
+        ]
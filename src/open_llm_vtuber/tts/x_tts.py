@@ -1,5 +1,7 @@
+import httpx
 import requests
 from loguru import logger
+from .http_client import download_to_file, get_client
 from .tts_interface import TTSInterface
 
 
@@ -16,16 +18,19 @@ class TTSEngine(TTSInterface):
         self.new_audio_dir = "cache"
         self.file_extension = "wav"
 
-    def generate_audio(self, text, file_name_no_ext=None):
-        file_name = self.generate_cache_file_name(file_name_no_ext, self.file_extension)
-
-        # Prepare the data for the POST request
-        data = {
+    def _request_data(self, text):
+        return {
             "text": text,
             "speaker_wav": self.speaker_wav,
             "language": self.language,
         }
 
+    def generate_audio(self, text, file_name_no_ext=None):
+        file_name = self.generate_cache_file_name(file_name_no_ext, self.file_extension)
+
+        # Prepare the data for the POST request
+        data = self._request_data(text)
+
         # Send POST request to the TTS API
         response = requests.post(self.api_url, json=data, timeout=120)
 
@@ -41,3 +46,18 @@ class TTSEngine(TTSInterface):
                 f"Error: Failed to generate audio. Status code: {response.status_code}"
             )
             return None
+
+    async def async_generate_audio(self, text, file_name_no_ext=None):
+        file_name = self.generate_cache_file_name(file_name_no_ext, self.file_extension)
+        try:
+            await download_to_file(
+                get_client("x_tts"),
+                "POST",
+                self.api_url,
+                file_name,
+                json=self._request_data(text),
+            )
+            return file_name
+        except httpx.HTTPError as e:
+            logger.critical(f"Error: Failed to generate audio: {e}")
+            return None
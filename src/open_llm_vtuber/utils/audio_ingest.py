@@ -0,0 +1,171 @@
+"""
+Microphone audio received from a client.
+
+Besides the JSON messages (`mic-audio-data` / `raw-audio-data` with the
+samples as a list of floats), a frontend can send audio as binary frames:
+a 12-byte big-endian header followed by the samples, little-endian.
+
+    offset  size  field
+    0       1     kind: 1 = mic-audio-data, 2 = raw-audio-data (VAD)
+    1       1     format: 0 = pcm_s16le, 1 = pcm_f32le
+    2       2     reserved, 0
+    4       4     sample rate in Hz
+    8       4     sequence number, incremented by one per frame of a kind
+
+Audio is mono. Samples are converted to float32 in [-1, 1] at
+INPUT_SAMPLE_RATE, as the JSON messages carry them.
+"""
+
+import asyncio
+import struct
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+from loguru import logger
+
+HEADER = struct.Struct(">BBHII")
+
+KIND_MIC_AUDIO = 1
+KIND_RAW_AUDIO = 2
+MESSAGE_TYPES = {KIND_MIC_AUDIO: "mic-audio-data", KIND_RAW_AUDIO: "raw-audio-data"}
+
+FORMAT_PCM_S16LE = 0
+FORMAT_PCM_F32LE = 1
+SAMPLE_DTYPES = {FORMAT_PCM_S16LE: np.dtype("<i2"), FORMAT_PCM_F32LE: np.dtype("<f4")}
+
+INPUT_SAMPLE_RATE = 16000
+SEQUENCE_MODULO = 2**32
+
+
+@dataclass
+class AudioFrame:
+    kind: int
+    sample_rate: int
+    sequence: int
+    samples: np.ndarray
+
+    @property
+    def message_type(self) -> str:
+        return MESSAGE_TYPES[self.kind]
+
+
+def _resample(samples: np.ndarray, rate: int, target_rate: int) -> np.ndarray:
+    """Linear resampling; enough for VAD and ASR input."""
+    length = int(round(len(samples) * target_rate / rate))
+    positions = np.arange(length) * (rate / target_rate)
+    return np.interp(positions, np.arange(len(samples)), samples).astype(np.float32)
+
+
+def parse_audio_frame(data: bytes) -> AudioFrame:
+    """Decode a binary audio frame. Raises ValueError on a malformed frame."""
+    if len(data) < HEADER.size:
+        raise ValueError("Audio frame shorter than its header")
+    kind, sample_format, _, sample_rate, sequence = HEADER.unpack_from(data)
+    if kind not in MESSAGE_TYPES:
+        raise ValueError(f"Unknown audio frame kind: {kind}")
+    dtype = SAMPLE_DTYPES.get(sample_format)
+    if dtype is None:
+        raise ValueError(f"Unknown audio frame format: {sample_format}")
+    if not sample_rate:
+        raise ValueError("Audio frame without sample rate")
+    if (len(data) - HEADER.size) % dtype.itemsize:
+        raise ValueError("Audio frame payload is not a whole number of samples")
+
+    samples = np.frombuffer(data, dtype=dtype, offset=HEADER.size)
+    if sample_format == FORMAT_PCM_S16LE:
+        samples = samples.astype(np.float32) / 32768.0
+    else:
+        samples = samples.astype(np.float32)
+    if sample_rate != INPUT_SAMPLE_RATE and len(samples):
+        samples = _resample(samples, sample_rate, INPUT_SAMPLE_RATE)
+    return AudioFrame(kind, sample_rate, sequence, samples)
+
+
+class AudioFrameReader:
+    """
+    Binary audio frames of one client. Frames arriving after a later frame
+    of the same kind (stale or duplicate) are dropped; gaps are logged.
+    """
+
+    def __init__(self, client_uid: str):
+        self.client_uid = client_uid
+        self._next_sequence: Dict[int, int] = {}
+        self.lost_frames = 0
+
+    def read(self, data: bytes) -> Optional[AudioFrame]:
+        frame = parse_audio_frame(data)
+        expected = self._next_sequence.get(frame.kind)
+        if expected is not None and frame.sequence != expected:
+            ahead = (frame.sequence - expected) % SEQUENCE_MODULO
+            if ahead >= SEQUENCE_MODULO // 2:
+                logger.debug(
+                    f"Dropping stale audio frame {frame.sequence} from {self.client_uid}"
+                )
+                return None
+            self.lost_frames += ahead
+            logger.warning(
+                f"{ahead} audio frame(s) missing from {self.client_uid} "
+                f"before frame {frame.sequence}"
+            )
+        self._next_sequence[frame.kind] = (frame.sequence + 1) % SEQUENCE_MODULO
+        return frame
+
+
+class UtteranceBuffer:
+    """
+    Audio of the utterance being received, kept as the list of received
+    chunks and joined once when it is taken. Audio beyond `max_samples` is
+    dropped.
+
+    `transcript` is the task decoding the text of the buffered audio when
+    it was transcribed while it was spoken (see asr.streaming); appending
+    audio cancels it.
+    """
+
+    def __init__(self, max_samples: int):
+        self.max_samples = max_samples
+        self._chunks: List[np.ndarray] = []
+        self._size = 0
+        self._truncated = False
+        self.transcript: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, samples: np.ndarray) -> None:
+        self._drop_transcript()
+        room = self.max_samples - self._size
+        if len(samples) > room:
+            if not self._truncated:
+                logger.warning(
+                    f"Utterance longer than {self.max_samples / INPUT_SAMPLE_RATE:.0f}s, "
+                    "dropping the rest of its audio"
+                )
+                self._truncated = True
+            samples = samples[:room]
+        if len(samples):
+            self._chunks.append(np.asarray(samples, dtype=np.float32))
+            self._size += len(samples)
+
+    def take(self) -> np.ndarray:
+        """The buffered audio as one array; the buffer is emptied. Read
+        `transcript` first: it is detached, not cancelled."""
+        self.transcript = None
+        if len(self._chunks) == 1:
+            audio = self._chunks[0]
+        else:
+            audio = np.concatenate(self._chunks) if self._chunks else np.array([])
+        self.clear()
+        return audio
+
+    def clear(self) -> None:
+        self._chunks = []
+        self._size = 0
+        self._truncated = False
+        self._drop_transcript()
+
+    def _drop_transcript(self) -> None:
+        if self.transcript is not None:
+            self.transcript.cancel()
+            self.transcript = None
@@ -0,0 +1,247 @@
+"""
+Per-client transport of audio payloads.
+
+By default an audio payload is one JSON text frame with the audio as base64
+(the format every frontend understands). A frontend can negotiate a binary
+transport by sending:
+
+    {"type": "audio-transport", "binary": true, "codecs": ["opus", "wav"],
+     "opus_bitrate": 24000}
+
+The server answers with `audio-transport-ack` and then sends each audio
+payload as a JSON header frame, whose `binary` field describes the audio,
+followed by a binary frame: a 4-byte big-endian frame id matching
+`binary.frame_id`, then the audio. Opus audio is a sequence of packets, each
+prefixed by its length as a 2-byte big-endian integer.
+"""
+
+import asyncio
+import base64
+import json
+import struct
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+import numpy as np
+from loguru import logger
+
+try:
+    import opuslib
+
+    OPUS_AVAILABLE = True
+except Exception:
+    # Not installed, or installed without the native libopus (plain Exception)
+    OPUS_AVAILABLE = False
+
+CODEC_WAV = "wav"
+CODEC_OPUS = "opus"
+SUPPORTED_CODECS = (CODEC_OPUS, CODEC_WAV) if OPUS_AVAILABLE else (CODEC_WAV,)
+
+OPUS_SAMPLE_RATES = (8000, 12000, 16000, 24000, 48000)
+OPUS_FRAME_MS = 20
+DEFAULT_OPUS_BITRATE = 24000
+
+SendBytes = Callable[[bytes], Awaitable[None]]
+SendText = Callable[[str], Awaitable[None]]
+
+
+def read_wav_pcm(data: bytes) -> Tuple[np.ndarray, int]:
+    """Return the int16 mono samples and sample rate of a 16-bit PCM WAV file."""
+    if data[:4] != b"RIFF" or data[8:12] != b"WAVE":
+        raise ValueError("Not a WAV file")
+    channels = sample_rate = bits = None
+    offset = 12
+    while offset + 8 <= len(data):
+        chunk_id = data[offset : offset + 4]
+        (chunk_size,) = struct.unpack("<I", data[offset + 4 : offset + 8])
+        body = offset + 8
+        if chunk_id == b"fmt ":
+            audio_format, channels, sample_rate = struct.unpack(
+                "<HHI", data[body : body + 8]
+            )
+            (bits,) = struct.unpack("<H", data[body + 14 : body + 16])
+            if audio_format != 1 or bits != 16:
+                raise ValueError("Only 16-bit PCM WAV is supported")
+        elif chunk_id == b"data":
+            if sample_rate is None:
+                raise ValueError("WAV data chunk before fmt chunk")
+            end = min(body + chunk_size, len(data))
+            end -= (end - body) % (2 * channels)
+            samples = np.frombuffer(data[body:end], dtype="<i2")
+            if channels > 1:
+                samples = samples.reshape(-1, channels).mean(axis=1).astype(np.int16)
+            return samples, sample_rate
+        offset = body + chunk_size + (chunk_size & 1)
+    raise ValueError("WAV file without data chunk")
+
+
+def _resample(samples: np.ndarray, rate: int, target_rate: int) -> np.ndarray:
+    """Linear resampling; enough for voice sent to remote viewers."""
+    length = int(round(len(samples) * target_rate / rate))
+    positions = np.arange(length) * (rate / target_rate)
+    return np.interp(positions, np.arange(len(samples)), samples).astype(np.int16)
+
+
+class _OpusEncoder:
+    """Opus encoding of int16 mono audio, in 20 ms packets."""
+
+    def __init__(self, bitrate: int):
+        self.bitrate = bitrate
+        self._encoders: Dict[int, Any] = {}
+        # Samples of a streamed sentence that did not fill a packet yet
+        self._carry = np.empty(0, dtype=np.int16)
+
+    def reset(self) -> None:
+        self._carry = np.empty(0, dtype=np.int16)
+
+    def _encoder(self, rate: int):
+        encoder = self._encoders.get(rate)
+        if encoder is None:
+            encoder = opuslib.Encoder(rate, 1, opuslib.APPLICATION_VOIP)
+            encoder.bitrate = self.bitrate
+            self._encoders[rate] = encoder
+        return encoder
+
+    def encode(
+        self, samples: np.ndarray, rate: int, partial: bool = False
+    ) -> Tuple[bytes, int]:
+        """
+        Encode samples; returns the packets and the rate they were encoded at.
+        With `partial`, samples that do not fill a packet are kept for the
+        next call instead of being padded with silence.
+        """
+        if rate not in OPUS_SAMPLE_RATES:
+            samples = _resample(samples, rate, 48000)
+            rate = 48000
+        samples = np.concatenate([self._carry, samples])
+        frame = rate * OPUS_FRAME_MS // 1000
+        whole = len(samples) - len(samples) % frame
+        if partial:
+            self._carry = samples[whole:]
+        else:
+            self._carry = np.empty(0, dtype=np.int16)
+            if whole < len(samples):
+                samples = np.concatenate(
+                    [samples, np.zeros(frame - (len(samples) - whole), np.int16)]
+                )
+                whole = len(samples)
+
+        encoder = self._encoder(rate)
+        packets = bytearray()
+        for start in range(0, whole, frame):
+            packet = encoder.encode(samples[start : start + frame].tobytes(), frame)
+            packets += struct.pack(">H", len(packet)) + packet
+        return bytes(packets), rate
+
+
+class AudioTransport:
+    """
+    How audio payloads are sent to one client.
+
+    Payloads are built with raw audio bytes (`encode_base64=False` in
+    utils.stream_audio): WAV for `audio` messages, 16-bit PCM for
+    `audio-chunk` messages. The transport encodes them when sending.
+
+    Args:
+        send_bytes: Sends a binary frame to the client. None keeps the JSON format.
+        codec: Codec of binary frames, "wav" or "opus".
+        opus_bitrate: Target bitrate of the Opus encoder in bits per second.
+    """
+
+    def __init__(
+        self,
+        send_bytes: Optional[SendBytes] = None,
+        codec: str = CODEC_WAV,
+        opus_bitrate: int = DEFAULT_OPUS_BITRATE,
+    ):
+        self.send_bytes = send_bytes
+        self.codec = codec
+        self._opus = _OpusEncoder(opus_bitrate) if codec == CODEC_OPUS else None
+        self._frame_id = 0
+        # Keeps a header and its binary frame together
+        self._lock = asyncio.Lock()
+
+    @property
+    def binary(self) -> bool:
+        return self.send_bytes is not None
+
+    @classmethod
+    def negotiate(
+        cls, request: Dict[str, Any], send_bytes: SendBytes
+    ) -> "AudioTransport":
+        """Build the transport for an `audio-transport` request."""
+        if not request.get("binary"):
+            return cls()
+        codec = CODEC_WAV
+        for requested in request.get("codecs") or [CODEC_WAV]:
+            if requested in SUPPORTED_CODECS:
+                codec = requested
+                break
+        bitrate = int(request.get("opus_bitrate") or DEFAULT_OPUS_BITRATE)
+        return cls(send_bytes=send_bytes, codec=codec, opus_bitrate=bitrate)
+
+    def describe(self) -> Dict[str, Any]:
+        """Negotiated settings, sent back in `audio-transport-ack`."""
+        return {
+            "binary": self.binary,
+            "codec": self.codec if self.binary else None,
+            "supported_codecs": list(SUPPORTED_CODECS),
+        }
+
+    async def send(self, payload: Dict[str, Any], send_text: SendText) -> None:
+        """Send one audio payload built with raw audio bytes."""
+        audio = payload.get("audio")
+        if isinstance(audio, (bytes, bytearray)) and not self.binary:
+            payload = {**payload, "audio": base64.b64encode(audio).decode("utf-8")}
+            audio = None
+        if not self.binary or (
+            not audio and not (self._opus is not None and payload.get("is_final"))
+        ):
+            await send_text(json.dumps(payload))
+            return
+
+        data, description = await self._encode(payload, audio or b"")
+        if not data:
+            await send_text(json.dumps({**payload, "audio": None}))
+            return
+        async with self._lock:
+            self._frame_id = (self._frame_id + 1) & 0xFFFFFFFF
+            description["frame_id"] = self._frame_id
+            description["byte_length"] = len(data)
+            await send_text(
+                json.dumps({**payload, "audio": None, "binary": description})
+            )
+            await self.send_bytes(struct.pack(">I", self._frame_id) + data)
+
+    async def _encode(
+        self, payload: Dict[str, Any], audio: bytes
+    ) -> Tuple[bytes, Dict[str, Any]]:
+        is_chunk = payload.get("type") == "audio-chunk"
+        if self._opus is None:
+            if is_chunk:
+                return audio, {
+                    "codec": payload.get("format", "pcm_s16le"),
+                    "sample_rate": payload.get("sample_rate"),
+                }
+            return audio, {"codec": CODEC_WAV}
+
+        try:
+            if is_chunk:
+                if payload.get("chunk_index") == 0:
+                    # Drop what is left of an interrupted sentence
+                    self._opus.reset()
+                samples = np.frombuffer(audio, dtype="<i2")
+                rate = payload["sample_rate"]
+                partial = not payload.get("is_final")
+            else:
+                samples, rate = read_wav_pcm(audio)
+                partial = False
+            # Encoding a sentence takes a few milliseconds; keep it off the loop
+            packets, rate = await asyncio.to_thread(
+                self._opus.encode, samples, rate, partial
+            )
+            return packets, {"codec": CODEC_OPUS, "sample_rate": rate}
+        except Exception as e:
+            if is_chunk:
+                raise
+            logger.warning(f"Opus encoding failed, sending WAV: {e}")
+            return audio, {"codec": CODEC_WAV}
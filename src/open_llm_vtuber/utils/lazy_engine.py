@@ -0,0 +1,88 @@
+import asyncio
+import inspect
+import threading
+import time
+from typing import Any, Callable
+
+from loguru import logger
+
+_OWN_ATTRIBUTES = {"_name", "_loader", "_interface", "_engine", "_lock"}
+
+
+class LazyEngine:
+    """
+    Stand-in for an engine that is only built when it is first used.
+
+    It is shared by reference like the engine it stands for. Calling a
+    coroutine method of `interface` (e.g. `async_transcribe_np`) builds the
+    engine in a worker thread first. Any other attribute builds it in the
+    calling thread, except on the event loop, where building it would block
+    every client: there it raises RuntimeError, so async callers must
+    `await ensure_loaded(engine)` before reading plain attributes.
+
+    Args:
+        name (str): Engine name, for logs.
+        loader (Callable): Builds the engine.
+        interface (type): Interface class of the engine.
+    """
+
+    def __init__(self, name: str, loader: Callable[[], Any], interface: type):
+        self._name = name
+        self._loader = loader
+        self._interface = interface
+        self._engine = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._engine is not None
+
+    def load(self) -> Any:
+        if self._engine is None:
+            with self._lock:
+                if self._engine is None:
+                    start = time.perf_counter()
+                    engine = self._loader()
+                    logger.info(
+                        f"{self._name} loaded on first use in {time.perf_counter() - start:.2f}s"
+                    )
+                    self._engine = engine
+        return self._engine
+
+    async def aload(self) -> Any:
+        if self._engine is None:
+            await asyncio.to_thread(self.load)
+        return self._engine
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("__") or name in _OWN_ATTRIBUTES:
+            raise AttributeError(name)
+        if self._engine is None and inspect.iscoroutinefunction(
+            getattr(self._interface, name, None)
+        ):
+
+            async def call(*args, **kwargs):
+                engine = await self.aload()
+                return await getattr(engine, name)(*args, **kwargs)
+
+            return call
+        if self._engine is None and _on_event_loop():
+            raise RuntimeError(
+                f"{self._name} is not loaded yet; `await ensure_loaded(engine)` "
+                f"before reading '{name}' on the event loop"
+            )
+        return getattr(self.load(), name)
+
+
+def _on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+async def ensure_loaded(engine: Any) -> None:
+    """Build a LazyEngine off the event loop; no-op for any other engine."""
+    if isinstance(engine, LazyEngine):
+        await engine.aload()
@@ -1,4 +1,5 @@
 import re
+from functools import lru_cache
 from typing import List, Tuple, AsyncIterator, Optional, Union, Dict, Any
 import pysbd
 from loguru import logger
@@ -72,6 +73,17 @@ SUPPORTED_LANGUAGES = {
     "zh",
 }
 
+# Precompiled matchers used by the incremental scan in SentenceDivider
+COMMA_PATTERN = re.compile("|".join(re.escape(c) for c in COMMAS))
+END_PUNCTUATION_PATTERN = re.compile("|".join(re.escape(p) for p in END_PUNCTUATIONS))
+
+# Pending text shorter than this is too short for a reliable language guess,
+# so SentenceDivider keeps detecting per call until it reaches this length.
+MIN_LANGUAGE_DETECTION_CHARS = 20
+
+# Sentinel for segment_text_by_pysbd: detect the language from the text
+AUTO_DETECT = "auto"
+
 
 def detect_language(text: str) -> str:
     """
@@ -86,6 +98,12 @@ def detect_language(text: str) -> str:
         return None
 
 
+@lru_cache(maxsize=None)
+def get_segmenter(language: str) -> pysbd.Segmenter:
+    """Return a cached pysbd segmenter for a supported language."""
+    return pysbd.Segmenter(language=language, clean=False)
+
+
 def is_complete_sentence(text: str) -> bool:
     """
     Check if text ends with sentence-ending punctuation and not abbreviation.
@@ -116,7 +134,7 @@ def contains_comma(text: str) -> bool:
     Returns:
         bool: Whether the text contains a comma
     """
-    return any(comma in text for comma in COMMAS)
+    return COMMA_PATTERN.search(text) is not None
 
 
 def comma_splitter(text: str) -> Tuple[str, str]:
@@ -167,7 +185,7 @@ def contains_end_punctuation(text: str) -> bool:
     Returns:
         bool: Whether the text contains ending punctuation
     """
-    return any(punct in text for punct in END_PUNCTUATIONS)
+    return END_PUNCTUATION_PATTERN.search(text) is not None
 
 
 def segment_text_by_regex(text: str) -> Tuple[List[str], str]:
@@ -210,13 +228,17 @@ def segment_text_by_regex(text: str) -> Tuple[List[str], str]:
     return complete_sentences, remaining_text
 
 
-def segment_text_by_pysbd(text: str) -> Tuple[List[str], str]:
+def segment_text_by_pysbd(
+    text: str, language: Optional[str] = AUTO_DETECT
+) -> Tuple[List[str], str]:
     """
     Segment text into complete sentences and remaining text.
     Uses pysbd for supported languages, falls back to regex for others.
 
     Args:
         text: Text to segment into sentences
+        language: pysbd language code, None for an unsupported language,
+            or AUTO_DETECT to detect it from the text
 
     Returns:
         Tuple[List[str], str]: (list of complete sentences, remaining incomplete text)
@@ -226,11 +248,11 @@ def segment_text_by_pysbd(text: str) -> Tuple[List[str], str]:
 
     try:
         # Detect language
-        lang = detect_language(text)
+        lang = detect_language(text) if language == AUTO_DETECT else language
 
         if lang is not None:
             # Use pysbd for supported languages
-            segmenter = pysbd.Segmenter(language=lang, clean=False)
+            segmenter = get_segmenter(lang)
             sentences = segmenter.segment(text)
 
             if not sentences:
@@ -321,6 +343,27 @@ class SentenceDivider:
         # Replace active_tags dict with a stack to handle nesting
         self._tag_stack = []
 
+        # One regex for every <tag>, </tag> and <tag/> form, mapped back to
+        # the tag name and state by the matched string
+        self._tag_lookup: Dict[str, Tuple[str, TagState]] = {}
+        for tag in self.valid_tags:
+            self._tag_lookup[f"<{tag}/>"] = (tag, TagState.SELF_CLOSING)
+            self._tag_lookup[f"<{tag}>"] = (tag, TagState.START)
+            self._tag_lookup[f"</{tag}>"] = (tag, TagState.END)
+        self._tag_pattern = re.compile(
+            "|".join(re.escape(pattern) for pattern in self._tag_lookup)
+        )
+        self._max_tag_len = max(len(pattern) for pattern in self._tag_lookup)
+
+        # Scan cursors: self._buffer[:cursor] is known to hold no tag / no comma /
+        # no end punctuation that could produce a new sentence. They only move
+        # forward as tokens arrive and drop back to 0 when a boundary is consumed.
+        self._tag_scan_pos = 0
+        self._comma_scan_pos = 0
+        self._punct_scan_pos = 0
+        # Language of the current response, detected once per response
+        self._language: Optional[str] = AUTO_DETECT
+
     def _get_current_tags(self) -> List[TagInfo]:
         """
         Get all current active tags from outermost to innermost.
@@ -351,44 +394,12 @@ class SentenceDivider:
             Tuple of (TagInfo if tag found else None, remaining text)
         """
         # Find the first occurrence of any tag
-        first_tag = None
-        first_pos = len(text)
-        tag_type = None
-        matched_tag = None
-
-        # Check for self-closing tags
-        for tag in self.valid_tags:
-            pattern = f"<{tag}/>"
-            match = re.search(pattern, text)
-            if match and match.start() < first_pos:
-                first_pos = match.start()
-                first_tag = match
-                tag_type = TagState.SELF_CLOSING
-                matched_tag = tag
-
-        # Check for opening tags
-        for tag in self.valid_tags:
-            pattern = f"<{tag}>"
-            match = re.search(pattern, text)
-            if match and match.start() < first_pos:
-                first_pos = match.start()
-                first_tag = match
-                tag_type = TagState.START
-                matched_tag = tag
-
-        # Check for closing tags
-        for tag in self.valid_tags:
-            pattern = f"</{tag}>"
-            match = re.search(pattern, text)
-            if match and match.start() < first_pos:
-                first_pos = match.start()
-                first_tag = match
-                tag_type = TagState.END
-                matched_tag = tag
-
+        first_tag = self._tag_pattern.search(text)
         if not first_tag:
             return None, text
 
+        matched_tag, tag_type = self._tag_lookup[first_tag.group(0)]
+
         # Handle the found tag
         if tag_type == TagState.START:
             # Push new tag onto stack
@@ -402,11 +413,55 @@ class SentenceDivider:
 
         return (TagInfo(matched_tag, tag_type), text[first_tag.end() :].lstrip())
 
+    def _set_buffer(self, text: str) -> None:
+        """Replace the buffer after consuming a boundary and rewind the scan cursors."""
+        self._buffer = text
+        self._tag_scan_pos = 0
+        self._comma_scan_pos = 0
+        self._punct_scan_pos = 0
+
+    def _find_next_tag(self) -> Tuple[int, Optional[str]]:
+        """
+        Find the next tag in the buffer, scanning only text not checked before.
+
+        Returns:
+            Tuple of (tag position or len(buffer), matched tag string or None)
+        """
+        match = self._tag_pattern.search(self._buffer, self._tag_scan_pos)
+        if match:
+            self._tag_scan_pos = match.start()
+            return match.start(), match.group(0)
+        # Keep a tail that may hold the beginning of a tag split across tokens
+        self._tag_scan_pos = max(
+            self._tag_scan_pos, len(self._buffer) - self._max_tag_len + 1
+        )
+        return len(self._buffer), None
+
+    def _has_new_comma(self) -> bool:
+        """Check the unscanned part of the buffer for a comma."""
+        if COMMA_PATTERN.search(self._buffer, self._comma_scan_pos):
+            return True
+        self._comma_scan_pos = len(self._buffer)
+        return False
+
+    def _has_new_end_punctuation(self) -> bool:
+        """Check the unscanned part of the buffer for sentence-ending punctuation."""
+        # Multi-character marks ("...", "。。。") are made of single-character
+        # ones, so a match anywhere after the cursor is enough
+        if END_PUNCTUATION_PATTERN.search(self._buffer, self._punct_scan_pos):
+            return True
+        self._punct_scan_pos = len(self._buffer)
+        return False
+
     async def _process_buffer(self) -> AsyncIterator[SentenceWithTags]:
         """
         Process the current buffer, yielding complete sentences with tags.
         This is now an async generator.
         It consumes processed parts from self._buffer.
+
+        Only the text after the scan cursors is examined for tags, commas and
+        end punctuation, so the per-token cost does not grow with the length
+        of the pending text.
         """
         processed_something = True  # Flag to loop until no more processing can be done
         while processed_something:
@@ -417,15 +472,7 @@ class SentenceDivider:
                 break
 
             # Find the next tag position
-            next_tag_pos = len(self._buffer)
-            tag_pattern_found = None
-            for tag in self.valid_tags:
-                patterns = [f"<{tag}>", f"</{tag}>", f"<{tag}/>"]
-                for pattern in patterns:
-                    pos = self._buffer.find(pattern)
-                    if pos != -1 and pos < next_tag_pos:
-                        next_tag_pos = pos
-                        tag_pattern_found = pattern  # Store the found pattern
+            next_tag_pos, tag_pattern_found = self._find_next_tag()
 
             if next_tag_pos == 0:
                 # Tag is at the start of buffer
@@ -436,7 +483,7 @@ class SentenceDivider:
                     ].strip()
                     # Yield the tag itself, represented as a SentenceWithTags
                     yield SentenceWithTags(text=processed_text, tags=[tag_info])
-                    self._buffer = remaining
+                    self._set_buffer(remaining)
                     processed_something = True
                     continue  # Restart processing loop for the remaining buffer
 
@@ -457,7 +504,7 @@ class SentenceDivider:
                             )
                     # The part consumed includes sentences + what's left before the tag
                     processed_segment = text_before_tag
-                    self._buffer = self._buffer[len(processed_segment) :]
+                    self._set_buffer(self._buffer[len(processed_segment) :])
                     processed_something = True
                     continue  # Restart processing loop
 
@@ -468,7 +515,7 @@ class SentenceDivider:
                         text=text_before_tag.strip(),
                         tags=current_tags or [TagInfo("", TagState.NONE)],
                     )
-                    self._buffer = self._buffer[len(text_before_tag) :]
+                    self._set_buffer(self._buffer[len(text_before_tag) :])
                     processed_something = True
                     continue  # Restart processing loop
                 # --- If no tag found after text_before_tag, we wait for more input or end punctuation ---
@@ -480,7 +527,7 @@ class SentenceDivider:
                         : len(self._buffer) - len(remaining_after_tag)
                     ].strip()
                     yield SentenceWithTags(text=processed_tag_text, tags=[tag_info])
-                    self._buffer = remaining_after_tag
+                    self._set_buffer(remaining_after_tag)
                     processed_something = True
                     continue  # Restart processing loop
 
@@ -493,7 +540,7 @@ class SentenceDivider:
                 if (
                     self._is_first_sentence
                     and self.faster_first_response
-                    and contains_comma(self._buffer)
+                    and self._has_new_comma()
                 ):
                     sentence, remaining = comma_splitter(self._buffer)
                     if sentence.strip():
@@ -501,16 +548,20 @@ class SentenceDivider:
                             text=sentence.strip(),
                             tags=current_tags or [TagInfo("", TagState.NONE)],
                         )
-                        self._buffer = remaining
+                        self._set_buffer(remaining)
                         self._is_first_sentence = False
                         processed_something = True
                         continue  # Restart processing loop
 
-                # Process normal sentences based on end punctuation
-                if contains_end_punctuation(self._buffer):
+                # Process normal sentences based on end punctuation. Text up to the
+                # cursor was already segmented without result, so only new
+                # punctuation can confirm another boundary.
+                if self._has_new_end_punctuation():
                     sentences, remaining = self._segment_text(self._buffer)
-                    if sentences:  # Only process if segmentation yielded sentences
-                        self._buffer = remaining
+                    if not sentences:
+                        self._punct_scan_pos = len(self._buffer)
+                    else:  # Only process if segmentation yielded sentences
+                        self._set_buffer(remaining)
                         self._is_first_sentence = False
                         processed_something = True
                         for sentence in sentences:
@@ -544,7 +595,7 @@ class SentenceDivider:
                 text=self._buffer.strip(),
                 tags=current_tags or [TagInfo("", TagState.NONE)],
             )
-            self._buffer = ""  # Clear buffer after flushing
+            self._set_buffer("")  # Clear buffer after flushing
 
     async def process_stream(
         self, segment_stream: AsyncIterator[Union[str, Dict[str, Any]]]
@@ -599,10 +650,21 @@ class SentenceDivider:
         """Segment text using the configured method"""
         if self.segment_method == "regex":
             return segment_text_by_regex(text)
-        return segment_text_by_pysbd(text)
+        return segment_text_by_pysbd(text, self._detect_language(text))
+
+    def _detect_language(self, text: str) -> Optional[str]:
+        """Detect the response language once, as soon as there is enough text."""
+        if self._language != AUTO_DETECT:
+            return self._language
+        language = detect_language(text)
+        if len(text.strip()) >= MIN_LANGUAGE_DETECTION_CHARS:
+            self._language = language
+            logger.debug(f"Detected response language for segmentation: {language}")
+        return language
 
     def reset(self):
         """Reset the divider state for a new conversation"""
         self._is_first_sentence = True
-        self._buffer = ""
+        self._set_buffer("")
         self._tag_stack = []
+        self._language = AUTO_DETECT
@@ -1,4 +1,6 @@
 import base64
+import struct
+import numpy as np
 from pydub import AudioSegment
 from pydub.utils import make_chunks
 from ..agent.output_types import Actions
@@ -24,12 +26,100 @@ def _get_volume_by_chunks(audio: AudioSegment, chunk_length_ms: int) -> list:
     return [volume / max_volume for volume in volumes]
 
 
+def _get_pcm_volumes(samples: np.ndarray, slice_samples: int) -> list:
+    """
+    Vectorized `_get_volume_by_chunks` for int16 samples: RMS per slice (the
+    last one may be shorter), normalized by the loudest slice.
+    """
+    if len(samples) == 0:
+        raise ValueError("Audio is empty or all zero.")
+    count = -(-len(samples) // slice_samples)
+    padded = np.zeros(count * slice_samples, dtype=np.float64)
+    padded[: len(samples)] = samples
+    sums = np.square(padded).reshape(count, slice_samples).sum(axis=1)
+    # Like pydub, the partial last slice is averaged over its own length
+    lengths = np.full(count, slice_samples)
+    lengths[-1] = len(samples) - (count - 1) * slice_samples
+    rms = np.sqrt(sums / lengths)
+    max_volume = rms.max()
+    if max_volume == 0:
+        raise ValueError("Audio is empty or all zero.")
+    return (rms / max_volume).tolist()
+
+
+def pcm_to_wav_bytes(samples: np.ndarray, sample_rate: int) -> bytes:
+    """Frame int16 mono samples as a WAV file."""
+    data = np.asarray(samples, dtype="<i2").tobytes()
+    header = struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF",
+        36 + len(data),
+        b"WAVE",
+        b"fmt ",
+        16,  # fmt chunk size
+        1,  # PCM
+        1,  # mono
+        sample_rate,
+        sample_rate * 2,  # byte rate
+        2,  # block align
+        16,  # bits per sample
+        b"data",
+        len(data),
+    )
+    return header + data
+
+
+def prepare_pcm_audio_payload(
+    samples: np.ndarray,
+    sample_rate: int,
+    chunk_length_ms: int = 20,
+    display_text: DisplayText = None,
+    actions: Actions = None,
+    forwarded: bool = False,
+    encode_base64: bool = True,
+) -> dict[str, any]:
+    """
+    Prepares the audio payload from samples in memory, without a file or ffmpeg.
+    Produces the same payload as `prepare_audio_payload`.
+
+    Parameters:
+        samples (np.ndarray): int16 mono samples
+        sample_rate (int): Sample rate of the samples
+        chunk_length_ms (int): The length of each audio chunk in milliseconds
+        display_text (DisplayText, optional): Text to be displayed with the audio
+        actions (Actions, optional): Actions associated with the audio
+        encode_base64 (bool): If False, the audio is left as WAV bytes for an
+            AudioTransport to encode
+
+    Returns:
+        dict: The audio payload to be sent
+    """
+    if isinstance(display_text, DisplayText):
+        display_text = display_text.to_dict()
+
+    volumes = _get_pcm_volumes(samples, max(1, sample_rate * chunk_length_ms // 1000))
+    audio_base64 = pcm_to_wav_bytes(samples, sample_rate)
+    if encode_base64:
+        audio_base64 = base64.b64encode(audio_base64).decode("utf-8")
+
+    return {
+        "type": "audio",
+        "audio": audio_base64,
+        "volumes": volumes,
+        "slice_length": chunk_length_ms,
+        "display_text": display_text,
+        "actions": actions.to_dict() if actions else None,
+        "forwarded": forwarded,
+    }
+
+
 def prepare_audio_payload(
     audio_path: str | None,
     chunk_length_ms: int = 20,
     display_text: DisplayText = None,
     actions: Actions = None,
     forwarded: bool = False,
+    encode_base64: bool = True,
 ) -> dict[str, any]:
     """
     Prepares the audio payload for sending to a broadcast endpoint.
@@ -40,6 +130,8 @@ def prepare_audio_payload(
         chunk_length_ms (int): The length of each audio chunk in milliseconds
         display_text (DisplayText, optional): Text to be displayed with the audio
         actions (Actions, optional): Actions associated with the audio
+        encode_base64 (bool): If False, the audio is left as WAV bytes for an
+            AudioTransport to encode
 
     Returns:
         dict: The audio payload to be sent
@@ -66,7 +158,9 @@ def prepare_audio_payload(
         raise ValueError(
             f"Error loading or converting generated audio file to wav file '{audio_path}': {e}"
         )
-    audio_base64 = base64.b64encode(audio_bytes).decode("utf-8")
+    audio_base64 = (
+        base64.b64encode(audio_bytes).decode("utf-8") if encode_base64 else audio_bytes
+    )
     volumes = _get_volume_by_chunks(audio, chunk_length_ms)
 
     payload = {
@@ -82,5 +176,103 @@ def prepare_audio_payload(
     return payload
 
 
+class ChunkVolumeMeter:
+    """
+    Lip-sync volumes of 16-bit PCM audio that arrives in chunks.
+
+    Volumes are computed per `chunk_length_ms` slice, like `_get_volume_by_chunks`.
+    Samples that do not fill a slice are carried over to the next chunk, so the
+    volumes of consecutive chunks line up with the audio played back to back.
+    The whole clip is not known in advance, so volumes are normalized by the
+    loudest slice so far.
+    """
+
+    def __init__(self, sample_rate: int, chunk_length_ms: int = 20):
+        self.slice_samples = max(1, sample_rate * chunk_length_ms // 1000)
+        self._leftover = np.empty(0, dtype=np.float64)
+        self._max_rms = 0.0
+
+    def _normalize(self, samples: np.ndarray) -> list:
+        slices = samples.reshape(-1, self.slice_samples)
+        rms = np.sqrt(np.mean(np.square(slices), axis=1))
+        peaks = np.maximum.accumulate(np.maximum(rms, self._max_rms))
+        self._max_rms = float(peaks[-1])
+        return np.divide(rms, peaks, out=np.zeros_like(rms), where=peaks > 0).tolist()
+
+    def feed(self, pcm: bytes) -> list:
+        """Return the volumes of the slices completed by this chunk."""
+        samples = np.concatenate(
+            [self._leftover, np.frombuffer(pcm, dtype="<i2").astype(np.float64)]
+        )
+        whole = len(samples) - len(samples) % self.slice_samples
+        self._leftover = samples[whole:]
+        if whole == 0:
+            return []
+        return self._normalize(samples[:whole])
+
+    def flush(self) -> list:
+        """Return the volume of the last, partial slice."""
+        if len(self._leftover) == 0:
+            return []
+        padded = np.zeros(self.slice_samples)
+        padded[: len(self._leftover)] = self._leftover
+        self._leftover = np.empty(0, dtype=np.float64)
+        return self._normalize(padded)
+
+
+def prepare_audio_chunk_payload(
+    pcm: bytes | None,
+    sample_rate: int,
+    chunk_index: int,
+    volumes: list,
+    is_final: bool,
+    chunk_length_ms: int = 20,
+    display_text: DisplayText = None,
+    actions: Actions = None,
+    forwarded: bool = False,
+    encode_base64: bool = True,
+) -> dict[str, any]:
+    """
+    Prepares one piece of a sentence's audio streamed while it is synthesized.
+
+    The chunks of a sentence are sent in order and played back to back. The
+    display text and actions are sent with the first chunk only.
+
+    Parameters:
+        pcm (bytes | None): 16-bit little-endian mono samples, or None (a final
+            chunk without audio)
+        sample_rate (int): Sample rate of the samples
+        chunk_index (int): Position of the chunk within the sentence
+        volumes (list): Lip-sync volumes of the chunk's slices
+        is_final (bool): Whether this is the last chunk of the sentence
+        chunk_length_ms (int): The length of each volume slice in milliseconds
+        display_text (DisplayText, optional): Text to be displayed with the audio
+        actions (Actions, optional): Actions associated with the audio
+        encode_base64 (bool): If False, the samples are left as bytes for an
+            AudioTransport to encode
+
+    Returns:
+        dict: The audio chunk payload to be sent
+    """
+    if isinstance(display_text, DisplayText):
+        display_text = display_text.to_dict()
+    if pcm and encode_base64:
+        pcm = base64.b64encode(pcm).decode("utf-8")
+
+    return {
+        "type": "audio-chunk",
+        "chunk_index": chunk_index,
+        "is_final": is_final,
+        "audio": pcm or None,
+        "format": "pcm_s16le",
+        "sample_rate": sample_rate,
+        "volumes": volumes,
+        "slice_length": chunk_length_ms,
+        "display_text": display_text if chunk_index == 0 else None,
+        "actions": actions.to_dict() if actions and chunk_index == 0 else None,
+        "forwarded": forwarded,
+    }
+
+
 # Example usage:
 # payload, duration = prepare_audio_payload("path/to/audio.mp3", display_text="Hello", expression_list=[0,1,2])
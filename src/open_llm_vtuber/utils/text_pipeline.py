@@ -0,0 +1,370 @@
+"""
+Compiled text pipeline for expression extraction, display cleanup and TTS filtering.
+
+A `TextPipeline` is built once per Live2D model and TTS preprocessor config
+(see `Live2dModel.text_pipeline`). It compiles a single regex that matches the
+model's expression tags together with the characters the enabled TTS filters
+care about, so one scan over a sentence yields:
+
+- the expression indices of the emotion tags (`Live2dModel.extract_emotion`),
+- the display text with the forbidden expression tags removed,
+- the TTS text, as produced by `utils.tts_preprocessor.tts_filter` without a
+  translator (asterisks, brackets, parentheses, angle brackets, whitespace
+  cleanup and special characters).
+
+`tests/test_text_pipeline.py` compares the results with the original
+multi-pass functions.
+"""
+
+import re
+import unicodedata
+from dataclasses import dataclass, field
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+# Expression tags that are never shown in subtitles
+FORBIDDEN_EXPRESSIONS = (
+    "neutral",
+    "joy",
+    "smirk",
+    "confused",
+    "surprise",
+    "anger",
+    "sadness",
+    "disgust",
+    "fear",
+)
+
+FORBIDDEN_EXPRESSION_PATTERN = re.compile(
+    r"\[(?:" + "|".join(map(re.escape, FORBIDDEN_EXPRESSIONS)) + r")\]",
+    flags=re.IGNORECASE,
+)
+
+# One pattern per tag, applied in order, for the rare text where removing a tag
+# joins the halves of another one: "[jo[neutral]y]"
+_FORBIDDEN_TAG_PATTERNS = [
+    re.compile(rf"\[{re.escape(name)}\]", flags=re.IGNORECASE)
+    for name in FORBIDDEN_EXPRESSIONS
+]
+
+# Token kinds produced by the compiled pattern
+TAG = "tag"
+SPACE = "space"
+STARS = "stars"
+NESTED = "nested"
+PLAIN = "plain"
+
+
+class _SpeakableCharTable(dict):
+    """
+    `str.translate` table keeping letters, numbers, punctuation and whitespace.
+
+    The Unicode category of each code point is looked up once and cached, so
+    translating a sentence runs at C speed after warm-up.
+    """
+
+    def __missing__(self, codepoint: int) -> Optional[int]:
+        char = chr(codepoint)
+        keep = unicodedata.category(char)[0] in "LNP" or char.isspace()
+        value = codepoint if keep else None
+        self[codepoint] = value
+        return value
+
+
+_SPEAKABLE_CHARS = _SpeakableCharTable()
+
+
+def remove_special_characters(text: str) -> str:
+    """Same as `utils.tts_preprocessor.remove_special_characters`, table driven."""
+    return unicodedata.normalize("NFKC", text).translate(_SPEAKABLE_CHARS)
+
+
+class FilterFlags(NamedTuple):
+    """Filter flags of a TTS preprocessor config, used as pipeline cache key."""
+
+    remove_special_char: bool = False
+    ignore_brackets: bool = True
+    ignore_parentheses: bool = True
+    ignore_asterisks: bool = True
+    ignore_angle_brackets: bool = True
+
+
+@dataclass
+class ProcessedText:
+    """Result of running a sentence through a `TextPipeline`."""
+
+    expressions: List[int] = field(default_factory=list)
+    display_text: str = ""
+    tts_text: str = ""
+
+
+class _FilterScan:
+    """
+    State of one TTS filter scan, fed with the tokens of the compiled pattern.
+
+    The original filters run one after another (asterisks, then brackets,
+    parentheses and angle brackets, each followed by whitespace cleanup). Here
+    every token goes through the same stages in the same order, so the result
+    is identical while the text is read only once.
+    """
+
+    def __init__(self, pipeline: "TextPipeline"):
+        self.asterisks = pipeline.ignore_asterisks
+        self.nested = pipeline.nested_pairs
+        self.depths = [0] * len(self.nested)
+        self.out: List[str] = []
+        self.pending_space = False
+        # Asterisk stage: length of the opening run and the tokens after it
+        self.star_run = 0
+        self.star_buffer: List[Tuple[str, str]] = []
+        # Stars right after a closing run still belong to that run
+        self.absorb_stars = False
+
+    def feed(self, kind: str, token: str) -> None:
+        if not self.asterisks:
+            self._filter_nested(kind, token)
+            return
+
+        if kind == STARS:
+            if self.absorb_stars:
+                return
+            if not self.star_run:
+                self.star_run = len(token)
+            elif not self.star_buffer:
+                self.star_run += len(token)
+            else:
+                # Closing run found: drop everything from the opening run
+                self.star_run = 0
+                self.star_buffer = []
+                self.absorb_stars = True
+            return
+
+        self.absorb_stars = False
+        if not self.star_run:
+            self._filter_nested(kind, token)
+        elif kind == SPACE and "\n" in token:
+            # Asterisk pairs do not span lines
+            self._release_stars()
+            self._filter_nested(kind, token)
+        else:
+            self.star_buffer.append((kind, token))
+
+    def _release_stars(self) -> None:
+        """Flush an unclosed asterisk run: a single '*' stays, longer runs go."""
+        buffered = self.star_buffer
+        if self.star_run == 1:
+            self._filter_nested(PLAIN, "*")
+        self.star_run = 0
+        self.star_buffer = []
+        for kind, token in buffered:
+            self._filter_nested(kind, token)
+
+    def _filter_nested(self, kind: str, token: str) -> None:
+        if kind == NESTED:
+            for i, (left, right) in enumerate(self.nested):
+                if token == left:
+                    self.depths[i] += 1
+                    return
+                if token == right:
+                    if self.depths[i]:
+                        self.depths[i] -= 1
+                    return
+                if self.depths[i]:
+                    return
+        elif any(self.depths):
+            return
+
+        if kind == SPACE:
+            self.pending_space = bool(self.out)
+            return
+        if self.pending_space:
+            self.out.append(" ")
+            self.pending_space = False
+        self.out.append(token)
+
+    def result(self) -> str:
+        if self.star_run:
+            self._release_stars()
+        return "".join(self.out)
+
+
+class TextPipeline:
+    """
+    Precompiled expression extraction and TTS filtering for one model and config.
+
+    Args:
+        emo_map (dict): Lower-cased emotion keyword to expression index.
+        remove_special_char (bool): Whether to remove special characters.
+        ignore_brackets (bool): Whether to ignore text within brackets.
+        ignore_parentheses (bool): Whether to ignore text within parentheses.
+        ignore_asterisks (bool): Whether to ignore text within asterisks.
+        ignore_angle_brackets (bool): Whether to ignore text within angle brackets.
+    """
+
+    def __init__(
+        self,
+        emo_map: Optional[Dict[str, int]] = None,
+        remove_special_char: bool = False,
+        ignore_brackets: bool = True,
+        ignore_parentheses: bool = True,
+        ignore_asterisks: bool = True,
+        ignore_angle_brackets: bool = True,
+    ):
+        self.emo_map: Dict[str, int] = {
+            k.lower(): v for k, v in (emo_map or {}).items()
+        }
+        self.remove_special_char = remove_special_char
+        self.ignore_asterisks = ignore_asterisks
+        self.nested_pairs: List[Tuple[str, str]] = [
+            pair
+            for pair, enabled in (
+                (("[", "]"), ignore_brackets),
+                (("(", ")"), ignore_parentheses),
+                (("<", ">"), ignore_angle_brackets),
+            )
+            if enabled
+        ]
+        # Every filter but the special characters one also normalizes whitespace
+        self.filtering = ignore_asterisks or bool(self.nested_pairs)
+
+        tag_names = sorted(
+            set(self.emo_map) | set(FORBIDDEN_EXPRESSIONS), key=len, reverse=True
+        )
+        self._emotion_pattern = (
+            re.compile(
+                r"\[(?:"
+                + "|".join(
+                    re.escape(k) for k in sorted(self.emo_map, key=len, reverse=True)
+                )
+                + r")\]",
+                flags=re.IGNORECASE,
+            )
+            if self.emo_map
+            else None
+        )
+
+        filter_groups = []
+        if self.filtering:
+            filter_groups.append(rf"(?P<{SPACE}>\s+)")
+        if ignore_asterisks:
+            filter_groups.append(rf"(?P<{STARS}>\*+)")
+        if self.nested_pairs:
+            chars = "".join(re.escape(c) for pair in self.nested_pairs for c in pair)
+            filter_groups.append(rf"(?P<{NESTED}>[{chars}])")
+        self._filter_pattern = (
+            re.compile("|".join(filter_groups)) if filter_groups else None
+        )
+
+        tag_group = rf"(?P<{TAG}>\[(?:" + "|".join(map(re.escape, tag_names)) + r")\])"
+        self._pattern = re.compile(
+            "|".join([tag_group, *filter_groups]), flags=re.IGNORECASE
+        )
+
+    @staticmethod
+    def config_key(tts_preprocessor_config=None) -> FilterFlags:
+        """Hashable key of the filter flags of a `TTSPreprocessorConfig`."""
+        if tts_preprocessor_config is None:
+            return FilterFlags()
+        return FilterFlags(
+            remove_special_char=tts_preprocessor_config.remove_special_char,
+            ignore_brackets=tts_preprocessor_config.ignore_brackets,
+            ignore_parentheses=tts_preprocessor_config.ignore_parentheses,
+            ignore_asterisks=tts_preprocessor_config.ignore_asterisks,
+            ignore_angle_brackets=tts_preprocessor_config.ignore_angle_brackets,
+        )
+
+    def process(self, text: str) -> ProcessedText:
+        """
+        Extract expressions, strip forbidden tags and filter for TTS in one scan.
+
+        Returns:
+            ProcessedText: expressions found in `text`, the display text and the
+            TTS text computed from the display text.
+            Text where stripping a forbidden tag forms another one falls back
+            to tag-by-tag removal, as the original display processor did.
+        """
+        result = ProcessedText()
+        display: List[str] = []
+        scan = _FilterScan(self) if self.filtering else None
+
+        pos = 0
+        for match in self._pattern.finditer(text):
+            start = match.start()
+            if start > pos:
+                plain = text[pos:start]
+                display.append(plain)
+                if scan:
+                    scan.feed(PLAIN, plain)
+            token = match.group()
+            kind = match.lastgroup
+            pos = match.end()
+
+            if kind == TAG:
+                name = token[1:-1].lower()
+                if name in self.emo_map:
+                    result.expressions.append(self.emo_map[name])
+                if name in FORBIDDEN_EXPRESSIONS:
+                    continue
+                display.append(token)
+                if scan:
+                    self._feed(scan, token)
+            else:
+                display.append(token)
+                scan.feed(kind, token)
+
+        if pos < len(text):
+            display.append(text[pos:])
+            if scan:
+                scan.feed(PLAIN, text[pos:])
+
+        result.display_text = "".join(display)
+        if FORBIDDEN_EXPRESSION_PATTERN.search(result.display_text):
+            result.display_text = text
+            for pattern in _FORBIDDEN_TAG_PATTERNS:
+                result.display_text = pattern.sub("", result.display_text)
+            result.tts_text = self.filter_tts(result.display_text)
+            return result
+
+        tts_text = scan.result() if scan else result.display_text
+        if self.remove_special_char:
+            tts_text = remove_special_characters(tts_text)
+        result.tts_text = tts_text
+        return result
+
+    def _feed(self, scan: _FilterScan, text: str) -> None:
+        pos = 0
+        for match in self._filter_pattern.finditer(text):
+            if match.start() > pos:
+                scan.feed(PLAIN, text[pos : match.start()])
+            scan.feed(match.lastgroup, match.group())
+            pos = match.end()
+        if pos < len(text):
+            scan.feed(PLAIN, text[pos:])
+
+    def filter_tts(self, text: str) -> str:
+        """Apply the enabled TTS filters to `text` (no expression handling)."""
+        if self.filtering:
+            scan = _FilterScan(self)
+            self._feed(scan, text)
+            text = scan.result()
+        if self.remove_special_char:
+            text = remove_special_characters(text)
+        return text
+
+    def extract_emotion(self, text: str) -> List[int]:
+        """Return the expression indices of the emotion tags in `text`, in order."""
+        if self._emotion_pattern is None:
+            return []
+        return [
+            self.emo_map[match.group()[1:-1].lower()]
+            for match in self._emotion_pattern.finditer(text)
+        ]
+
+    def remove_emotion_keywords(self, text: str) -> str:
+        """Remove the emotion tags from `text`."""
+        if self._emotion_pattern is None:
+            return text
+        count = 1
+        while count:
+            # Removing a tag can join the halves of another one: "[jo[joy]y]"
+            text, count = self._emotion_pattern.subn("", text)
+        return text
@@ -0,0 +1,176 @@
+"""
+Adaptive end-of-utterance detection for the Silero VAD state machine.
+
+With a fixed hangover, every utterance ends after the same silence:
+answers to a quick question wait as long as a speaker hesitating in the
+middle of a sentence. The Endpointer of a session sets the silence that
+ends the utterance in progress from
+
+- the pauses its speaker makes within utterances: speech that resumed
+  after a pause shows how long this speaker pauses without being done;
+- the interim transcript: terminal punctuation shortens the hangover, a
+  trailing comma or conjunction (the clause is not finished) lengthens it.
+"""
+
+import re
+import time
+from collections import deque
+from typing import Optional, Tuple
+
+import numpy as np
+from loguru import logger
+
+# Silences shorter than this are gaps between words, not pauses
+MIN_PAUSE_WINDOWS = 6
+PAUSE_HISTORY = 50
+# Pauses observed before they replace the configured hangover
+MIN_LEARNED_PAUSES = 5
+PAUSE_PERCENTILE = 90
+PAUSE_MARGIN_WINDOWS = 4
+
+COMPLETE_FACTOR = 0.5
+CONTINUATION_FACTOR = 1.5
+
+TERMINAL_PUNCTUATION = ".!?。！？…"
+CONTINUATION_PUNCTUATION = ",;:-—，、；："
+# Last words of an unfinished clause
+CONTINUATION_WORDS = set(
+    "and but or so because if that the a to of with then um uh".split()
+    + "и но а или что чтобы потому если когда как в на с к по ну э".split()
+)
+_LAST_WORD = re.compile(r"(\w+)\W*$")
+
+
+def transcript_cue(text: Optional[str]) -> str:
+    """
+    What the end of an interim transcript says about the utterance:
+    "complete", "continuation" or "none" (no transcript, or no sign).
+    """
+    text = (text or "").rstrip()
+    if not text:
+        return "none"
+    if text[-1] in TERMINAL_PUNCTUATION:
+        return "complete"
+    if text[-1] in CONTINUATION_PUNCTUATION:
+        return "continuation"
+    match = _LAST_WORD.search(text)
+    if match and match.group(1).lower() in CONTINUATION_WORDS:
+        return "continuation"
+    return "none"
+
+
+class Endpointer:
+    """
+    Hangover of one speaker's utterances, in VAD windows.
+
+    Args:
+        default_windows (int): Hangover until enough pauses are observed.
+        min_windows (int): Shortest hangover.
+        max_windows (int): Longest hangover.
+        window_seconds (float): Duration of a VAD window, for logs and metrics.
+    """
+
+    def __init__(
+        self,
+        default_windows: int,
+        min_windows: int,
+        max_windows: int,
+        window_seconds: float,
+    ):
+        self.default_windows = default_windows
+        self.min_windows = min_windows
+        self.max_windows = max(max_windows, min_windows)
+        self.window_seconds = window_seconds
+        self.pauses: deque[int] = deque(maxlen=PAUSE_HISTORY)
+        self.transcript: Optional[str] = None
+        # Silence that ended the last utterance, to notice it was cut short
+        self._last_end_windows: Optional[int] = None
+        # perf_counter() time the last speech window of the utterance ended
+        self._last_speech_at: Optional[float] = None
+        # (latency, transcript cue) of the last utterance sent, until taken
+        self._decision: Optional[Tuple[float, str]] = None
+
+    def learned_windows(self) -> Optional[int]:
+        """Hangover fitting the observed pauses, None until there are enough."""
+        if len(self.pauses) < MIN_LEARNED_PAUSES:
+            return None
+        return int(np.percentile(self.pauses, PAUSE_PERCENTILE)) + PAUSE_MARGIN_WINDOWS
+
+    def hangover_windows(self) -> int:
+        """Silence, in windows, that ends the utterance in progress."""
+        windows = self.learned_windows() or self.default_windows
+        cue = transcript_cue(self.transcript)
+        if cue == "complete":
+            windows *= COMPLETE_FACTOR
+        elif cue == "continuation":
+            windows *= CONTINUATION_FACTOR
+        return int(min(max(round(windows), self.min_windows), self.max_windows))
+
+    def observe_pause(self, windows: int) -> None:
+        """Speech resumed after `windows` of silence within an utterance."""
+        if windows >= MIN_PAUSE_WINDOWS:
+            self.pauses.append(windows)
+
+    def set_transcript(self, text: Optional[str]) -> None:
+        self.transcript = text
+
+    def speech_heard(self, at: float) -> None:
+        """A speech window of the utterance ended at perf_counter() time `at`."""
+        self._last_speech_at = at
+
+    def speech_started(self, idle_windows: int) -> None:
+        """
+        A new utterance started `idle_windows` after the last one ended.
+        When the whole silence is within the longest hangover, the last
+        utterance was probably ended at a pause: it is learned as one.
+        """
+        if self._last_end_windows is not None:
+            silence = self._last_end_windows + idle_windows
+            if silence < self.max_windows:
+                logger.debug(
+                    f"Speech resumed {silence * self.window_seconds:.2f}s after "
+                    "the end of an utterance, learning it as a pause"
+                )
+                self.observe_pause(silence)
+        self._last_end_windows = None
+        self._last_speech_at = None
+        self.transcript = None
+
+    def utterance_ended(
+        self,
+        silence_windows: int,
+        hangover_windows: int,
+        sent: bool = True,
+        now: Optional[float] = None,
+    ) -> None:
+        """
+        Record the endpointing decision of an utterance, made at
+        perf_counter() time `now`; `sent` is false for speech too short to be
+        sent to ASR, which is not logged.
+        """
+        now = time.perf_counter() if now is None else now
+        self._last_end_windows = silence_windows
+        cue = transcript_cue(self.transcript)
+        last_speech_at = self._last_speech_at
+        self._last_speech_at = None
+        self.transcript = None
+        if not sent:
+            return
+        seconds = silence_windows * self.window_seconds
+        # From the end of the last speech window to the decision
+        latency = now - last_speech_at if last_speech_at is not None else seconds
+        self._decision = (latency, cue)
+        logger.info(
+            f"End of utterance after {seconds * 1000:.0f} ms of silence, "
+            f"{latency * 1000:.0f} ms after the last speech "
+            f"(hangover {hangover_windows} windows, transcript cue: {cue}, "
+            f"{len(self.pauses)} pauses learned)"
+        )
+
+    def take_decision(self) -> Optional[Tuple[float, str]]:
+        """
+        Endpointing latency in seconds and transcript cue of the last utterance
+        sent, once; None when there is none.
+        """
+        decision, self._decision = self._decision, None
+        return decision
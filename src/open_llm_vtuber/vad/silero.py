@@ -1,13 +1,15 @@
 import asyncio
-from collections import deque
+import threading
+import time
 from enum import Enum
+from importlib.resources import files
+from typing import Literal
 
 import numpy as np
-import torch
 from loguru import logger
 from pydantic import BaseModel
-from silero_vad import load_silero_vad
 
+from .endpointing import Endpointer
 from .vad_interface import VADInterface
 
 
@@ -19,9 +21,102 @@ class SileroVADConfig(BaseModel):
     required_hits: int = 3  # 3 * (0.032) = 0.1s
     required_misses: int = 24  # 24 * (0.032) = 0.8s
     smoothing_window: int = 5
+    backend: Literal["onnx", "torch"] = "onnx"
+    adaptive_endpointing: bool = False
+    min_misses: int = 8  # 8 * (0.032) = 0.26s
+    max_misses: int = 48  # 48 * (0.032) = 1.5s
+
+
+class _OnnxSileroModel:
+    """
+    The packaged Silero ONNX model on onnxruntime. The recurrent state and
+    the context samples are passed in and returned, so one session serves
+    every stream without copying through torch tensors.
+    """
+
+    def __init__(self, sample_rate: int, context_size: int):
+        import onnxruntime
+
+        options = onnxruntime.SessionOptions()
+        # Windows are tiny; thread handoffs would cost more than they save
+        options.inter_op_num_threads = 1
+        options.intra_op_num_threads = 1
+        self.session = onnxruntime.InferenceSession(
+            str(files("silero_vad.data") / "silero_vad.onnx"),
+            sess_options=options,
+            providers=["CPUExecutionProvider"],
+        )
+        self.context_size = context_size
+        self._sr = np.array(sample_rate, dtype=np.int64)
+        # Model input (context + window) per batch size, reused between calls
+        self._inputs: dict[int, np.ndarray] = {}
+
+    def run(
+        self, windows: np.ndarray, state: np.ndarray, context: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        batch, size = windows.shape
+        inputs = self._inputs.get(batch)
+        if inputs is None or inputs.shape[1] != self.context_size + size:
+            inputs = np.empty((batch, self.context_size + size), dtype=np.float32)
+            self._inputs[batch] = inputs
+        inputs[:, : self.context_size] = context
+        inputs[:, self.context_size :] = windows
+        probs, state = self.session.run(
+            None, {"input": inputs, "state": state, "sr": self._sr}
+        )
+        return probs.reshape(-1), state, inputs[:, -self.context_size :].copy()
+
+
+class _TorchSileroModel:
+    """
+    The Silero JIT model. Silero v5 keeps the recurrent state of the last
+    call in _state / _context; they are swapped in and out around each call.
+    """
+
+    def __init__(self, sample_rate: int, context_size: int):
+        import torch
+        from silero_vad import load_silero_vad
+
+        self.torch = torch
+        self.model = load_silero_vad()
+        if not (hasattr(self.model, "_state") and hasattr(self.model, "_context")):
+            raise RuntimeError(
+                "Silero-VAD model without _state/_context, use the onnx backend"
+            )
+        self.sample_rate = sample_rate
+
+    def run(
+        self, windows: np.ndarray, state: np.ndarray, context: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        torch = self.torch
+        with torch.no_grad():
+            self.model._state = torch.from_numpy(state)
+            self.model._context = torch.from_numpy(context)
+            self.model._last_sr = self.sample_rate
+            self.model._last_batch_size = len(windows)
+            probs = self.model(torch.from_numpy(windows), self.sample_rate)
+            return (
+                probs.numpy().reshape(-1),
+                self.model._state.numpy(),
+                self.model._context.numpy(),
+            )
 
 
 class VADEngine(VADInterface):
+    """
+    Silero VAD. The model is loaded once and shared by the sessions created
+    with `create_session` (one per client), each with its own state machine
+    and recurrent model state. Windows submitted by several sessions in the
+    same event loop tick are scored in one batched model call.
+
+    The default `onnx` backend runs the packaged ONNX model on onnxruntime
+    with numpy state; `torch` runs the JIT model.
+
+    With `adaptive_endpointing`, the silence ending an utterance is set per
+    session by an Endpointer (see vad.endpointing), between `min_misses`
+    and `max_misses` windows, instead of the fixed `required_misses`.
+    """
+
     def __init__(
         self,
         orig_sr: int = 16000,
@@ -31,6 +126,10 @@ class VADEngine(VADInterface):
         required_hits: int = 3,
         required_misses: int = 24,
         smoothing_window: int = 5,
+        backend: str = "onnx",
+        adaptive_endpointing: bool = False,
+        min_misses: int = 8,
+        max_misses: int = 48,
     ):
         self.config = SileroVADConfig(
             orig_sr=orig_sr,
@@ -40,39 +139,161 @@ class VADEngine(VADInterface):
             required_hits=required_hits,
             required_misses=required_misses,
             smoothing_window=smoothing_window,
+            backend=backend,
+            adaptive_endpointing=adaptive_endpointing,
+            min_misses=min_misses,
+            max_misses=max_misses,
         )
-        self.model = self.load_vad_model()
-        self.state = StateMachine(self.config)
         self.window_size_samples = 512 if self.config.target_sr == 16000 else 256
         # 512 / 16000 = 0.032s
+        self.context_size = 64 if self.config.target_sr == 16000 else 32
+        self.model = self.load_vad_model()
+        self._model_lock = threading.Lock()
+        # (session, windows, future) waiting for the next batch
+        self._requests: list[tuple["VADSession", np.ndarray, asyncio.Future]] = []
+        self._runner: asyncio.Task | None = None
+        # Session of the legacy detect_speech method
+        self._default_session = VADSession(self)
 
     def load_vad_model(self):
-        logger.info("Loading Silero-VAD model...")
-        return load_silero_vad()
+        logger.info(f"Loading Silero-VAD model ({self.config.backend} backend)...")
+        if self.config.backend == "onnx":
+            return _OnnxSileroModel(self.config.target_sr, self.context_size)
+        return _TorchSileroModel(self.config.target_sr, self.context_size)
+
+    def create_session(self) -> "VADSession":
+        return VADSession(self)
+
+    def detect_speech(self, audio_data: list[float]):
+        yield from self._default_session.detect_speech(audio_data)
+
+    def infer(self, sessions: list["VADSession"], windows: np.ndarray) -> np.ndarray:
+        """
+        Speech probabilities of one window per session (windows[i] belongs
+        to sessions[i]), in a single model call.
+        """
+        state = np.concatenate([s.model_state for s in sessions], axis=1)
+        context = np.concatenate([s.model_context for s in sessions], axis=0)
+        with self._model_lock:
+            probs, state, context = self.model.run(windows, state, context)
+        for i, session in enumerate(sessions):
+            session.model_state = state[:, i : i + 1]
+            session.model_context = context[i : i + 1]
+        return probs
+
+    def _infer_requests(
+        self, requests: list[tuple["VADSession", np.ndarray, asyncio.Future]]
+    ) -> list[np.ndarray]:
+        """
+        Score the windows of several sessions, one window per session per
+        model call: the model is recurrent, so the windows of one stream
+        are scored in order.
+        """
+        results = [
+            np.empty(len(windows), dtype=np.float32) for _, windows, _ in requests
+        ]
+        steps = max(len(windows) for _, windows, _ in requests)
+        for step in range(steps):
+            active = [i for i, (_, w, _) in enumerate(requests) if len(w) > step]
+            if len(active) == 1:
+                session, windows, _ = requests[active[0]]
+                probs = self.infer([session], windows[step : step + 1])
+            else:
+                probs = self.infer(
+                    [requests[i][0] for i in active],
+                    np.stack([requests[i][1][step] for i in active]),
+                )
+            for i, prob in zip(active, probs):
+                results[i][step] = prob
+        return results
+
+    async def score(self, session: "VADSession", windows: np.ndarray) -> np.ndarray:
+        """Speech probability of each window, batched with the other sessions."""
+        future = asyncio.get_running_loop().create_future()
+        self._requests.append((session, windows, future))
+        if self._runner is None or self._runner.done():
+            self._runner = asyncio.create_task(self._run_batches())
+        return await future
+
+    async def _run_batches(self) -> None:
+        while self._requests:
+            # Let the sessions handling audio in this tick join the batch
+            await asyncio.sleep(0)
+            batch, queued, seen = [], [], set()
+            for request in self._requests:
+                # A session's windows must be scored in order, one batch at a time
+                if id(request[0]) in seen:
+                    queued.append(request)
+                else:
+                    seen.add(id(request[0]))
+                    batch.append(request)
+            self._requests = queued
+            try:
+                results = await asyncio.to_thread(self._infer_requests, batch)
+            except Exception as e:
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for (_, _, future), probs in zip(batch, results):
+                if not future.done():
+                    future.set_result(probs)
+
+
+class VADSession(VADInterface):
+    """Speech detection state of one client, on the model of a VADEngine."""
+
+    def __init__(self, engine: VADEngine):
+        self.engine = engine
+        self.state = StateMachine(engine.config, engine.window_size_samples)
+        self.model_state = np.zeros((2, 1, 128), dtype=np.float32)
+        self.model_context = np.zeros((1, engine.context_size), dtype=np.float32)
+        # Samples of the last chunk that did not fill a window
+        self._leftover = np.empty(0, dtype=np.float32)
+
+    def _take_windows(self, audio_data) -> np.ndarray:
+        """Whole windows of the leftover plus the new audio, shape (n, window size)."""
+        audio_np = np.asarray(audio_data, dtype=np.float32)
+        if len(self._leftover):
+            audio_np = np.concatenate([self._leftover, audio_np])
+        size = self.engine.window_size_samples
+        whole = len(audio_np) - len(audio_np) % size
+        self._leftover = audio_np[whole:].copy()
+        return audio_np[:whole].reshape(-1, size)
 
     def detect_speech(self, audio_data: list[float]):
-        audio_np = np.array(audio_data, dtype=np.float32)
-        for i in range(0, len(audio_np), self.window_size_samples):
-            chunk_np = audio_np[i : i + self.window_size_samples]
-            if len(chunk_np) < self.window_size_samples:
-                break
-            chunk = torch.Tensor(chunk_np)
+        windows = self._take_windows(audio_data)
+        probs = np.empty(len(windows), dtype=np.float32)
+        for i in range(len(windows)):
+            probs[i] = self.engine.infer([self], windows[i : i + 1])[0]
+        yield from self.state.process_windows(probs, windows)
+
+    async def async_detect_speech(self, audio_data) -> list[bytes]:
+        windows = self._take_windows(audio_data)
+        if not len(windows):
+            return []
+        probs = await self.engine.score(self, windows)
+        return self.state.process_windows(probs, windows)
 
-            with torch.no_grad():
-                speech_prob = self.model(chunk, self.config.target_sr).item()
+    def take_speech_audio(self) -> np.ndarray | None:
+        return self.state.take_speech()
 
-            if speech_prob:
-                # print(speech_prob)
-                iter = self.state.get_result(speech_prob, chunk_np)
+    def set_transcript_hint(self, text: str | None) -> None:
+        if self.state.endpointer is not None:
+            self.state.endpointer.set_transcript(text)
 
-                for probs, dbs, chunk in iter:  # detected a sequence of voice bytes
-                    # rounded_probs = [round(x, 2) for x in probs]
-                    # rounded_dbs = [round(y, 2) for y in dbs]
+    def take_endpointing(self) -> tuple[float, str] | None:
+        if self.state.endpointer is None:
+            return None
+        return self.state.endpointer.take_decision()
 
-                    audio_chunk = bytes(chunk)
-                    yield audio_chunk
+    @property
+    def speech_ending(self) -> bool:
+        return self.state.state == State.INACTIVE
 
-        del audio_np
+    @property
+    def speech_resumes(self) -> int:
+        return self.state.resumes
 
 
 # Define state enumeration
@@ -82,110 +303,241 @@ class State(Enum):
     INACTIVE = 3  # Speech end state (silence state)
 
 
+PRE_BUFFER_WINDOWS = 20
+# Initial capacity of the speech buffer; it doubles when a longer utterance needs it
+SPEECH_BUFFER_SECONDS = 10
+# Utterances of fewer windows are not sent to ASR
+MIN_SPEECH_WINDOWS = 30
+
+
+def _moving_average(
+    history: np.ndarray, values: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Mean of each value and the len(history) values before it; NaN entries of
+    the history (start of a stream) are left out. Returns the means and the
+    history for the next call.
+    """
+    series = np.concatenate([history, values])
+    windows = np.lib.stride_tricks.sliding_window_view(series, len(history) + 1)
+    return np.nanmean(windows, axis=1), series[len(series) - len(history) :]
+
+
+class _SampleBuffer:
+    """Preallocated float32 samples; the capacity doubles when it runs out."""
+
+    def __init__(self, capacity: int):
+        self._data = np.empty(capacity, dtype=np.float32)
+        self.size = 0
+
+    def append(self, samples: np.ndarray) -> None:
+        end = self.size + len(samples)
+        if end > len(self._data):
+            grown = np.empty(max(end, 2 * len(self._data)), dtype=np.float32)
+            grown[: self.size] = self._data[: self.size]
+            self._data = grown
+        self._data[self.size : end] = samples
+        self.size = end
+
+    def samples(self) -> np.ndarray:
+        return self._data[: self.size]
+
+    def clear(self) -> None:
+        self.size = 0
+
+
+class _WindowRing:
+    """The last `count` windows, in a preallocated float32 ring."""
+
+    def __init__(self, count: int, window_size: int):
+        self._data = np.empty((count, window_size), dtype=np.float32)
+        self._start = 0
+        self._length = 0
+
+    def append(self, window: np.ndarray) -> None:
+        count = len(self._data)
+        self._data[(self._start + self._length) % count] = window
+        if self._length < count:
+            self._length += 1
+        else:
+            self._start = (self._start + 1) % count
+
+    def samples(self) -> np.ndarray:
+        order = (self._start + np.arange(self._length)) % len(self._data)
+        return self._data[order].reshape(-1)
+
+    def clear(self) -> None:
+        self._start = 0
+        self._length = 0
+
+
 class StateMachine:
-    def __init__(self, config: SileroVADConfig):
+    def __init__(self, config: SileroVADConfig, window_size: int = 512):
         self.state = State.IDLE
         self.prob_threshold = config.prob_threshold
         self.db_threshold = config.db_threshold
         self.required_hits = config.required_hits
         self.required_misses = config.required_misses
         self.smoothing_window = config.smoothing_window
+        self.window_seconds = window_size / config.target_sr
 
-        self.probs = []
-        self.dbs = []
-        self.bytes = bytearray()
         self.miss_count = 0
         self.hit_count = 0
 
-        self.prob_window = deque(maxlen=self.smoothing_window)
-        self.db_window = deque(maxlen=self.smoothing_window)
-
-        self.pre_buffer = deque(maxlen=20)
-
-    @classmethod
-    def calculate_db(cls, audio_data: np.ndarray) -> float:
-        rms = np.sqrt(np.mean(np.square(audio_data)))
-        return 20 * np.log10(rms + 1e-7) if rms > 0 else -np.inf
-
-    def update(self, chunk_bytes, prob, db):
-        self.probs.append(prob)
-        self.dbs.append(db)
-        self.bytes.extend(chunk_bytes)
-
-    def reset_buffers(self):
-        self.probs.clear()
-        self.dbs.clear()
-        self.bytes.clear()
-
-    def get_smoothed_values(self, prob, db):
-        self.prob_window.append(prob)
-        self.db_window.append(db)
-        smoothed_prob = np.mean(self.prob_window)
-        smoothed_db = np.mean(self.db_window)
-        return smoothed_prob, smoothed_db
-
-    def process(self, prob, float_chunk_np: np.ndarray):
-        int_chunk_np = float_chunk_np * 32767
-        chunk_bytes = int_chunk_np.astype(np.int16).tobytes()
-        db = self.calculate_db(int_chunk_np)
-
-        # Obtain the smoothed prob and db
-        smoothed_prob, smoothed_db = self.get_smoothed_values(prob, db)
-
+        # Values of the previous windows for smoothing, NaN until there are any
+        self.prob_history = np.full(self.smoothing_window - 1, np.nan)
+        self.db_history = np.full(self.smoothing_window - 1, np.nan)
+
+        self.pre_buffer = _WindowRing(PRE_BUFFER_WINDOWS, window_size)
+        self.speech = _SampleBuffer(SPEECH_BUFFER_SECONDS * config.target_sr)
+        self.speech_windows = 0
+        # Samples of the utterance in progress returned by take_speech
+        self.taken_samples = 0
+        # INACTIVE -> ACTIVE transitions: speech went on after a pause
+        self.resumes = 0
+        # Windows since the last utterance ended
+        self.idle_windows = 0
+
+        self.endpointer = None
+        if config.adaptive_endpointing:
+            # Speech is "ending" after the shortest hangover; how long the
+            # silence goes on before the utterance ends is up to the endpointer
+            self.required_misses = config.min_misses
+            self.endpointer = Endpointer(
+                config.required_misses,
+                config.min_misses,
+                config.max_misses,
+                self.window_seconds,
+            )
+
+    @staticmethod
+    def calculate_db(int_windows: np.ndarray) -> np.ndarray:
+        """Level in dB of each row of int16-scaled samples."""
+        rms = np.sqrt(np.mean(np.square(int_windows), axis=-1))
+        return np.where(rms > 0, 20 * np.log10(rms + 1e-7), -np.inf)
+
+    def _append(self, window: np.ndarray) -> None:
+        self.speech.append(window)
+        self.speech_windows += 1
+
+    def _utterance_bytes(self) -> bytes:
+        audio = np.concatenate([self.pre_buffer.samples(), self.speech.samples()])
+        return (audio * 32767).astype(np.int16).tobytes()
+
+    def take_speech(self) -> np.ndarray | None:
+        """
+        int16 samples of the utterance in progress added since the last call;
+        together they are a prefix of the utterance bytes. None when idle.
+        """
         if self.state == State.IDLE:
-            self.pre_buffer.append(chunk_bytes)
-            if (
-                smoothed_prob >= self.prob_threshold
-                and smoothed_db >= self.db_threshold
-            ):
-                self.hit_count += 1
-                if self.hit_count >= self.required_hits:
-                    self.state = State.ACTIVE
-                    self.update(chunk_bytes, smoothed_prob, smoothed_db)
-                    self.hit_count = 0
-                    yield [], [], b"<|PAUSE|>"
-            else:
-                self.hit_count = 0
-
-        elif self.state == State.ACTIVE:
-            self.update(chunk_bytes, smoothed_prob, smoothed_db)
-            if (
-                smoothed_prob >= self.prob_threshold
-                and smoothed_db >= self.db_threshold
-            ):
-                self.miss_count = 0
-            else:
-                self.miss_count += 1
-                if self.miss_count >= self.required_misses:
-                    self.state = State.INACTIVE
-                    self.miss_count = 0
+            return None
+        audio = self.speech.samples()[self.taken_samples :]
+        if not self.taken_samples:
+            audio = np.concatenate([self.pre_buffer.samples(), audio])
+        self.taken_samples = self.speech.size
+        return (audio * 32767).astype(np.int16)
+
+    def _hangover_windows(self) -> int:
+        """Silent windows in INACTIVE state that end the utterance."""
+        if self.endpointer is None:
+            return self.required_misses
+        return self.endpointer.hangover_windows()
+
+    def process_windows(self, probs: np.ndarray, windows: np.ndarray) -> list[bytes]:
+        """
+        Feed scored windows, shape (n, window size); returns the
+        <|PAUSE|> / <|RESUME|> markers and the int16 bytes of each
+        utterance that ended.
+        """
+        # Windows the model scored exactly 0 are ignored
+        scored = probs != 0
+        if not scored.all():
+            probs, windows = probs[scored], windows[scored]
+        if not len(probs):
+            return []
+
+        smoothed_probs, self.prob_history = _moving_average(
+            self.prob_history, probs.astype(np.float64)
+        )
+        smoothed_dbs, self.db_history = _moving_average(
+            self.db_history, self.calculate_db(windows * 32767)
+        )
+        speech = (smoothed_probs >= self.prob_threshold) & (
+            smoothed_dbs >= self.db_threshold
+        )
 
-        elif self.state == State.INACTIVE:
-            self.update(chunk_bytes, smoothed_prob, smoothed_db)
-            if (
-                smoothed_prob >= self.prob_threshold
-                and smoothed_db >= self.db_threshold
-            ):
-                self.hit_count += 1
-                if self.hit_count >= self.required_hits:
-                    self.state = State.ACTIVE
+        # perf_counter() time each window ended: the last one just arrived
+        now = time.perf_counter()
+        ended_at = now - np.arange(len(windows) - 1, -1, -1) * self.window_seconds
+
+        outputs = []
+        for window, is_speech, at in zip(windows, speech.tolist(), ended_at.tolist()):
+            if self.state == State.IDLE:
+                self.pre_buffer.append(window)
+                self.idle_windows += 1
+                if is_speech:
+                    self.hit_count += 1
+                    if self.hit_count >= self.required_hits:
+                        self.state = State.ACTIVE
+                        self._append(window)
+                        self.hit_count = 0
+                        outputs.append(b"<|PAUSE|>")
+                        if self.endpointer is not None:
+                            self.endpointer.speech_started(self.idle_windows)
+                            self.endpointer.speech_heard(at)
+                else:
                     self.hit_count = 0
+
+            elif self.state == State.ACTIVE:
+                self._append(window)
+                if is_speech:
+                    if self.endpointer is not None:
+                        self.endpointer.observe_pause(self.miss_count)
+                        self.endpointer.speech_heard(at)
                     self.miss_count = 0
-            else:
-                self.hit_count = 0
-                self.miss_count += 1
-                if self.miss_count >= self.required_misses:
-                    self.state = State.IDLE
-                    self.miss_count = 0
-                    yield [], [], b"<|RESUME|>"
-                    if len(self.probs) > 30:
-                        pre_bytes = b"".join(self.pre_buffer)
-                        yield self.probs, self.dbs, pre_bytes + self.bytes
-                        self.reset_buffers()
-                    self.pre_buffer.clear()
-
-    def get_result(self, input_num, chunk_np):
-        yield from self.process(input_num, chunk_np)
+                else:
+                    self.miss_count += 1
+                    if self.miss_count >= self.required_misses:
+                        self.state = State.INACTIVE
+                        if self.endpointer is None:
+                            self.miss_count = 0
+
+            elif self.state == State.INACTIVE:
+                self._append(window)
+                if is_speech:
+                    if self.endpointer is not None:
+                        self.endpointer.speech_heard(at)
+                    self.hit_count += 1
+                    if self.hit_count >= self.required_hits:
+                        self.state = State.ACTIVE
+                        self.hit_count = 0
+                        if self.endpointer is not None:
+                            self.endpointer.observe_pause(self.miss_count)
+                        self.miss_count = 0
+                        self.resumes += 1
+                else:
+                    self.hit_count = 0
+                    self.miss_count += 1
+                    hangover = self._hangover_windows()
+                    if self.miss_count >= hangover:
+                        if self.endpointer is not None:
+                            self.endpointer.utterance_ended(
+                                self.miss_count,
+                                hangover,
+                                sent=self.speech_windows > MIN_SPEECH_WINDOWS,
+                                now=at,
+                            )
+                        self.state = State.IDLE
+                        self.miss_count = 0
+                        self.idle_windows = 0
+                        outputs.append(b"<|RESUME|>")
+                        self.taken_samples = 0
+                        if self.speech_windows > MIN_SPEECH_WINDOWS:
+                            outputs.append(self._utterance_bytes())
+                            self.speech.clear()
+                            self.speech_windows = 0
+                        self.pre_buffer.clear()
+        return outputs
 
 
 async def vad_main():
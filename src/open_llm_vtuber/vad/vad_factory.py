@@ -18,4 +18,8 @@ class VADFactory:
                 kwargs.get("required_hits"),
                 kwargs.get("required_misses"),
                 kwargs.get("smoothing_window"),
+                kwargs.get("backend") or "onnx",
+                bool(kwargs.get("adaptive_endpointing")),
+                kwargs.get("min_misses") or 8,
+                kwargs.get("max_misses") or 48,
             )
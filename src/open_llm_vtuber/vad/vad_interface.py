@@ -1,4 +1,7 @@
 from abc import ABC, abstractmethod
+from typing import Optional, Tuple
+
+import numpy as np
 
 
 class VADInterface(ABC):
@@ -10,3 +13,50 @@ class VADInterface(ABC):
         :return: Returns a sequence of audio bytes containing human voice if voice activity is detected
         """
         pass
+
+    def create_session(self) -> "VADInterface":
+        """
+        Return a detector for one client: it shares this engine's model but
+        keeps its own detection state. Engines without per-stream state
+        return themselves.
+        """
+        return self
+
+    async def async_detect_speech(self, audio_data) -> list[bytes]:
+        """
+        Asynchronous detect_speech returning all the outputs of the audio data.
+        Engines can override it to run the model off the event loop.
+        """
+        return list(self.detect_speech(audio_data))
+
+    def take_speech_audio(self) -> Optional[np.ndarray]:
+        """
+        int16 samples of the utterance in progress that were not taken yet,
+        to transcribe it while it is spoken. None when no utterance is in
+        progress or the engine does not track it.
+        """
+        return None
+
+    def set_transcript_hint(self, text: Optional[str]) -> None:
+        """
+        Interim transcript of the utterance in progress, for engines that
+        adapt the end of speech detection to it.
+        """
+
+    def take_endpointing(self) -> Optional[Tuple[float, str]]:
+        """
+        Seconds from the last speech to the decision that ended the last
+        utterance, and the transcript cue it was made with; once per
+        utterance. None when the engine does not measure it.
+        """
+        return None
+
+    @property
+    def speech_ending(self) -> bool:
+        """Whether speech stopped and the engine waits to confirm its end."""
+        return False
+
+    @property
+    def speech_resumes(self) -> int:
+        """How many times speech went on after speech_ending became true."""
+        return 0
@@ -7,6 +7,7 @@ from enum import Enum
 import numpy as np
 from loguru import logger
 
+from .asr.streaming import StreamingTranscriber
 from .service_context import ServiceContext
 from .chat_group import (
     ChatGroupManager,
@@ -15,6 +16,13 @@ from .chat_group import (
     broadcast_to_group,
 )
 from .message_handler import message_handler
+from .utils.audio_ingest import (
+    INPUT_SAMPLE_RATE,
+    KIND_MIC_AUDIO,
+    AudioFrameReader,
+    UtteranceBuffer,
+)
+from .utils.audio_transport import AudioTransport
 from .utils.stream_audio import prepare_audio_payload
 from .chat_history_manager import (
     create_new_history,
@@ -40,6 +48,7 @@ from .conversations.conversation_handler import (
     handle_group_interrupt,
     handle_individual_interrupt,
 )
+from .tracing import turn_tracer
 
 
 class MessageType(Enum):
@@ -81,7 +90,9 @@ class WebSocketHandler:
         self.chat_group_manager = ChatGroupManager()
         self.current_conversation_tasks: Dict[str, Optional[asyncio.Task]] = {}
         self.default_context_cache = default_context_cache
-        self.received_data_buffers: Dict[str, np.ndarray] = {}
+        self.received_data_buffers: Dict[str, UtteranceBuffer] = {}
+        self._audio_readers: Dict[str, AudioFrameReader] = {}
+        self._transcribers: Dict[str, StreamingTranscriber] = {}
         self._client_connection_times: Dict[str, float] = {}
 
         # Message handlers mapping
@@ -114,6 +125,7 @@ class WebSocketHandler:
             "rag-memory-clear-all": self._handle_rag_memory_clear_all,
             "fetch-live2d-models": self._handle_fetch_live2d_models,
             "set-live2d-model": self._handle_set_live2d_model,
+            "audio-transport": self._handle_audio_transport,
         }
 
     async def handle_new_connection(
@@ -161,7 +173,11 @@ class WebSocketHandler:
         """Store client data and initialize group status"""
         self.client_connections[client_uid] = websocket
         self.client_contexts[client_uid] = session_service_context
-        self.received_data_buffers[client_uid] = np.array([])
+        self.received_data_buffers[client_uid] = UtteranceBuffer(
+            session_service_context.system_config.max_utterance_seconds
+            * INPUT_SAMPLE_RATE
+        )
+        self._audio_readers[client_uid] = AudioFrameReader(client_uid)
         self._client_connection_times[client_uid] = time.monotonic()
 
         self.chat_group_manager.client_group_map[client_uid] = ""
@@ -217,11 +233,13 @@ class WebSocketHandler:
             live2d_model=self.default_context_cache.live2d_model,
             asr_engine=self.default_context_cache.asr_engine,
             tts_engine=self.default_context_cache.tts_engine,
+            tts_scheduler=self.default_context_cache.tts_scheduler,
             vad_engine=self.default_context_cache.vad_engine,
             agent_engine=self.default_context_cache.agent_engine,
             translate_engine=self.default_context_cache.translate_engine,
             mcp_server_registery=self.default_context_cache.mcp_server_registery,
             tool_adapter=self.default_context_cache.tool_adapter,
+            mcp_session_pool=self.default_context_cache.mcp_session_pool,
             send_text=send_text,
             client_uid=client_uid,
             rag_engine=self.default_context_cache.rag_engine,
@@ -242,7 +260,15 @@ class WebSocketHandler:
         try:
             while True:
                 try:
-                    data = await websocket.receive_json()
+                    message = await websocket.receive()
+                    if message["type"] == "websocket.disconnect":
+                        raise WebSocketDisconnect(message.get("code", 1000))
+                    if message.get("bytes") is not None:
+                        await self._handle_audio_frame(
+                            websocket, client_uid, message["bytes"]
+                        )
+                        continue
+                    data = json.loads(message.get("text") or "")
                     message_handler.handle_message(client_uid, data)
                     await self._route_message(websocket, client_uid, data)
                 except WebSocketDisconnect:
@@ -330,7 +356,10 @@ class WebSocketHandler:
         self.client_connections.pop(client_uid, None)
         self.client_contexts.pop(client_uid, None)
         self.received_data_buffers.pop(client_uid, None)
+        self._audio_readers.pop(client_uid, None)
+        self._transcribers.pop(client_uid, None)
         self._client_connection_times.pop(client_uid, None)
+        turn_tracer.discard_pending(client_uid)
         if client_uid in self.current_conversation_tasks:
             task = self.current_conversation_tasks[client_uid]
             if task and not task.done():
@@ -349,6 +378,8 @@ class WebSocketHandler:
         self.client_connections.pop(client_uid, None)
         self.client_contexts.pop(client_uid, None)
         self.received_data_buffers.pop(client_uid, None)
+        self._audio_readers.pop(client_uid, None)
+        self._transcribers.pop(client_uid, None)
         self._client_connection_times.pop(client_uid, None)
         self.chat_group_manager.client_group_map.pop(client_uid, None)
 
@@ -547,35 +578,104 @@ class WebSocketHandler:
         """Handle incoming audio data"""
         audio_data = data.get("audio", [])
         if audio_data:
-            self.received_data_buffers[client_uid] = np.append(
-                self.received_data_buffers[client_uid],
-                np.array(audio_data, dtype=np.float32),
+            self.received_data_buffers[client_uid].append(
+                np.array(audio_data, dtype=np.float32)
             )
 
     async def _handle_raw_audio_data(
         self, websocket: WebSocket, client_uid: str, data: WSMessage
     ) -> None:
         """Handle incoming raw audio data for VAD processing"""
+        await self._detect_speech(websocket, client_uid, data.get("audio", []))
+
+    async def _handle_audio_frame(
+        self, websocket: WebSocket, client_uid: str, frame_bytes: bytes
+    ) -> None:
+        """Handle a binary audio frame (see utils.audio_ingest)"""
+        frame = self._audio_readers[client_uid].read(frame_bytes)
+        if frame is None:
+            return
+        if frame.kind == KIND_MIC_AUDIO:
+            self.received_data_buffers[client_uid].append(frame.samples)
+        else:
+            await self._detect_speech(websocket, client_uid, frame.samples)
+
+    async def _detect_speech(
+        self, websocket: WebSocket, client_uid: str, chunk
+    ) -> None:
+        """Run VAD on a chunk of microphone audio"""
         context = self.client_contexts[client_uid]
-        chunk = data.get("audio", [])
-        if chunk:
-            for audio_bytes in context.vad_engine.detect_speech(chunk):
+        if len(chunk) and context.vad_session:
+            vad = context.vad_session
+            transcriber = self._get_transcriber(client_uid, context, websocket)
+            if transcriber and transcriber.active:
+                vad.set_transcript_hint(transcriber.latest_text)
+            # Scored together with the audio of the other clients
+            for audio_bytes in await vad.async_detect_speech(chunk):
                 if audio_bytes == b"<|PAUSE|>":
                     await websocket.send_text(
                         json.dumps({"type": "control", "text": "interrupt"})
                     )
+                    if transcriber:
+                        await transcriber.start()
                 elif audio_bytes == b"<|RESUME|>":
                     pass
                 elif len(audio_bytes) > 1024:
                     # Detected audio activity (voice)
-                    self.received_data_buffers[client_uid] = np.append(
-                        self.received_data_buffers[client_uid],
-                        np.frombuffer(audio_bytes, dtype=np.int16).astype(np.float32),
+                    audio = np.frombuffer(audio_bytes, dtype=np.int16).astype(
+                        np.float32
                     )
+                    transcript = None
+                    if transcriber and transcriber.active:
+                        # Decoded in a task: this loop goes on reading the client
+                        transcript = transcriber.finish(audio, vad.speech_resumes)
+                    buffer = self.received_data_buffers[client_uid]
+                    # The transcript only stands for the buffer if it is
+                    # this utterance alone
+                    was_empty = not len(buffer)
+                    buffer.append(audio)
+                    if was_empty:
+                        buffer.transcript = transcript
+                    elif transcript is not None:
+                        transcript.cancel()
+                    endpointing = vad.take_endpointing()
+                    if endpointing is not None:
+                        latency, cue = endpointing
+                        turn_tracer.record_before_turn(
+                            client_uid, "endpointing", latency, cue=cue
+                        )
                     await websocket.send_text(
                         json.dumps({"type": "control", "text": "mic-audio-end"})
                     )
 
+            if transcriber and transcriber.active:
+                speech = vad.take_speech_audio()
+                if speech is None:
+                    # Too short to be an utterance
+                    transcriber.cancel()
+                else:
+                    await transcriber.feed(speech.astype(np.float32))
+                    if vad.speech_ending:
+                        transcriber.speculate(vad.speech_resumes)
+
+    def _get_transcriber(
+        self, client_uid: str, context: ServiceContext, websocket: WebSocket
+    ) -> Optional[StreamingTranscriber]:
+        """Streaming transcriber of the client, if asr_config.streaming is on"""
+        asr_config = context.character_config.asr_config
+        if not (asr_config and asr_config.streaming and context.asr_engine):
+            self._transcribers.pop(client_uid, None)
+            return None
+        transcriber = self._transcribers.get(client_uid)
+        if transcriber is None or transcriber.asr_engine is not context.asr_engine:
+            transcriber = StreamingTranscriber(
+                context.asr_engine,
+                websocket.send_text,
+                asr_config.partial_interval_ms / 1000,
+            )
+            self._transcribers[client_uid] = transcriber
+        return transcriber
+
     async def _handle_conversation_trigger(
         self, websocket: WebSocket, client_uid: str, data: WSMessage
     ) -> None:
@@ -642,6 +742,17 @@ class WebSocketHandler:
                     group_members, silent_payload, exclude_uid=client_uid
                 )
 
+    async def _handle_audio_transport(
+        self, websocket: WebSocket, client_uid: str, data: WSMessage
+    ) -> None:
+        """Negotiate binary audio frames (and their codec) with the frontend"""
+        transport = AudioTransport.negotiate(data, websocket.send_bytes)
+        self.client_contexts[client_uid].audio_transport = transport
+        logger.info(f"Audio transport for client {client_uid}: {transport.describe()}")
+        await websocket.send_text(
+            json.dumps({"type": "audio-transport-ack", **transport.describe()})
+        )
+
     async def _handle_group_info(
         self, websocket: WebSocket, client_uid: str, data: WSMessage
     ) -> None:
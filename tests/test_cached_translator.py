@@ -0,0 +1,175 @@
+"""CachedTranslator: LRU cache, coalescing, batching and interrupted turns."""
+
+import asyncio
+
+import pytest
+
+from open_llm_vtuber.translate.cached_translator import CachedTranslator
+from open_llm_vtuber.translate.translate_interface import TranslateInterface
+
+
+class FakeTranslator(TranslateInterface):
+    """Upper-cases texts; requests wait until `release` is set."""
+
+    def __init__(self, supports_batch=False, fail=False):
+        self.supports_batch = supports_batch
+        self.fail = fail
+        self.requests = []
+        self.release = asyncio.Event()
+        self.release.set()
+        self.cancelled = 0
+        self.closed = False
+
+    def translate(self, text: str) -> str:
+        self.requests.append([text])
+        return text.upper()
+
+    async def async_translate_batch(self, texts):
+        self.requests.append(list(texts))
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.fail:
+            raise RuntimeError("provider down")
+        return [text.upper() for text in texts]
+
+    async def async_translate(self, text):
+        return (await self.async_translate_batch([text]))[0]
+
+    async def aclose(self):
+        self.closed = True
+
+
+def test_lru_cache_evicts_the_least_recently_used():
+    provider = FakeTranslator()
+    translator = CachedTranslator(provider, cache_size=2)
+
+    assert translator.translate("a") == "A"
+    assert translator.translate("b") == "B"
+    assert translator.translate("a") == "A"
+    # "b" is the least recently used
+    assert translator.translate("c") == "C"
+    assert list(translator._cache) == ["a", "c"]
+    assert translator.translate("b") == "B"
+
+    assert provider.requests == [["a"], ["b"], ["c"], ["b"]]
+    assert (translator.hits, translator.misses) == (1, 4)
+
+
+def test_identical_texts_in_flight_share_one_request():
+    async def main():
+        provider = FakeTranslator()
+        provider.release.clear()
+        translator = CachedTranslator(provider)
+
+        calls = [
+            asyncio.create_task(translator.async_translate("hi")) for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+        provider.release.set()
+        results = await asyncio.gather(*calls)
+        # Then from the cache
+        results.append(await translator.async_translate("hi"))
+        return provider, translator, results
+
+    provider, translator, results = asyncio.run(main())
+    assert results == ["HI"] * 4
+    assert provider.requests == [["hi"]]
+    assert (translator.hits, translator.misses) == (1, 1)
+
+
+def test_batching_providers_get_texts_of_one_window_together():
+    async def main():
+        provider = FakeTranslator(supports_batch=True)
+        translator = CachedTranslator(provider, max_batch_size=2, batch_window=0.01)
+        results = await translator.async_translate_batch(["a", "b", "c", "a"])
+        return provider, results
+
+    provider, results = asyncio.run(main())
+    assert results == ["A", "B", "C", "A"]
+    assert provider.requests == [["a", "b"], ["c"]]
+
+
+def test_errors_reach_every_caller_and_are_not_cached():
+    async def main():
+        provider = FakeTranslator(fail=True)
+        translator = CachedTranslator(provider)
+        results = await asyncio.gather(
+            translator.async_translate("x"),
+            translator.async_translate("x"),
+            return_exceptions=True,
+        )
+        provider.fail = False
+        return provider, results, await translator.async_translate("x")
+
+    provider, results, retried = asyncio.run(main())
+    assert [str(r) for r in results] == ["provider down"] * 2
+    assert retried == "X"
+    assert provider.requests == [["x"], ["x"]]
+
+
+def test_request_nobody_waits_for_is_aborted():
+    async def main():
+        provider = FakeTranslator()
+        provider.release.clear()
+        translator = CachedTranslator(provider)
+
+        first = asyncio.create_task(translator.async_translate("hi"))
+        second = asyncio.create_task(translator.async_translate("hi"))
+        while not provider.requests:
+            await asyncio.sleep(0)
+        # One interrupted caller does not cancel the shared request
+        first.cancel()
+        await asyncio.sleep(0)
+        assert provider.cancelled == 0
+        second.cancel()
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        with pytest.raises(asyncio.CancelledError):
+            await second
+        return provider, translator
+
+    provider, translator = asyncio.run(main())
+    assert provider.cancelled == 1
+    assert translator.dropped == 1
+    assert not translator._inflight and not translator._requests
+
+
+def test_pending_text_nobody_waits_for_is_not_sent():
+    async def main():
+        provider = FakeTranslator(supports_batch=True)
+        translator = CachedTranslator(provider, batch_window=0.01)
+
+        dropped = asyncio.create_task(translator.async_translate("gone"))
+        kept = asyncio.create_task(translator.async_translate("kept"))
+        await asyncio.sleep(0)
+        dropped.cancel()
+        return provider, translator, await kept
+
+    provider, translator, kept = asyncio.run(main())
+    assert kept == "KEPT"
+    assert provider.requests == [["kept"]]
+    assert translator.dropped == 1
+
+
+def test_aclose_aborts_requests_and_closes_the_provider():
+    async def main():
+        provider = FakeTranslator()
+        provider.release.clear()
+        translator = CachedTranslator(provider)
+
+        call = asyncio.create_task(translator.async_translate("hi"))
+        # Until the request is sent
+        while not provider.requests:
+            await asyncio.sleep(0)
+        await translator.aclose()
+        with pytest.raises(asyncio.CancelledError):
+            await call
+        return provider, translator
+
+    provider, translator = asyncio.run(main())
+    assert provider.closed
+    assert provider.cancelled == 1
+    assert not translator._inflight
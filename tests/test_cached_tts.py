@@ -0,0 +1,212 @@
+"""CachedTTS: content-addressed files, LRU eviction and in-flight sharing."""
+
+import asyncio
+import os
+
+import numpy as np
+import pytest
+
+from open_llm_vtuber.tts import cached_tts
+from open_llm_vtuber.tts.cached_tts import CachedTTS, normalize_tts_text
+from open_llm_vtuber.tts.tts_interface import PCMAudio, PCMChunk, TTSInterface
+
+SAMPLE_RATE = 16000
+
+
+class FakeEngine(TTSInterface):
+    """Writes `size` bytes per sentence; syntheses wait until `release` is set."""
+
+    supports_streaming = True
+
+    def __init__(self, out_dir, size=1024):
+        self.out_dir = out_dir
+        self.size = size
+        self.calls = []
+        self.removed = []
+        self.release = asyncio.Event()
+        self.release.set()
+
+    def generate_audio(self, text, file_name_no_ext=None):
+        self.calls.append(text)
+        path = os.path.join(self.out_dir, f"{len(self.calls)}.wav")
+        with open(path, "wb") as f:
+            f.write(b"\0" * self.size)
+        return path
+
+    async def async_generate_audio(self, text, file_name_no_ext=None):
+        await self.release.wait()
+        return self.generate_audio(text, file_name_no_ext)
+
+    async def async_stream_audio(self, text):
+        self.calls.append(text)
+        for value in (1, 2, 3):
+            yield PCMChunk(np.full(100, value, dtype="<i2").tobytes(), SAMPLE_RATE)
+
+    def remove_file(self, filepath, verbose=True):
+        self.removed.append(filepath)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    out_dir = tmp_path / "out"
+    out_dir.mkdir()
+    return FakeEngine(str(out_dir))
+
+
+def make_cache(engine, tmp_path, **kwargs):
+    return CachedTTS(
+        engine, "fake", {"voice": "a"}, cache_dir=str(tmp_path / "cache"), **kwargs
+    )
+
+
+def test_key_depends_on_engine_params_and_normalized_text(engine, tmp_path):
+    cache = make_cache(engine, tmp_path)
+    other_voice = CachedTTS(
+        engine, "fake", {"voice": "b"}, cache_dir=str(tmp_path / "cache")
+    )
+    assert normalize_tts_text(" Hello　 world ") == "Hello world"
+    assert cache.cache_key("Hello  world") == cache.cache_key("Hello world ")
+    assert cache.cache_key("Hello") != other_voice.cache_key("Hello")
+    assert cache.cache_key("Hello") != cache.cache_key("Hello", pcm=True)
+
+
+def test_sentences_are_synthesized_once(engine, tmp_path):
+    cache = make_cache(engine, tmp_path)
+    first = cache.generate_audio("Hello")
+    assert first.startswith(cache.cache_dir)
+    assert cache.generate_audio(" Hello ") == first
+    assert asyncio.run(cache.async_generate_audio("Hello")) == first
+    assert engine.calls == ["Hello"]
+    assert (cache.hits, cache.misses) == (2, 1)
+
+    # Sent audio stays in the cache; other files go
+    cache.remove_file(first)
+    assert os.path.exists(first) and engine.removed == []
+    cache.remove_file("/elsewhere/a.wav")
+    assert engine.removed == ["/elsewhere/a.wav"]
+
+
+def test_index_survives_a_restart(engine, tmp_path):
+    path = make_cache(engine, tmp_path).generate_audio("Hello")
+    cache = make_cache(engine, tmp_path)
+    assert (len(cache._entries), cache.total_bytes) == (1, engine.size)
+    assert cache.generate_audio("Hello") == path
+    assert engine.calls == ["Hello"]
+
+
+def test_least_recently_used_files_are_evicted(engine, tmp_path, monkeypatch):
+    monkeypatch.setattr(cached_tts, "EVICTION_GRACE_SECONDS", 0.0)
+    cache = make_cache(engine, tmp_path, max_size_mb=3 * engine.size / 1024 / 1024)
+    paths = {text: cache.generate_audio(text) for text in "abc"}
+    cache.generate_audio("a")
+    cache.generate_audio("d")
+
+    assert not os.path.exists(paths["b"])
+    assert all(os.path.exists(paths[text]) for text in "ac")
+    assert (cache.evictions, cache.total_bytes) == (1, 3 * engine.size)
+    cache.generate_audio("b")
+    assert engine.calls == ["a", "b", "c", "d", "b"]
+
+
+def test_recently_used_files_are_not_evicted(engine, tmp_path):
+    # Their path may have been handed out and not read yet
+    cache = make_cache(engine, tmp_path, max_size_mb=engine.size / 1024 / 1024)
+    first = cache.generate_audio("a")
+    cache.generate_audio("b")
+    assert os.path.exists(first)
+    assert cache.evictions == 0
+
+
+def test_missing_files_are_synthesized_again(engine, tmp_path):
+    cache = make_cache(engine, tmp_path)
+    os.remove(cache.generate_audio("a"))
+    cache.generate_audio("a")
+    assert engine.calls == ["a", "a"]
+    assert cache.total_bytes == engine.size
+
+
+def test_concurrent_requests_share_one_synthesis(engine, tmp_path):
+    async def main():
+        cache = make_cache(engine, tmp_path)
+        engine.release.clear()
+        calls = [
+            asyncio.create_task(cache.async_generate_audio("Hello")) for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+        engine.release.set()
+        return cache, await asyncio.gather(*calls)
+
+    cache, paths = asyncio.run(main())
+    assert len(set(paths)) == 1
+    assert engine.calls == ["Hello"]
+    assert (cache.hits, cache.misses) == (2, 1)
+    assert not cache._inflight
+
+
+def test_cancelled_synthesis_fails_the_callers_sharing_it(engine, tmp_path):
+    async def main():
+        cache = make_cache(engine, tmp_path)
+        engine.release.clear()
+        owner = asyncio.create_task(cache.async_generate_audio("Hello"))
+        await asyncio.sleep(0)
+        sharer = asyncio.create_task(cache.async_generate_audio("Hello"))
+        await asyncio.sleep(0)
+        owner.cancel()
+        with pytest.raises(RuntimeError, match="cancelled"):
+            await sharer
+        # The next request synthesizes it
+        engine.release.set()
+        return cache, await cache.async_generate_audio("Hello")
+
+    cache, path = asyncio.run(main())
+    assert os.path.exists(path)
+    assert engine.calls == ["Hello"]
+    assert not cache._inflight
+
+
+def test_streams_are_cached_as_pcm(engine, tmp_path):
+    cache = make_cache(engine, tmp_path)
+    assert cache.supports_streaming and cache.supports_pcm
+
+    async def stream():
+        return [chunk async for chunk in cache.async_stream_audio("Hello")]
+
+    chunks = asyncio.run(stream())
+    assert len(chunks) == 3
+    # A hit is a single chunk with the same audio
+    (cached,) = asyncio.run(stream())
+    assert cached == PCMChunk(b"".join(c.pcm for c in chunks), SAMPLE_RATE)
+
+    audio = asyncio.run(cache.async_generate_pcm("Hello"))
+    assert audio.sample_rate == SAMPLE_RATE
+    assert audio.samples.tolist() == [1] * 100 + [2] * 100 + [3] * 100
+    assert engine.calls == ["Hello"]
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_interrupted_streams_are_not_cached(engine, tmp_path):
+    cache = make_cache(engine, tmp_path)
+
+    async def first_chunk():
+        stream = cache.async_stream_audio("Hello")
+        chunk = await stream.__anext__()
+        await stream.aclose()
+        return chunk
+
+    asyncio.run(first_chunk())
+    assert cache._entries == {}
+    asyncio.run(cache.async_generate_pcm("Hello"))
+    assert engine.calls == ["Hello", "Hello"]
+
+
+def test_unreadable_pcm_entries_are_dropped(engine, tmp_path):
+    cache = make_cache(engine, tmp_path)
+    audio = asyncio.run(cache.async_generate_pcm("Hello"))
+    assert isinstance(audio, PCMAudio)
+    ((path, _, _),) = cache._entries.values()
+    with open(path, "wb") as f:
+        f.write(b"not a wav")
+
+    asyncio.run(cache.async_generate_pcm("Hello"))
+    assert engine.calls == ["Hello", "Hello"]
+    assert cache.hits == 0
@@ -0,0 +1,158 @@
+"""Adaptive end of utterance detection and its latency span."""
+
+import numpy as np
+import pytest
+
+from open_llm_vtuber.tracing import PENDING_SPAN_SECONDS, TurnTracer
+from open_llm_vtuber.vad.endpointing import (
+    MIN_LEARNED_PAUSES,
+    MIN_PAUSE_WINDOWS,
+    Endpointer,
+    transcript_cue,
+)
+from open_llm_vtuber.vad.silero import SileroVADConfig, StateMachine
+
+WINDOW_SECONDS = 0.032
+
+
+@pytest.mark.parametrize(
+    "text, cue",
+    [
+        (None, "none"),
+        ("  ", "none"),
+        ("I am done.", "complete"),
+        ("Really?  ", "complete"),
+        ("你好。", "complete"),
+        ("First of all,", "continuation"),
+        ("bread and", "continuation"),
+        ("I went to the...", "complete"),
+        ("and then", "continuation"),
+        ("потому что", "continuation"),
+        ("Hello there", "none"),
+    ],
+)
+def test_transcript_cue(text, cue):
+    assert transcript_cue(text) == cue
+
+
+def make_endpointer():
+    return Endpointer(24, 8, 48, WINDOW_SECONDS)
+
+
+def test_transcript_cue_scales_the_hangover():
+    endpointer = make_endpointer()
+    assert endpointer.hangover_windows() == 24
+    endpointer.set_transcript("I am done.")
+    assert endpointer.hangover_windows() == 12
+    endpointer.set_transcript("I went and")
+    assert endpointer.hangover_windows() == 36
+
+
+def test_hangover_learned_from_pauses_stays_in_bounds():
+    endpointer = make_endpointer()
+    # Gaps between words are not pauses
+    endpointer.observe_pause(MIN_PAUSE_WINDOWS - 1)
+    assert len(endpointer.pauses) == 0
+    for _ in range(MIN_LEARNED_PAUSES - 1):
+        endpointer.observe_pause(10)
+    assert endpointer.learned_windows() is None
+    endpointer.observe_pause(10)
+    assert endpointer.learned_windows() == 14
+    assert endpointer.hangover_windows() == 14
+
+    for _ in range(50):
+        endpointer.observe_pause(100)
+    assert endpointer.hangover_windows() == 48
+    endpointer.set_transcript("Done!")
+    assert endpointer.hangover_windows() == 48
+
+
+def test_speech_resumed_soon_after_an_end_is_learned_as_a_pause():
+    endpointer = make_endpointer()
+    endpointer.utterance_ended(20, 20)
+    endpointer.speech_started(10)
+    assert list(endpointer.pauses) == [30]
+
+    endpointer.utterance_ended(20, 20)
+    endpointer.speech_started(40)
+    assert list(endpointer.pauses) == [30]
+
+
+def test_latency_runs_from_the_last_speech_to_the_decision():
+    endpointer = make_endpointer()
+    endpointer.set_transcript("Done.")
+    endpointer.speech_heard(100.0)
+    endpointer.speech_heard(100.5)
+    endpointer.utterance_ended(12, 12, now=100.9)
+    latency, cue = endpointer.take_decision()
+    assert latency == pytest.approx(0.4)
+    assert cue == "complete"
+    # Once per utterance
+    assert endpointer.take_decision() is None
+
+    # Speech too short to be sent has no decision to report
+    endpointer.speech_heard(200.0)
+    endpointer.utterance_ended(12, 12, sent=False, now=201.0)
+    assert endpointer.take_decision() is None
+
+
+def test_state_machine_measures_the_silence_after_speech():
+    config = SileroVADConfig(adaptive_endpointing=True)
+    machine = StateMachine(config)
+    speech, silence = 40, 30
+    probs = np.array([0.9] * speech + [0.01] * silence)
+    windows = np.zeros((speech + silence, 512), dtype=np.float32)
+    windows[:speech] = 0.3
+
+    # The windows of one call are taken to have arrived in real time
+    outputs = machine.process_windows(probs, windows)
+    assert outputs[:2] == [b"<|PAUSE|>", b"<|RESUME|>"]
+    latency, cue = machine.endpointer.take_decision()
+    assert cue == "none"
+    hangover = config.required_misses
+    assert latency == pytest.approx(hangover * machine.window_seconds)
+
+
+def test_endpointing_is_recorded_under_the_next_turn():
+    tracer = TurnTracer()
+    tracer.record_before_turn("alice", "endpointing", 0.4, cue="complete")
+    tracer.record_before_turn("alice", "endpointing", 0.6, cue="none")
+    tracer.record_before_turn("bob", "endpointing", 0.5)
+    # Nothing reaches the histograms before there is a turn
+    assert tracer.stage_seconds._series == {}
+
+    trace = tracer.start_turn("alice")
+    (span,) = trace.spans
+    assert (span.name, span.duration, span.attributes) == (
+        "endpointing",
+        0.6,
+        {"cue": "none"},
+    )
+    # It ended before the turn started
+    assert span.start + span.duration <= 0
+    assert tracer.stage_seconds._series["endpointing"][2] == 1
+    tracer.end_turn(trace)
+
+    # Taken once
+    trace = tracer.start_turn("alice")
+    assert trace.spans == []
+    tracer.end_turn(trace)
+
+    tracer.discard_pending("bob")
+    trace = tracer.start_turn("bob")
+    assert trace.spans == []
+    tracer.end_turn(trace)
+
+
+def test_stale_endpointing_is_not_recorded():
+    tracer = TurnTracer()
+    tracer.record_before_turn("alice", "endpointing", 0.4)
+    end, duration, attributes = tracer._pending["alice"]["endpointing"]
+    tracer._pending["alice"]["endpointing"] = (
+        end - PENDING_SPAN_SECONDS - 1,
+        duration,
+        attributes,
+    )
+    trace = tracer.start_turn("alice")
+    assert trace.spans == []
+    tracer.end_turn(trace)
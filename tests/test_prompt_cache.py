@@ -0,0 +1,173 @@
+"""Prompt prefix caching: usage reports and Claude cache breakpoints."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from open_llm_vtuber.agent.stateless_llm.prompt_cache import (
+    EPHEMERAL_CACHE_CONTROL,
+    PromptUsage,
+    mark_claude_cache_breakpoints,
+)
+
+
+def test_usage_from_openai_cached_tokens():
+    usage = PromptUsage.from_openai(
+        {"prompt_tokens": 1200, "prompt_tokens_details": {"cached_tokens": 1024}}
+    )
+    assert usage == PromptUsage(cached_tokens=1024, uncached_tokens=176, requests=1)
+    assert usage.hit_ratio == pytest.approx(1024 / 1200)
+
+
+def test_usage_from_openai_deepseek_and_missing_details():
+    usage = PromptUsage.from_openai(
+        {"prompt_tokens": 50, "prompt_cache_hit_tokens": 20}
+    )
+    assert (usage.cached_tokens, usage.uncached_tokens) == (20, 30)
+
+    usage = PromptUsage.from_openai(
+        {"prompt_tokens": 50, "prompt_tokens_details": None}
+    )
+    assert (usage.cached_tokens, usage.uncached_tokens) == (0, 50)
+
+
+def test_usage_from_openai_model():
+    class Usage:
+        def model_dump(self):
+            return {"prompt_tokens": 10, "prompt_tokens_details": {"cached_tokens": 4}}
+
+    usage = PromptUsage.from_openai(Usage())
+    assert (usage.cached_tokens, usage.uncached_tokens) == (4, 6)
+    # Objects without model_dump report nothing
+    assert PromptUsage.from_openai(object()).prompt_tokens == 0
+
+
+def test_usage_from_anthropic_and_add():
+    total = PromptUsage()
+    assert total.hit_ratio == 0.0
+    total.add(
+        PromptUsage.from_anthropic(
+            {
+                "input_tokens": 10,
+                "cache_read_input_tokens": 0,
+                "cache_creation_input_tokens": 900,
+            }
+        )
+    )
+    total.add(
+        PromptUsage.from_anthropic({"input_tokens": 12, "cache_read_input_tokens": 900})
+    )
+    assert total == PromptUsage(
+        cached_tokens=900, uncached_tokens=22, cache_write_tokens=900, requests=2
+    )
+    assert total.prompt_tokens == 1822
+    assert "requests=2" in str(total)
+    assert PromptUsage.from_anthropic(None).requests == 1
+
+
+def test_claude_breakpoints_on_the_stable_prefix():
+    tools = [{"name": "a"}, {"name": "b"}]
+    messages = [
+        {"role": "user", "content": "first"},
+        {"role": "assistant", "content": [{"type": "text", "text": "reply"}]},
+        {"role": "user", "content": "newest"},
+    ]
+    system, cached_tools, cached_messages = mark_claude_cache_breakpoints(
+        "be nice", tools, messages
+    )
+
+    assert system == [
+        {"type": "text", "text": "be nice", "cache_control": EPHEMERAL_CACHE_CONTROL}
+    ]
+    assert cached_tools[0] == {"name": "a"}
+    assert cached_tools[1]["cache_control"] == EPHEMERAL_CACHE_CONTROL
+    # The history before the newest message ends with a breakpoint
+    assert cached_messages[0] == messages[0]
+    assert cached_messages[1]["content"][-1]["cache_control"] == EPHEMERAL_CACHE_CONTROL
+    assert cached_messages[2] == messages[2]
+
+    # The inputs are left as they were
+    assert "cache_control" not in tools[1]
+    assert "cache_control" not in messages[1]["content"][-1]
+
+
+def test_claude_breakpoints_string_content_and_short_requests():
+    messages = [
+        {"role": "user", "content": "first"},
+        {"role": "user", "content": "newest"},
+    ]
+    _, _, cached = mark_claude_cache_breakpoints("", None, messages)
+    assert cached[0]["content"] == [
+        {"type": "text", "text": "first", "cache_control": EPHEMERAL_CACHE_CONTROL}
+    ]
+    assert messages[0]["content"] == "first"
+
+    system, tools, cached = mark_claude_cache_breakpoints("", [], messages[1:])
+    assert (system, tools, cached) == ("", [], messages[1:])
+
+
+class FakeCompletions:
+    """`client.chat.completions` of a backend, optionally rejecting stream_options."""
+
+    def __init__(self, reject_stream_options=False, reject_all=False):
+        self.reject_stream_options = reject_stream_options
+        self.reject_all = reject_all
+        self.calls = []
+
+    async def create(self, **kwargs):
+        from openai import NOT_GIVEN
+
+        self.calls.append(kwargs)
+        with_options = kwargs["stream_options"] is not NOT_GIVEN
+        if self.reject_all or (self.reject_stream_options and with_options):
+            raise bad_request()
+        return f"stream{len(self.calls)}"
+
+
+def bad_request():
+    import httpx
+    from openai import BadRequestError
+
+    request = httpx.Request("POST", "http://llm/v1/chat/completions")
+    response = httpx.Response(400, request=request)
+    return BadRequestError("unknown field stream_options", response=response, body=None)
+
+
+def make_llm(completions, prompt_caching=True):
+    pytest.importorskip("openai")
+    from open_llm_vtuber.agent.stateless_llm.openai_compatible_llm import AsyncLLM
+
+    llm = AsyncLLM(model="m", base_url="http://llm/v1", prompt_caching=prompt_caching)
+    llm.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return llm
+
+
+def test_stream_options_only_with_prompt_caching():
+    completions = FakeCompletions()
+    llm = make_llm(completions, prompt_caching=False)
+    assert asyncio.run(llm._create_stream([], None)) == ("stream1", False)
+
+    llm = make_llm(completions)
+    assert asyncio.run(llm._create_stream([], None)) == ("stream2", True)
+    assert completions.calls[-1]["stream_options"] == {"include_usage": True}
+
+
+def test_stream_options_dropped_when_rejected():
+    completions = FakeCompletions(reject_stream_options=True)
+    llm = make_llm(completions)
+
+    assert asyncio.run(llm._create_stream([], None)) == ("stream2", False)
+    assert not llm.support_stream_usage
+    # Not asked for again
+    assert asyncio.run(llm._create_stream([], None)) == ("stream3", False)
+    assert len(completions.calls) == 3
+
+
+def test_other_bad_requests_keep_stream_options():
+    completions = FakeCompletions(reject_all=True)
+    llm = make_llm(completions)
+
+    with pytest.raises(Exception, match="stream_options"):
+        asyncio.run(llm._create_stream([], None))
+    assert llm.support_stream_usage
@@ -0,0 +1,147 @@
+"""Silero VAD sessions: batched scoring on a shared model and the state machine."""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from open_llm_vtuber.vad import silero
+from open_llm_vtuber.vad.silero import SileroVADConfig, StateMachine, VADEngine
+
+WINDOW = 512
+SPEECH = 0.3
+SILENCE = 0.0
+
+
+class FakeModel:
+    """
+    Scores a window by its first sample. The recurrent state counts the
+    windows each stream was scored with.
+    """
+
+    def __init__(self):
+        self.batches = []
+        self.fail = False
+
+    def run(self, windows, state, context):
+        if self.fail:
+            raise RuntimeError("model failed")
+        self.batches.append(len(windows))
+        return windows[:, 0].copy(), state + 1, windows[:, -context.shape[1] :].copy()
+
+
+class FakeVADEngine(VADEngine):
+    def load_vad_model(self):
+        return FakeModel()
+
+
+def windows(*values):
+    return np.repeat(np.array(values, dtype=np.float32)[:, None], WINDOW, axis=1)
+
+
+def test_sessions_of_one_tick_share_a_model_call():
+    async def main():
+        engine = FakeVADEngine()
+        first, second = engine.create_session(), engine.create_session()
+        return (
+            engine,
+            first,
+            second,
+            await asyncio.gather(
+                engine.score(first, windows(0.1, 0.2, 0.3)),
+                engine.score(second, windows(0.9)),
+            ),
+        )
+
+    engine, first, second, (first_probs, second_probs) = asyncio.run(main())
+    assert first_probs == pytest.approx([0.1, 0.2, 0.3])
+    assert second_probs == pytest.approx([0.9])
+    # One window per session per call: the model is recurrent
+    assert engine.model.batches == [2, 1, 1]
+    assert first.model_state[0, 0, 0] == 3
+    assert second.model_state[0, 0, 0] == 1
+    assert first.model_context.shape == (1, engine.context_size)
+    assert np.all(first.model_context == np.float32(0.3))
+
+
+def test_windows_of_one_session_are_scored_in_order():
+    async def main():
+        engine = FakeVADEngine()
+        session = engine.create_session()
+        probs = await asyncio.gather(
+            engine.score(session, windows(0.1)),
+            engine.score(session, windows(0.2, 0.3)),
+        )
+        return engine, session, probs
+
+    engine, session, probs = asyncio.run(main())
+    assert probs[0] == pytest.approx([0.1])
+    assert probs[1] == pytest.approx([0.2, 0.3])
+    # The second request waits for the next batch instead of joining the first
+    assert engine.model.batches == [1, 1, 1]
+    assert session.model_state[0, 0, 0] == 3
+
+
+def test_model_errors_reach_the_waiting_sessions():
+    async def main():
+        engine = FakeVADEngine()
+        engine.model.fail = True
+        session = engine.create_session()
+        with pytest.raises(RuntimeError, match="model failed"):
+            await engine.score(session, windows(0.1))
+        # The engine keeps serving
+        engine.model.fail = False
+        return await engine.score(session, windows(0.2))
+
+    assert asyncio.run(main()).tolist() == pytest.approx([0.2])
+
+
+def test_audio_is_cut_into_whole_windows_across_chunks():
+    async def main():
+        session = FakeVADEngine().create_session()
+        audio = np.full(WINDOW * 3, SILENCE, dtype=np.float32)
+        await session.async_detect_speech(audio[:700])
+        leftover = len(session._leftover)
+        await session.async_detect_speech(audio[700:])
+        return leftover, len(session._leftover)
+
+    assert asyncio.run(main()) == (700 - WINDOW, 0)
+
+
+def feed(machine, probs):
+    """Feed one window per probability; speech windows are loud."""
+    probs = np.asarray(probs, dtype=np.float32)
+    audio = np.where(probs[:, None] >= 0.5, SPEECH, SILENCE) * np.ones(WINDOW)
+    return machine.process_windows(probs, audio.astype(np.float32))
+
+
+def test_state_machine_sends_utterances():
+    config = SileroVADConfig()
+    machine = StateMachine(config)
+    speech = silero.MIN_SPEECH_WINDOWS + 10
+
+    outputs = feed(machine, [0.9] * speech)
+    assert outputs == [b"<|PAUSE|>"]
+    # A short pause does not end it
+    assert feed(machine, [0.01] * (config.required_misses // 2) + [0.9] * 5) == []
+
+    outputs = feed(machine, [0.01] * (2 * config.required_misses))
+    assert outputs[0] == b"<|RESUME|>"
+    utterance = np.frombuffer(outputs[1], dtype=np.int16)
+    assert len(utterance) % WINDOW == 0
+    assert utterance.max() == int(SPEECH * 32767)
+    assert machine.state == silero.State.IDLE
+
+
+def test_state_machine_drops_short_speech_and_unscored_windows():
+    config = SileroVADConfig(required_misses=8)
+    machine = StateMachine(config)
+    # Misses until INACTIVE, then as many until the end of the utterance
+    hangover = 2 * config.required_misses
+    outputs = feed(machine, [0.9] * 5 + [0.01] * (hangover + 10))
+    # Too short for ASR: only the markers
+    assert outputs == [b"<|PAUSE|>", b"<|RESUME|>"]
+
+    # Windows scored exactly 0 are not windows of the stream
+    assert feed(machine, [0.0] * 10) == []
+    assert machine.idle_windows == 10
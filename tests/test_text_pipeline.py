@@ -0,0 +1,239 @@
+"""
+The compiled TextPipeline must give the results of the multi-pass chain it
+replaced: emotion tag scan, forbidden tag removal, then
+`utils.tts_preprocessor.tts_filter`.
+"""
+
+import asyncio
+import itertools
+import random
+import re
+
+import pytest
+
+from open_llm_vtuber.agent.transformers import sentence_divider, text_processor
+from open_llm_vtuber.config_manager import TTSPreprocessorConfig, TranslatorConfig
+from open_llm_vtuber.utils.sentence_divider import TagState
+from open_llm_vtuber.utils.text_pipeline import (
+    FORBIDDEN_EXPRESSIONS,
+    FilterFlags,
+    TextPipeline,
+)
+from open_llm_vtuber.utils.tts_preprocessor import tts_filter
+
+EMO_MAP = {"joy": 3, "anger": 2, "happy": 7, "sadness": 1, "wink": 9, "fear": 5}
+FLAG_NAMES = (
+    "remove_special_char",
+    "ignore_brackets",
+    "ignore_parentheses",
+    "ignore_asterisks",
+    "ignore_angle_brackets",
+)
+ALL_FLAGS = [
+    dict(zip(FLAG_NAMES, values))
+    for values in itertools.product([False, True], repeat=len(FLAG_NAMES))
+]
+
+CASES = [
+    "",
+    "Plain sentence, nothing to filter.",
+    # Brackets, nested and unbalanced
+    "[aside] Hello there",
+    "Hello [note [nested] text] world",
+    "Unclosed [bracket stays hidden",
+    "Stray ] closing bracket",
+    # Asterisks
+    "*waves* Hi!",
+    "**bold** and ***very bold*** text",
+    "A single * star",
+    "*an action\nacross lines*",
+    "Unclosed **run of stars",
+    # Parentheses and angle brackets
+    "(quietly) I see (you)",
+    "Full-width （括号） stay",
+    "<b>tagged</b> text",
+    "a < b > c",
+    # Emotion tags, known, forbidden and unknown
+    "[joy] Yay! [anger] Grr",
+    "[JOY] Upper [Happy] mixed case",
+    "[wink] [neutral] [unknown] tags",
+    "Joined halves [jo[neutral]y]",
+    "[jo[joy]y] twice",
+    # Whitespace and special characters
+    "  Lots   of \t spaces \n here  ",
+    "Emoji 😀 and ♥ symbols, $5 ｆｕｌｌ",
+    "Привет, *мир* [joy] 你好",
+]
+
+FRAGMENTS = [
+    "Hello",
+    " world",
+    "Привет",
+    "你好",
+    " ",
+    "\n",
+    "*",
+    "**",
+    "[",
+    "]",
+    "(",
+    ")",
+    "<",
+    ">",
+    "[joy]",
+    "[JOY]",
+    "[happy]",
+    "[neutral]",
+    "[fear]",
+    "[unknown]",
+    "[jo",
+    "y]",
+    "!",
+    ",",
+    "😀",
+    "ｆｕｌｌ",
+]
+
+
+def reference_extract_emotion(text: str) -> list:
+    """`Live2dModel.extract_emotion` before the compiled pipeline."""
+    expression_list = []
+    lower = text.lower()
+    i = 0
+    while i < len(lower):
+        if lower[i] != "[":
+            i += 1
+            continue
+        for key in EMO_MAP.keys():
+            emo_tag = f"[{key}]"
+            if lower[i : i + len(emo_tag)] == emo_tag:
+                expression_list.append(EMO_MAP[key])
+                i += len(emo_tag) - 1
+                break
+        i += 1
+    return expression_list
+
+
+def reference_display_text(text: str) -> str:
+    """Forbidden tag removal of `display_processor` before the compiled pipeline."""
+    for name in FORBIDDEN_EXPRESSIONS:
+        text = re.sub(rf"\[{re.escape(name)}\]", "", text, flags=re.I)
+    return text
+
+
+def reference(text: str, flags: dict) -> tuple:
+    display = reference_display_text(text)
+    return reference_extract_emotion(text), display, tts_filter(display, **flags)
+
+
+def processed(pipeline: TextPipeline, text: str) -> tuple:
+    result = pipeline.process(text)
+    return result.expressions, result.display_text, result.tts_text
+
+
+@pytest.mark.parametrize("flags", ALL_FLAGS)
+@pytest.mark.parametrize("text", CASES)
+def test_process_matches_reference(text, flags):
+    pipeline = TextPipeline(EMO_MAP, **flags)
+    assert processed(pipeline, text) == reference(text, flags)
+
+
+@pytest.mark.parametrize("flags", ALL_FLAGS)
+def test_random_sentences_match_reference(flags):
+    rng = random.Random(0)
+    pipeline = TextPipeline(EMO_MAP, **flags)
+    for _ in range(300):
+        text = "".join(rng.choice(FRAGMENTS) for _ in range(rng.randint(0, 24)))
+        assert processed(pipeline, text) == reference(text, flags), text
+
+
+def test_default_filters():
+    pipeline = TextPipeline(EMO_MAP)
+    result = pipeline.process("[joy] *waves* Hello (softly) [aside] <b>there</b>!")
+    assert result.expressions == [3]
+    assert result.display_text == " *waves* Hello (softly) [aside] <b>there</b>!"
+    assert result.tts_text == "Hello there!"
+
+
+def test_filter_tts_and_emotion_helpers():
+    pipeline = TextPipeline(EMO_MAP, remove_special_char=True)
+    # Special characters go after the whitespace cleanup, as in tts_filter
+    assert pipeline.filter_tts("*hm* Hi 😀 [x]") == "Hi "
+    assert pipeline.extract_emotion("[Wink] a [happy] b [neutral]") == [9, 7]
+    assert pipeline.remove_emotion_keywords("[jo[joy]y]ok") == "ok"
+    assert TextPipeline().extract_emotion("[joy]") == []
+
+
+class FakeLive2dModel:
+    """The parts of Live2dModel used by `text_processor`."""
+
+    def text_pipeline(self, tts_preprocessor_config=None) -> TextPipeline:
+        return TextPipeline(
+            EMO_MAP, **TextPipeline.config_key(tts_preprocessor_config)._asdict()
+        )
+
+
+def run_chat(chunks: list, flags: dict) -> tuple:
+    """
+    A chunked LLM reply through `sentence_divider`: the sentences, and their
+    (expressions, display text, TTS text) from `text_processor`.
+    """
+    config = TTSPreprocessorConfig(
+        **flags,
+        translator_config=TranslatorConfig(
+            translate_audio=False, translate_provider="deeplx"
+        ),
+    )
+
+    async def chat():
+        for chunk in chunks:
+            yield chunk
+
+    divider = sentence_divider(
+        faster_first_response=False, segment_method="regex", valid_tags=["think"]
+    )
+    processor = text_processor(FakeLive2dModel(), config)(divider(chat))
+
+    async def collect():
+        sentences = [sentence async for sentence in divider(chat)()]
+        outputs = [
+            (out.actions.expressions or [], out.display_text.text, out.tts_text)
+            async for out in processor()
+        ]
+        return sentences, outputs
+
+    return asyncio.run(collect())
+
+
+REPLY = (
+    "[joy] Hello *waves* there (softly). "
+    "I am [neutral]fine, [aside] thank you! "
+    "<think>hidden [anger] thought</think> "
+    "See **you** [wink] soon."
+)
+
+
+@pytest.mark.parametrize(
+    "flags", [ALL_FLAGS[0], ALL_FLAGS[-1], FilterFlags()._asdict()]
+)
+def test_reply_split_across_chunks(flags):
+    sentences, outputs = run_chat([REPLY], flags)
+    assert len(sentences) == len(outputs) == 6
+
+    expected = []
+    for sentence in sentences:
+        expressions, display, tts = reference(sentence.text, flags)
+        tag = sentence.tags[0]
+        if tag.name == "think":
+            # Thoughts are shown in parentheses and not spoken
+            tts = ""
+            if tag.state != TagState.INSIDE:
+                expressions = []
+                display = "(" if tag.state == TagState.START else ")"
+        expected.append((expressions, display, tts))
+    assert outputs == expected
+
+    # Tags, asterisk runs and brackets cut in the middle
+    assert run_chat(list(REPLY), flags)[1] == outputs
+    thirds = [REPLY[i : i + 3] for i in range(0, len(REPLY), 3)]
+    assert run_chat(thirds, flags)[1] == outputs
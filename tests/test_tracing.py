@@ -0,0 +1,140 @@
+"""Per-turn latency tracing and its Prometheus rendering."""
+
+import asyncio
+import json
+
+from open_llm_vtuber.config_manager import TracingConfig
+from open_llm_vtuber.tracing import (
+    Histogram,
+    TurnTracer,
+    current_trace,
+    trace_mark,
+    trace_span,
+    turn_tracer,
+)
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram("h", "Help.", "stage", buckets=(0.1, 1.0))
+    histogram.observe("asr", 0.05)
+    histogram.observe("asr", 0.5)
+    histogram.observe("asr", 3.0)
+    histogram.observe('say "hi"', 1.0)
+
+    lines = histogram.render()
+    assert lines[:2] == ["# HELP h Help.", "# TYPE h histogram"]
+    assert 'h_bucket{stage="asr",le="0.1"} 1' in lines
+    assert 'h_bucket{stage="asr",le="1"} 2' in lines
+    assert 'h_bucket{stage="asr",le="+Inf"} 3' in lines
+    assert 'h_sum{stage="asr"} 3.550000' in lines
+    assert 'h_count{stage="asr"} 3' in lines
+    assert 'h_count{stage="say \\"hi\\""} 1' in lines
+
+
+def test_turn_records_spans_and_milestones_once():
+    tracer = TurnTracer()
+    trace = tracer.start_turn("client", kind="single")
+    assert current_trace() is trace
+
+    tracer.record_span("asr", 0.0, 0.2, engine="fake")
+    tracer.mark("first_audio")
+    tracer.mark("first_audio")
+    tracer.end_turn(trace)
+
+    assert current_trace() is None
+    assert [(s.name, s.duration, s.attributes) for s in trace.spans] == [
+        ("asr", 0.2, {"engine": "fake"})
+    ]
+    assert list(trace.milestones) == ["first_audio"]
+    assert tracer.milestone_seconds._series["first_audio"][2] == 1
+    assert tracer.turns_total == {("single", "completed"): 1}
+    assert tracer.turns_in_progress == 0
+    assert tracer.turn_seconds._series["single"][2] == 1
+
+    # Ending twice changes nothing
+    tracer.end_turn(trace, "interrupted")
+    assert trace.outcome == "completed"
+    assert tracer.turns_total == {("single", "completed"): 1}
+
+
+def test_interrupted_turns_are_not_timed():
+    tracer = TurnTracer()
+    tracer.end_turn(tracer.start_turn("client"), "interrupted")
+    assert tracer.turns_total == {("single", "interrupted"): 1}
+    assert tracer.turn_seconds._series == {}
+
+
+def test_spans_outside_a_turn_only_reach_the_histograms():
+    tracer = TurnTracer()
+    tracer.record_span("tts", 0.0, 0.3)
+    tracer.mark("first_audio")
+    assert tracer.stage_seconds._series["tts"][2] == 1
+    assert tracer.milestone_seconds._series == {}
+
+
+def test_disabled_tracer_records_nothing():
+    tracer = TurnTracer()
+    tracer.configure(TracingConfig(enabled=False))
+    assert tracer.start_turn("client") is None
+    tracer.record_span("tts", 0.0, 0.3)
+    tracer.end_turn(None)
+    assert tracer.stage_seconds._series == {}
+    assert tracer.turns_total == {}
+
+
+def test_tasks_of_concurrent_turns_record_on_their_own_trace():
+    async def turn(client_uid, stages):
+        trace = turn_tracer.start_turn(client_uid)
+
+        async def stage(name):
+            # Tasks copy the context: they see the trace of their turn
+            with trace_span(name):
+                await asyncio.sleep(0.01)
+            trace_mark(f"{name}_done")
+
+        await asyncio.gather(*(asyncio.create_task(stage(s)) for s in stages))
+        turn_tracer.end_turn(trace)
+        return trace
+
+    async def main():
+        return await asyncio.gather(turn("a", ["asr", "llm"]), turn("b", ["tts"]))
+
+    first, second = asyncio.run(main())
+    assert sorted(s.name for s in first.spans) == ["asr", "llm"]
+    assert [s.name for s in second.spans] == ["tts"]
+    assert set(first.milestones) == {"asr_done", "llm_done"}
+    assert all(s.duration >= 0.01 for s in first.spans + second.spans)
+
+
+def test_trace_file_gets_one_line_per_turn(tmp_path):
+    tracer = TurnTracer()
+    tracer.configure(TracingConfig(trace_file=str(tmp_path / "traces" / "t.jsonl")))
+    for outcome in ("completed", "interrupted"):
+        trace = tracer.start_turn("client")
+        tracer.record_span("llm", 0.0, 1.5)
+        tracer.end_turn(trace, outcome)
+
+    lines = (tmp_path / "traces" / "t.jsonl").read_text().splitlines()
+    records = [json.loads(line) for line in lines]
+    assert [r["outcome"] for r in records] == ["completed", "interrupted"]
+    assert records[0]["spans"] == [{"name": "llm", "start": 0.0, "duration": 1.5}]
+    assert records[0]["turn_id"] != records[1]["turn_id"]
+
+
+def test_render_prometheus():
+    tracer = TurnTracer()
+    tracer.end_turn(tracer.start_turn("client", kind="group"))
+    tracer.count_cancelled("tts_synthesis", 3)
+    tracer.count_cancelled("tts_synthesis", 0)
+    tracer.count_cancelled("translation")
+    tracer.add_collector("cache", lambda: ["vtuber_cache_hits_total 7"])
+
+    text = tracer.render_prometheus()
+    assert text.endswith("\n")
+    lines = text.splitlines()
+    assert 'vtuber_turns_total{kind="group",outcome="completed"} 1' in lines
+    assert "vtuber_turns_in_progress 0" in lines
+    assert 'vtuber_interrupted_work_total{work="tts_synthesis"} 3' in lines
+    assert 'vtuber_interrupted_work_total{work="translation"} 1' in lines
+    assert 'vtuber_turn_duration_seconds_count{kind="group"} 1' in lines
+    assert lines[-1] == "vtuber_cache_hits_total 7"
@@ -0,0 +1,228 @@
+"""TTSTaskManager: ordered delivery, backpressure, sentence batching and clear."""
+
+import asyncio
+import json
+import time
+
+import numpy as np
+
+from open_llm_vtuber.agent.output_types import DisplayText
+from open_llm_vtuber.conversations import tts_manager
+from open_llm_vtuber.conversations.tts_manager import TTSTaskManager
+from open_llm_vtuber.tracing import turn_tracer
+from open_llm_vtuber.tts.tts_interface import PCMAudio, TTSInterface
+
+
+class FakeEngine(TTSInterface):
+    """In-memory engine; a sentence is synthesized once its text is released."""
+
+    def __init__(self, delays=None, blocked=False):
+        self.delays = delays or {}
+        self.texts = []
+        self.released = asyncio.Event()
+        if not blocked:
+            self.released.set()
+
+    @property
+    def supports_pcm(self) -> bool:
+        return True
+
+    def generate_audio(self, text, file_name_no_ext=None):
+        raise NotImplementedError
+
+    async def async_generate_pcm(self, text):
+        self.texts.append(text)
+        await self.released.wait()
+        await asyncio.sleep(self.delays.get(text, 0))
+        return PCMAudio(np.full(1600, 1000, dtype=np.int16), 16000)
+
+
+class Client:
+    def __init__(self):
+        self.messages = []
+
+    async def send(self, text):
+        self.messages.append(json.loads(text))
+
+    @property
+    def texts(self):
+        return [m["display_text"]["text"] for m in self.messages]
+
+
+def speak(manager, engine, client, text):
+    return manager.speak(
+        tts_text=text,
+        display_text=DisplayText(text=text),
+        actions=None,
+        live2d_model=None,
+        tts_engine=engine,
+        websocket_send=client.send,
+    )
+
+
+async def drain(manager):
+    await manager.flush()
+    await asyncio.gather(*manager.task_list)
+    await manager._payload_queue.join()
+
+
+def cancelled_work():
+    return dict(turn_tracer.cancelled_work)
+
+
+def cancelled_since(before, work):
+    return turn_tracer.cancelled_work.get(work, 0) - before.get(work, 0)
+
+
+def test_sentences_are_sent_in_order():
+    async def main():
+        # Later sentences finish first
+        engine = FakeEngine(delays={"one": 0.03, "two": 0.02, "three": 0.01})
+        client = Client()
+        manager = TTSTaskManager()
+        for text in ("one", "two", "...", "three"):
+            await speak(manager, engine, client, text)
+        await drain(manager)
+        manager.clear()
+        return client
+
+    client = asyncio.run(main())
+    assert client.texts == ["one", "two", "...", "three"]
+    # The silent sentence has no audio
+    assert [bool(m["audio"]) for m in client.messages] == [True, True, False, True]
+
+
+def test_speak_waits_while_too_many_sentences_are_queued():
+    async def main():
+        engine = FakeEngine(blocked=True)
+        client = Client()
+        manager = TTSTaskManager()
+        for i in range(tts_manager.MAX_SENTENCES_AHEAD):
+            await speak(manager, engine, client, f"s{i}")
+
+        waiting = asyncio.create_task(speak(manager, engine, client, "late"))
+        await asyncio.sleep(0.05)
+        blocked = not waiting.done()
+        engine.released.set()
+        await waiting
+        await drain(manager)
+        manager.clear()
+        return blocked, client
+
+    blocked, client = asyncio.run(main())
+    assert blocked
+    assert client.texts[-1] == "late"
+    assert len(client.texts) == tts_manager.MAX_SENTENCES_AHEAD + 1
+
+
+def test_short_sentences_are_batched_while_audio_is_ahead():
+    async def main():
+        engine = FakeEngine()
+        client = Client()
+        manager = TTSTaskManager(batch_sentences=True)
+        manager.speed.rtf = 0.1
+        manager.speed.seconds_per_char = 0.05
+        await speak(manager, engine, client, "First.")
+        # Seconds of audio still to play: waiting costs nothing
+        manager._playback_end = time.monotonic() + 10
+        for text in ("Two.", "Three.", "Four."):
+            await speak(manager, engine, client, text)
+        held = manager._pending.tts_text
+        await drain(manager)
+        manager.clear()
+        return engine, held
+
+    engine, held = asyncio.run(main())
+    assert held == "Two. Three. Four."
+    assert engine.texts == ["First.", "Two. Three. Four."]
+
+
+def test_held_sentence_is_dispatched_before_the_audio_runs_out():
+    async def main():
+        engine = FakeEngine()
+        client = Client()
+        manager = TTSTaskManager(batch_sentences=True)
+        manager.speed.rtf = 0.1
+        manager.speed.seconds_per_char = 0.01
+        await speak(manager, engine, client, "First.")
+        manager._playback_end = (
+            time.monotonic() + tts_manager.BATCH_SAFETY_SECONDS + 0.05
+        )
+        await speak(manager, engine, client, "Second.")
+        assert manager._flush_timer is not None
+        await asyncio.sleep(0.1)
+        return engine, manager
+
+    engine, manager = asyncio.run(main())
+    assert engine.texts == ["First.", "Second."]
+    assert manager._pending is None and not manager._timer_flushes
+
+
+def test_clear_cancels_running_syntheses():
+    async def main():
+        before = cancelled_work()
+        engine = FakeEngine(blocked=True)
+        client = Client()
+        manager = TTSTaskManager()
+        for text in ("one", "two"):
+            await speak(manager, engine, client, text)
+        tasks = list(manager.task_list)
+        await asyncio.sleep(0)
+        manager.clear()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        return before, tasks, manager, client
+
+    before, tasks, manager, client = asyncio.run(main())
+    assert all(task.cancelled() for task in tasks)
+    assert client.messages == []
+    assert manager.task_list == [] and manager._sequence_counter == 0
+    assert cancelled_since(before, "tts_synthesis") == 2
+
+
+def test_clear_drops_a_sentence_waiting_on_backpressure():
+    async def main():
+        before = cancelled_work()
+        engine = FakeEngine(blocked=True)
+        client = Client()
+        manager = TTSTaskManager()
+        for i in range(tts_manager.MAX_SENTENCES_AHEAD):
+            await speak(manager, engine, client, f"s{i}")
+        # Not a task the conversation cancels along with the manager
+        waiting = asyncio.create_task(speak(manager, engine, client, "stale"))
+        await asyncio.sleep(0.01)
+        manager.clear()
+        await waiting
+        return before, manager
+
+    before, manager = asyncio.run(main())
+    assert manager.task_list == [] and manager._sequence_counter == 0
+    assert cancelled_since(before, "tts_synthesis") == tts_manager.MAX_SENTENCES_AHEAD
+    assert cancelled_since(before, "tts_queued") == 1
+
+
+def test_clear_cancels_a_timer_dispatching_its_sentence():
+    async def main():
+        before = cancelled_work()
+        engine = FakeEngine(blocked=True)
+        client = Client()
+        manager = TTSTaskManager(batch_sentences=True)
+        manager.speed.rtf = 0.1
+        manager.speed.seconds_per_char = 0.01
+        for i in range(tts_manager.MAX_SENTENCES_AHEAD):
+            await speak(manager, engine, client, f"s{i}")
+        manager._playback_end = (
+            time.monotonic() + tts_manager.BATCH_SAFETY_SECONDS + 0.02
+        )
+        await speak(manager, engine, client, "held")
+        # The timer took the held sentence and waits on backpressure
+        while not manager._timer_flushes:
+            await asyncio.sleep(0.01)
+        (timer,) = manager._timer_flushes
+        manager.clear()
+        await asyncio.sleep(0.01)
+        return before, manager, timer
+
+    before, manager, timer = asyncio.run(main())
+    assert timer.cancelled()
+    assert manager.task_list == [] and manager._sequence_counter == 0
+    assert cancelled_since(before, "tts_held_sentence") == 1